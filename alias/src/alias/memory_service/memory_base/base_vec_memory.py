@@ -30,6 +30,9 @@ from mem0.memory.utils import (
 )
 from mem0.utils.factory import EmbedderFactory, LlmFactory, VectorStoreFactory
 
+from alias.memory_service.memory_base.embedding_batcher import (
+    get_embedding_batcher,
+)
 from alias.memory_service.memory_base.storage import SQLiteManager
 from alias.memory_service.profiling_utils.logging_utils import setup_logging
 from alias.memory_service.profiling_utils.memory_utils import (
@@ -106,6 +109,19 @@ class BaseAsyncVectorMemory(MemoryBase):
             logger.error(f"Configuration validation error: {e}")
             raise
 
+    async def _embed(self, text: str, memory_action: str) -> list:
+        """Embed one text, batched with concurrent requests of all pools."""
+        return await get_embedding_batcher(self.embedding_model).embed(
+            text,
+            memory_action,
+        )
+
+    async def _embed_many(self, texts: List[str], memory_action: str) -> list:
+        """Embed several texts in as few embedding calls as possible."""
+        return await get_embedding_batcher(
+            self.embedding_model,
+        ).embed_many(texts, memory_action)
+
     def _prepare_metadata_for_add(
         self,
         metadata: Optional[Dict[str, Any]],
@@ -262,7 +278,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         metadata: dict,
     ) -> list:
         """Add messages directly to vector store without inference."""
-        returned_memories = []
+        valid_messages = []
         for message_dict in messages:
             if (
                 not isinstance(message_dict, dict)
@@ -276,7 +292,19 @@ class BaseAsyncVectorMemory(MemoryBase):
 
             if message_dict["role"] == "system":
                 continue
+            valid_messages.append(message_dict)
 
+        # Embed every message with one batched call
+        all_embeddings = await self._embed_many(
+            [message_dict["content"] for message_dict in valid_messages],
+            "add",
+        )
+
+        returned_memories = []
+        for message_dict, msg_embeddings in zip(
+            valid_messages,
+            all_embeddings,
+        ):
             per_msg_meta = deepcopy(metadata)
             per_msg_meta["role"] = message_dict["role"]
 
@@ -285,11 +313,6 @@ class BaseAsyncVectorMemory(MemoryBase):
                 per_msg_meta["actor_id"] = actor_name
 
             msg_content = message_dict["content"]
-            msg_embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                msg_content,
-                "add",
-            )
             mem_id = await self._create_memory(
                 msg_content,
                 {msg_content: msg_embeddings},
@@ -350,15 +373,16 @@ class BaseAsyncVectorMemory(MemoryBase):
     ) -> tuple:
         """Search for existing memories similar to the given content list."""
         retrieved_memories = []
-        embeddings_map = {}
+        # Embed every fact with one batched call before searching
+        embeddings_map = dict(
+            zip(
+                content_list,
+                await self._embed_many(content_list, "add"),
+            ),
+        )
 
         async def process_content_for_search(content):
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                content,
-                "add",
-            )
-            embeddings_map[content] = embeddings
+            embeddings = embeddings_map[content]
             existing_mems = await asyncio.to_thread(
                 self.vector_store.search,
                 query=content,
@@ -465,14 +489,12 @@ class BaseAsyncVectorMemory(MemoryBase):
             or {}
         )
 
-    def _create_memory_task_for_event(
+    def _resolve_memory_action(
         self,
         action: dict,
         uuid_mapping: dict,
-        embeddings_map: dict,
-        metadata: dict,
     ):
-        """Create a memory task for a specific event type
+        """Validate an action and resolve the memory it targets
         (ADD/UPDATE/DELETE)."""
         action_text = action.get("text")
         if not action_text:
@@ -501,39 +523,121 @@ class BaseAsyncVectorMemory(MemoryBase):
         else:
             memory_id = None
 
-        try:
-            if event_type == "ADD":
-                task = asyncio.create_task(
-                    self._create_memory(
-                        data=action_text,
-                        existing_embeddings=embeddings_map,
-                        metadata=deepcopy(metadata),
-                    ),
-                )
-            elif event_type == "UPDATE":
-                task = asyncio.create_task(
-                    self._update_memory(
-                        memory_id=memory_id,
-                        data=action_text,
-                        existing_embeddings=embeddings_map,
-                        metadata=deepcopy(metadata),
-                    ),
+        return (action, event_type, memory_id)
+
+    async def _prepare_memory_action(
+        self,
+        action: dict,
+        event_type: str,
+        memory_id: Optional[str],
+        embeddings_map: dict,
+        metadata: dict,
+    ) -> dict:
+        if event_type == "ADD":
+            return await self._prepare_create(
+                data=action.get("text"),
+                existing_embeddings=embeddings_map,
+                metadata=deepcopy(metadata),
+            )
+        if event_type == "UPDATE":
+            return await self._prepare_update(
+                memory_id=memory_id,
+                data=action.get("text"),
+                existing_embeddings=embeddings_map,
+                metadata=deepcopy(metadata),
+            )
+        return await self._prepare_delete(memory_id=memory_id)
+
+    @staticmethod
+    def _log_memory_action_error(error: BaseException) -> None:
+        if str(error).lower() not in ["not an error", "no error", "success"]:
+            logger.error(f"Error processing memory action (async): {error}")
+        else:
+            logger.debug(
+                f"Non-error exception in memory task (async): {error}",
+            )
+
+    async def _write_memory_point(self, point: dict) -> None:
+        if point["event"] == "ADD":
+            await asyncio.to_thread(
+                self.vector_store.insert,
+                vectors=[point["vector"]],
+                ids=[point["id"]],
+                payloads=[point["payload"]],
+            )
+        elif point["event"] == "UPDATE":
+            await asyncio.to_thread(
+                self.vector_store.update,
+                vector_id=point["id"],
+                vector=point["vector"],
+                payload=point["payload"],
+            )
+        else:
+            await asyncio.to_thread(
+                self.vector_store.delete,
+                vector_id=point["id"],
+            )
+
+    async def _write_memory_points(self, points: list) -> list:
+        """
+        Write prepared points to the vector store and their history.
+
+        ADD and UPDATE points go to Qdrant in one upsert (Qdrant's insert
+        replaces existing points); DELETEs and the points of other vector
+        stores are written concurrently. The history records of all
+        written points are added in one SQLite transaction; if that
+        fails, the points stay written and the missing history is
+        logged.
+
+        Returns:
+            list: None for each point written, or the exception that
+                prevented it.
+        """
+        errors: List[Optional[BaseException]] = [None] * len(points)
+        single = list(range(len(points)))
+
+        upserts = [
+            i for i, point in enumerate(points) if point["vector"] is not None
+        ]
+        if len(upserts) > 1 and self.config.vector_store.provider == "qdrant":
+            try:
+                await asyncio.to_thread(
+                    self.vector_store.insert,
+                    vectors=[points[i]["vector"] for i in upserts],
+                    ids=[points[i]["id"] for i in upserts],
+                    payloads=[points[i]["payload"] for i in upserts],
                 )
-            else:  # DELETE
-                task = asyncio.create_task(
-                    self._delete_memory(memory_id=memory_id),
+                upserted = set(upserts)
+                single = [i for i in single if i not in upserted]
+            except Exception as e:
+                logger.warning(
+                    f"Bulk upsert of {len(upserts)} memories failed, "
+                    f"writing them one by one: {e}",
                 )
 
-            return (task, action, event_type, memory_id)
+        results = await asyncio.gather(
+            *(self._write_memory_point(points[i]) for i in single),
+            return_exceptions=True,
+        )
+        for i, result in zip(single, results):
+            if isinstance(result, BaseException):
+                errors[i] = result
+
+        written = [i for i, error in enumerate(errors) if error is None]
+        try:
+            await asyncio.to_thread(
+                self.db.add_history_many,
+                [points[i]["history"] for i in written],
+            )
         except Exception as e:
-            error_str = str(e).lower()
-            if error_str not in ["not an error", "no error", "success"]:
-                logger.error(f"Error processing memory action (async): {e}")
-            else:
-                logger.debug(
-                    f"Non-error exception in memory task (async): {e}",
-                )
-            return None
+            logger.error(
+                f"Wrote {len(written)} memories but failed to record "
+                f"their history: {e}",
+            )
+
+        for i in written:
+            self._capture_point_event(points[i])
+        return errors
 
     async def _execute_memory_actions(
         self,
@@ -542,79 +646,95 @@ class BaseAsyncVectorMemory(MemoryBase):
         embeddings_map: dict,
         metadata: dict,
     ) -> list:
-        """Execute memory actions (ADD/UPDATE/DELETE) based on LLM response."""
-        returned_memories = []
-        memory_tasks = []
+        """Execute memory actions (ADD/UPDATE/DELETE) based on LLM response.
 
-        # Create tasks for each action
+        The actions are prepared concurrently and written together by
+        ``_write_memory_points``, so only the last action on a memory is
+        applied; the result of each action is reported in the order of
+        the LLM response.
+        """
+        resolved = []
         for action in memory_actions.get("memory", []):
             logger.info(action)
-            task_info = self._create_memory_task_for_event(
-                action,
-                uuid_mapping,
-                embeddings_map,
-                metadata,
+            action_info = self._resolve_memory_action(action, uuid_mapping)
+            if action_info:
+                resolved.append(action_info)
+
+        last = {mem_id: i for i, (_, _, mem_id) in enumerate(resolved)}
+        superseded = {
+            i
+            for i, (_, _, mem_id) in enumerate(resolved)
+            if mem_id is not None and last[mem_id] != i
+        }
+        if superseded:
+            logger.warning(
+                f"Skipping memory actions superseded by a later action "
+                f"on the same memory: {[resolved[i] for i in superseded]}",
             )
-            if task_info:
-                memory_tasks.append(task_info)
+            resolved = [
+                action_info
+                for i, action_info in enumerate(resolved)
+                if i not in superseded
+            ]
 
-        logger.info(f"Memory tasks: {memory_tasks}")
+        logger.info(f"Memory actions: {resolved}")
 
-        # Execute all tasks
-        for task, resp, event_type, mem_id in memory_tasks:
-            logger.info(
-                f"Processing memory task: {task}, {resp}, "
-                f"{event_type}, {mem_id}",
-            )
-            try:
-                if task is None:
-                    logger.warning(
-                        f"Skipping None task for event_type: {event_type}",
-                    )
-                    continue
-
-                if not hasattr(task, "__await__"):
-                    logger.error(f"Task is not awaitable: {type(task)}")
-                    continue
-
-                result_id = await task
-
-                if event_type == "ADD":
-                    returned_memories.append(
-                        {
-                            "id": result_id,
-                            "memory": resp.get("text"),
-                            "event": event_type,
-                        },
-                    )
-                elif event_type == "UPDATE":
-                    returned_memories.append(
-                        {
-                            "id": mem_id,
-                            "memory": resp.get("text"),
-                            "event": event_type,
-                            "previous_memory": resp.get("old_memory"),
-                        },
-                    )
-                elif event_type == "DELETE":
-                    returned_memories.append(
-                        {
-                            "id": mem_id,
-                            "memory": resp.get("text"),
-                            "event": event_type,
-                        },
-                    )
-            except Exception as e:
-                if str(e).lower() not in [
-                    "not an error",
-                    "no error",
-                    "success",
-                ]:
-                    logger.error(f"Error awaiting memory task (async): {e}")
-                else:
-                    logger.debug(
-                        f"Non-error exception in memory task (async): {e}",
-                    )
+        prepared = await asyncio.gather(
+            *(
+                self._prepare_memory_action(
+                    action,
+                    event_type,
+                    mem_id,
+                    embeddings_map,
+                    metadata,
+                )
+                for action, event_type, mem_id in resolved
+            ),
+            return_exceptions=True,
+        )
+
+        ready = []
+        for action_info, point in zip(resolved, prepared):
+            if isinstance(point, BaseException):
+                self._log_memory_action_error(point)
+            else:
+                ready.append((action_info, point))
+
+        errors = await self._write_memory_points(
+            [point for _, point in ready],
+        )
+
+        returned_memories = []
+        for ((resp, event_type, mem_id), point), error in zip(ready, errors):
+            if error is not None:
+                self._log_memory_action_error(error)
+                continue
+
+            if event_type == "ADD":
+                returned_memories.append(
+                    {
+                        "id": point["id"],
+                        "memory": resp.get("text"),
+                        "event": event_type,
+                    },
+                )
+            elif event_type == "UPDATE":
+                returned_memories.append(
+                    {
+                        "id": mem_id,
+                        "memory": resp.get("text"),
+                        "event": event_type,
+                        "previous_memory": resp.get("old_memory"),
+                    },
+                )
+            elif event_type == "DELETE":
+                returned_memories.append(
+                    {
+                        "id": mem_id,
+                        "memory": resp.get("text"),
+                        "event": event_type,
+                    },
+                )
 
         return returned_memories
 
@@ -1068,11 +1188,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         threshold: Optional[float] = None,
     ):
         # Adapted from mem0.memory.main.AsyncMemory._search_vector_store
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
-            query,
-            "search",
-        )
+        embeddings = await self._embed(query, "search")
         memories = await asyncio.to_thread(
             self.vector_store.search,
             query=query,
@@ -1145,11 +1261,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             {"memory_id": memory_id, "sync_type": "async"},
         )
 
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
-            data,
-            "update",
-        )
+        embeddings = await self._embed(data, "update")
         existing_embeddings = {data: embeddings}
 
         await self._update_memory(
@@ -1247,15 +1359,29 @@ class BaseAsyncVectorMemory(MemoryBase):
 
     async def _create_memory(self, data, existing_embeddings, metadata=None):
         # Adapted from mem0.memory.main.AsyncMemory._create_memory
+        point = await self._prepare_create(data, existing_embeddings, metadata)
+        await asyncio.to_thread(
+            self.vector_store.insert,
+            vectors=[point["vector"]],
+            ids=[point["id"]],
+            payloads=[point["payload"]],
+        )
+        await asyncio.to_thread(self.db.add_history, **point["history"])
+        self._capture_point_event(point)
+        return point["id"]
+
+    async def _prepare_create(
+        self,
+        data,
+        existing_embeddings,
+        metadata=None,
+    ) -> dict:
+        """Build the point and history record of a new memory."""
         logger.debug(f"Creating memory with {data=}")
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                memory_action="add",
-            )
+            embeddings = await self._embed(data, "add")
 
         memory_id = (
             metadata["memory_id"]
@@ -1272,30 +1398,21 @@ class BaseAsyncVectorMemory(MemoryBase):
         if "memory_id" in metadata:
             del metadata["memory_id"]
 
-        await asyncio.to_thread(
-            self.vector_store.insert,
-            vectors=[embeddings],
-            ids=[memory_id],
-            payloads=[metadata],
-        )
-
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            None,
-            data,
-            "ADD",
-            created_at=metadata.get("created_at"),
-            actor_id=metadata.get("actor_id"),
-            role=metadata.get("role"),
-        )
-
-        capture_event(
-            "mem0._create_memory",
-            self,
-            {"memory_id": memory_id, "sync_type": "async"},
-        )
-        return memory_id
+        return {
+            "id": memory_id,
+            "event": "ADD",
+            "vector": embeddings,
+            "payload": metadata,
+            "history": {
+                "memory_id": memory_id,
+                "old_memory": None,
+                "new_memory": data,
+                "event": "ADD",
+                "created_at": metadata.get("created_at"),
+                "actor_id": metadata.get("actor_id"),
+                "role": metadata.get("role"),
+            },
+        }
 
     async def _create_procedural_memory(
         self,
@@ -1365,11 +1482,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             raise ValueError("Metadata cannot be done for procedural memory.")
 
         metadata["memory_type"] = MemoryType.PROCEDURAL.value
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
-            procedural_memory,
-            memory_action="add",
-        )
+        embeddings = await self._embed(procedural_memory, "add")
         memory_id = await self._create_memory(
             procedural_memory,
             {procedural_memory: embeddings},
@@ -1397,6 +1510,31 @@ class BaseAsyncVectorMemory(MemoryBase):
         metadata=None,
     ):
         # Adapted from mem0.memory.main.AsyncMemory._update_memory
+        point = await self._prepare_update(
+            memory_id,
+            data,
+            existing_embeddings,
+            metadata,
+        )
+        await asyncio.to_thread(
+            self.vector_store.update,
+            vector_id=memory_id,
+            vector=point["vector"],
+            payload=point["payload"],
+        )
+        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
+        await asyncio.to_thread(self.db.add_history, **point["history"])
+        self._capture_point_event(point)
+        return memory_id
+
+    async def _prepare_update(
+        self,
+        memory_id,
+        data,
+        existing_embeddings,
+        metadata=None,
+    ) -> dict:
+        """Build the point and history record of an updated memory."""
         logger.info(f"Updating memory with {data=}")
 
         try:
@@ -1448,65 +1586,68 @@ class BaseAsyncVectorMemory(MemoryBase):
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                "update",
-            )
-
-        await asyncio.to_thread(
-            self.vector_store.update,
-            vector_id=memory_id,
-            vector=embeddings,
-            payload=new_metadata,
-        )
-        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
-
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            prev_value,
-            data,
-            "UPDATE",
-            created_at=new_metadata["created_at"],
-            updated_at=new_metadata["updated_at"],
-            actor_id=new_metadata.get("actor_id"),
-            role=new_metadata.get("role"),
-        )
-        capture_event(
-            "mem0._update_memory",
-            self,
-            {"memory_id": memory_id, "sync_type": "async"},
-        )
-        return memory_id
+            embeddings = await self._embed(data, "update")
+
+        return {
+            "id": memory_id,
+            "event": "UPDATE",
+            "vector": embeddings,
+            "payload": new_metadata,
+            "history": {
+                "memory_id": memory_id,
+                "old_memory": prev_value,
+                "new_memory": data,
+                "event": "UPDATE",
+                "created_at": new_metadata["created_at"],
+                "updated_at": new_metadata["updated_at"],
+                "actor_id": new_metadata.get("actor_id"),
+                "role": new_metadata.get("role"),
+            },
+        }
 
     async def _delete_memory(self, memory_id):
         # Adapted from mem0.memory.main.AsyncMemory._delete_memory
+        point = await self._prepare_delete(memory_id)
+        await asyncio.to_thread(self.vector_store.delete, vector_id=memory_id)
+        await asyncio.to_thread(self.db.add_history, **point["history"])
+        self._capture_point_event(point)
+        return memory_id
+
+    async def _prepare_delete(self, memory_id) -> dict:
+        """Build the history record of a deleted memory."""
         logger.info(f"Deleting memory with {memory_id=}")
         existing_memory = await asyncio.to_thread(
             self.vector_store.get,
             vector_id=memory_id,
         )
         prev_value = existing_memory.payload["data"]
+        return {
+            "id": memory_id,
+            "event": "DELETE",
+            "vector": None,
+            "payload": None,
+            "history": {
+                "memory_id": memory_id,
+                "old_memory": prev_value,
+                "new_memory": None,
+                "event": "DELETE",
+                "actor_id": existing_memory.payload.get("actor_id"),
+                "role": existing_memory.payload.get("role"),
+                "is_deleted": 1,
+            },
+        }
 
-        await asyncio.to_thread(self.vector_store.delete, vector_id=memory_id)
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            prev_value,
-            None,
-            "DELETE",
-            actor_id=existing_memory.payload.get("actor_id"),
-            role=existing_memory.payload.get("role"),
-            is_deleted=1,
-        )
-
+    def _capture_point_event(self, point: dict) -> None:
+        event_names = {
+            "ADD": "mem0._create_memory",
+            "UPDATE": "mem0._update_memory",
+            "DELETE": "mem0._delete_memory",
+        }
         capture_event(
-            "mem0._delete_memory",
+            event_names[point["event"]],
             self,
-            {"memory_id": memory_id, "sync_type": "async"},
+            {"memory_id": point["id"], "sync_type": "async"},
         )
-        return memory_id
 
     async def reset(self):
         # Adapted from mem0.memory.main.AsyncMemory.reset
@@ -304,11 +304,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
             memory_data = existing_memory.payload["data"]
             embeddings = (
-                await asyncio.to_thread(
-                    self.embedding_model.embed,
-                    memory_data,
-                    "update metadata",
-                )
+                await self._embed(memory_data, "update metadata")
                 if existing_memory.vector is None
                 else existing_memory.vector
             )
@@ -325,13 +321,14 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
         return memory_ids
 
-    async def _update_memory(
+    async def _prepare_update(
         self,
         memory_id,
         data,
         existing_embeddings,
         metadata=None,
-    ):
+    ) -> dict:
+        """Build the updated memory, counting the update as a visit."""
         logger.info(f"Updating memory with {data=}")
 
         try:
@@ -383,37 +380,24 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                "update",
-            )
-
-        await asyncio.to_thread(
-            self.vector_store.update,
-            vector_id=memory_id,
-            vector=embeddings,
-            payload=new_metadata,
-        )
-        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
-
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            prev_value,
-            data,
-            "UPDATE",
-            created_at=new_metadata["created_at"],
-            updated_at=new_metadata["updated_at"],
-            actor_id=new_metadata.get("actor_id"),
-            role=new_metadata.get("role"),
-        )
-        capture_event(
-            "mem0._update_memory",
-            self,
-            {"memory_id": memory_id, "sync_type": "async"},
-        )
-        return memory_id
+            embeddings = await self._embed(data, "update")
+
+        return {
+            "id": memory_id,
+            "event": "UPDATE",
+            "vector": embeddings,
+            "payload": new_metadata,
+            "history": {
+                "memory_id": memory_id,
+                "old_memory": prev_value,
+                "new_memory": data,
+                "event": "UPDATE",
+                "created_at": new_metadata["created_at"],
+                "updated_at": new_metadata["updated_at"],
+                "actor_id": new_metadata.get("actor_id"),
+                "role": new_metadata.get("role"),
+            },
+        }
 
     async def chat(self, query):
         raise NotImplementedError("Chat function not implemented yet.")
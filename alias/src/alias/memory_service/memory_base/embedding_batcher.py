@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-batching of embedding requests.
+
+Memory pools embed one text per call, so concurrent ``add`` and
+``search`` requests of different users each pay a full round trip to the
+embedding endpoint. An ``EmbeddingBatcher`` queues the texts requested
+within ``MEMORY_EMBED_BATCH_WAIT_MS`` (or until
+``MEMORY_EMBED_BATCH_SIZE`` texts are queued) and embeds them with one
+request. All pools whose embedders share a configuration share a batcher
+on each event loop.
+
+Embeddings are looked up in the process-wide ``embedding_cache`` first,
+and a text already being embedded is not sent again, so identical
+content is embedded once per process.
+"""
+import asyncio
+import os
+import weakref
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from mem0.embeddings.openai import OpenAIEmbedding
+
+from alias.memory_service.memory_base.embedding_cache import (
+    EmbeddingCache,
+    embedding_cache,
+    embedding_key,
+)
+from alias.memory_service.profiling_utils.logging_utils import setup_logging
+
+logger = setup_logging()
+
+# DashScope's OpenAI-compatible endpoint accepts at most 10 inputs
+EMBED_BATCH_SIZE = int(os.getenv("MEMORY_EMBED_BATCH_SIZE", "10"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("MEMORY_EMBED_BATCH_WAIT_MS", "10"))
+
+
+class EmbeddingBatcher:
+    """Collects concurrent embedding requests into batched calls."""
+
+    def __init__(
+        self,
+        embedding_model: Any,
+        max_batch_size: int = 0,
+        max_wait: Optional[float] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        """
+        Args:
+            embedding_model: mem0 embedder used for the batched calls.
+            max_batch_size: Most texts embedded by one call,
+                ``MEMORY_EMBED_BATCH_SIZE`` by default.
+            max_wait: Seconds a text waits for others to join its batch,
+                ``MEMORY_EMBED_BATCH_WAIT_MS`` by default.
+            cache: Cache of the embeddings, ``embedding_cache`` by default.
+        """
+        self.embedding_model = embedding_model
+        self.max_batch_size = max(1, max_batch_size or EMBED_BATCH_SIZE)
+        self.max_wait = (
+            EMBED_BATCH_WAIT_MS / 1000 if max_wait is None else max_wait
+        )
+        self.cache = embedding_cache if cache is None else cache
+        # Requests whose embeddings are the same share a group, named
+        # like their cache keys: group -> text -> future of its embedding
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._actions: Dict[str, str] = {}
+        # Futures of the texts queued or being embedded
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._running: set = set()
+
+        self.requested = 0
+        self.embedded = 0
+        self.batches = 0
+
+    async def embed(self, text: str, memory_action: str = "add") -> list:
+        """Embed one text together with concurrently requested ones."""
+        return (await self.embed_many([text], memory_action))[0]
+
+    async def embed_many(
+        self,
+        texts: Sequence[str],
+        memory_action: str = "add",
+    ) -> List[list]:
+        """
+        Embed texts, batched with the ones requested concurrently.
+
+        Args:
+            texts: Texts to embed; duplicates are embedded once.
+            memory_action: Action passed to the embedder ("add",
+                "search", "update").
+
+        Returns:
+            List[list]: The embedding of each text, in order.
+        """
+        if not texts:
+            return []
+        self.requested += len(texts)
+        group = self._group(memory_action)
+        keys = {text: embedding_key(group, text) for text in texts}
+        if self.cache.on_disk:
+            cached = await asyncio.to_thread(
+                self.cache.get_many,
+                keys.values(),
+            )
+        else:
+            cached = self.cache.get_many(keys.values())
+
+        futures = {
+            text: self._submit(group, memory_action, text)
+            for text, key in keys.items()
+            if key not in cached
+        }
+        # A cancelled caller must not cancel the texts it shares with others
+        embedded = await asyncio.gather(
+            *(asyncio.shield(future) for future in futures.values()),
+        )
+        found = dict(zip(futures, embedded))
+        return [
+            found[text] if text in found else cached[keys[text]]
+            for text in texts
+        ]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requested": self.requested,
+            "embedded": self.embedded,
+            "batches": self.batches,
+            "avg_batch_size": (
+                self.embedded / self.batches if self.batches else 0.0
+            ),
+        }
+
+    def _group(self, memory_action: str) -> str:
+        """Name the embeddings made for an action by this embedder."""
+        config = getattr(self.embedding_model, "config", None)
+        name = (
+            f"{getattr(config, 'model', None)}"
+            f"/{getattr(config, 'embedding_dims', None)}"
+        )
+        if isinstance(self.embedding_model, OpenAIEmbedding):
+            # Endpoints may serve different models under the same name
+            base_url = getattr(config, "openai_base_url", None)
+            return f"{name}@{base_url}"
+        # Other providers may embed differently per action
+        return f"{type(self.embedding_model).__name__}/{name}/{memory_action}"
+
+    def _submit(
+        self,
+        group: str,
+        memory_action: str,
+        text: str,
+    ) -> asyncio.Future:
+        future = self._inflight.get((group, text))
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[(group, text)] = future
+        pending = self._pending.setdefault(group, {})
+        self._actions.setdefault(group, memory_action)
+        pending[text] = future
+        if len(pending) >= self.max_batch_size:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(
+                self.max_wait,
+                self._flush,
+                group,
+            )
+        return future
+
+    def _flush(self, group: str) -> None:
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(group, None)
+        memory_action = self._actions.pop(group, None)
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._run_batch(group, memory_action, pending),
+        )
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(
+        self,
+        group: str,
+        memory_action: str,
+        pending: Dict[str, asyncio.Future],
+    ) -> None:
+        texts = list(pending)
+        try:
+            embeddings = await asyncio.to_thread(
+                self._embed_and_cache,
+                group,
+                memory_action,
+                texts,
+            )
+        except Exception as e:
+            logger.error(f"Failed to embed a batch of {len(texts)}: {e}")
+            for text, future in pending.items():
+                self._inflight.pop((group, text), None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.embedded += len(texts)
+        for text, embedding in zip(texts, embeddings):
+            self._inflight.pop((group, text), None)
+            future = pending[text]
+            if not future.done():
+                future.set_result(embedding)
+
+    def _embed_and_cache(
+        self,
+        group: str,
+        memory_action: str,
+        texts: List[str],
+    ) -> list:
+        embeddings = self._embed_batch(texts, memory_action)
+        self.cache.put_many(
+            {
+                embedding_key(group, text): embedding
+                for text, embedding in zip(texts, embeddings)
+            },
+        )
+        return embeddings
+
+    def _embed_batch(self, texts: List[str], memory_action: str) -> list:
+        """Embed texts with one request when the embedder supports it."""
+        model = self.embedding_model
+        if isinstance(model, OpenAIEmbedding):
+            response = model.client.embeddings.create(
+                input=[text.replace("\n", " ") for text in texts],
+                model=model.config.model,
+                dimensions=model.config.embedding_dims,
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in data]
+        # Other providers embed one text per request, in one worker thread
+        return [model.embed(text, memory_action) for text in texts]
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _embedder_key(embedding_model: Any) -> Hashable:
+    config = getattr(embedding_model, "config", None)
+    if config is None:
+        return id(embedding_model)
+    return (
+        type(embedding_model),
+        getattr(config, "model", None),
+        getattr(config, "embedding_dims", None),
+        getattr(config, "api_key", None),
+        getattr(config, "openai_base_url", None),
+    )
+
+
+def get_embedding_batcher(embedding_model: Any) -> EmbeddingBatcher:
+    """
+    Return the batcher shared by the embedders configured like
+    ``embedding_model`` on the running event loop.
+    """
+    loop_batchers = _batchers.setdefault(asyncio.get_running_loop(), {})
+    key = _embedder_key(embedding_model)
+    batcher = loop_batchers.get(key)
+    if batcher is None:
+        batcher = EmbeddingBatcher(embedding_model)
+        loop_batchers[key] = batcher
+    return batcher
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Process-wide cache of text embeddings.
+
+The memory pools embed the same text several times: a fact is embedded
+to search the existing memories of one pool and again when it is added
+to another, and repeated retrieval queries are embedded on every call.
+The cache keeps the most recently used ``MEMORY_EMBED_CACHE_SIZE``
+embeddings in memory, keyed by the embedding model and a hash of the
+text. When ``MEMORY_EMBED_CACHE_PATH`` is set, embeddings are also
+stored in a SQLite file (at most ``MEMORY_EMBED_CACHE_DISK_SIZE`` rows)
+that survives restarts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from alias.memory_service.profiling_utils.logging_utils import setup_logging
+
+logger = setup_logging()
+
+EMBED_CACHE_SIZE = int(os.getenv("MEMORY_EMBED_CACHE_SIZE", "10000"))
+EMBED_CACHE_PATH = os.getenv("MEMORY_EMBED_CACHE_PATH", "")
+EMBED_CACHE_DISK_SIZE = int(
+    os.getenv("MEMORY_EMBED_CACHE_DISK_SIZE", "200000"),
+)
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Cache key of the embedding of ``text`` by ``model``."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """Bounded LRU of embeddings with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int = EMBED_CACHE_SIZE,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        max_disk_entries: int = EMBED_CACHE_DISK_SIZE,
+    ):
+        """
+        Args:
+            max_entries: Embeddings kept in memory; 0 disables the cache.
+            path: SQLite file of the on-disk tier, none when empty.
+            max_disk_entries: Embeddings kept in the SQLite file.
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Pools running on other event loops share the cache
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Rows written since the SQLite file was last trimmed
+        self._unpruned = 0
+        if path and max_entries > 0:
+            self._open(path)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def on_disk(self) -> bool:
+        return self._db is not None
+
+    def _open(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB,
+                    accessed REAL
+                )
+                """,
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed "
+                "ON embeddings (accessed)",
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache stays in memory only: {e}")
+            self._db = None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up embeddings.
+
+        Args:
+            keys: Keys built with ``embedding_key``.
+
+        Returns:
+            Dict[str, List[float]]: The cached embedding of each key found.
+        """
+        if not self.enabled:
+            return {}
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            self.hits += len(found)
+
+            missing = [key for key in keys if key not in found]
+            if missing and self._db is not None:
+                from_disk = self._read(missing)
+                self.disk_hits += len(from_disk)
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+                found.update(from_disk)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store embeddings, evicting the least recently used ones."""
+        if not self.enabled or not vectors:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, list(vector))
+            if self._db is not None:
+                self._write(vectors)
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        try:
+            # Stay below SQLite's limit of bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = self._db.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("d", blob).tolist()
+            if found:
+                self._db.executemany(
+                    "UPDATE embeddings SET accessed = ? WHERE key = ?",
+                    [(time.time(), key) for key in found],
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read cached embeddings: {e}")
+        return found
+
+    def _write(self, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        rows: List[Tuple[str, bytes, float]] = [
+            (key, array("d", vector).tobytes(), now)
+            for key, vector in vectors.items()
+        ]
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, accessed) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._unpruned += len(rows)
+            # Trim the file now and then rather than on every write
+            if self._unpruned >= min(1000, self.max_disk_entries):
+                self._unpruned = 0
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY accessed DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store embeddings on disk: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "disk": self.on_disk,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            ),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+
+embedding_cache = EmbeddingCache()
@@ -4,9 +4,11 @@ Task management API endpoints
 """
 
 from datetime import datetime
+from typing import Optional
 
 from fastapi import APIRouter
 
+from alias.memory_service.memory_base.embedding_cache import embedding_cache
 from alias.memory_service.service.core.exceptions import (
     UserProfilingServiceError,
     TaskNotFoundError,
@@ -15,6 +17,7 @@ from alias.memory_service.service.core.exceptions import (
 from alias.memory_service.service.core.task_manager import (
     UserProfilingTaskManager,
 )
+from alias.memory_service.service.core.work_queue import work_queue
 from alias.memory_service.profiling_utils.logging_utils import setup_logging
 
 logger = setup_logging()
@@ -28,7 +31,7 @@ task_manager = UserProfilingTaskManager()
 async def get_task_status(submit_id: str):
     """Get the status of a background task by submit_id"""
     try:
-        status = task_manager.get_task_status(submit_id)
+        status = await task_manager.get_task_status(submit_id)
         if status is None:
             raise TaskNotFoundError(submit_id)
         return {
@@ -51,11 +54,9 @@ async def get_all_tasks():
     """Get all tracked tasks (for debugging/monitoring)"""
     try:
         # Clean up old completed tasks first
-        task_manager.cleanup_completed_tasks()
+        await task_manager.cleanup_completed_tasks()
 
-        all_tasks = {}
-        for submit_id in task_manager.tasks:
-            all_tasks[submit_id] = task_manager.get_task_status(submit_id)
+        all_tasks = await task_manager.get_all_tasks()
 
         return {"status": "success", "data": all_tasks}
     except UserProfilingServiceError:
@@ -73,7 +74,7 @@ async def get_tasks_by_date(date_str: str):
     """Get all tasks for a specific date (format: YYYY-MM-DD)"""
     try:
         task_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        tasks = task_manager.get_tasks_by_date(task_date)
+        tasks = await task_manager.get_tasks_by_date(task_date)
         return {"status": "success", "date": date_str, "data": tasks}
     except ValueError as exc:
         raise ValidationError(
@@ -91,8 +92,17 @@ async def get_tasks_by_date(date_str: str):
 
 
 @router.get("/tasks_by_date_range")
-async def get_tasks_by_date_range(start_date: str, end_date: str):
-    """Get all tasks within a date range (format: YYYY-MM-DD)"""
+async def get_tasks_by_date_range(
+    start_date: str,
+    end_date: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """Get tasks within a date range (format: YYYY-MM-DD)
+
+    Without ``limit`` all tasks are returned; with it, one page of about
+    ``limit`` tasks and the ``next_cursor`` to pass for the next page.
+    """
     try:
         start = datetime.strptime(start_date, "%Y-%m-%d").date()
         end = datetime.strptime(end_date, "%Y-%m-%d").date()
@@ -103,12 +113,29 @@ async def get_tasks_by_date_range(start_date: str, end_date: str):
                 "date_range",
             )
 
-        tasks = task_manager.get_tasks_by_date_range(start, end)
+        if limit is None:
+            tasks = await task_manager.get_tasks_by_date_range(start, end)
+            return {
+                "status": "success",
+                "start_date": start_date,
+                "end_date": end_date,
+                "data": tasks,
+            }
+
+        if limit < 1:
+            raise ValidationError("Limit must be positive", "limit")
+        tasks, next_cursor = await task_manager.get_tasks_page(
+            start,
+            end,
+            cursor,
+            limit,
+        )
         return {
             "status": "success",
             "start_date": start_date,
             "end_date": end_date,
             "data": tasks,
+            "next_cursor": next_cursor,
         }
     except ValueError as exc:
         raise ValidationError(
@@ -129,7 +156,7 @@ async def get_tasks_by_date_range(start_date: str, end_date: str):
 async def get_storage_stats():
     """Get storage statistics for task files"""
     try:
-        stats = task_manager.get_storage_stats()
+        stats = await task_manager.get_storage_stats()
         return {"status": "success", "data": stats}
     except UserProfilingServiceError:
         raise
@@ -139,3 +166,16 @@ async def get_storage_stats():
             f"Failed to get storage stats: {str(e)}",
             "GET_STORAGE_STATS_ERROR",
         ) from e
+
+
+@router.get("/embedding_stats")
+async def get_embedding_stats():
+    """Get hit-rate statistics of the embedding cache"""
+    return {"status": "success", "data": embedding_cache.stats()}
+
+
+@router.get("/work_queue_stats")
+async def get_work_queue_stats():
+    """Get depth, outcome counts and latency histograms of the background
+    work queue"""
+    return {"status": "success", "data": work_queue.stats()}
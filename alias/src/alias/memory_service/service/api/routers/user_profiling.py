@@ -3,7 +3,6 @@
 User profiling API endpoints
 """
 
-import asyncio
 import uuid
 from fastapi import APIRouter
 
@@ -31,6 +30,7 @@ from alias.memory_service.models.user_profiling import (
 from alias.memory_service.service.core.exceptions import (
     MemoryServiceError,
     EmptyQueryError,
+    QueueFullError,
 )
 from alias.memory_service.service.api.dependencies import (
     get_memory_service,
@@ -38,6 +38,7 @@ from alias.memory_service.service.api.dependencies import (
 from alias.memory_service.service.core.task_manager import (
     UserProfilingTaskManager,
 )
+from alias.memory_service.service.core.work_queue import work_queue
 from alias.memory_service.profiling_utils.logging_utils import setup_logging
 from alias.memory_service.profiling_utils import get_messages_by_session_id
 
@@ -74,7 +75,7 @@ async def add_memory(request: UserProfilingAddRequest):
                     request.uid,
                     request.content,
                 )
-                task_manager.update_task_status(
+                await task_manager.update_task_status(
                     submit_id,
                     "completed",
                     result=result,
@@ -85,7 +86,7 @@ async def add_memory(request: UserProfilingAddRequest):
                 )
             except Exception as e:
                 error_msg = str(e)
-                task_manager.update_task_status(
+                await task_manager.update_task_status(
                     submit_id,
                     "failed",
                     error=error_msg,
@@ -95,8 +96,13 @@ async def add_memory(request: UserProfilingAddRequest):
                     f"{submit_id}, error: {error_msg}",
                 )
 
-        task = asyncio.create_task(background_add_memory())
-        task_manager.add_task(submit_id, task, "add_memory")
+        # Register the task before it can report its status
+        await task_manager.add_task(submit_id, None, "add_memory")
+        try:
+            work_queue.submit(request.uid, background_add_memory, "add_memory")
+        except QueueFullError:
+            await task_manager.delete_task(submit_id)
+            raise
 
         return UserProfilingResponseSubmitId(
             status="submit success",
@@ -125,14 +131,14 @@ async def clear_memory(
             try:
                 memory_service = get_memory_service()
                 await memory_service.clear_memory(request.uid)
-                task_manager.update_task_status(submit_id, "completed")
+                await task_manager.update_task_status(submit_id, "completed")
                 logger.info(
                     f"Background clear_memory completed for submit_id: "
                     f"{submit_id}",
                 )
             except Exception as e:
                 error_msg = str(e)
-                task_manager.update_task_status(
+                await task_manager.update_task_status(
                     submit_id,
                     "failed",
                     error=error_msg,
@@ -142,8 +148,17 @@ async def clear_memory(
                     f"{submit_id}, error: {error_msg}",
                 )
 
-        task = asyncio.create_task(background_clear_memory())
-        task_manager.add_task(submit_id, task, "clear_memory")
+        # Register the task before it can report its status
+        await task_manager.add_task(submit_id, None, "clear_memory")
+        try:
+            work_queue.submit(
+                request.uid,
+                background_clear_memory,
+                "clear_memory",
+            )
+        except QueueFullError:
+            await task_manager.delete_task(submit_id)
+            raise
 
         return UserProfilingResponseSubmitId(
             status="submit success",
@@ -316,7 +331,7 @@ async def record_action(
                     data=request.data,
                     session_content=session_content,
                 )
-                task_manager.update_task_status(
+                await task_manager.update_task_status(
                     submit_id,
                     "completed",
                     result=result,
@@ -330,7 +345,7 @@ async def record_action(
 
                 error_msg = str(e)
                 full_traceback = traceback.format_exc()
-                task_manager.update_task_status(
+                await task_manager.update_task_status(
                     submit_id,
                     "failed",
                     error=error_msg,
@@ -348,8 +363,17 @@ async def record_action(
                     f"message_id={request.message_id}",
                 )
 
-        task = asyncio.create_task(background_record_action())
-        task_manager.add_task(submit_id, task, "record_action")
+        # Register the task before it can report its status
+        await task_manager.add_task(submit_id, None, "record_action")
+        try:
+            work_queue.submit(
+                request.uid,
+                background_record_action,
+                "record_action",
+            )
+        except QueueFullError:
+            await task_manager.delete_task(submit_id)
+            raise
 
         return UserProfilingResponseSubmitId(
             status="submit success",
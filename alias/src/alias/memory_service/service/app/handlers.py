@@ -27,9 +27,12 @@ async def memory_service_exception_handler(
         message=exc.message,
         timestamp=datetime.now().isoformat(),
     )
+    retry_after = getattr(exc, "retry_after", None)
+    headers = {"Retry-After": str(retry_after)} if retry_after else None
     return JSONResponse(
         status_code=exc.status_code,
         content=error_response.model_dump(),
+        headers=headers,
     )
 
 
@@ -6,6 +6,7 @@ A standalone service for memory functionality with memory management.
 """
 
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
@@ -14,6 +15,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError as PydanticValidationError
 from alias.memory_service.service.core.exceptions import MemoryServiceError
+from alias.memory_service.service.core.work_queue import work_queue
 from alias.memory_service.service.app.handlers import (
     memory_service_exception_handler,
     validation_exception_handler,
@@ -41,10 +43,20 @@ logger = setup_logging()
 # FastAPI App Setup
 # =============================================================================
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Run the background work queue for the lifetime of the app"""
+    work_queue.start()
+    yield
+    await work_queue.stop()
+
+
 app = FastAPI(
     title="Memory Service",
     description="A standalone service for memory functionality",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
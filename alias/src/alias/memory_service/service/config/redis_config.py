@@ -16,6 +16,15 @@ class UserProfilingRedisConfig:
             os.getenv("USER_PROFILING_REDIS_DB", "1"),
         )  # Use DB 1 for user profiling
         self.REDIS_PASSWORD = os.getenv("USER_PROFILING_REDIS_PASSWORD", None)
+        self.REDIS_MAX_CONNECTIONS = int(
+            os.getenv("USER_PROFILING_REDIS_MAX_CONNECTIONS", "50"),
+        )
+
+        # Keys read per SCAN/SSCAN page when listing tasks
+        self.SCAN_COUNT = int(os.getenv("USER_PROFILING_SCAN_COUNT", "500"))
+
+        # Task store backend: "redis", or "memory" for tests
+        self.TASK_BACKEND = os.getenv("USER_PROFILING_TASK_BACKEND", "redis")
 
         # Task expiration settings
         self.TASK_EXPIRY_HOURS = int(
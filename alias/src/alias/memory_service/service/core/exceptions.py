@@ -93,6 +93,18 @@ class ServiceUnavailableError(MemoryServiceError):
         )
 
 
+class QueueFullError(MemoryServiceError):
+    """Error when the background work queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            "Too many background tasks queued, retry later",
+            "QUEUE_FULL",
+            429,
+        )
+        self.retry_after = retry_after
+
+
 class EmptyStringFieldError(MemoryServiceError):
     """Error when field is empty"""
 
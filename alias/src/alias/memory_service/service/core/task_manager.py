@@ -2,12 +2,17 @@
 import asyncio
 import json
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import redis
+import redis.asyncio as redis
 
 # from loguru import logger
 from alias.memory_service.service.config.redis_config import redis_config
+from alias.memory_service.service.core.task_store import (
+    RedisTaskStore,
+    TaskStore,
+    create_task_store,
+)
 from alias.memory_service.profiling_utils.logging_utils import setup_logging
 
 logger = setup_logging()
@@ -17,6 +22,9 @@ logger = setup_logging()
 class UserProfilingTaskManager:
     """
     Redis-based task manager to track background tasks
+
+    Tasks are kept by a ``TaskStore``: Redis through an asyncio client on
+    a shared connection pool, or process memory for tests.
     """
 
     def __init__(
@@ -25,6 +33,7 @@ class UserProfilingTaskManager:
         redis_port: Optional[int] = None,
         redis_db: Optional[int] = None,
         redis_password: Optional[str] = None,
+        store: Optional[TaskStore] = None,
     ):
         """
         Initialize the task manager with Redis storage
@@ -38,55 +47,30 @@ class UserProfilingTaskManager:
                 (defaults to config)
             redis_password (str, optional): Redis password
                 (defaults to config)
+            store (TaskStore, optional): Task store to use instead of the
+                one selected by ``USER_PROFILING_TASK_BACKEND``
         """
-        # Use provided parameters or fall back to config
-        host = redis_host or redis_config.REDIS_HOST
-        port = redis_port or redis_config.REDIS_PORT
-        db = redis_db or redis_config.REDIS_DB
-        password = redis_password or redis_config.REDIS_PASSWORD
-
-        self.redis_client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            decode_responses=True,
-        )
-
-        # Test connection
-        try:
-            self.redis_client.ping()
-            logger.info(f"Redis connection established: {host}:{port}/{db}")
-        except redis.ConnectionError as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            raise
-
-        # Key prefixes for different data types
-        self.task_prefix = f"{redis_config.KEY_PREFIX}:task:"
-        self.task_index_prefix = f"{redis_config.KEY_PREFIX}:index:"
-        self.task_date_prefix = f"{redis_config.KEY_PREFIX}:date:"
-        self.task_status_prefix = f"{redis_config.KEY_PREFIX}:status:"
-
         # Default expiration time for tasks
         self.default_expiry = redis_config.get_task_expiry_seconds()
 
-        logger.info("UserProfilingTaskManager initialized with Redis storage")
-
-    def _get_task_key(self, submit_id: str) -> str:
-        """Get Redis key for a specific task"""
-        return f"{self.task_prefix}{submit_id}"
-
-    def _get_index_key(self, submit_id: str) -> str:
-        """Get Redis key for task index"""
-        return f"{self.task_index_prefix}{submit_id}"
-
-    def _get_date_key(self, task_date: date) -> str:
-        """Get Redis key for tasks on a specific date"""
-        return f"{self.task_date_prefix}{task_date.isoformat()}"
+        if store is None:
+            store = create_task_store(
+                host=redis_host,
+                port=redis_port,
+                db=redis_db,
+                password=redis_password,
+                expiry=self.default_expiry,
+            )
+        self.store = store
+        # Connections are opened from the shared pool on first use
+        self.redis_client = (
+            store.client if isinstance(store, RedisTaskStore) else None
+        )
 
-    def _get_status_key(self, status: str) -> str:
-        """Get Redis key for tasks with a specific status"""
-        return f"{self.task_status_prefix}{status}"
+        logger.info(
+            f"UserProfilingTaskManager initialized with "
+            f"{type(store).__name__}",
+        )
 
     def _serialize_task(self, task_data: Dict[str, Any]) -> str:
         """Serialize task data to JSON string"""
@@ -109,7 +93,12 @@ class UserProfilingTaskManager:
                     pass  # Keep as string if parsing fails
         return task_data
 
-    def add_task(self, submit_id: str, task: asyncio.Task, task_type: str):
+    async def add_task(
+        self,
+        submit_id: str,
+        task: Optional[asyncio.Task],
+        task_type: str,
+    ):
         """
         Add a task to the task manager
 
@@ -133,35 +122,17 @@ class UserProfilingTaskManager:
             "date": current_date.isoformat(),
         }
 
-        # Store task data
-        task_key = self._get_task_key(submit_id)
-        self.redis_client.setex(
-            task_key,
-            self.default_expiry,
+        # Store task data, its index and date/status sets in one MULTI
+        await self.store.write(
+            submit_id,
             self._serialize_task(task_data),
+            status="running",
+            task_date=current_date.isoformat(),
         )
 
-        # Update index
-        index_key = self._get_index_key(submit_id)
-        self.redis_client.setex(
-            index_key,
-            self.default_expiry,
-            current_date.isoformat(),
-        )
-
-        # Add to date-based set
-        date_key = self._get_date_key(current_date)
-        self.redis_client.sadd(date_key, submit_id)
-        self.redis_client.expire(date_key, self.default_expiry)
-
-        # Add to status-based set
-        status_key = self._get_status_key("running")
-        self.redis_client.sadd(status_key, submit_id)
-        self.redis_client.expire(status_key, self.default_expiry)
-
         logger.info(f"Task {submit_id} added to Redis storage")
 
-    def update_task_status(
+    async def update_task_status(
         self,
         submit_id: str,
         status: str,
@@ -177,8 +148,7 @@ class UserProfilingTaskManager:
             result (Any, optional): Task result
             error (str, optional): Error message
         """
-        task_key = self._get_task_key(submit_id)
-        task_json = self.redis_client.get(task_key)
+        task_json = await self.store.read(submit_id)
 
         if task_json:
             task_data = self._deserialize_task(task_json)
@@ -192,29 +162,19 @@ class UserProfilingTaskManager:
             if error is not None:
                 task_data["error"] = error
 
-            # Save updated task
-            self.redis_client.setex(
-                task_key,
-                self.default_expiry,
+            # Save updated task and move it between status sets
+            await self.store.write(
+                submit_id,
                 self._serialize_task(task_data),
+                status=status,
+                old_status=old_status,
             )
 
-            # Update status-based sets
-            if old_status != status:
-                # Remove from old status set
-                old_status_key = self._get_status_key(old_status)
-                self.redis_client.srem(old_status_key, submit_id)
-
-                # Add to new status set
-                new_status_key = self._get_status_key(status)
-                self.redis_client.sadd(new_status_key, submit_id)
-                self.redis_client.expire(new_status_key, self.default_expiry)
-
             logger.info(f"Task {submit_id} status updated to {status}")
         else:
             logger.warning(f"Task {submit_id} not found in Redis")
 
-    def get_task_status(self, submit_id: str) -> Dict[str, Any]:
+    async def get_task_status(self, submit_id: str) -> Dict[str, Any]:
         """
         Get the status of a task
 
@@ -224,15 +184,26 @@ class UserProfilingTaskManager:
         Returns:
             Dict[str, Any]: Task information or error message
         """
-        task_key = self._get_task_key(submit_id)
-        task_json = self.redis_client.get(task_key)
+        task_json = await self.store.read(submit_id)
 
         if task_json:
             return self._deserialize_task(task_json)
 
         return {"error": "Task not found"}
 
-    def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
+    async def _read_tasks(
+        self,
+        submit_ids: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read and deserialize tasks with one MGET"""
+        return {
+            submit_id: self._deserialize_task(task_json)
+            for submit_id, task_json in (
+                await self.store.read_many(submit_ids)
+            ).items()
+        }
+
+    async def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all tasks from Redis
 
@@ -240,17 +211,20 @@ class UserProfilingTaskManager:
             Dict[str, Dict[str, Any]]: All tasks
         """
         all_tasks = {}
-        pattern = f"{self.task_prefix}*"
-
-        for key in self.redis_client.scan_iter(match=pattern):
-            submit_id = key.replace(self.task_prefix, "")
-            task_json = self.redis_client.get(key)
-            if task_json:
-                all_tasks[submit_id] = self._deserialize_task(task_json)
-
-        return all_tasks
+        cursor = 0
+        while True:
+            cursor, submit_ids = await self.store.scan_tasks(
+                cursor,
+                count=redis_config.SCAN_COUNT,
+            )
+            all_tasks.update(await self._read_tasks(submit_ids))
+            if not cursor:
+                return all_tasks
 
-    def get_tasks_by_date(self, task_date: date) -> Dict[str, Dict[str, Any]]:
+    async def get_tasks_by_date(
+        self,
+        task_date: date,
+    ) -> Dict[str, Dict[str, Any]]:
         """
         Get all tasks for a specific date
 
@@ -260,19 +234,53 @@ class UserProfilingTaskManager:
         Returns:
             Dict[str, Dict[str, Any]]: Tasks for the specified date
         """
-        tasks = {}
-        date_key = self._get_date_key(task_date)
-        submit_ids = self.redis_client.smembers(date_key)
+        return await self.get_tasks_by_date_range(task_date, task_date)
 
-        for submit_id in submit_ids:
-            task_key = self._get_task_key(submit_id)
-            task_json = self.redis_client.get(task_key)
-            if task_json:
-                tasks[submit_id] = self._deserialize_task(task_json)
+    async def get_tasks_page(
+        self,
+        start_date: date,
+        end_date: date,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of the tasks within a date range
 
-        return tasks
+        Dates are walked from ``start_date`` with SSCAN, so a page costs
+        a few round trips whatever the number of tasks per day.
+
+        Args:
+            start_date (date): Start date (inclusive)
+            end_date (date): End date (inclusive)
+            cursor (str, optional): Cursor returned with the previous page
+            limit (int): Approximate number of tasks per page
 
-    def get_tasks_by_date_range(
+        Returns:
+            Tuple[Dict[str, Dict[str, Any]], Optional[str]]: Tasks of the
+                page and the cursor of the next one (None when done)
+        """
+        current_date, scan_cursor = start_date, 0
+        if cursor:
+            date_str, _, scan_str = cursor.partition(":")
+            current_date = date.fromisoformat(date_str)
+            scan_cursor = int(scan_str or 0)
+
+        tasks: Dict[str, Dict[str, Any]] = {}
+        while current_date <= end_date and len(tasks) < limit:
+            scan_cursor, submit_ids = await self.store.scan_date(
+                current_date.isoformat(),
+                scan_cursor,
+                count=limit - len(tasks),
+            )
+            tasks.update(await self._read_tasks(submit_ids))
+            if not scan_cursor:
+                current_date += timedelta(days=1)
+
+        if current_date > end_date:
+            return tasks, None
+        return tasks, f"{current_date.isoformat()}:{scan_cursor}"
+
+    async def get_tasks_by_date_range(
         self,
         start_date: date,
         end_date: date,
@@ -287,17 +295,23 @@ class UserProfilingTaskManager:
         Returns:
             Dict[str, Dict[str, Any]]: Tasks within the date range
         """
-        all_tasks = {}
-        current_date = start_date
-
-        while current_date <= end_date:
-            tasks = self.get_tasks_by_date(current_date)
+        all_tasks: Dict[str, Dict[str, Any]] = {}
+        cursor = None
+        while True:
+            tasks, cursor = await self.get_tasks_page(
+                start_date,
+                end_date,
+                cursor,
+                limit=redis_config.SCAN_COUNT,
+            )
             all_tasks.update(tasks)
-            current_date = current_date + timedelta(days=1)
-
-        return all_tasks
+            if cursor is None:
+                return all_tasks
 
-    def get_tasks_by_status(self, status: str) -> Dict[str, Dict[str, Any]]:
+    async def get_tasks_by_status(
+        self,
+        status: str,
+    ) -> Dict[str, Dict[str, Any]]:
         """
         Get all tasks with a specific status
 
@@ -307,19 +321,9 @@ class UserProfilingTaskManager:
         Returns:
             Dict[str, Dict[str, Any]]: Tasks with the specified status
         """
-        tasks = {}
-        status_key = self._get_status_key(status)
-        submit_ids = self.redis_client.smembers(status_key)
-
-        for submit_id in submit_ids:
-            task_key = self._get_task_key(submit_id)
-            task_json = self.redis_client.get(task_key)
-            if task_json:
-                tasks[submit_id] = self._deserialize_task(task_json)
-
-        return tasks
+        return await self._read_tasks(await self.store.status_members(status))
 
-    def cleanup_completed_tasks(self, max_age_hours: int = 24):
+    async def cleanup_completed_tasks(self, max_age_hours: int = 24):
         """
         Clean up completed tasks older than max_age_hours
 
@@ -331,26 +335,20 @@ class UserProfilingTaskManager:
         completed_statuses = ["completed", "failed"]
 
         for status in completed_statuses:
-            status_key = self._get_status_key(status)
-            submit_ids = self.redis_client.smembers(status_key)
+            tasks = await self.get_tasks_by_status(status)
 
-            for submit_id in submit_ids:
-                task_key = self._get_task_key(submit_id)
-                task_json = self.redis_client.get(task_key)
+            for submit_id, task_data in tasks.items():
+                completed_at = task_data.get("completed_at")
 
-                if task_json:
-                    task_data = self._deserialize_task(task_json)
-                    completed_at = task_data.get("completed_at")
-
-                    if completed_at and completed_at < cutoff_time:
-                        # Remove task from all sets and delete task data
-                        self.delete_task(submit_id)
+                if completed_at and completed_at < cutoff_time:
+                    # Remove task from all sets and delete task data
+                    await self._remove_task(submit_id, task_data)
 
         logger.info(
             f"Cleaned up completed tasks older than {max_age_hours} hours",
         )
 
-    def delete_task(self, submit_id: str) -> bool:
+    async def delete_task(self, submit_id: str) -> bool:
         """
         Delete a specific task
 
@@ -360,82 +358,61 @@ class UserProfilingTaskManager:
         Returns:
             bool: True if task was deleted, False if not found
         """
-        task_key = self._get_task_key(submit_id)
-        task_json = self.redis_client.get(task_key)
+        task_json = await self.store.read(submit_id)
 
         if task_json:
-            task_data = self._deserialize_task(task_json)
-            status = task_data.get("status", "unknown")
-            task_date_str = task_data.get("date")
-
-            # Delete task data
-            self.redis_client.delete(task_key)
-
-            # Remove from index
-            index_key = self._get_index_key(submit_id)
-            self.redis_client.delete(index_key)
-
-            # Remove from date set
-            if task_date_str:
-                try:
-                    task_date = datetime.strptime(
-                        task_date_str,
-                        "%Y-%m-%d",
-                    ).date()
-                    date_key = self._get_date_key(task_date)
-                    self.redis_client.srem(date_key, submit_id)
-                except ValueError:
-                    pass
-
-            # Remove from status set
-            status_key = self._get_status_key(status)
-            self.redis_client.srem(status_key, submit_id)
-
+            await self._remove_task(
+                submit_id,
+                self._deserialize_task(task_json),
+            )
             logger.info(f"Task {submit_id} deleted from Redis")
             return True
 
         return False
 
-    def clear_all_tasks(self):
+    async def _remove_task(
+        self,
+        submit_id: str,
+        task_data: Dict[str, Any],
+    ) -> None:
+        """Delete a task with its index and set entries in one MULTI"""
+        task_date = task_data.get("date")
+        try:
+            datetime.strptime(task_date or "", "%Y-%m-%d")
+        except ValueError:
+            task_date = None
+        await self.store.remove(
+            submit_id,
+            status=task_data.get("status", "unknown"),
+            task_date=task_date,
+        )
+
+    async def clear_all_tasks(self):
         """
         Clear all tasks from Redis
         """
-        # Delete all task keys
-        pattern = f"{self.task_prefix}*"
-        for key in self.redis_client.scan_iter(match=pattern):
-            self.redis_client.delete(key)
-
-        # Delete all index keys
-        pattern = f"{self.task_index_prefix}*"
-        for key in self.redis_client.scan_iter(match=pattern):
-            self.redis_client.delete(key)
-
-        # Delete all date keys
-        pattern = f"{self.task_date_prefix}*"
-        for key in self.redis_client.scan_iter(match=pattern):
-            self.redis_client.delete(key)
-
-        # Delete all status keys
-        pattern = f"{self.task_status_prefix}*"
-        for key in self.redis_client.scan_iter(match=pattern):
-            self.redis_client.delete(key)
-
+        await self.store.clear()
         logger.info("All tasks cleared from Redis")
 
-    def get_task_count(self) -> int:
+    async def get_task_count(self) -> int:
         """
         Get the total number of tasks
 
         Returns:
             int: Total number of tasks
         """
-        pattern = f"{self.task_prefix}*"
         count = 0
-        for _ in self.redis_client.scan_iter(match=pattern):
-            count += 1
-        return count
+        cursor = 0
+        while True:
+            cursor, submit_ids = await self.store.scan_tasks(
+                cursor,
+                count=redis_config.SCAN_COUNT,
+            )
+            count += len(submit_ids)
+            if not cursor:
+                return count
 
-    def get_storage_stats(self) -> Dict[str, Any]:
+    async def get_storage_stats(self) -> Dict[str, Any]:
         """
         Get storage statistics
 
@@ -450,38 +427,27 @@ class UserProfilingTaskManager:
         }
 
         # Count total tasks
-        stats["total_tasks"] = self.get_task_count()
-
-        # Count tasks by status
-        for status in ["running", "completed", "failed", "pending"]:
-            status_key = self._get_status_key(status)
-            count = self.redis_client.scard(status_key)
-            stats["tasks_by_status"][status] = count
-
-        # Count tasks by date (last 7 days)
-        for i in range(7):
-            check_date = date.today() - timedelta(days=i)
-            date_key = self._get_date_key(check_date)
-            count = self.redis_client.scard(date_key)
-            stats["tasks_by_date"][check_date.isoformat()] = count
+        stats["total_tasks"] = await self.get_task_count()
+
+        # Count tasks by status and by date (last 7 days) in one round trip
+        statuses = ["running", "completed", "failed", "pending"]
+        dates = [
+            (date.today() - timedelta(days=i)).isoformat() for i in range(7)
+        ]
+        (
+            stats["tasks_by_status"],
+            stats["tasks_by_date"],
+        ) = await self.store.count_sets(statuses, dates)
 
         # Redis info
         try:
-            info = self.redis_client.info()
-            stats["redis_info"] = {
-                "used_memory_human": info.get("used_memory_human", "N/A"),
-                "connected_clients": info.get("connected_clients", "N/A"),
-                "total_commands_processed": info.get(
-                    "total_commands_processed",
-                    "N/A",
-                ),
-            }
+            stats["redis_info"] = await self.store.info()
         except Exception as e:
             stats["redis_info"] = {"error": str(e)}
 
         return stats
 
-    def rebuild_index(self) -> int:
+    async def rebuild_index(self) -> int:
         """
         Rebuild the task index by scanning all tasks
         Useful for fixing corrupted index or migrating from old version
@@ -492,29 +458,27 @@ class UserProfilingTaskManager:
         logger.info("Rebuilding task index...")
         index_count = 0
 
-        pattern = f"{self.task_prefix}*"
-        for key in self.redis_client.scan_iter(match=pattern):
-            submit_id = key.replace(self.task_prefix, "")
-            task_json = self.redis_client.get(key)
-
-            if task_json:
-                task_data = self._deserialize_task(task_json)
-                task_date_str = task_data.get("date")
-
-                if task_date_str:
-                    # Update index
-                    index_key = self._get_index_key(submit_id)
-                    self.redis_client.setex(
-                        index_key,
-                        self.default_expiry,
-                        task_date_str,
-                    )
-                    index_count += 1
+        cursor = 0
+        while True:
+            cursor, submit_ids = await self.store.scan_tasks(
+                cursor,
+                count=redis_config.SCAN_COUNT,
+            )
+            tasks = await self._read_tasks(submit_ids)
+            dates = {
+                submit_id: task_data["date"]
+                for submit_id, task_data in tasks.items()
+                if task_data.get("date")
+            }
+            await self.store.set_indexes(dates)
+            index_count += len(dates)
+            if not cursor:
+                break
 
         logger.info(f"Index rebuilt with {index_count} tasks")
         return index_count
 
-    def set_task_expiry(self, submit_id: str, expiry_seconds: int):
+    async def set_task_expiry(self, submit_id: str, expiry_seconds: int):
         """
         Set custom expiry time for a specific task
 
@@ -522,23 +486,18 @@ class UserProfilingTaskManager:
             submit_id (str): Task identifier
             expiry_seconds (int): Expiry time in seconds
         """
-        task_key = self._get_task_key(submit_id)
-        index_key = self._get_index_key(submit_id)
-
-        if self.redis_client.exists(task_key):
-            self.redis_client.expire(task_key, expiry_seconds)
-            self.redis_client.expire(index_key, expiry_seconds)
+        if await self.store.expire(submit_id, expiry_seconds):
             logger.info(
                 f"Set expiry for task {submit_id} to {expiry_seconds} seconds",
             )
         else:
             logger.warning(f"Task {submit_id} not found")
 
-    def get_redis_client(self) -> redis.Redis:
+    def get_redis_client(self) -> Optional[redis.Redis]:
         """
         Get the underlying Redis client for advanced operations
 
         Returns:
-            redis.Redis: Redis client instance
+            redis.Redis: Async Redis client, None for the in-memory store
         """
         return self.redis_client
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""
+Storage backends of the user profiling task manager.
+
+``RedisTaskStore`` keeps tasks in Redis through an asyncio client whose
+connection pool is shared by every task manager of the process; a task
+and its date/status index entries are written in one MULTI round trip.
+``InMemoryTaskStore`` keeps the same data in process memory, for tests
+and single-process runs without Redis.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from alias.memory_service.service.config.redis_config import redis_config
+
+# Connection pools by Redis URL, shared by the stores of the process
+_pools: Dict[str, redis.ConnectionPool] = {}
+
+
+class TaskStore:
+    """
+    Persistence of serialized tasks and of their date and status indexes.
+
+    Tasks are identified by submit id; a task belongs to one date set
+    (``YYYY-MM-DD``) and one status set.
+    """
+
+    async def write(
+        self,
+        submit_id: str,
+        task_json: str,
+        status: str,
+        task_date: Optional[str] = None,
+        old_status: Optional[str] = None,
+    ) -> None:
+        """
+        Store a task and index it, atomically.
+
+        Args:
+            submit_id (str): Task identifier
+            task_json (str): Serialized task
+            status (str): Status set the task belongs to
+            task_date (str, optional): Date set to add the task to
+            old_status (str, optional): Status set to remove the task from
+        """
+        raise NotImplementedError
+
+    async def read(self, submit_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def read_many(self, submit_ids: Iterable[str]) -> Dict[str, str]:
+        """Read tasks in one round trip, skipping missing ones."""
+        raise NotImplementedError
+
+    async def remove(
+        self,
+        submit_id: str,
+        status: str,
+        task_date: Optional[str] = None,
+    ) -> None:
+        raise NotImplementedError
+
+    async def expire(self, submit_id: str, seconds: int) -> bool:
+        raise NotImplementedError
+
+    async def status_members(self, status: str) -> List[str]:
+        raise NotImplementedError
+
+    async def scan_date(
+        self,
+        task_date: str,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        """
+        Page through the tasks of a date.
+
+        Returns:
+            Tuple[int, List[str]]: The cursor of the next page (0 when
+                done) and submit ids, possibly repeated across pages.
+        """
+        raise NotImplementedError
+
+    async def scan_tasks(
+        self,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        """Page through the submit ids of all tasks, like ``scan_date``."""
+        raise NotImplementedError
+
+    async def count_sets(
+        self,
+        statuses: Iterable[str],
+        task_dates: Iterable[str],
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Count the tasks of each status and date in one round trip."""
+        raise NotImplementedError
+
+    async def set_indexes(self, dates: Dict[str, str]) -> None:
+        """Point the index entries of tasks (submit id -> date)."""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    async def info(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisTaskStore(TaskStore):
+    """Task store on an asyncio Redis client with a shared pool."""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: Optional[int] = None,
+        password: Optional[str] = None,
+        expiry: Optional[int] = None,
+        client: Optional[redis.Redis] = None,
+    ):
+        """
+        Args:
+            host, port, db, password: Redis server, from the config by
+                default.
+            expiry (int, optional): Seconds tasks and indexes are kept.
+            client (redis.Redis, optional): Client to use instead of one
+                on the shared pool.
+        """
+        if client is None:
+            host = host or redis_config.REDIS_HOST
+            port = port or redis_config.REDIS_PORT
+            db = redis_config.REDIS_DB if db is None else db
+            password = password or redis_config.REDIS_PASSWORD
+            url = f"redis://{host}:{port}/{db}"
+            pool = _pools.get(url)
+            if pool is None:
+                pool = redis.ConnectionPool(
+                    host=host,
+                    port=port,
+                    db=db,
+                    password=password,
+                    decode_responses=True,
+                    max_connections=redis_config.REDIS_MAX_CONNECTIONS,
+                )
+                _pools[url] = pool
+            client = redis.Redis(connection_pool=pool)
+        self.client = client
+        self.expiry = expiry or redis_config.get_task_expiry_seconds()
+
+        prefix = redis_config.KEY_PREFIX
+        self.task_prefix = f"{prefix}:task:"
+        self.task_index_prefix = f"{prefix}:index:"
+        self.task_date_prefix = f"{prefix}:date:"
+        self.task_status_prefix = f"{prefix}:status:"
+
+    def _task_key(self, submit_id: str) -> str:
+        return f"{self.task_prefix}{submit_id}"
+
+    def _index_key(self, submit_id: str) -> str:
+        return f"{self.task_index_prefix}{submit_id}"
+
+    def _date_key(self, task_date: str) -> str:
+        return f"{self.task_date_prefix}{task_date}"
+
+    def _status_key(self, status: str) -> str:
+        return f"{self.task_status_prefix}{status}"
+
+    async def write(
+        self,
+        submit_id: str,
+        task_json: str,
+        status: str,
+        task_date: Optional[str] = None,
+        old_status: Optional[str] = None,
+    ) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(self._task_key(submit_id), task_json, ex=self.expiry)
+            if task_date:
+                pipe.set(self._index_key(submit_id), task_date, ex=self.expiry)
+                pipe.sadd(self._date_key(task_date), submit_id)
+                pipe.expire(self._date_key(task_date), self.expiry)
+            if old_status and old_status != status:
+                pipe.srem(self._status_key(old_status), submit_id)
+            if old_status != status:
+                pipe.sadd(self._status_key(status), submit_id)
+                pipe.expire(self._status_key(status), self.expiry)
+            await pipe.execute()
+
+    async def read(self, submit_id: str) -> Optional[str]:
+        return await self.client.get(self._task_key(submit_id))
+
+    async def read_many(self, submit_ids: Iterable[str]) -> Dict[str, str]:
+        submit_ids = list(dict.fromkeys(submit_ids))
+        if not submit_ids:
+            return {}
+        values = await self.client.mget(
+            [self._task_key(submit_id) for submit_id in submit_ids],
+        )
+        return {
+            submit_id: value
+            for submit_id, value in zip(submit_ids, values)
+            if value
+        }
+
+    async def remove(
+        self,
+        submit_id: str,
+        status: str,
+        task_date: Optional[str] = None,
+    ) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._task_key(submit_id), self._index_key(submit_id))
+            if task_date:
+                pipe.srem(self._date_key(task_date), submit_id)
+            pipe.srem(self._status_key(status), submit_id)
+            await pipe.execute()
+
+    async def expire(self, submit_id: str, seconds: int) -> bool:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.expire(self._task_key(submit_id), seconds)
+            pipe.expire(self._index_key(submit_id), seconds)
+            found, _ = await pipe.execute()
+        return bool(found)
+
+    async def status_members(self, status: str) -> List[str]:
+        return list(await self.client.smembers(self._status_key(status)))
+
+    async def scan_date(
+        self,
+        task_date: str,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        cursor, members = await self.client.sscan(
+            self._date_key(task_date),
+            cursor=cursor,
+            count=count,
+        )
+        return int(cursor), list(members)
+
+    async def scan_tasks(
+        self,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        cursor, keys = await self.client.scan(
+            cursor=cursor,
+            match=f"{self.task_prefix}*",
+            count=count,
+        )
+        return int(cursor), [key[len(self.task_prefix) :] for key in keys]
+
+    async def count_sets(
+        self,
+        statuses: Iterable[str],
+        task_dates: Iterable[str],
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        statuses, task_dates = list(statuses), list(task_dates)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for status in statuses:
+                pipe.scard(self._status_key(status))
+            for task_date in task_dates:
+                pipe.scard(self._date_key(task_date))
+            counts = await pipe.execute()
+        return (
+            dict(zip(statuses, counts[: len(statuses)])),
+            dict(zip(task_dates, counts[len(statuses) :])),
+        )
+
+    async def set_indexes(self, dates: Dict[str, str]) -> None:
+        if not dates:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for submit_id, task_date in dates.items():
+                pipe.set(self._index_key(submit_id), task_date, ex=self.expiry)
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        for prefix in (
+            self.task_prefix,
+            self.task_index_prefix,
+            self.task_date_prefix,
+            self.task_status_prefix,
+        ):
+            cursor = 0
+            while True:
+                cursor, keys = await self.client.scan(
+                    cursor=cursor,
+                    match=f"{prefix}*",
+                    count=1000,
+                )
+                if keys:
+                    await self.client.delete(*keys)
+                if not cursor:
+                    break
+
+    async def info(self) -> Dict[str, Any]:
+        info = await self.client.info()
+        return {
+            "used_memory_human": info.get("used_memory_human", "N/A"),
+            "connected_clients": info.get("connected_clients", "N/A"),
+            "total_commands_processed": info.get(
+                "total_commands_processed",
+                "N/A",
+            ),
+        }
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class InMemoryTaskStore(TaskStore):
+    """Task store in process memory, with the expiry of the Redis one."""
+
+    def __init__(self, expiry: Optional[int] = None):
+        self.expiry = expiry or redis_config.get_task_expiry_seconds()
+        # submit id -> (task json, expiry timestamp)
+        self._tasks: Dict[str, Tuple[str, float]] = {}
+        self._index: Dict[str, Tuple[str, float]] = {}
+        self._dates: Dict[str, set] = {}
+        self._statuses: Dict[str, set] = {}
+
+    def _alive(self, entries: Dict, key: str) -> Optional[Any]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        return value
+
+    async def write(
+        self,
+        submit_id: str,
+        task_json: str,
+        status: str,
+        task_date: Optional[str] = None,
+        old_status: Optional[str] = None,
+    ) -> None:
+        expires_at = time.monotonic() + self.expiry
+        self._tasks[submit_id] = (task_json, expires_at)
+        if task_date:
+            self._index[submit_id] = (task_date, expires_at)
+            self._dates.setdefault(task_date, set()).add(submit_id)
+        if old_status and old_status != status:
+            self._statuses.get(old_status, set()).discard(submit_id)
+        self._statuses.setdefault(status, set()).add(submit_id)
+
+    async def read(self, submit_id: str) -> Optional[str]:
+        return self._alive(self._tasks, submit_id)
+
+    async def read_many(self, submit_ids: Iterable[str]) -> Dict[str, str]:
+        found = {}
+        for submit_id in submit_ids:
+            value = self._alive(self._tasks, submit_id)
+            if value:
+                found[submit_id] = value
+        return found
+
+    async def remove(
+        self,
+        submit_id: str,
+        status: str,
+        task_date: Optional[str] = None,
+    ) -> None:
+        self._tasks.pop(submit_id, None)
+        self._index.pop(submit_id, None)
+        if task_date:
+            self._dates.get(task_date, set()).discard(submit_id)
+        self._statuses.get(status, set()).discard(submit_id)
+
+    async def expire(self, submit_id: str, seconds: int) -> bool:
+        task_json = self._alive(self._tasks, submit_id)
+        if task_json is None:
+            return False
+        expires_at = time.monotonic() + seconds
+        self._tasks[submit_id] = (task_json, expires_at)
+        task_date = self._alive(self._index, submit_id)
+        if task_date is not None:
+            self._index[submit_id] = (task_date, expires_at)
+        return True
+
+    async def status_members(self, status: str) -> List[str]:
+        return list(self._statuses.get(status, ()))
+
+    @staticmethod
+    def _page(
+        items: List[str],
+        cursor: int,
+        count: int,
+    ) -> Tuple[int, List[str]]:
+        page = items[cursor : cursor + count]
+        next_cursor = cursor + count
+        return (next_cursor if next_cursor < len(items) else 0), page
+
+    async def scan_date(
+        self,
+        task_date: str,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        return self._page(
+            sorted(self._dates.get(task_date, ())),
+            cursor,
+            count,
+        )
+
+    async def scan_tasks(
+        self,
+        cursor: int = 0,
+        count: int = 100,
+    ) -> Tuple[int, List[str]]:
+        alive = [
+            submit_id
+            for submit_id in sorted(self._tasks)
+            if self._alive(self._tasks, submit_id) is not None
+        ]
+        return self._page(alive, cursor, count)
+
+    async def count_sets(
+        self,
+        statuses: Iterable[str],
+        task_dates: Iterable[str],
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        return (
+            {s: len(self._statuses.get(s, ())) for s in statuses},
+            {d: len(self._dates.get(d, ())) for d in task_dates},
+        )
+
+    async def set_indexes(self, dates: Dict[str, str]) -> None:
+        expires_at = time.monotonic() + self.expiry
+        for submit_id, task_date in dates.items():
+            self._index[submit_id] = (task_date, expires_at)
+
+    async def clear(self) -> None:
+        self._tasks.clear()
+        self._index.clear()
+        self._dates.clear()
+        self._statuses.clear()
+
+    async def info(self) -> Dict[str, Any]:
+        return {"backend": "memory", "tasks": len(self._tasks)}
+
+
+def create_task_store(backend: Optional[str] = None, **kwargs) -> TaskStore:
+    """
+    Create the task store selected by ``backend`` or
+    ``USER_PROFILING_TASK_BACKEND`` ("redis" or "memory").
+    """
+    backend = (backend or redis_config.TASK_BACKEND).lower()
+    if backend == "memory":
+        return InMemoryTaskStore(expiry=kwargs.get("expiry"))
+    if backend == "redis":
+        return RedisTaskStore(**kwargs)
+    raise ValueError(f"Unknown task store backend: {backend}")
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded queue of the background work of the user profiling routes.
+
+Background jobs (adding memory, clearing it, recording actions) run on
+``USER_PROFILING_WORKERS`` workers instead of one task per request, so
+bursts do not start thousands of LLM and embedding pipelines at once.
+Jobs of a user run one at a time in submission order, and users take
+turns on the workers. Once ``USER_PROFILING_QUEUE_MAX_DEPTH`` jobs are
+waiting, new ones are refused with HTTP 429.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from alias.memory_service.service.core.exceptions import QueueFullError
+from alias.memory_service.profiling_utils.logging_utils import setup_logging
+
+logger = setup_logging()
+
+WORKERS = int(os.getenv("USER_PROFILING_WORKERS", "8"))
+QUEUE_MAX_DEPTH = int(os.getenv("USER_PROFILING_QUEUE_MAX_DEPTH", "200"))
+
+
+class Histogram:
+    """Cumulative histogram of durations in seconds"""
+
+    BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets, total = {}, 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            total += count
+            buckets[str(bound)] = total
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.mean(), 6),
+            "buckets": buckets,
+        }
+
+
+class WorkQueue:
+    """Worker pool running background jobs in per-user FIFO order"""
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        max_depth: int = QUEUE_MAX_DEPTH,
+    ):
+        """
+        Args:
+            workers (int): Jobs run concurrently
+            max_depth (int): Jobs waiting before new ones are refused
+        """
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        # uid -> jobs waiting: (job, kind, enqueue time)
+        self._jobs: Dict[str, Deque] = {}
+        # Users with a job to start; a user is queued at most once
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self.depth = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_latency: Dict[str, Histogram] = {"all": Histogram()}
+        self.processing_time: Dict[str, Histogram] = {"all": Histogram()}
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        for uid in self._jobs:
+            self._ready.put_nowait(uid)
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+        logger.info(f"WorkQueue started with {self.workers} workers")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Let queued jobs finish for up to ``timeout`` seconds, then
+        cancel the workers."""
+        if not self._workers:
+            return
+        deadline = time.monotonic() + timeout
+        while (self.depth or self.running) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._ready = None
+        if self.depth:
+            logger.warning(f"WorkQueue stopped with {self.depth} jobs left")
+        else:
+            logger.info("WorkQueue stopped")
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained a little"""
+        per_job = self.processing_time["all"].mean() or 1.0
+        return min(60, max(1, math.ceil(per_job * self.depth / self.workers)))
+
+    def submit(
+        self,
+        uid: str,
+        job: Callable[[], Awaitable[Any]],
+        kind: str = "task",
+    ) -> None:
+        """
+        Queue a job behind the other jobs of the same user
+
+        Args:
+            uid (str): User the job works on
+            job (Callable[[], Awaitable[Any]]): Coroutine function to run
+            kind (str): Name the job is measured under
+
+        Raises:
+            QueueFullError: ``max_depth`` jobs are waiting
+        """
+        if self.depth >= self.max_depth:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+        if not self._workers:
+            self.start()
+        jobs = self._jobs.get(uid)
+        if jobs is None:
+            jobs = self._jobs[uid] = deque()
+            self._ready.put_nowait(uid)
+        jobs.append((job, kind, time.monotonic()))
+        self.depth += 1
+
+    async def _work(self) -> None:
+        while True:
+            uid = await self._ready.get()
+            jobs = self._jobs[uid]
+            job, kind, enqueued_at = jobs.popleft()
+            self.depth -= 1
+            self.running += 1
+            started = time.monotonic()
+            self._observe(self.queue_latency, kind, started - enqueued_at)
+            try:
+                await job()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Background {kind} for {uid} failed: {e}")
+            finally:
+                self.running -= 1
+                self._observe(
+                    self.processing_time,
+                    kind,
+                    time.monotonic() - started,
+                )
+                # The user's next job waits for the other users' turns
+                if jobs:
+                    self._ready.put_nowait(uid)
+                else:
+                    del self._jobs[uid]
+
+    @staticmethod
+    def _observe(
+        histograms: Dict[str, Histogram],
+        kind: str,
+        seconds: float,
+    ) -> None:
+        histograms["all"].observe(seconds)
+        histograms.setdefault(kind, Histogram()).observe(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+            "depth": self.depth,
+            "running": self.running,
+            "active_users": len(self._jobs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_latency_seconds": {
+                kind: histogram.snapshot()
+                for kind, histogram in self.queue_latency.items()
+            },
+            "processing_time_seconds": {
+                kind: histogram.snapshot()
+                for kind, histogram in self.processing_time.items()
+            },
+        }
+
+
+# Work queue shared by the routers
+work_queue = WorkQueue()
@@ -2,18 +2,21 @@
 # pylint: disable=unused-argument
 import json
 import uuid
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Query
 
 from fastapi.responses import StreamingResponse
 from loguru import logger
 from starlette.types import Receive
 
 from alias.server.api.deps import CurrentUser
+from alias.server.core.config import settings
 from alias.server.exceptions.base import BaseError
 from alias.server.schemas.chat import (
     ChatRequest,
     StopChatPayload,
+    StreamFormat,
     StopChatResponse,
 )
 from alias.server.services.chat_service import (
@@ -43,6 +46,12 @@ class EnhancedStreamingResponse(StreamingResponse):
         while True:
             message = await receive()
             if message["type"] == "http.disconnect":
+                if not settings.STOP_CHAT_ON_DISCONNECT:
+                    logger.info(
+                        f"Client disconnected, chat continues for resume: "
+                        f"task_id={self.task_id}",
+                    )
+                    break
                 logger.warning(
                     f"Chat stopped by disconnect from client: "
                     f"task_id={self.task_id}",
@@ -58,7 +67,10 @@ class EnhancedStreamingResponse(StreamingResponse):
 async def event_generator(generator):
     try:
         async for chunk in generator:
-            yield f"data: {json.dumps(chunk)}\n\n"
+            event_id = chunk.pop("event_id", None)
+            # Reconnecting EventSource clients send it as Last-Event-ID
+            prefix = f"id: {event_id}\n" if event_id else ""
+            yield f"{prefix}data: {json.dumps(chunk)}\n\n"
         yield "data: [DONE]\n\n"
     except Exception as e:
         if not isinstance(e, BaseError):
@@ -98,6 +110,28 @@ async def chat(
     )
 
 
+@router.get("/{conversation_id}/chat/{task_id}/events")
+async def resume_chat(
+    current_user: CurrentUser,
+    conversation_id: uuid.UUID,
+    task_id: uuid.UUID,
+    last_event_id: Optional[str] = Header(default=None),
+    stream_format: StreamFormat = Query(default=StreamFormat.FULL),
+):
+    service = ChatService()
+    response = await service.resume_chat(
+        user_id=current_user.id,
+        conversation_id=conversation_id,
+        task_id=task_id,
+        last_event_id=last_event_id,
+        stream_format=stream_format,
+    )
+    return StreamingResponse(
+        event_generator(generator=response),
+        media_type="text/event-stream",
+    )
+
+
 @router.post(
     "/{conversation_id}/chat/{task_id}/stop",
     response_model=StopChatResponse,
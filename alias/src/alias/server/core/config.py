@@ -108,6 +108,66 @@ class ServerConfig(BaseSettings):
         default=10,
         description="Heartbeat interval (seconds)",
     )
+    EVENT_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Maximum events queued per chat stream",
+    )
+    EVENT_BACKPRESSURE: Literal["block", "drop"] = Field(
+        default="block",
+        description="When the event queue is full: 'block' makes the "
+        "agent wait, 'drop' drops message updates",
+    )
+    EVENT_MANAGER: Literal["memory", "redis"] = Field(
+        default="memory",
+        description="Chat event transport: 'memory' keeps events in the "
+        "worker running the agent, 'redis' in a Redis stream per task "
+        "that any worker can read and clients can resume",
+    )
+    EVENT_STREAM_MAXLEN: int = Field(
+        default=10000,
+        description="Approximate maximum length of a chat event stream",
+    )
+    EVENT_STREAM_TTL: int = Field(
+        default=2 * 60 * 60,
+        description="Seconds a chat event stream is kept after its last "
+        "event",
+    )
+    EVENT_STREAM_BATCH_SIZE: int = Field(
+        default=64,
+        description="Maximum events written or read per Redis round trip",
+    )
+    EVENT_STREAM_FLUSH_INTERVAL: float = Field(
+        default=0.05,
+        description="Seconds events are buffered before being written to "
+        "the stream",
+    )
+    STREAM_SNAPSHOT_INTERVAL: int = Field(
+        default=50,
+        description="Frames of a message between full snapshots in the "
+        "delta stream format",
+    )
+    PERSIST_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        description="Seconds chat messages, plans and states are buffered "
+        "before being written to the database",
+    )
+    PERSIST_BATCH_SIZE: int = Field(
+        default=100,
+        description="Buffered records that trigger an early flush",
+    )
+    PERSIST_MAX_PENDING: int = Field(
+        default=1000,
+        description="Buffered records at which streams wait for a flush",
+    )
+    PERSIST_SHUTDOWN_RETRIES: int = Field(
+        default=3,
+        description="Flush retries on shutdown before giving up",
+    )
+    STOP_CHAT_ON_DISCONNECT: bool = Field(
+        default=True,
+        description="Whether a client disconnect stops the chat task; "
+        "disable with the redis event manager to let clients resume",
+    )
 
 
 class DatabaseConfig(BaseSettings):
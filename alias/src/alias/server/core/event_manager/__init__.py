@@ -1,6 +1,35 @@
 # -*- coding: utf-8 -*-
+import uuid
+from typing import Optional
+
+from alias.server.core.config import settings
+
 from .async_queue_event_manager import AsyncQueueEventManager as EventManager
+from .base import BaseEventManager
+from .redis_stream_event_manager import RedisStreamEventManager
+
+
+def create_event_manager(
+    task_id: uuid.UUID,
+    user_id: uuid.UUID,
+    last_event_id: Optional[str] = None,
+) -> BaseEventManager:
+    """Create the event manager selected by ``EVENT_MANAGER``."""
+    if settings.EVENT_MANAGER == "redis":
+        return RedisStreamEventManager(
+            task_id=task_id,
+            user_id=user_id,
+            last_event_id=last_event_id,
+        )
+    return EventManager(
+        task_id=task_id,
+        user_id=user_id,
+    )
+
 
 __all__ = [
+    "BaseEventManager",
     "EventManager",
+    "RedisStreamEventManager",
+    "create_event_manager",
 ]
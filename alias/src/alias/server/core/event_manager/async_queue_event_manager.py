@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import uuid
-import asyncio
+from typing import Optional
+
+from alias.server.core.config import settings
+from alias.server.core.event import Event
 
 from .base import BaseEventManager
+from .event_bus import BackpressurePolicy, EventBus
 
 
 class AsyncQueueEventManager(BaseEventManager):
@@ -10,10 +14,32 @@ class AsyncQueueEventManager(BaseEventManager):
         self,
         task_id: uuid.UUID,
         user_id: uuid.UUID,
+        maxsize: int = 0,
+        policy: Optional[BackpressurePolicy] = None,
     ):
-        _queue = asyncio.Queue()
         super().__init__(
             task_id=task_id,
             user_id=user_id,
-            queue=_queue,
         )
+        self.bus = EventBus(
+            maxsize=maxsize or settings.EVENT_QUEUE_SIZE,
+            policy=policy or settings.EVENT_BACKPRESSURE,
+        )
+
+    async def _put(self, event: Event) -> None:
+        await self.bus.put(event)
+
+    async def _get(self) -> Optional[Event]:
+        return await self.bus.get()
+
+    async def _wake(self) -> None:
+        await self.bus.wake()
+
+    async def _detach(self) -> None:
+        # Nothing else reads an in-process bus: release the producer
+        # instead of letting it wait on a full bus
+        await self.close()
+
+    async def close(self):
+        await self.bus.clear()
+        await self.bus.close()
@@ -1,77 +1,86 @@
 # -*- coding: utf-8 -*-
-import asyncio
 import time
 import uuid
-from typing import AsyncGenerator
+from abc import ABC, abstractmethod
+from typing import AsyncGenerator, Optional
 
 from alias.server.core.config import settings
-from alias.server.core.event import Event, HeartBeatEvent, StopEvent
+from alias.server.core.event import Event, StopEvent
 
+from .heartbeat import heartbeat_timer
+
+
+class BaseEventManager(ABC):
+    """Event stream of one chat task, from the agent worker to the SSE
+    response.
+
+    Subclasses provide the transport through ``_put`` and ``_get``.
+    ``listen`` waits on the transport without polling; heartbeats and the
+    maximum execution time are driven by the shared heartbeat timer.
+    """
 
-class BaseEventManager:
     def __init__(
         self,
         task_id: uuid.UUID,
         user_id: uuid.UUID,
-        queue: asyncio.Queue,
         heartbeat_interval: int = 0,
     ):
         self.task_id = task_id
         self.user_id = user_id
-        self.queue = queue
         self.heartbeat_interval = (
             heartbeat_interval or settings.HEARTBEAT_INTERVAL
         )
+        self.started_at = time.monotonic()
+        self.last_event_at = self.started_at
+        self.expired = False
+        # Position of the last event returned by ``listen`` in transports
+        # that can resume from it (SSE ``id``), else None
+        self.last_event_id: Optional[str] = None
+
+    @abstractmethod
+    async def _put(self, event: Event) -> None:
+        """Send an event to the listeners."""
+
+    @abstractmethod
+    async def _get(self) -> Optional[Event]:
+        """Wait for the next event; None ends the stream."""
+
+    @abstractmethod
+    async def _wake(self) -> None:
+        """Make a waiting ``_get`` return so that expiry is noticed."""
+
+    async def _detach(self) -> None:
+        """Called when ``listen`` ends, also when the client disconnected
+        and the response stopped reading."""
 
     async def put(self, event: Event) -> None:
-        await self.queue.put(event)
+        self.last_event_at = time.monotonic()
+        await self._put(event)
 
     async def stop(self):
         await self.put(StopEvent())
 
+    async def expire(self) -> None:
+        """End ``listen`` once the maximum execution time is exceeded."""
+        self.expired = True
+        await self._wake()
+
     async def listen(self) -> AsyncGenerator[Event, None]:
-        start_time = time.time()
-        last_event_time = start_time
-
-        while True:
-            try:
-                event = await asyncio.wait_for(
-                    self.queue.get(),
-                    timeout=1.0,
-                )
-
-                if isinstance(event, (StopEvent)):
-                    yield event
+        heartbeat_timer.register(self)
+        try:
+            while not self.expired:
+                event = await self._get()
+                if event is None or self.expired:
                     return
 
                 yield event
 
-                last_event_time = time.time()
-
-            except asyncio.TimeoutError:
-                pass
-            except Exception:
-                continue
-            finally:
-                current_time = time.time()
-                working_time = current_time - start_time
-
-                if working_time > settings.MAX_CHAT_EXECUTION_TIME:
-                    break  # pylint: disable=W0150
-
-                if (
-                    self.heartbeat_interval > 0
-                    and current_time - last_event_time
-                    > self.heartbeat_interval
-                ):
-                    await self.put(HeartBeatEvent())
-                    last_event_time = current_time
+                if isinstance(event, StopEvent):
+                    return
+        finally:
+            heartbeat_timer.unregister(self)
+            await self._detach()
 
+    @abstractmethod
     async def close(self):
-        while not self.queue.empty():
-            try:
-                await self.queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-
-        await self.stop()
+        """Release the transport of the stream."""
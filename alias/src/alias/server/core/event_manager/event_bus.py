@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Bounded in-process event buffer with backpressure and coalescing."""
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional
+
+from alias.server.core.event import (
+    ErrorEvent,
+    Event,
+    FinishEvent,
+    HeartBeatEvent,
+    StopEvent,
+    UpdateEvent,
+)
+
+
+class BackpressurePolicy(str, Enum):
+    """What ``put`` does when the buffer is full.
+
+    BLOCK: the producer waits until the consumer frees a slot.
+    DROP: message updates are dropped (the next update or the finish
+        event carries the full message again); other events still wait.
+    """
+
+    BLOCK = "block"
+    DROP = "drop"
+
+
+def coalesce_key(event: Event) -> Optional[Any]:
+    """Message id of an event that carries a whole message, else None."""
+    message = getattr(event, "message", None)
+    if message is None or not isinstance(event, (UpdateEvent, FinishEvent)):
+        return None
+    return getattr(message, "id", None)
+
+
+class EventBus:
+    """Bounded FIFO of events between one producer and one consumer.
+
+    Every message update carries the whole message, so a pending update
+    is superseded by a newer update or the finish event of the same
+    message: it is discarded and the newer event queued at the tail,
+    after the events put since. A consumer that falls behind a fast
+    token stream therefore only ever sees the latest state of each
+    message and the buffer stays at constant size.
+    Heartbeats are only queued while the buffer is empty; stop and error
+    events are always accepted so that a full buffer cannot keep a task
+    from ending. Once the bus is closed, ``put`` drops its event instead
+    of waiting for a consumer that is gone.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: BackpressurePolicy = BackpressurePolicy.BLOCK,
+    ):
+        """Initialize the bus.
+
+        Args:
+            maxsize: Maximum number of queued events.
+            policy: Behaviour of ``put`` when the bus is full.
+        """
+        self.maxsize = max(1, maxsize)
+        self.policy = BackpressurePolicy(policy)
+        # Slots are one-element lists so that a superseded update can be
+        # emptied in place; an emptied slot (None) is skipped on get.
+        self._slots: Deque[List[Optional[Event]]] = deque()
+        self._pending: Dict[Any, List[Optional[Event]]] = {}
+        self._size = 0
+        self._closed = False
+        self._wakeups = 0
+        self._cond = asyncio.Condition()
+
+        self.coalesced = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    async def put(self, event: Event) -> None:
+        """Queue an event according to the coalescing and backpressure
+        rules.
+
+        Args:
+            event: Event to queue.
+        """
+        async with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return
+
+            key = coalesce_key(event)
+            is_update = key is not None and isinstance(event, UpdateEvent)
+
+            slot = self._pending.pop(key, None) if key is not None else None
+            if slot is not None:
+                # Superseded: the newer event takes its place in the
+                # buffer, behind the events put since
+                slot[0] = None
+                self._size -= 1
+                self.coalesced += 1
+
+            if isinstance(event, HeartBeatEvent) and self._size:
+                # The consumer has something to read already
+                self.dropped += 1
+                return
+
+            if not isinstance(event, (StopEvent, ErrorEvent)):
+                if self._size >= self.maxsize:
+                    if is_update and self.policy is BackpressurePolicy.DROP:
+                        self.dropped += 1
+                        return
+                    await self._cond.wait_for(
+                        lambda: self._size < self.maxsize or self._closed,
+                    )
+                    if self._closed:
+                        self.dropped += 1
+                        return
+
+            slot = [event]
+            self._slots.append(slot)
+            if is_update:
+                self._pending[key] = slot
+            self._size += 1
+            self.high_water = max(self.high_water, self._size)
+            self._cond.notify_all()
+
+    async def get(self) -> Optional[Event]:
+        """Wait for the next event without polling.
+
+        Returns:
+            The next event, or None once the bus is closed and empty or
+            ``wake`` was called while waiting.
+        """
+        async with self._cond:
+            wakeups = self._wakeups
+            await self._cond.wait_for(
+                lambda: self._size or self._closed or self._wakeups != wakeups,
+            )
+            while self._slots:
+                slot = self._slots.popleft()
+                event = slot[0]
+                if event is None:
+                    continue
+                key = coalesce_key(event)
+                if key is not None and self._pending.get(key) is slot:
+                    del self._pending[key]
+                self._size -= 1
+                self._cond.notify_all()
+                return event
+            return None
+
+    async def wake(self) -> None:
+        """Make waiting consumers return and producers re-check their
+        state."""
+        async with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    async def close(self) -> None:
+        """Stop accepting events: blocked and later ``put`` calls drop
+        theirs, ``get`` returns None once drained."""
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    async def clear(self) -> None:
+        """Drop every queued event."""
+        async with self._cond:
+            self._slots.clear()
+            self._pending.clear()
+            self._size = 0
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._size,
+            "high_water": self.high_water,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
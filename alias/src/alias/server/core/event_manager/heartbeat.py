@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""One timer driving heartbeats and expiry of all listening event
+managers."""
+import asyncio
+import time
+from typing import TYPE_CHECKING, Optional, Set
+
+from loguru import logger
+
+from alias.server.core.config import settings
+from alias.server.core.event import HeartBeatEvent
+
+if TYPE_CHECKING:
+    from .base import BaseEventManager
+
+
+class HeartbeatTimer:
+    """Sleeps until the earliest heartbeat or expiry deadline among the
+    registered managers, instead of every listener waking up once a
+    second to check its own."""
+
+    def __init__(self):
+        self._managers: Set["BaseEventManager"] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    def register(self, manager: "BaseEventManager") -> None:
+        """Start driving a manager's heartbeats and expiry."""
+        self._managers.add(manager)
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not loop
+        ):
+            self._changed = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._changed.set()
+
+    def unregister(self, manager: "BaseEventManager") -> None:
+        self._managers.discard(manager)
+
+    @staticmethod
+    def _deadline(manager: "BaseEventManager") -> float:
+        deadline = manager.started_at + settings.MAX_CHAT_EXECUTION_TIME
+        if manager.heartbeat_interval > 0:
+            deadline = min(
+                deadline,
+                manager.last_event_at + manager.heartbeat_interval,
+            )
+        return deadline
+
+    async def _tick(self, manager: "BaseEventManager", now: float) -> None:
+        if now - manager.started_at > settings.MAX_CHAT_EXECUTION_TIME:
+            self._managers.discard(manager)
+            await manager.expire()
+        elif (
+            manager.heartbeat_interval > 0
+            and now - manager.last_event_at >= manager.heartbeat_interval
+        ):
+            await manager.put(HeartBeatEvent())
+
+    async def _run(self) -> None:
+        while self._managers:
+            self._changed.clear()
+            now = time.monotonic()
+            # A slow transport must not delay the other managers
+            managers = list(self._managers)
+            results = await asyncio.gather(
+                *(self._tick(manager, now) for manager in managers),
+                return_exceptions=True,
+            )
+            for manager, result in zip(managers, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Heartbeat failed for task {manager.task_id}: "
+                        f"{result}",
+                    )
+
+            deadlines = [self._deadline(m) for m in self._managers]
+            if not deadlines:
+                break
+            timeout = max(0.0, min(deadlines) - time.monotonic())
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+heartbeat_timer = HeartbeatTimer()
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""Chat events kept in one Redis stream per task, readable from any
+worker and resumable from the last event a client received."""
+import asyncio
+import json
+import re
+import uuid
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+from sqlmodel import SQLModel
+
+from alias.server.core.config import settings
+from alias.server.core.event import (
+    ErrorEvent,
+    Event,
+    HeartBeatEvent,
+    StopEvent,
+    UpdateEvent,
+)
+from alias.server.utils.redis import redis_client
+
+from .base import BaseEventManager
+from .event_bus import coalesce_key
+
+STREAM_START = "0-0"
+
+_STREAM_ID = re.compile(r"^\d+-\d+$")
+
+
+def stream_key(task_id: uuid.UUID) -> str:
+    return f"chat_events:{task_id}"
+
+
+def is_stream_id(value: str) -> bool:
+    """Whether a value is a Redis stream entry id such as ``1700-0``."""
+    return bool(_STREAM_ID.match(value or ""))
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@lru_cache(maxsize=1)
+def _event_types() -> Dict[str, Type[Event]]:
+    # Message, plan and state events subclass the core events in the
+    # schemas package, which imports this package's dependencies.
+    from alias.server.schemas import event  # noqa: F401
+
+    types: Dict[str, Type[Event]] = {}
+    pending = [Event]
+    while pending:
+        cls = pending.pop()
+        types[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return types
+
+
+def encode_event(event: Event) -> Dict[str, str]:
+    return {"type": type(event).__name__, "data": event.model_dump_json()}
+
+
+def decode_event(fields: Dict[Any, Any]) -> Event:
+    fields = {_text(k): _text(v) for k, v in fields.items()}
+    cls = _event_types()[fields["type"]]
+    data = json.loads(fields["data"])
+    # Nested table models (message, plan, state) are not validated by the
+    # event, so their ids would stay strings
+    for name, field in cls.model_fields.items():
+        model = field.annotation
+        if (
+            data.get(name) is not None
+            and isinstance(model, type)
+            and issubclass(model, SQLModel)
+        ):
+            data[name] = model.model_validate(data[name])
+    return cls.model_validate(data)
+
+
+class RedisStreamEventManager(BaseEventManager):
+    """Event manager backed by the Redis stream ``chat_events:<task_id>``.
+
+    The worker running the agent buffers events for up to
+    ``EVENT_STREAM_FLUSH_INTERVAL`` and writes them with one pipelined
+    round of XADDs; a newer update of a message supersedes a buffered one.
+    Stop and error events are written immediately. Readers on any worker
+    XREAD from their last entry id, so a reconnecting client passes the
+    SSE ``Last-Event-ID`` and receives everything it missed. The stream
+    is trimmed to ``EVENT_STREAM_MAXLEN`` entries and expires
+    ``EVENT_STREAM_TTL`` seconds after its last event.
+
+    Heartbeats are not written to the stream: a reader whose XREAD times
+    out after one heartbeat interval yields one itself.
+    """
+
+    def __init__(
+        self,
+        task_id: uuid.UUID,
+        user_id: uuid.UUID,
+        last_event_id: Optional[str] = None,
+        redis: Any = None,
+        maxlen: int = 0,
+        ttl: int = 0,
+        batch_size: int = 0,
+        flush_interval: Optional[float] = None,
+    ):
+        """Initialize the event manager.
+
+        Args:
+            task_id: Chat task id.
+            user_id: Id of the user owning the task.
+            last_event_id: Entry id to resume reading after; the stream is
+                read from its start if not given.
+            redis: Async Redis client, the shared client by default.
+            maxlen: Approximate maximum stream length.
+            ttl: Seconds the stream is kept after its last event.
+            batch_size: Maximum events per write or read round trip.
+            flush_interval: Seconds events are buffered before writing.
+        """
+        super().__init__(
+            task_id=task_id,
+            user_id=user_id,
+        )
+        self.redis = redis or redis_client
+        self.key = stream_key(task_id)
+        self.maxlen = maxlen or settings.EVENT_STREAM_MAXLEN
+        self.ttl = ttl or settings.EVENT_STREAM_TTL
+        self.batch_size = max(
+            1,
+            batch_size or settings.EVENT_STREAM_BATCH_SIZE,
+        )
+        self.flush_interval = (
+            settings.EVENT_STREAM_FLUSH_INTERVAL
+            if flush_interval is None
+            else flush_interval
+        )
+        self.last_event_id = last_event_id or STREAM_START
+
+        self._outbox: List[Optional[Event]] = []
+        self._pending: Dict[Any, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._inbox: Deque[Tuple[Any, Dict[Any, Any]]] = deque()
+
+        self.written = 0
+        self.coalesced = 0
+        self.round_trips = 0
+
+    async def exists(self) -> bool:
+        """Whether the task's stream exists (and has not expired)."""
+        return bool(await self.redis.exists(self.key))
+
+    async def _put(self, event: Event) -> None:
+        if isinstance(event, HeartBeatEvent):
+            return
+
+        key = coalesce_key(event)
+        index = self._pending.pop(key, None) if key is not None else None
+        if index is not None:
+            # Superseded: the newer event is buffered behind the events
+            # put since
+            self._outbox[index] = None
+            self.coalesced += 1
+
+        if isinstance(event, UpdateEvent) and key is not None:
+            self._pending[key] = len(self._outbox)
+        self._outbox.append(event)
+
+        if isinstance(event, (StopEvent, ErrorEvent)) or (
+            len(self._outbox) >= self.batch_size
+        ):
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write events of task {self.task_id}: {e}")
+
+    async def flush(self) -> None:
+        """Write the buffered events to the stream."""
+        async with self._flush_lock:
+            events = [event for event in self._outbox if event is not None]
+            self._outbox = []
+            self._pending.clear()
+            if not events:
+                return
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for event in events:
+                    pipe.xadd(
+                        self.key,
+                        encode_event(event),
+                        maxlen=self.maxlen,
+                        approximate=True,
+                    )
+                pipe.expire(self.key, self.ttl)
+                await pipe.execute()
+            self.written += len(events)
+            self.round_trips += 1
+
+    async def _get(self) -> Optional[Event]:
+        while True:
+            while self._inbox:
+                entry_id, fields = self._inbox.popleft()
+                self.last_event_id = _text(entry_id)
+                try:
+                    return decode_event(fields)
+                except Exception as e:
+                    logger.error(
+                        f"Skipping undecodable event {self.last_event_id} "
+                        f"of task {self.task_id}: {e}",
+                    )
+
+            if self.expired:
+                return None
+            response = await self.redis.xread(
+                {self.key: self.last_event_id},
+                count=self.batch_size,
+                block=max(1, self.heartbeat_interval) * 1000,
+            )
+            if not response:
+                if self.heartbeat_interval > 0 and not self.expired:
+                    return HeartBeatEvent()
+                continue
+            for _key, entries in response:
+                self._inbox.extend(entries)
+
+    async def _wake(self) -> None:
+        # A blocked XREAD returns within one heartbeat interval
+        pass
+
+    async def close(self):
+        # The stop event flushes everything buffered before it
+        await self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "round_trips": self.round_trips,
+        }
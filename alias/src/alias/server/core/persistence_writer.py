@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""Write-behind persistence of chat messages, plans and states."""
+import asyncio
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import insert, select
+
+from alias.server.cache.plan_cache import PlanCache
+from alias.server.cache.state_cache import StateCache
+from alias.server.core.config import settings
+from alias.server.db.init_db import session_scope
+from alias.server.models.message import Message
+from alias.server.models.plan import Plan
+from alias.server.models.state import State
+from alias.server.utils.timestamp import get_current_time
+
+
+class PersistenceWriter:
+    """Buffers the messages, plans and states of chat streams and writes
+    them in batches from one background task.
+
+    A flush opens one database session and writes every buffered message
+    with a single INSERT (skipping ids already stored, so a resumed
+    stream can submit a message twice) and the latest plan and state of
+    each conversation, all in one transaction. Flushes run every
+    ``PERSIST_FLUSH_INTERVAL`` seconds or as soon as
+    ``PERSIST_BATCH_SIZE`` records are buffered; ``submit`` waits while
+    ``PERSIST_MAX_PENDING`` records are buffered. A failed flush puts
+    its records back for the next one, and ``stop`` keeps flushing until
+    everything is written or ``PERSIST_SHUTDOWN_RETRIES`` is exhausted.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized"):
+            return
+        self._messages: Dict[uuid.UUID, Message] = {}
+        # Only the latest plan and state of a conversation are written
+        self._plans: Dict[uuid.UUID, Plan] = {}
+        self._states: Dict[uuid.UUID, State] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.written = 0
+        self.failures = 0
+        self._initialized = True
+
+    @property
+    def pending(self) -> int:
+        return len(self._messages) + len(self._plans) + len(self._states)
+
+    async def start(self):
+        """Start the background flush task."""
+        if not self._flusher:
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._run())
+            logger.info("PersistenceWriter started")
+
+    async def stop(self):
+        """Stop the flush task and write everything still buffered."""
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        for attempt in range(settings.PERSIST_SHUTDOWN_RETRIES + 1):
+            if await self.flush():
+                logger.info("PersistenceWriter stopped")
+                return
+            await asyncio.sleep(min(2**attempt, 10))
+        logger.error(
+            f"PersistenceWriter stopped with {len(self._messages)} "
+            f"messages, {len(self._plans)} plans and {len(self._states)} "
+            f"states not written",
+        )
+
+    async def add_message(self, message: Message) -> None:
+        self._messages[message.id] = message
+        await self._submitted()
+
+    async def add_plan(self, plan: Plan) -> None:
+        self._plans[plan.conversation_id] = plan
+        await self._submitted()
+
+    async def add_state(self, state: State) -> None:
+        self._states[state.conversation_id] = state
+        await self._submitted()
+
+    async def _submitted(self) -> None:
+        if self._flusher is None:
+            # Not started (scripts, tests): write through
+            await self.flush()
+        elif self.pending >= settings.PERSIST_MAX_PENDING:
+            await self.flush()
+        elif self.pending >= settings.PERSIST_BATCH_SIZE:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    settings.PERSIST_FLUSH_INTERVAL,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(
+        self,
+        conversation_id: Optional[uuid.UUID] = None,
+    ) -> bool:
+        """Write everything buffered.
+
+        Args:
+            conversation_id: Only write the records of this conversation.
+
+        Returns:
+            Whether the records were written; on failure they stay
+            buffered for the next flush.
+        """
+        async with self._flush_lock:
+            messages, plans, states = self._take(conversation_id)
+            if not (messages or plans or states):
+                return True
+
+            try:
+                async with session_scope() as session:
+                    await self._write_messages(session, messages)
+                    await self._write_latest(session, Plan, plans)
+                    await self._write_latest(session, State, states)
+                    await session.commit()
+            except Exception as e:
+                self.failures += 1
+                logger.error(
+                    f"Failed to persist {len(messages)} messages, "
+                    f"{len(plans)} plans and {len(states)} states: {e}",
+                )
+                # Keep newer records submitted during the flush
+                for message in messages:
+                    self._messages.setdefault(message.id, message)
+                for conversation_id, plan in plans.items():
+                    self._plans.setdefault(conversation_id, plan)
+                for conversation_id, state in states.items():
+                    self._states.setdefault(conversation_id, state)
+                return False
+
+            self.flushes += 1
+            self.written += len(messages) + len(plans) + len(states)
+            for conversation_id in plans:
+                await PlanCache().clear_cache(conversation_id)
+            for conversation_id in states:
+                await StateCache().clear_cache(conversation_id)
+            return True
+
+    def _take(
+        self,
+        conversation_id: Optional[uuid.UUID],
+    ) -> Tuple[List[Message], Dict[uuid.UUID, Plan], Dict[uuid.UUID, State]]:
+        """Remove the records to write from the buffer."""
+        if conversation_id is None:
+            taken = list(self._messages.values()), self._plans, self._states
+            self._messages, self._plans, self._states = {}, {}, {}
+            return taken
+
+        messages = [
+            message
+            for message in self._messages.values()
+            if message.conversation_id == conversation_id
+        ]
+        for message in messages:
+            del self._messages[message.id]
+        plans, states = {}, {}
+        if conversation_id in self._plans:
+            plans[conversation_id] = self._plans.pop(conversation_id)
+        if conversation_id in self._states:
+            states[conversation_id] = self._states.pop(conversation_id)
+        return messages, plans, states
+
+    @staticmethod
+    async def _write_messages(session, messages: List[Message]) -> None:
+        if not messages:
+            return
+        result = await session.execute(
+            select(Message.id).where(
+                Message.id.in_([message.id for message in messages]),
+            ),
+        )
+        stored = set(result.scalars().all())
+        rows = [
+            message.model_dump()
+            for message in messages
+            if message.id not in stored
+        ]
+        if rows:
+            await session.execute(insert(Message), rows)
+
+    @staticmethod
+    async def _write_latest(session, model, records: Dict) -> None:
+        """Update the last row of each conversation or insert one."""
+        if not records:
+            return
+        result = await session.execute(
+            select(model)
+            .where(model.conversation_id.in_(list(records)))
+            .order_by(model.create_time),
+        )
+        # The latest row of each conversation is kept
+        stored = {row.conversation_id: row for row in result.scalars().all()}
+        now = get_current_time()
+        for conversation_id, record in records.items():
+            row = stored.get(conversation_id)
+            if row is None:
+                session.add(
+                    model(
+                        conversation_id=conversation_id,
+                        content=record.content,
+                    ),
+                )
+            else:
+                row.content = record.content
+                row.update_time = now
+
+
+persistence_writer = PersistenceWriter()
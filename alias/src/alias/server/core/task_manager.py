@@ -71,8 +71,17 @@ class TaskManager:
             user_id=user_id,
         )
         self._tasks[task_id] = task_info
+        # Finished tasks no longer need stop signals polled for them
+        task.add_done_callback(
+            lambda _task: self._forget_task(task_id, _task),
+        )
         logger.info(f"Task {task_id} registered")
 
+    def _forget_task(self, task_id: uuid.UUID, task: asyncio.Task) -> None:
+        task_info = self._tasks.get(task_id)
+        if task_info and task_info.task is task:
+            del self._tasks[task_id]
+
     async def stop_task(
         self,
         task_id: uuid.UUID,
@@ -120,12 +129,20 @@ class TaskManager:
         try:
             while True:
                 task_ids = list(self._tasks.keys())
-                for task_id in task_ids:
-                    stop_key = f"task_stop:{task_id}"
-                    if await redis_client.exists(stop_key):
-                        await self._stop_task(task_id)
-                        await redis_client.delete(stop_key)
-                        continue
+                if task_ids:
+                    # One round trip for all local tasks
+                    stop_keys = [
+                        f"task_stop:{task_id}" for task_id in task_ids
+                    ]
+                    signals = await redis_client.mget(stop_keys)
+                    for task_id, stop_key, signal in zip(
+                        task_ids,
+                        stop_keys,
+                        signals,
+                    ):
+                        if signal is not None:
+                            await self._stop_task(task_id)
+                            await redis_client.delete(stop_key)
 
                 await asyncio.sleep(1)
 
@@ -156,3 +156,15 @@ class BackgroundChatError(DisabledError):
     """Raised when background chat fails."""
 
     message = "Background chat disabled"
+
+
+class ChatStreamNotFoundError(NotFoundError):
+    """Raised when a chat stream does not exist or has expired."""
+
+    message = "Chat stream not found"
+
+
+class ChatResumeDisabledError(DisabledError):
+    """Raised when resuming chat streams is not enabled."""
+
+    message = "Resuming chat streams requires EVENT_MANAGER=redis"
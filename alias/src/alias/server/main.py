@@ -23,6 +23,7 @@ from alias.server.middleware.error_handler_middleware import (
 from alias.server.middleware.request_context_middleware import (
     RequestContextMiddleware,
 )
+from alias.server.core.persistence_writer import persistence_writer
 from alias.server.core.task_manager import task_manager
 
 
@@ -37,6 +38,7 @@ async def lifespan(_app: FastAPI):
     print("🚀 Starting Alias API Server...")
     await initialize_database()
     await task_manager.start()
+    await persistence_writer.start()
     await redis_client.ping()
 
     try:
@@ -47,6 +49,8 @@ async def lifespan(_app: FastAPI):
     yield
 
     await task_manager.stop()
+    # Written before the database is closed
+    await persistence_writer.stop()
     await close_database()
 
 
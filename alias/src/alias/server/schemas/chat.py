@@ -26,6 +26,11 @@ class LanguageType(str, Enum):
     EN_US = "en-US"
 
 
+class StreamFormat(str, Enum):
+    FULL = "full"
+    DELTA = "delta"
+
+
 class StopChatPayload(SQLModel):
     task_id: uuid.UUID
     conversation_id: uuid.UUID
@@ -42,6 +47,7 @@ class ChatRequest(SQLModel):
     language_type: Optional[LanguageType] = LanguageType.EN_US
     chat_mode: Optional[ChatMode] = ChatMode.GENERAL
     roadmap: Optional[RoadmapChange] = None
+    stream_format: Optional[StreamFormat] = StreamFormat.FULL
 
 
 class ContinueChatRequest(SQLModel):
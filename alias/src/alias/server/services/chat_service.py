@@ -15,16 +15,27 @@ from alias.server.core.event import (
     HeartBeatEvent,
     StopEvent,
 )
-from alias.server.core.event_manager import EventManager
+from alias.server.core.cache import Cache
+from alias.server.core.event_manager import (
+    RedisStreamEventManager,
+    create_event_manager,
+)
+from alias.server.core.event_manager.redis_stream_event_manager import (
+    is_stream_id,
+)
+from alias.server.core.persistence_writer import persistence_writer
 from alias.server.core.task_manager import task_manager
-from alias.server.exceptions.base import BaseError
-from alias.server.schemas.chat import ChatRequest
+from alias.server.exceptions.base import BaseError, IncorrectParameterError
+from alias.server.exceptions.service import (
+    ChatResumeDisabledError,
+    ChatStreamNotFoundError,
+)
+from alias.server.schemas.chat import ChatRequest, StreamFormat
 from alias.server.schemas.event import (
     MessageCreateEvent,
     MessageUpdateEvent,
     MessageFinishEvent,
     PlanCreateEvent,
-    StateCreateEvent,
 )
 
 from alias.server.schemas.message import MessageInfo
@@ -33,13 +44,32 @@ from alias.server.services.action_service import ActionService
 from alias.server.services.conversation_service import ConversationService
 from alias.server.services.message_service import MessageService
 from alias.server.services.session_service import SessionService
-from alias.server.services.plan_service import PlanService
-from alias.server.services.state_service import StateService
 from alias.server.db.init_db import session_scope
+from alias.server.utils.message_delta import MessageDeltaEncoder
 from alias.agent.run import arun_agents
 from alias.runtime.alias_sandbox import AliasSandbox
 
 
+def chat_session_key(task_id: uuid.UUID) -> str:
+    return f"chat_session:{task_id}"
+
+
+async def finish_task(session_service: SessionService) -> None:
+    """Record the end of a chat task and end its stream.
+
+    Everything the task submitted is written before its stop event, so a
+    client sees the task's output stored once its stream ends.
+    """
+    session_entity = session_service.session_entity
+    await ActionService().record_task_stop(
+        user_id=session_entity.user_id,
+        conversation_id=session_entity.conversation_id,
+        task_id=session_entity.task_id,
+    )
+    await persistence_writer.flush(session_entity.conversation_id)
+    await session_service.put_event(StopEvent())
+
+
 # pylint: disable=R0912
 async def run_agent_worker(
     session_service: SessionService,
@@ -63,14 +93,12 @@ async def run_agent_worker(
         await agent_task
 
         if session_service:
-            await session_service.put_event(StopEvent())
+            await finish_task(session_service)
 
     except asyncio.CancelledError:
         logger.info(f"Task {session_entity.task_id} cancelled")
         if session_service:
-            await session_service.put_event(
-                StopEvent(),
-            )
+            await finish_task(session_service)
         if agent_task and not agent_task.done():
             agent_task.cancel()
             try:
@@ -180,10 +208,17 @@ class ChatService:
             roadmap=roadmap,
         )
 
-        event_manager = EventManager(
+        event_manager = create_event_manager(
             task_id=task_id,
             user_id=user_id,
         )
+        if isinstance(event_manager, RedisStreamEventManager):
+            # Lets a reader on any worker resume the stream
+            await Cache().set(
+                chat_session_key(task_id),
+                session_entity,
+                ex=settings.EVENT_STREAM_TTL,
+            )
 
         session_service = SessionService(
             session_entity=session_entity,
@@ -202,14 +237,97 @@ class ChatService:
             user_id=user_id,
         )
 
-        return self.handle_chat_response(session_service=session_service)
+        return self.handle_chat_response(
+            session_service=session_service,
+            stream_format=chat_request.stream_format,
+        )
+
+    async def resume_chat(
+        self,
+        user_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        task_id: uuid.UUID,
+        last_event_id: Optional[str] = None,
+        stream_format: Optional[StreamFormat] = StreamFormat.FULL,
+    ):
+        """Stream a chat task's events after ``last_event_id`` from any
+        worker.
+
+        Args:
+            user_id: Id of the requesting user.
+            conversation_id: Conversation of the task.
+            task_id: Chat task to stream.
+            last_event_id: SSE ``Last-Event-ID`` of the last event the
+                client received; the stream is replayed from its start if
+                not given.
+            stream_format: Format of the streamed messages.
+
+        Returns:
+            The chat response generator.
+        """
+        if settings.EVENT_MANAGER != "redis":
+            raise ChatResumeDisabledError()
+        if last_event_id is not None and not is_stream_id(last_event_id):
+            raise IncorrectParameterError(
+                message=f"Invalid Last-Event-ID: {last_event_id}",
+            )
+
+        data = await Cache().get(chat_session_key(task_id))
+        session_entity = SessionEntity.model_validate(data) if data else None
+        if (
+            session_entity is None
+            or session_entity.user_id != user_id
+            or session_entity.conversation_id != conversation_id
+        ):
+            raise ChatStreamNotFoundError(extra_info={"task_id": task_id})
+
+        event_manager = create_event_manager(
+            task_id=task_id,
+            user_id=user_id,
+            last_event_id=last_event_id,
+        )
+        if not await event_manager.exists():
+            raise ChatStreamNotFoundError(extra_info={"task_id": task_id})
+
+        session_service = SessionService(
+            session_entity=session_entity,
+            event_manager=event_manager,
+        )
+        return self.handle_chat_response(
+            session_service=session_service,
+            stream_format=stream_format,
+        )
 
     # pylint: disable=R0915, R0913
     async def handle_chat_response(
         self,
         session_service: SessionService,
+        stream_format: Optional[StreamFormat] = StreamFormat.FULL,
     ):
+        """Yield the outputs of a chat task's events.
+
+        The agent worker persists the events when it publishes them, the
+        stream only delivers them.
+
+        Args:
+            session_service: Session service of the task.
+            stream_format: ``full`` sends every message update in full,
+                ``delta`` only what changed since the message's previous
+                frame (see ``alias.server.utils.message_delta``).
+        """
         session_entity = session_service.session_entity
+        event_manager = session_service.event_manager
+        encoder = (
+            MessageDeltaEncoder()
+            if stream_format == StreamFormat.DELTA
+            else None
+        )
+
+        def message_frames(message, snapshot: bool):
+            info = MessageInfo.model_validate(message).model_dump()
+            if encoder is None:
+                return [info]
+            return [encoder.encode(info, snapshot=snapshot)]
 
         async def convert_outputs(
             messages,
@@ -222,85 +340,54 @@ class ChatService:
             return outputs
 
         try:
-            async with session_scope() as session:
-                message_service = MessageService(session=session)
-                plan_service = PlanService(session=session)
-                state_service = StateService(session=session)
-                create_message_time = None
-
-                try:
-                    async for event in session_service.listen():
-                        messages = []
-                        roadmap = {}
-                        if isinstance(  # pylint: disable=R1720
-                            event,
-                            ErrorEvent,
-                        ):
-                            raise BaseError(
-                                code=event.code,
-                                message=event.message,
-                            )
-                        elif isinstance(event, StopEvent | None):
-                            action_service = ActionService()
-                            await action_service.record_task_stop(
-                                user_id=session_entity.user_id,
-                                conversation_id=session_entity.conversation_id,
-                                task_id=session_entity.task_id,
-                            )
-                            break
-                        elif isinstance(event, HeartBeatEvent):
-                            pass
-                        elif isinstance(event, MessageCreateEvent):
-                            message = event.message
-                            create_message_time = message.create_time
-                            messages = [
-                                MessageInfo.model_validate(
-                                    message,
-                                ).model_dump(),
-                            ]
-                        elif isinstance(event, MessageUpdateEvent):
-                            message = event.message
-                            if create_message_time:
-                                message.create_time = create_message_time
-                            messages = [
-                                MessageInfo.model_validate(
-                                    message,
-                                ).model_dump(),
-                            ]
-                        elif isinstance(event, MessageFinishEvent):
-                            message = event.message
-                            if create_message_time:
-                                message.create_time = create_message_time
-                            messages = [
-                                MessageInfo.model_validate(
-                                    message,
-                                ).model_dump(),
-                            ]
-                            await message_service.create(message)
-                        elif isinstance(event, PlanCreateEvent):
-                            plan = event.plan
-                            await plan_service.create_plan(
-                                conversation_id=plan.conversation_id,
-                                content=plan.content,
-                            )
-                            roadmap = plan.roadmap.model_dump()
-                        elif isinstance(event, StateCreateEvent):
-                            state = event.state
-                            await state_service.create_state(
-                                conversation_id=state.conversation_id,
-                                content=state.content,
-                            )
-                        output = await convert_outputs(
-                            messages=messages,
-                            roadmap=roadmap,
+            try:
+                async for event in session_service.listen():
+                    messages = []
+                    roadmap = {}
+                    if isinstance(  # pylint: disable=R1720
+                        event,
+                        ErrorEvent,
+                    ):
+                        raise BaseError(
+                            code=event.code,
+                            message=event.message,
+                        )
+                    elif isinstance(event, StopEvent | None):
+                        break
+                    elif isinstance(event, HeartBeatEvent):
+                        pass
+                    elif isinstance(event, MessageCreateEvent):
+                        messages = message_frames(
+                            event.message,
+                            snapshot=True,
+                        )
+                    elif isinstance(event, MessageUpdateEvent):
+                        messages = message_frames(
+                            event.message,
+                            snapshot=False,
                         )
-                        yield output
-                        logger.warning(
-                            f"conversation service yield outputs: {output}",
+                    elif isinstance(event, MessageFinishEvent):
+                        messages = message_frames(
+                            event.message,
+                            snapshot=True,
                         )
-                except BaseError as e:
-                    logger.error(f"{e}: {traceback.format_exc()}")
-                    raise e
+                        if encoder is not None:
+                            encoder.forget(event.message.id)
+                    elif isinstance(event, PlanCreateEvent):
+                        roadmap = event.plan.roadmap.model_dump()
+                    output = await convert_outputs(
+                        messages=messages,
+                        roadmap=roadmap,
+                    )
+                    if event_manager.last_event_id:
+                        output["event_id"] = event_manager.last_event_id
+                    yield output
+                    logger.warning(
+                        f"conversation service yield outputs: {output}",
+                    )
+            except BaseError as e:
+                logger.error(f"{e}: {traceback.format_exc()}")
+                raise e
         except Exception as e:
             logger.error(f"{e}: {traceback.format_exc()}")
             raise BaseError(code=500, message=str(e)) from e
@@ -5,12 +5,13 @@ import functools
 import json
 import uuid
 import time
-from typing import Any, List, Optional, AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from loguru import logger
 
 
 from alias.server.core.event import Event
-from alias.server.core.event_manager import EventManager
+from alias.server.core.event_manager import BaseEventManager
+from alias.server.core.persistence_writer import persistence_writer
 from alias.server.db.init_db import session_scope
 from alias.server.models.message import (
     BaseMessage,
@@ -60,16 +61,20 @@ class SessionService:
     def __init__(
         self,
         session_entity: SessionEntity,
-        event_manager: Optional[EventManager] = None,
+        event_manager: Optional[BaseEventManager] = None,
         sandbox: Optional[AliasSandbox] = None,
     ):
         self.session_entity = session_entity
         self.event_manager = event_manager
         self.sandbox = sandbox
+        # Creation time of the messages being streamed, by message id
+        self._create_times: Dict[uuid.UUID, str] = {}
 
     # State operations
     @log_time
     async def get_state(self) -> Optional[State]:
+        # Read what this task has submitted to the write-behind buffer
+        await persistence_writer.flush(self.session_entity.conversation_id)
         async with session_scope() as session:
             state = await StateService(session=session).get_state(
                 conversation_id=self.session_entity.conversation_id,
@@ -92,6 +97,7 @@ class SessionService:
     # Plan operations
     @log_time
     async def get_plan(self) -> Optional[Plan]:
+        await persistence_writer.flush(self.session_entity.conversation_id)
         async with session_scope() as session:
             return await PlanService(session=session).get_plan(
                 conversation_id=self.session_entity.conversation_id,
@@ -153,6 +159,7 @@ class SessionService:
 
     @log_time
     async def get_messages(self) -> List[Message]:
+        await persistence_writer.flush(self.session_entity.conversation_id)
         async with session_scope() as session:
             filters = {"conversation_id": self.session_entity.conversation_id}
             return await MessageService(session=session).paginate(
@@ -161,6 +168,25 @@ class SessionService:
 
     # Event operations
     async def put_event(self, event: Event) -> None:
+        """Persist (write-behind) and publish an event of the agent.
+
+        Events are persisted here rather than by the stream reader, so
+        the task's output is stored even when no client is listening.
+        """
+        if isinstance(event, MessageCreateEvent):
+            self._create_times[event.message.id] = event.message.create_time
+        elif isinstance(event, (MessageUpdateEvent, MessageFinishEvent)):
+            # A message keeps the creation time of its first frame
+            create_time = self._create_times.get(event.message.id)
+            if create_time:
+                event.message.create_time = create_time
+            if isinstance(event, MessageFinishEvent):
+                self._create_times.pop(event.message.id, None)
+                await persistence_writer.add_message(event.message)
+        elif isinstance(event, PlanCreateEvent):
+            await persistence_writer.add_plan(event.plan)
+        elif isinstance(event, StateCreateEvent):
+            await persistence_writer.add_state(event.state)
         await self.event_manager.put(event)
 
     async def listen(self) -> AsyncGenerator[Event, None]:
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Delta encoding of streamed chat messages.
+
+In the delta stream format a message is sent in full once (a snapshot
+frame) and every following update only carries what changed since the
+previous frame of that message:
+
+    {"id": ..., "frame": "snapshot", "seq": 1, <all MessageInfo fields>}
+    {"id": ..., "frame": "delta", "seq": 2,
+     "append": {"message.content": " world"},
+     "set": {"update_time": "..."}}
+
+``append`` maps a field path to text appended to that field and ``set``
+maps a field path to its new value (None when removed). Paths are
+top-level fields or ``message.<key>`` for keys of the message body.
+``seq`` counts the frames of one message; a delta applies on top of the
+frame with the previous ``seq``, and a client that lost track waits for
+the next snapshot, sent every ``STREAM_SNAPSHOT_INTERVAL`` frames and
+for the finished message.
+"""
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from alias.server.core.config import settings
+
+_MISSING = object()
+
+
+def _fields(info: Dict[str, Any], nested: bool) -> Iterator[Tuple[str, Any]]:
+    for key, value in info.items():
+        if key == "message" and nested:
+            for name, item in value.items():
+                yield f"message.{name}", item
+        else:
+            yield key, value
+
+
+def diff_message(
+    previous: Dict[str, Any],
+    current: Dict[str, Any],
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Changes between two dumps of a message.
+
+    Args:
+        previous: Message as sent in the previous frame.
+        current: Message to send.
+
+    Returns:
+        Text appended per field path, and the new value of every other
+        changed field path.
+    """
+    nested = isinstance(previous.get("message"), dict) and isinstance(
+        current.get("message"),
+        dict,
+    )
+    old_fields = dict(_fields(previous, nested))
+    new_fields = dict(_fields(current, nested))
+
+    append: Dict[str, str] = {}
+    changed: Dict[str, Any] = {}
+    for path, value in new_fields.items():
+        old = old_fields.get(path, _MISSING)
+        if old == value:
+            continue
+        if (
+            isinstance(old, str)
+            and isinstance(value, str)
+            and old
+            and value.startswith(old)
+        ):
+            append[path] = value[len(old) :]
+        else:
+            changed[path] = value
+    for path in old_fields.keys() - new_fields.keys():
+        changed[path] = None
+    return append, changed
+
+
+class MessageDeltaEncoder:
+    """Turns the successive states of streamed messages into snapshot and
+    delta frames, keeping the last frame sent per message."""
+
+    def __init__(self, snapshot_interval: int = 0):
+        """Initialize the encoder.
+
+        Args:
+            snapshot_interval: Frames of a message between full snapshots,
+                ``STREAM_SNAPSHOT_INTERVAL`` by default.
+        """
+        self.snapshot_interval = max(
+            1,
+            snapshot_interval or settings.STREAM_SNAPSHOT_INTERVAL,
+        )
+        # message id -> (seq, message as last sent)
+        self._sent: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def encode(
+        self,
+        info: Dict[str, Any],
+        snapshot: bool = False,
+    ) -> Dict[str, Any]:
+        """Encode the current state of a message.
+
+        Args:
+            info: ``MessageInfo`` dump of the message.
+            snapshot: Send the full message even if a delta is possible.
+
+        Returns:
+            The snapshot or delta frame.
+        """
+        message_id = str(info["id"])
+        seq, previous = self._sent.get(message_id, (0, None))
+        seq += 1
+        self._sent[message_id] = (seq, info)
+
+        if (
+            snapshot
+            or previous is None
+            or (seq - 1) % self.snapshot_interval == 0
+        ):
+            return {**info, "frame": "snapshot", "seq": seq}
+
+        append, changed = diff_message(previous, info)
+        frame: Dict[str, Any] = {
+            "id": info["id"],
+            "frame": "delta",
+            "seq": seq,
+        }
+        if append:
+            frame["append"] = append
+        if changed:
+            frame["set"] = changed
+        return frame
+
+    def forget(self, message_id: Optional[Any]) -> None:
+        """Drop the state of a message that will not be updated again."""
+        self._sent.pop(str(message_id), None)
@@ -11,12 +11,13 @@ from agentscope.message import Msg
 
 from ..config.constants import ANALYST_TYPES
 from ..utils.progress import progress
+from .prefetched_memory import PrefetchedMemoryMixin
 from .prompt_loader import PromptLoader
 
 _prompt_loader = PromptLoader()
 
 
-class AnalystAgent(ReActAgent):
+class AnalystAgent(PrefetchedMemoryMixin, ReActAgent):
     """
     Analyst Agent - Uses LLM for tool selection and analysis
     Inherits from AgentScope's ReActAgent
@@ -68,6 +69,9 @@ class AnalystAgent(ReActAgent):
             "toolkit": toolkit,
             "memory": InMemoryMemory(),
             "max_iters": 10,
+            # Tool calls of one reasoning step (e.g. one per ticker) run
+            # concurrently
+            "parallel_tool_calls": True,
         }
         if long_term_memory:
             kwargs["long_term_memory"] = long_term_memory
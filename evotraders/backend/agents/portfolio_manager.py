@@ -12,12 +12,13 @@ from agentscope.message import Msg, TextBlock
 from agentscope.tool import Toolkit, ToolResponse
 
 from ..utils.progress import progress
+from .prefetched_memory import PrefetchedMemoryMixin
 from .prompt_loader import PromptLoader
 
 _prompt_loader = PromptLoader()
 
 
-class PMAgent(ReActAgent):
+class PMAgent(PrefetchedMemoryMixin, ReActAgent):
     """
     Portfolio Manager Agent - Makes investment decisions
 
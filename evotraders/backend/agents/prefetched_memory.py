@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Prefetched long-term memory for ReActAgent subclasses
+
+In static_control mode ReActAgent queries its long-term memory on every
+reply, i.e. on every analysis, conference turn and prediction of a day.
+The pipeline instead retrieves once at the start of the day, in parallel
+with the data prefetch, and puts the result in short-term memory; agents
+with ``memory_prefetched`` set skip the per-reply retrieval.
+"""
+from typing import Any
+
+
+class PrefetchedMemoryMixin:
+    """Skips per-reply long-term memory retrieval after the day's prefetch"""
+
+    # Set by the pipeline after the day's retrieval, reset with the memory
+    memory_prefetched = False
+
+    async def _retrieve_from_long_term_memory(self, msg: Any) -> None:
+        if self.memory_prefetched:
+            return
+        await super()._retrieve_from_long_term_memory(msg)
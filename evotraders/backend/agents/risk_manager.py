@@ -11,12 +11,13 @@ from agentscope.message import Msg
 from agentscope.tool import Toolkit
 
 from ..utils.progress import progress
+from .prefetched_memory import PrefetchedMemoryMixin
 from .prompt_loader import PromptLoader
 
 _prompt_loader = PromptLoader()
 
 
-class RiskAgent(ReActAgent):
+class RiskAgent(PrefetchedMemoryMixin, ReActAgent):
     """
     Risk Manager Agent - Uses LLM for risk assessment
     Inherits from AgentScope's ReActAgent
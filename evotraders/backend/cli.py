@@ -325,6 +325,110 @@ def backtest(
         raise typer.Exit(1)
 
 
+@app.command()
+def sweep(
+    start: str = typer.Option(
+        ...,
+        "--start",
+        "-s",
+        help="Start date for backtest (YYYY-MM-DD)",
+    ),
+    end: str = typer.Option(
+        ...,
+        "--end",
+        "-e",
+        help="End date for backtest (YYYY-MM-DD)",
+    ),
+    shards: int = typer.Option(
+        1,
+        "--shards",
+        help="Split the date range into this many independent runs",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Worker processes (default: number of CPUs)",
+    ),
+    sweep_file: Optional[str] = typer.Option(
+        None,
+        "--sweep-file",
+        help="JSON list of configurations to compare",
+    ),
+    output_dir: str = typer.Option(
+        "sweeps/latest",
+        "--output-dir",
+        "-o",
+        help="Directory for run outputs and the merged report",
+    ),
+    llm_mode: Optional[str] = typer.Option(
+        None,
+        "--llm-mode",
+        help="'record' LLM responses or 'replay' recorded ones",
+    ),
+):
+    """
+    Run several independent backtests in parallel and merge the results.
+
+    Example:
+        evotraders sweep --start 2025-01-02 --end 2025-06-30 --shards 4
+        evotraders sweep -s 2025-01-02 -e 2025-03-31 --sweep-file sweep.json
+        evotraders sweep -s 2025-01-02 -e 2025-03-31 --llm-mode replay
+    """
+    console.print(
+        Panel.fit(
+            "[bold cyan]EvoTraders Backtest Sweep[/bold cyan]",
+            border_style="cyan",
+        ),
+    )
+
+    for value in (start, end):
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError as exc:
+            console.print("[red]✗ Invalid date format. Use YYYY-MM-DD[/red]")
+            raise typer.Exit(1) from exc
+
+    if llm_mode not in (None, "record", "replay"):
+        console.print("[red]✗ --llm-mode must be 'record' or 'replay'[/red]")
+        raise typer.Exit(1)
+
+    project_root = get_project_root()
+    os.chdir(project_root)
+    run_data_updater(project_root)
+
+    cmd = [
+        sys.executable,
+        "-u",
+        "-m",
+        "backend.core.backtest_runner",
+        "--start",
+        start,
+        "--end",
+        end,
+        "--shards",
+        str(shards),
+        "--output-dir",
+        output_dir,
+    ]
+    if workers:
+        cmd.extend(["--workers", str(workers)])
+    if sweep_file:
+        cmd.extend(["--sweep-file", sweep_file])
+    if llm_mode:
+        cmd.extend(["--llm-mode", llm_mode])
+
+    try:
+        subprocess.run(cmd, check=True)
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]Sweep stopped by user[/yellow]")
+    except subprocess.CalledProcessError as e:
+        console.print(
+            f"\n[red]Sweep failed with exit code {e.returncode}[/red]",
+        )
+        raise typer.Exit(1)
+
+
 @app.command()
 def live(
     mock: bool = typer.Option(
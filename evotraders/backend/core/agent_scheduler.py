@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Agent Scheduler - Bounded concurrent fan-out of independent agent calls
+
+Analysts work independently within a phase: the pipeline calls
+``reply()`` directly, so nothing one analyst says reaches another until
+the conference. Running them one after another therefore only adds up
+their LLM latencies. The scheduler runs them concurrently, bounded by a
+global limit and a per model provider limit so that one provider's rate
+limit is not exceeded.
+
+Results and completion callbacks are delivered in the order the agents
+were given, no matter which one finishes first, so StateSync events keep
+a stable order. Each callback fires as soon as it and every agent before
+it have finished.
+
+Per-agent latencies are recorded per phase; the slowest agent of a phase
+is its critical path.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.config.env_config import get_env_int
+from backend.llm.models import get_agent_model_info
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentTiming:
+    """Latency of one agent call within a phase"""
+
+    agent: str
+    provider: str
+    # Seconds spent waiting for a concurrency slot
+    queued: float
+    # Seconds spent in the call itself
+    latency: float
+
+
+def _agent_provider(agent: Any) -> str:
+    return get_agent_model_info(agent.name)[1]
+
+
+class AgentScheduler:
+    """Runs agent calls concurrently under global and per-provider limits"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        provider_fn: Callable[[Any], str] = _agent_provider,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            max_concurrency: Agents in flight at once (default:
+                AGENT_CONCURRENCY or 4); 1 runs agents sequentially
+            provider_limits: Agents in flight per model provider (default:
+                ``{PROVIDER}_LLM_CONCURRENCY`` or max_concurrency)
+            provider_fn: Maps an agent to its model provider
+        """
+        self.max_concurrency = max(
+            1,
+            max_concurrency or get_env_int("AGENT_CONCURRENCY", 4),
+        )
+        self.provider_limits = {
+            k.upper(): v for k, v in (provider_limits or {}).items()
+        }
+        self.provider_fn = provider_fn
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._providers: Dict[str, asyncio.Semaphore] = {}
+        self.timings: Dict[str, List[AgentTiming]] = {}
+        self.phase_wall: Dict[str, float] = {}
+
+    def _provider_semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._providers.get(provider)
+        if semaphore is None:
+            limit = self.provider_limits.get(provider) or get_env_int(
+                f"{provider}_LLM_CONCURRENCY",
+                self.max_concurrency,
+            )
+            semaphore = asyncio.Semaphore(max(1, limit))
+            self._providers[provider] = semaphore
+        return semaphore
+
+    async def _timed_call(
+        self,
+        phase: str,
+        agent: Any,
+        call: Callable[[Any], Awaitable[Any]],
+    ) -> Any:
+        provider = self.provider_fn(agent)
+        queued_at = time.perf_counter()
+        async with self._provider_semaphore(provider), self._global:
+            started = time.perf_counter()
+            try:
+                return await call(agent)
+            finally:
+                self.timings.setdefault(phase, []).append(
+                    AgentTiming(
+                        agent=agent.name,
+                        provider=provider,
+                        queued=started - queued_at,
+                        latency=time.perf_counter() - started,
+                    ),
+                )
+
+    async def run(
+        self,
+        phase: str,
+        agents: List[Any],
+        call: Callable[[Any], Awaitable[Any]],
+        on_complete: Optional[Callable[[Any, Any], Awaitable[None]]] = None,
+    ) -> List[Any]:
+        """
+        Run ``call(agent)`` for all agents concurrently
+
+        Args:
+            phase: Phase name the latencies are recorded under
+            agents: Agents to run
+            call: Coroutine function producing one agent's result
+            on_complete: Awaited with (agent, result) in agent order
+
+        Returns:
+            Results in agent order. The first failure cancels the agents
+            still running and is raised.
+        """
+        self.timings[phase] = []
+        phase_start = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._timed_call(phase, agent, call))
+            for agent in agents
+        ]
+
+        results = []
+        try:
+            for agent, task in zip(agents, tasks):
+                result = await task
+                results.append(result)
+                if on_complete:
+                    await on_complete(agent, result)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self.phase_wall[phase] = time.perf_counter() - phase_start
+
+        return results
+
+    def phase_report(self, phase: str) -> Dict[str, Any]:
+        """
+        Summarize one phase's latencies
+
+        Returns:
+            Wall time, summed agent latency (the sequential cost), the
+            slowest agent (the phase's critical path) and per-agent
+            latencies in seconds
+        """
+        timings = self.timings.get(phase, [])
+        slowest = max(timings, key=lambda t: t.latency, default=None)
+        return {
+            "wall": round(self.phase_wall.get(phase, 0.0), 3),
+            "sequential": round(sum(t.latency for t in timings), 3),
+            "critical_agent": slowest.agent if slowest else None,
+            "agents": {
+                t.agent: {
+                    "latency": round(t.latency, 3),
+                    "queued": round(t.queued, 3),
+                    "provider": t.provider,
+                }
+                for t in timings
+            },
+        }
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries of all phases run so far"""
+        return {phase: self.phase_report(phase) for phase in self.timings}
+
+    def reset(self):
+        """Forget recorded latencies, e.g. at the start of a trading day"""
+        self.timings.clear()
+        self.phase_wall.clear()
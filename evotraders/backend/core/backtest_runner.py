@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel Backtest Runner - Runs independent backtests across processes
+
+A sweep is a list of jobs: configurations (tickers, initial cash, model
+environment) optionally sharded into contiguous date ranges. Every job
+runs headless in its own worker process with its own TradingPipeline,
+StorageService directory and SettlementCoordinator, so jobs share no
+state. Results are merged into one report with a combined analyst
+leaderboard.
+
+A single portfolio path cannot be split across processes, because each
+day trades on the previous day's positions. Date shards are therefore
+independent runs that each start from the initial cash.
+
+Set ``llm_mode`` to "record" on a first run and "replay" afterwards to
+reuse the recorded LLM responses, which makes runs reproducible and
+comparable across configurations.
+
+Usage (from the evotraders directory):
+    python -m backend.core.backtest_runner --start 2025-01-02 \\
+        --end 2025-06-30 --shards 4 --workers 4 --llm-mode record
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from backend.config.env_config import get_env_float, get_env_int, get_env_list
+from backend.core.scheduler import BacktestScheduler
+from backend.utils.analyst_tracker import update_leaderboard_with_evaluations
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BacktestJob:
+    """One independent backtest run"""
+
+    name: str
+    start_date: str
+    end_date: str
+    tickers: List[str]
+    initial_cash: float = 100000.0
+    margin_requirement: float = 0.0
+    max_comm_cycles: int = 2
+    # Environment overrides, e.g. {"MODEL_NAME": "gpt-4o-mini"}
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+def shard_dates(dates: List[str], num_shards: int) -> List[List[str]]:
+    """Split trading dates into at most ``num_shards`` contiguous chunks"""
+    num_shards = max(1, min(num_shards, len(dates)))
+    size, extra = divmod(len(dates), num_shards)
+    shards = []
+    start = 0
+    for i in range(num_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(dates[start:end])
+        start = end
+    return [shard for shard in shards if shard]
+
+
+def build_jobs(
+    start_date: str,
+    end_date: str,
+    configs: List[Dict[str, Any]],
+    num_shards: int = 1,
+) -> List[BacktestJob]:
+    """
+    Expand configurations and date shards into jobs
+
+    Args:
+        start_date: Backtest start (YYYY-MM-DD)
+        end_date: Backtest end (YYYY-MM-DD)
+        configs: Sweep configurations, each with a ``name`` and any
+            BacktestJob fields except the dates
+        num_shards: Number of date shards per configuration
+
+    Returns:
+        One job per (configuration, shard)
+    """
+    dates = BacktestScheduler(
+        start_date=start_date,
+        end_date=end_date,
+        trading_calendar="NYSE",
+    ).get_trading_dates()
+    shards = shard_dates(dates, num_shards)
+
+    jobs = []
+    for config in configs:
+        for i, shard in enumerate(shards):
+            name = config["name"]
+            if len(shards) > 1:
+                name = f"{name}_shard{i + 1}"
+            jobs.append(
+                BacktestJob(
+                    **{
+                        **config,
+                        "name": name,
+                        "start_date": shard[0],
+                        "end_date": shard[-1],
+                    },
+                ),
+            )
+    return jobs
+
+
+def _get_market_caps(tickers: List[str], date: str) -> Dict[str, float]:
+    from backend.tools.data_tools import get_market_cap
+
+    market_caps = {}
+    for ticker in tickers:
+        try:
+            market_caps[ticker] = get_market_cap(ticker, date) or 1e9
+        except Exception:
+            market_caps[ticker] = 1e9
+    return market_caps
+
+
+async def _run_job(job: BacktestJob, run_dir: Path) -> Dict[str, Any]:
+    """Run all trading days of one job headless"""
+    from backend.data.historical_price_manager import HistoricalPriceManager
+    from backend.core.pipeline import TradingPipeline
+    from backend.main import create_agents
+    from backend.services.storage import StorageService
+    from backend.utils.settlement import SettlementCoordinator
+
+    storage = StorageService(
+        dashboard_dir=run_dir / "team_dashboard",
+        initial_cash=job.initial_cash,
+        config_name=str(run_dir),
+    )
+    storage.initialize_empty_dashboard()
+
+    analysts, risk_manager, pm, _ = create_agents(
+        config_name=str(run_dir),
+        initial_cash=job.initial_cash,
+        margin_requirement=job.margin_requirement,
+    )
+    pipeline = TradingPipeline(
+        analysts=analysts,
+        risk_manager=risk_manager,
+        portfolio_manager=pm,
+        settlement_coordinator=SettlementCoordinator(
+            storage=storage,
+            initial_capital=job.initial_cash,
+        ),
+        max_comm_cycles=job.max_comm_cycles,
+    )
+
+    price_manager = HistoricalPriceManager()
+    price_manager.subscribe(job.tickers)
+    price_manager.preload_data(job.start_date, job.end_date)
+
+    dates = BacktestScheduler(
+        start_date=job.start_date,
+        end_date=job.end_date,
+        trading_calendar="NYSE",
+    ).get_trading_dates()
+
+    try:
+        for i, date in enumerate(dates, 1):
+            logger.info(f"[{job.name}] [{i}/{len(dates)}] Processing {date}")
+            price_manager.set_date(date)
+            prices = {
+                t: price_manager.get_open_price(t) or 0.0 for t in job.tickers
+            }
+            close_prices = {
+                t: price_manager.get_close_price(t) or 0.0 for t in job.tickers
+            }
+
+            result = await pipeline.run_cycle(
+                tickers=job.tickers,
+                date=date,
+                prices=prices,
+                close_prices=close_prices,
+                market_caps=_get_market_caps(job.tickers, date),
+            )
+
+            settlement_result = result.get("settlement_result") or {}
+            if result.get("portfolio"):
+                storage.update_dashboard_after_cycle(
+                    portfolio=result["portfolio"],
+                    prices=close_prices,
+                    date=date,
+                    executed_trades=result.get("executed_trades", []),
+                    baseline_values=settlement_result.get("baseline_values"),
+                )
+    finally:
+        # A failed day must not lose the queued long-term memory writes
+        await pipeline.close()
+    return _job_report(job, storage, len(dates))
+
+
+def _job_report(job: BacktestJob, storage: Any, days: int) -> Dict[str, Any]:
+    """Summarize a finished job from its dashboard files"""
+    summary = storage.load_file("summary") or {}
+
+    def _return_pct(history: List[Dict[str, Any]]) -> Optional[float]:
+        if not history:
+            return None
+        return round((history[-1]["v"] / job.initial_cash - 1) * 100, 2)
+
+    return {
+        "name": job.name,
+        "start_date": job.start_date,
+        "end_date": job.end_date,
+        "days": days,
+        "tickers": job.tickers,
+        "initial_cash": job.initial_cash,
+        "env": job.env,
+        "final_value": summary.get("totalAssetValue", job.initial_cash),
+        "total_return": summary.get("totalReturn", 0.0),
+        "total_trades": summary.get("totalTrades", 0),
+        "baselines": {
+            "equal_weight": _return_pct(summary.get("baseline", [])),
+            "market_cap_weighted": _return_pct(
+                summary.get("baseline_vw", []),
+            ),
+            "momentum": _return_pct(summary.get("momentum", [])),
+        },
+        "leaderboard": storage.load_file("leaderboard") or [],
+        "error": None,
+    }
+
+
+def run_backtest_job(
+    job: BacktestJob,
+    output_dir: str,
+    llm_mode: Optional[str] = None,
+    llm_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Process pool entry point: run one job in the current process
+
+    Failures are reported in the result instead of raised, so one broken
+    configuration does not abort the sweep. The job's environment is
+    restored afterwards, as pool workers run several jobs.
+    """
+    environ = dict(os.environ)
+    os.environ.update(job.env)
+    if llm_mode:
+        os.environ["LLM_RESPONSE_MODE"] = llm_mode
+        if llm_dir:
+            os.environ["LLM_RESPONSE_DIR"] = llm_dir
+
+    run_dir = Path(output_dir) / job.name
+    try:
+        return asyncio.run(_run_job(job, run_dir))
+    except Exception as e:
+        logger.exception(f"Backtest job {job.name} failed")
+        return {**asdict(job), "error": f"{type(e).__name__}: {e}"}
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+
+
+def merge_reports(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge job results into one report
+
+    Runs are ranked by total return. Analyst bull/bear statistics are
+    summed across runs and win rates recomputed on the totals.
+    """
+    completed = [r for r in results if not r.get("error")]
+    runs = sorted(
+        completed,
+        key=lambda r: r.get("total_return", 0.0),
+        reverse=True,
+    )
+
+    leaderboard: List[Dict[str, Any]] = []
+    for result in runs:
+        entries = result.get("leaderboard", [])
+        if not leaderboard:
+            leaderboard = copy.deepcopy(entries)
+            for entry in leaderboard:
+                entry["bull"] = {"n": 0, "win": 0, "unknown": 0}
+                entry["bear"] = {"n": 0, "win": 0, "unknown": 0}
+                entry["winRate"] = None
+                entry["signals"] = []
+        evaluations = {
+            entry["agentId"]: {
+                side: {
+                    "n": entry.get(side, {}).get("n", 0),
+                    "win": entry.get(side, {}).get("win", 0),
+                    "unknown": entry.get(side, {}).get("unknown", 0),
+                }
+                for side in ("bull", "bear")
+            }
+            for entry in entries
+            if entry.get("agentId")
+        }
+        update_leaderboard_with_evaluations(leaderboard, evaluations)
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "runs": [
+            {
+                "rank": i + 1,
+                **{k: v for k, v in r.items() if k != "leaderboard"},
+            }
+            for i, r in enumerate(runs)
+        ],
+        "failed": [r for r in results if r.get("error")],
+        "leaderboard": leaderboard,
+    }
+
+
+def run_parallel_backtest(
+    jobs: List[BacktestJob],
+    output_dir: str,
+    max_workers: Optional[int] = None,
+    llm_mode: Optional[str] = None,
+    llm_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run jobs across a process pool and write the merged report
+
+    Args:
+        jobs: Jobs to run
+        output_dir: Root directory, each job writes to ``output_dir/name``
+        max_workers: Worker processes (default: BACKTEST_WORKERS or CPUs)
+        llm_mode: "record" or "replay" LLM responses, None for live calls
+        llm_dir: Shared directory for recorded LLM responses
+
+    Returns:
+        Merged report, also written to ``output_dir/report.json``
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    if llm_mode and not llm_dir:
+        llm_dir = str(output / "llm_responses")
+
+    max_workers = max_workers or get_env_int(
+        "BACKTEST_WORKERS",
+        os.cpu_count() or 1,
+    )
+    logger.info(
+        f"Running {len(jobs)} backtest jobs on {max_workers} workers "
+        f"(llm_mode={llm_mode or 'live'})",
+    )
+
+    # Spawn fresh interpreters: the pipeline runs its own event loop and
+    # threads, which do not survive a fork
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = [
+            executor.submit(
+                run_backtest_job,
+                job,
+                str(output),
+                llm_mode,
+                llm_dir,
+            )
+            for job in jobs
+        ]
+        results = [future.result() for future in futures]
+
+    report = merge_reports(results)
+    with open(output / "report.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+    logger.info(
+        f"Backtest sweep done: {len(report['runs'])} completed, "
+        f"{len(report['failed'])} failed, report at {output / 'report.json'}",
+    )
+    return report
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Parallel backtest sweep")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--output-dir", default="sweeps/latest")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument(
+        "--sweep-file",
+        help="JSON list of configurations (name, tickers, initial_cash, "
+        "env, ...); defaults to one configuration from the environment",
+    )
+    parser.add_argument("--llm-mode", choices=["record", "replay"])
+    parser.add_argument("--llm-dir")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.sweep_file:
+        with open(args.sweep_file, "r", encoding="utf-8") as f:
+            configs = json.load(f)
+    else:
+        configs = [
+            {
+                "name": "default",
+                "tickers": get_env_list("TICKERS", ["AAPL", "MSFT"]),
+                "initial_cash": get_env_float("INITIAL_CASH", 100000.0),
+                "margin_requirement": get_env_float(
+                    "MARGIN_REQUIREMENT",
+                    0.0,
+                ),
+                "max_comm_cycles": get_env_int("MAX_COMM_CYCLES", 2),
+            },
+        ]
+
+    jobs = build_jobs(args.start, args.end, configs, num_shards=args.shards)
+    report = run_parallel_backtest(
+        jobs,
+        output_dir=args.output_dir,
+        max_workers=args.workers,
+        llm_mode=args.llm_mode,
+        llm_dir=args.llm_dir,
+    )
+
+    for run in report["runs"]:
+        print(
+            f"{run['rank']:>3}. {run['name']:<30} "
+            f"{run['start_date']} -> {run['end_date']} "
+            f"return {run['total_return']:>7.2f}%",
+        )
+    for failed in report["failed"]:
+        print(f"  FAILED {failed['name']}: {failed['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Conference Transcript - Shared, compacted record of the conference discussion
+
+Each conference turn calls ``agent.reply()``, which does not broadcast
+to the MsgHub, so agents used to see only their own prompts and replies
+and never what the others said. The transcript keeps the discussion in
+one place and gives it to every agent, rendering each turn's prompt as
+
+    [brief]  [summary of earlier cycles]  [recent turns]  [instruction]
+
+Everything before the instruction only ever grows at the end between
+compactions, so an agent's prompt shares its prefix with its previous
+turn and provider-side prompt caching applies. Once the verbatim turns
+pass a token budget, the oldest cycles are folded into the summary one
+at a time, which bounds how much of the discussion each prompt carries.
+
+Token counts are estimates (about four characters per token), which is
+enough to compare cycles and runs without a tokenizer per provider.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.config.env_config import get_env_int
+
+logger = logging.getLogger(__name__)
+
+# Characters kept per turn by the default summarizer
+SUMMARY_CHARS_PER_TURN = 240
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)"""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def estimate_msgs_tokens(msgs: List[Any]) -> int:
+    """Rough token count of a list of Msg (text and tool blocks)"""
+    return sum(estimate_tokens(str(msg.content)) for msg in msgs)
+
+
+@dataclass
+class ConferenceTurn:
+    """One agent message of the conference"""
+
+    cycle: int
+    speaker: str
+    text: str
+
+    def render(self) -> str:
+        return f"{self.speaker}: {self.text}"
+
+
+Summarizer = Callable[[str, int, List[ConferenceTurn]], Awaitable[str]]
+
+
+async def extractive_summary(
+    summary: str,
+    cycle: int,
+    turns: List[ConferenceTurn],
+) -> str:
+    """
+    Fold one cycle into the summary by keeping the opening of each turn
+
+    Args:
+        summary: Summary of the cycles folded so far
+        cycle: Cycle being folded (0-based)
+        turns: Turns of that cycle
+
+    Returns:
+        Updated summary
+    """
+    lines = [summary] if summary else []
+    lines.append(f"Cycle {cycle + 1}:")
+    for turn in turns:
+        text = re.sub(r"\s+", " ", turn.text).strip()
+        if len(text) > SUMMARY_CHARS_PER_TURN:
+            text = text[:SUMMARY_CHARS_PER_TURN].rsplit(" ", 1)[0] + " ..."
+        lines.append(f"- {turn.speaker}: {text}")
+    return "\n".join(lines)
+
+
+class ConferenceTranscript:
+    """Conference record rendered into stable-prefix prompts"""
+
+    def __init__(
+        self,
+        header: str,
+        brief: str = "",
+        token_budget: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Args:
+            header: Opening line shown to every agent (date, tickers)
+            brief: Context only the chair (PM) sees, e.g. signals and risk
+            token_budget: Verbatim turn tokens kept before older cycles
+                are summarized (default: CONFERENCE_TOKEN_BUDGET or 2000)
+            summarizer: Folds one cycle into the running summary
+                (default: keep the opening of each turn)
+        """
+        self.header = header
+        self.brief = brief
+        self.token_budget = token_budget or get_env_int(
+            "CONFERENCE_TOKEN_BUDGET",
+            2000,
+        )
+        self.summarizer = summarizer or extractive_summary
+        self.turns: List[ConferenceTurn] = []
+        self.summary = ""
+        # Cycles folded into the summary so far
+        self.summarized_cycles = 0
+        self.usage: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, cycle: int, speaker: str, text: str):
+        """Append one agent message"""
+        self.turns.append(ConferenceTurn(cycle, speaker, text))
+
+    def verbatim_tokens(self) -> int:
+        return sum(estimate_tokens(turn.render()) for turn in self.turns)
+
+    async def compact(self, current_cycle: int):
+        """
+        Fold the oldest finished cycles into the summary while the
+        verbatim turns exceed the token budget
+
+        Args:
+            current_cycle: Cycle about to run; it and later ones stay verbatim
+        """
+        while (
+            self.summarized_cycles < current_cycle
+            and self.verbatim_tokens() > self.token_budget
+        ):
+            cycle = self.summarized_cycles
+            folded = [t for t in self.turns if t.cycle == cycle]
+            self.summary = await self.summarizer(self.summary, cycle, folded)
+            self.turns = [t for t in self.turns if t.cycle != cycle]
+            self.summarized_cycles += 1
+            logger.debug(
+                f"Conference cycle {cycle + 1} summarized "
+                f"({estimate_tokens(self.summary)} summary tokens)",
+            )
+
+    def render(self, instruction: str, include_brief: bool = False) -> str:
+        """
+        Prompt for one turn: the shared prefix followed by the instruction
+
+        Args:
+            instruction: What the agent should do this turn
+            include_brief: Whether to include the chair's brief
+        """
+        parts = [self.header]
+        if include_brief and self.brief:
+            parts.append(self.brief)
+        if self.summary:
+            parts.append(
+                f"=== Earlier Discussion (summary) ===\n{self.summary}",
+            )
+        if self.turns:
+            parts.append(
+                "=== Discussion ===\n"
+                + "\n\n".join(turn.render() for turn in self.turns),
+            )
+        parts.append(f"=== Your Turn ===\n{instruction}")
+        return "\n\n".join(parts)
+
+    def record_usage(
+        self,
+        cycle: int,
+        prompt_tokens: int,
+        completion_tokens: int,
+        seconds: float,
+    ):
+        """Add one turn's token counts and latency to its cycle"""
+        stats = self.usage.setdefault(
+            cycle,
+            {
+                "cycle": cycle + 1,
+                "turns": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "seconds": 0.0,
+            },
+        )
+        stats["turns"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        stats["seconds"] += seconds
+
+    def usage_report(self) -> List[Dict[str, Any]]:
+        """Per-cycle token counts and latency, in cycle order"""
+        return [self.usage[cycle] for cycle in sorted(self.usage)]
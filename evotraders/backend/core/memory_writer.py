@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Long-Term Memory Writer - Background, batched long-term memory recording
+
+Recording a trajectory to ReMe runs an LLM summarization and embedding
+per call. Awaited one agent after another at the end of a trading day,
+those writes delay the next day. The writer takes them off the critical
+path: the pipeline only enqueues trajectories (waiting only when the
+bounded queue is full), and a background task drains the queue, writing
+everything queued for one memory backend as one bulk request and all
+backends concurrently.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from agentscope.message import Msg
+
+from backend.config.env_config import get_env_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemoryRecord:
+    """One trajectory waiting to be written"""
+
+    agent: str
+    memory: Any
+    msgs: List[Msg]
+    score: float
+
+
+def _msg_text(msg: Msg) -> str:
+    """Text of a Msg as ReMe records it (text and thinking blocks)"""
+    if isinstance(msg.content, str):
+        return msg.content
+    if isinstance(msg.content, list):
+        parts = []
+        for block in msg.content:
+            if isinstance(block, dict) and "text" in block:
+                parts.append(block["text"])
+            elif isinstance(block, dict) and "thinking" in block:
+                parts.append(block["thinking"])
+        return "\n".join(parts)
+    return str(msg.content)
+
+
+def supports_batch(memory: Any) -> bool:
+    """Whether a memory takes many trajectories in one request (ReMe)"""
+    return (
+        getattr(memory, "app", None) is not None
+        and getattr(memory, "workspace_id", None) is not None
+    )
+
+
+async def record_batch(memory: Any, records: List[MemoryRecord]):
+    """
+    Write trajectories to one long-term memory backend
+
+    ReMe task memories take all trajectories in one summarization
+    request; other backends get one ``record`` call per trajectory.
+    """
+    if not supports_batch(memory):
+        for record in records:
+            await memory.record(msgs=record.msgs, score=record.score)
+        return
+
+    await memory.app.async_execute(
+        name="summary_task_memory",
+        workspace_id=memory.workspace_id,
+        trajectories=[
+            {
+                "messages": [
+                    {"role": msg.role, "content": _msg_text(msg)}
+                    for msg in record.msgs
+                    if msg is not None
+                ],
+                "score": record.score,
+            }
+            for record in records
+        ],
+    )
+
+
+class LongTermMemoryWriter:
+    """Bounded queue of trajectories written by one background task"""
+
+    def __init__(self, max_queue: Optional[int] = None):
+        """
+        Args:
+            max_queue: Trajectories queued before ``submit`` waits
+                (default: MEMORY_WRITE_QUEUE_SIZE or 64)
+        """
+        self.max_queue = max(
+            1,
+            max_queue or get_env_int("MEMORY_WRITE_QUEUE_SIZE", 64),
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.records = 0
+        self.batches = 0
+        self.failures = 0
+        self.write_seconds = 0.0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(),
+            )
+
+    async def submit(
+        self,
+        agent: str,
+        memory: Any,
+        msgs: List[Msg],
+        score: float,
+    ):
+        """Queue a trajectory, waiting only while the queue is full"""
+        self._ensure_started()
+        await self._queue.put(MemoryRecord(agent, memory, msgs, score))
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[MemoryRecord]):
+        by_memory: Dict[int, List[MemoryRecord]] = {}
+        for record in batch:
+            by_memory.setdefault(id(record.memory), []).append(record)
+
+        async def _write_group(records: List[MemoryRecord]):
+            agents = ", ".join(sorted({r.agent for r in records}))
+            try:
+                await record_batch(records[0].memory, records)
+                self.records += len(records)
+                logger.debug(
+                    f"Recorded {len(records)} trajectories to long-term "
+                    f"memory for {agents}",
+                )
+            except Exception as e:
+                self.failures += len(records)
+                logger.warning(
+                    f"Failed to record to long-term memory for {agents}: {e}",
+                )
+
+        async def _write_one(records: List[MemoryRecord]):
+            if supports_batch(records[0].memory):
+                await _write_group(records)
+                return
+            # One failed trajectory must not drop the others
+            for record in records:
+                await _write_group([record])
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(_write_one(records) for records in by_memory.values()),
+        )
+        self.batches += 1
+        self.write_seconds += time.perf_counter() - start
+
+    async def flush(self):
+        """Wait until every queued trajectory has been written"""
+        if self._queue is not None and self._task and not self._task.done():
+            await self._queue.join()
+
+    async def close(self):
+        """Flush and stop the background task"""
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since the writer was created"""
+        return {
+            "records": self.records,
+            "batches": self.batches,
+            "failures": self.failures,
+            "pending": self.pending,
+            "write_seconds": round(self.write_seconds, 3),
+        }
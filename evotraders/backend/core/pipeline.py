@@ -6,18 +6,31 @@ Core Pipeline - Orchestrates multi-agent analysis and decision-making
 # flake8: noqa: E501
 # pylint: disable=W0613,C0301
 
+import asyncio
+import inspect
 import json
 import logging
+from contextlib import contextmanager
 import os
 import re
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from agentscope.message import Msg
 from agentscope.pipeline import MsgHub
 
+from backend.core.agent_scheduler import AgentScheduler
+from backend.core.memory_writer import LongTermMemoryWriter
+from backend.core.conference import (
+    ConferenceTranscript,
+    estimate_msgs_tokens,
+    estimate_tokens,
+)
+from backend.llm.models import get_response_store
 from backend.utils.settlement import SettlementCoordinator
 from backend.utils.terminal_dashboard import get_dashboard
 from backend.core.state_sync import StateSync
+from backend.tools.data_prefetch import prefetch
 from backend.utils.trade_executor import PortfolioTradeExecutor
 
 
@@ -33,17 +46,34 @@ def _log(msg: str):
         logger.info(msg)
 
 
+async def _forget_msgs(memory: Any, msgs: List[Msg]):
+    """
+    Remove ``msgs`` from an agent memory
+
+    agentscope 1.0.12 and later delete by message id, earlier versions
+    by position in the memory.
+    """
+    if "msg_ids" in inspect.signature(memory.delete).parameters:
+        await memory.delete([msg.id for msg in msgs])
+        return
+    ids = {msg.id for msg in msgs}
+    content = await memory.get_memory()
+    await memory.delete([i for i, msg in enumerate(content) if msg.id in ids])
+
+
 class TradingPipeline:
     """
     Trading Pipeline - Orchestrates the complete trading cycle
 
     Flow:
-    1. Clear agent short-term memory (avoid cross-day context pollution)
-    2. Analysts analyze stocks
+    1. Clear agent short-term memory (avoid cross-day context pollution),
+       then prefetch market data and retrieve long-term memory in parallel
+    2. Analysts analyze stocks (concurrently, bounded by AgentScheduler)
     3. Risk Manager provides risk assessment
     4. PM makes decisions (direction + quantity)
     5. Execute trades with provided prices
-    6. Reflection phase: broadcast closing P&L, agents record to long-term memory
+    6. Reflection phase: broadcast closing P&L, queue trajectories for the
+       background long-term memory writer
 
     Real-time updates via StateSync after each agent completes.
     """
@@ -56,6 +86,9 @@ class TradingPipeline:
         state_sync: Optional["StateSync"] = None,
         settlement_coordinator: Optional[SettlementCoordinator] = None,
         max_comm_cycles: Optional[int] = None,
+        prefetch_data: bool = True,
+        scheduler: Optional[AgentScheduler] = None,
+        memory_writer: Optional[LongTermMemoryWriter] = None,
     ):
         self.analysts = analysts
         self.risk_manager = risk_manager
@@ -66,6 +99,18 @@ class TradingPipeline:
             os.getenv("MAX_COMM_CYCLES", "2"),
         )
         self.conference_summary = None  # Store latest conference summary
+        self.conference_transcript: Optional[ConferenceTranscript] = None
+        # agent name -> (memory position, conference prompts and replies),
+        # put back into the trajectories captured for long-term memory
+        self.conference_msgs: Dict[str, Tuple[int, List[Msg]]] = {}
+        self.prefetch_data = prefetch_data
+        # Bounded concurrent fan-out for the independent analyst phases
+        self.scheduler = scheduler or AgentScheduler()
+        self.phase_times: Dict[str, float] = {}
+        # Long-term memory: written in the background, retrieved once a day
+        self.memory_writer = memory_writer or LongTermMemoryWriter()
+        self.retrieved_memories: Dict[str, str] = {}
+        self.memory_times: Dict[str, float] = {}
 
     async def run_cycle(
         self,
@@ -101,11 +146,29 @@ class TradingPipeline:
         Each agent's result is broadcast immediately via StateSync.
         """
         _log(f"Starting cycle {date} - {len(tickers)} tickers")
+        self.scheduler.reset()
+        self.phase_times = {}
+        self.conference_transcript = None
+        self.conference_msgs = {}
+        self.memory_times = {}
+        memory_stats = self.memory_writer.stats()
+        response_stats = get_response_store().stats()
 
         # Phase 0: Clear short-term memory to avoid cross-day context pollution
         _log("Phase 0: Clearing memory")
         await self._clear_all_agent_memory()
 
+        # Phase 0.1: Warm the data cache for all tickers and retrieve the
+        # day's long-term memories before analysts run
+        _log("Phase 0.1: Prefetching market data and memories")
+        with self._timed_phase("prefetch"):
+            await asyncio.gather(
+                prefetch(tickers, end_date=date)
+                if self.prefetch_data
+                else asyncio.sleep(0),
+                self._prefetch_long_term_memory(tickers, date),
+            )
+
         participants = self.analysts + [self.risk_manager, self.pm]
 
         # Single MsgHub for entire cycle - no nesting
@@ -116,36 +179,44 @@ class TradingPipeline:
                 f"Starting analysis cycle for {date}. Tickers: {', '.join(tickers)}",
                 "system",
             ),
-        ):
+        ) as hub:
             # Phase 1.1: Analysts
             _log("Phase 1.1: Analyst analysis")
-            analyst_results = await self._run_analysts_with_sync(tickers, date)
+            with self._timed_phase("analysts"):
+                analyst_results = await self._run_analysts_with_sync(
+                    tickers,
+                    date,
+                )
 
             # Phase 1.2: Risk Manager
             _log("Phase 1.2: Risk assessment")
-            risk_assessment = await self._run_risk_manager_with_sync(
-                tickers,
-                date,
-                prices,
-            )
+            with self._timed_phase("risk_manager"):
+                risk_assessment = await self._run_risk_manager_with_sync(
+                    tickers,
+                    date,
+                    prices,
+                )
 
             # Phase 2.1: Conference discussion (within same MsgHub)
             _log("Phase 2.1: Conference discussion")
-            conference_summary = await self._run_conference_cycles(
-                tickers=tickers,
-                date=date,
-                prices=prices,
-                analyst_results=analyst_results,
-                risk_assessment=risk_assessment,
-            )
+            with self._timed_phase("conference"):
+                conference_summary = await self._run_conference_cycles(
+                    tickers=tickers,
+                    date=date,
+                    prices=prices,
+                    analyst_results=analyst_results,
+                    risk_assessment=risk_assessment,
+                    hub=hub,
+                )
             self.conference_summary = conference_summary
 
             # Phase 2.2: Analysts generate final structured predictions
             _log("Phase 2.2: Analysts generate final structured predictions")
-            final_predictions = await self._collect_final_predictions(
-                tickers,
-                date,
-            )
+            with self._timed_phase("final_predictions"):
+                final_predictions = await self._collect_final_predictions(
+                    tickers,
+                    date,
+                )
 
             # Record final predictions for leaderboard ranking
             if self.settlement_coordinator:
@@ -161,13 +232,14 @@ class TradingPipeline:
 
             # Phase 3: PM makes decisions
             _log("Phase 3.1: PM makes decisions")
-            pm_result = await self._run_pm_with_sync(
-                tickers,
-                date,
-                prices,
-                analyst_results,
-                risk_assessment,
-            )
+            with self._timed_phase("portfolio_manager"):
+                pm_result = await self._run_pm_with_sync(
+                    tickers,
+                    date,
+                    prices,
+                    analyst_results,
+                    risk_assessment,
+                )
 
         # Phase 4: Execute decisions
         _log("Phase 4: Executing trades")
@@ -202,18 +274,43 @@ class TradingPipeline:
                 )
             )
 
-            await self._run_reflection(
-                date=date,
-                agent_trajectories=agent_trajectories,
-                analyst_results=analyst_results,
-                decisions=decisions,
-                executed_trades=execution_result.get("executed_trades", []),
-                open_prices=prices,
-                close_prices=close_prices,
-                settlement_result=settlement_result,
-                conference_summary=self.conference_summary,
+            with self._timed_phase("reflection"):
+                await self._run_reflection(
+                    date=date,
+                    agent_trajectories=agent_trajectories,
+                    analyst_results=analyst_results,
+                    decisions=decisions,
+                    executed_trades=execution_result.get(
+                        "executed_trades",
+                        [],
+                    ),
+                    open_prices=prices,
+                    close_prices=close_prices,
+                    settlement_result=settlement_result,
+                    conference_summary=self.conference_summary,
+                )
+
+        if os.getenv("LLM_RESPONSE_MODE", "passthrough") != "passthrough":
+            # Counters of this cycle; the store is shared by every cycle
+            stats = get_response_store().stats()
+            replayed = stats["hits"] - response_stats["hits"]
+            recorded = stats["writes"] - response_stats["writes"]
+            _log(
+                f"LLM response store {date}: {replayed} replayed, "
+                f"{recorded} recorded",
+            )
+
+        memory = self._memory_report(memory_stats)
+        if self._memory_agents():
+            _log(
+                f"Long-term memory {date}: retrieval "
+                f"{memory['retrieve_seconds']:.1f}s, queueing "
+                f"{memory['enqueue_seconds']:.1f}s, background writes "
+                f"{memory['write_seconds']:.1f}s ({memory['pending']} pending)",
             )
 
+        timings = self.get_cycle_timings()
+        _log(f"Critical path {date}: {self._format_critical_path(timings)}")
         _log(f"Cycle complete: {date}")
 
         return {
@@ -223,8 +320,49 @@ class TradingPipeline:
             "executed_trades": execution_result.get("executed_trades", []),
             "portfolio": execution_result.get("portfolio", {}),
             "settlement_result": settlement_result,
+            "timings": timings,
+            "memory": memory,
+            "conference_usage": (
+                self.conference_transcript.usage_report()
+                if self.conference_transcript
+                else []
+            ),
         }
 
+    @contextmanager
+    def _timed_phase(self, phase: str):
+        """Record the wall time of a cycle phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] = time.perf_counter() - start
+
+    def get_cycle_timings(self) -> Dict[str, Any]:
+        """
+        Latency breakdown of the last cycle
+
+        Returns:
+            Wall seconds per phase, in the order the phases ran, plus
+            per-agent latencies of the concurrent analyst phases
+        """
+        return {
+            "phases": {k: round(v, 3) for k, v in self.phase_times.items()},
+            "agents": self.scheduler.report(),
+        }
+
+    def _format_critical_path(self, timings: Dict[str, Any]) -> str:
+        parts = []
+        for phase, seconds in timings["phases"].items():
+            part = f"{phase} {seconds:.1f}s"
+            agents = timings["agents"].get(phase)
+            if agents and agents["critical_agent"]:
+                slowest = agents["critical_agent"]
+                latency = agents["agents"][slowest]["latency"]
+                part += f" (slowest: {slowest} {latency:.1f}s)"
+            parts.append(part)
+        return " -> ".join(parts) or "no phases ran"
+
     async def _clear_all_agent_memory(self):
         """Clear short-term memory for all agents"""
         for analyst in self.analysts:
@@ -233,28 +371,129 @@ class TradingPipeline:
         await self.risk_manager.memory.clear()
         await self.pm.memory.clear()
 
+        # Yesterday's retrieval went with the short-term memory
+        self.retrieved_memories = {}
+        for agent in self._memory_agents():
+            agent.memory_prefetched = False
+
+    def _memory_agents(self) -> List[Any]:
+        """Agents with a long-term memory"""
+        agents = self.analysts + [self.risk_manager, self.pm]
+        return [
+            agent
+            for agent in agents
+            if getattr(agent, "long_term_memory", None) is not None
+        ]
+
+    async def _prefetch_long_term_memory(
+        self,
+        tickers: List[str],
+        date: str,
+    ) -> None:
+        """
+        Retrieve every agent's long-term memory for the day at once
+
+        Waits for the background writer first so that yesterday's
+        trajectories can be found. Retrieved memories go into short-term
+        memory; agents then skip retrieval on each reply. An agent whose
+        retrieval fails keeps retrieving per reply.
+        """
+        agents = [
+            agent
+            for agent in self._memory_agents()
+            if getattr(agent, "_static_control", False)
+        ]
+        if not agents:
+            return
+
+        start = time.perf_counter()
+        await self.memory_writer.flush()
+        self.memory_times["flush_wait"] = time.perf_counter() - start
+
+        query = self._build_analysis_msg(tickers, date)
+
+        async def _retrieve(agent: Any):
+            try:
+                retrieved = await agent.long_term_memory.retrieve(query)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to retrieve long-term memory for {agent.name}: {e}",
+                )
+                return
+            if retrieved:
+                self.retrieved_memories[agent.name] = retrieved
+                await agent.memory.add(
+                    Msg(
+                        name="long_term_memory",
+                        content="<long_term_memory>The content below are "
+                        "retrieved from long-term memory, which maybe "
+                        f"useful:\n{retrieved}</long_term_memory>",
+                        role="user",
+                    ),
+                )
+            agent.memory_prefetched = True
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_retrieve(agent) for agent in agents))
+        self.memory_times["retrieve"] = time.perf_counter() - start
+
+    def _memory_report(self, stats_before: Dict[str, Any]) -> Dict[str, Any]:
+        """Time spent in long-term memory operations during the cycle"""
+        stats = self.memory_writer.stats()
+        return {
+            "retrieved": len(self.retrieved_memories),
+            "flush_wait_seconds": round(
+                self.memory_times.get("flush_wait", 0.0),
+                3,
+            ),
+            "retrieve_seconds": round(
+                self.memory_times.get("retrieve", 0.0),
+                3,
+            ),
+            "enqueue_seconds": round(self.memory_times.get("enqueue", 0.0), 3),
+            # Background writes finished since the cycle started
+            "write_seconds": round(
+                stats["write_seconds"] - stats_before["write_seconds"],
+                3,
+            ),
+            "records_written": stats["records"] - stats_before["records"],
+            "pending": stats["pending"],
+        }
+
+    async def close(self):
+        """Finish queued long-term memory writes"""
+        await self.memory_writer.close()
+
     async def _sync_memory_if_retrieved(self, agent: Any) -> None:
         """
-        Check agent's short-term memory for retrieved long-term memory and sync to frontend.
+        Sync the long-term memory retrieved for an agent to the frontend
 
-        AgentScope's ReActAgent adds a Msg with name="long_term_memory" when
-        memory is retrieved in static_control mode.
+        Memories prefetched at the start of the day are synced directly.
+        Otherwise the agent's short-term memory is checked for the Msg with
+        name="long_term_memory" that ReActAgent adds in static_control mode.
         """
         if not self.state_sync:
             return
+        if getattr(agent, "long_term_memory", None) is None:
+            return
 
         try:
-            msgs = await agent.memory.get_memory()
-            for msg in msgs:
-                if getattr(msg, "name", None) == "long_term_memory":
-                    content = self._extract_text_content(msg.content)
-                    if content:
-                        parsed = self._parse_memory_content(content)
-                        await self.state_sync.on_memory_retrieved(
-                            agent_id=agent.name,
-                            content=parsed,
-                        )
-                    break  # Only sync the first (most recent) memory retrieval
+            content = self.retrieved_memories.get(agent.name)
+            if content is None and not getattr(
+                agent,
+                "memory_prefetched",
+                False,
+            ):
+                for msg in await agent.memory.get_memory():
+                    if getattr(msg, "name", None) == "long_term_memory":
+                        content = self._extract_text_content(msg.content)
+                        break  # Only sync the first (most recent) memory retrieval
+            if content:
+                parsed = self._parse_memory_content(content)
+                await self.state_sync.on_memory_retrieved(
+                    agent_id=agent.name,
+                    content=parsed,
+                )
         except Exception as e:
             logger.warning(f"Failed to sync memory for {agent.name}: {e}")
 
@@ -312,8 +551,9 @@ class TradingPipeline:
         for analyst in self.analysts:
             try:
                 msgs = await analyst.memory.get_memory()
+                msgs = self._with_conference_msgs(analyst.name, msgs)
                 if msgs:
-                    trajectories[analyst.name] = list(msgs)
+                    trajectories[analyst.name] = msgs
             except Exception as e:
                 logger.warning(
                     f"Failed to capture trajectory for {analyst.name}: {e}",
@@ -332,8 +572,9 @@ class TradingPipeline:
         # Capture PM trajectory
         try:
             msgs = await self.pm.memory.get_memory()
+            msgs = self._with_conference_msgs(self.pm.name, msgs)
             if msgs:
-                trajectories["portfolio_manager"] = list(msgs)
+                trajectories["portfolio_manager"] = msgs
         except Exception as e:
             logger.warning(
                 f"Failed to capture trajectory for portfolio_manager: {e}",
@@ -341,6 +582,12 @@ class TradingPipeline:
 
         return trajectories
 
+    def _with_conference_msgs(self, name: str, msgs: List[Msg]) -> List[Msg]:
+        """Put an agent's conference turns back into its trajectory"""
+        position, conference = self.conference_msgs.get(name, (0, []))
+        msgs = list(msgs)
+        return msgs[:position] + conference + msgs[position:]
+
     async def _run_reflection(
         self,
         date: str,
@@ -494,11 +741,13 @@ class TradingPipeline:
         score: float,
     ):
         """
-        Record execution trajectories to long-term memory for all agents
+        Queue execution trajectories for long-term memory for all agents
 
         This method records the actual execution trajectory (conversation history)
         from each agent's short-term memory. This allows the ReMe memory system
         to learn from the complete task execution flow, not just summaries.
+        Trajectories are written by the background memory writer, so the
+        next trading day does not wait for them.
 
         Args:
             date: Trading date
@@ -518,94 +767,47 @@ class TradingPipeline:
             name="system",
         )
 
-        # Record for analysts
-        for analyst in self.analysts:
-            if (
-                hasattr(analyst, "long_term_memory")
-                and analyst.long_term_memory is not None
-            ):
-                trajectory = agent_trajectories.get(analyst.name, [])
-                if trajectory:
-                    # Append outcome to trajectory
-                    trajectory_with_outcome = trajectory + [outcome_msg]
-                    try:
-                        await analyst.long_term_memory.record(
-                            msgs=trajectory_with_outcome,
-                            score=score,
-                        )
-                        logger.debug(
-                            f"Recorded {len(trajectory_with_outcome)} messages "
-                            f"to long-term memory for {analyst.name}",
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to record to long-term memory for {analyst.name}: {e}",
-                        )
-
-        # Record for risk manager
-        if (
-            hasattr(self.risk_manager, "long_term_memory")
-            and self.risk_manager.long_term_memory is not None
-        ):
-            trajectory = agent_trajectories.get("risk_manager", [])
-            if trajectory:
-                trajectory_with_outcome = trajectory + [outcome_msg]
-                try:
-                    await self.risk_manager.long_term_memory.record(
-                        msgs=trajectory_with_outcome,
-                        score=score,
-                    )
-                    logger.debug(
-                        f"Recorded {len(trajectory_with_outcome)} messages "
-                        f"to long-term memory for risk_manager",
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to record to long-term memory for risk_manager: {e}",
-                    )
+        # Build detailed outcome message for PM
+        pnl_details = []
+        for t in trade_pnl:
+            pnl_sign = "+" if t["pnl"] >= 0 else ""
+            pnl_details.append(
+                f"{t['ticker']}: {t['action']} {t['quantity']} @ "
+                f"${t['entry_price']:.2f} -> ${t['exit_price']:.2f}, "
+                f"P&L: {pnl_sign}${t['pnl']:.2f}",
+            )
 
-        # Record for PM with trade outcome details
-        if (
-            hasattr(self.pm, "long_term_memory")
-            and self.pm.long_term_memory is not None
-        ):
-            trajectory = agent_trajectories.get("portfolio_manager", [])
-            if trajectory:
-                # Build detailed outcome message for PM
-                pnl_details = []
-                for t in trade_pnl:
-                    pnl_sign = "+" if t["pnl"] >= 0 else ""
-                    pnl_details.append(
-                        f"{t['ticker']}: {t['action']} {t['quantity']} @ "
-                        f"${t['entry_price']:.2f} -> ${t['exit_price']:.2f}, "
-                        f"P&L: {pnl_sign}${t['pnl']:.2f}",
-                    )
+        pm_outcome_msg = Msg(
+            role="user",
+            content=f"[Outcome] Trading day {date}\n"
+            f"Total P&L: ${total_pnl:,.2f} "
+            f"({'Profitable' if total_pnl >= 0 else 'Loss'})\n"
+            f"Trade details:\n" + "\n".join(pnl_details)
+            if pnl_details
+            else f"[Outcome] Trading day {date}\n"
+            f"Total P&L: ${total_pnl:,.2f}\nNo trades executed.",
+            name="system",
+        )
 
-                pm_outcome_msg = Msg(
-                    role="user",
-                    content=f"[Outcome] Trading day {date}\n"
-                    f"Total P&L: ${total_pnl:,.2f} "
-                    f"({'Profitable' if total_pnl >= 0 else 'Loss'})\n"
-                    f"Trade details:\n" + "\n".join(pnl_details)
-                    if pnl_details
-                    else f"[Outcome] Trading day {date}\n"
-                    f"Total P&L: ${total_pnl:,.2f}\nNo trades executed.",
-                    name="system",
-                )
-                trajectory_with_outcome = trajectory + [pm_outcome_msg]
-                try:
-                    await self.pm.long_term_memory.record(
-                        msgs=trajectory_with_outcome,
-                        score=score,
-                    )
-                    logger.debug(
-                        f"Recorded {len(trajectory_with_outcome)} messages "
-                        f"to long-term memory for portfolio_manager",
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to record to long-term memory for portfolio_manager: {e}",
-                    )
+        # Trajectories are keyed by agent name; risk manager and PM by role
+        keys = {id(analyst): analyst.name for analyst in self.analysts}
+        keys[id(self.risk_manager)] = "risk_manager"
+        keys[id(self.pm)] = "portfolio_manager"
+
+        start = time.perf_counter()
+        for agent in self._memory_agents():
+            key = keys[id(agent)]
+            trajectory = agent_trajectories.get(key, [])
+            if not trajectory:
+                continue
+            outcome = pm_outcome_msg if agent is self.pm else outcome_msg
+            await self.memory_writer.submit(
+                agent=key,
+                memory=agent.long_term_memory,
+                msgs=trajectory + [outcome],
+                score=score,
+            )
+        self.memory_times["enqueue"] = time.perf_counter() - start
 
     async def _run_conference_cycles(
         self,
@@ -614,11 +816,16 @@ class TradingPipeline:
         prices: Optional[Dict[str, float]],
         analyst_results: List[Dict[str, Any]],
         risk_assessment: Dict[str, Any],
+        hub: Optional[MsgHub] = None,
     ) -> Optional[str]:
         """
         Run conference discussion cycles (within existing MsgHub context)
 
-        No nested MsgHub - this runs inside the main cycle's MsgHub.
+        No nested MsgHub - this runs inside the main cycle's MsgHub. Turns
+        call ``reply()``, which does not broadcast, so the discussion is
+        kept in one ConferenceTranscript and each turn gets it as a
+        stable-prefix prompt. Only the PM's closing summary is broadcast
+        to all participants.
 
         Returns:
             Conference summary string generated by PM
@@ -638,7 +845,17 @@ class TradingPipeline:
                 date=date,
             )
 
-        # Run discussion cycles (no new MsgHub - use parent's)
+        transcript = ConferenceTranscript(
+            header=f"=== {conference_title} ===\nTickers: {', '.join(tickers)}",
+            brief=self._build_conference_brief(
+                date=date,
+                prices=prices,
+                analyst_results=analyst_results,
+                risk_assessment=risk_assessment,
+            ),
+        )
+        self.conference_transcript = transcript
+
         for cycle in range(self.max_comm_cycles):
             _log(
                 "Phase 2.1: Conference discussion - "
@@ -651,21 +868,17 @@ class TradingPipeline:
                     total_cycles=self.max_comm_cycles,
                 )
 
+            await transcript.compact(cycle)
+
             # PM sets agenda or asks questions
-            pm_prompt = self._build_pm_discussion_prompt(
-                cycle=cycle,
-                tickers=tickers,
-                date=date,
-                prices=prices,
-                analyst_results=analyst_results,
-                risk_assessment=risk_assessment,
+            pm_content = await self._conference_turn(
+                self.pm,
+                transcript,
+                cycle,
+                self._build_pm_discussion_prompt(cycle, tickers),
+                include_brief=True,
             )
-
-            pm_msg = Msg(name="system", content=pm_prompt, role="user")
-            pm_response = await self.pm.reply(pm_msg)
-
             if self.state_sync:
-                pm_content = self._extract_text_content(pm_response.content)
                 await self.state_sync.on_conference_message(
                     agent_id="portfolio_manager",
                     content=pm_content,
@@ -673,23 +886,17 @@ class TradingPipeline:
 
             # Analysts share perspectives
             for analyst in self.analysts:
-                analyst_prompt = self._build_analyst_discussion_prompt(
-                    cycle=cycle,
-                    tickers=tickers,
-                    date=date,
+                analyst_content = await self._conference_turn(
+                    analyst,
+                    transcript,
+                    cycle,
+                    self._build_analyst_discussion_prompt(
+                        cycle=cycle,
+                        tickers=tickers,
+                        date=date,
+                    ),
                 )
-
-                analyst_msg = Msg(
-                    name="system",
-                    content=analyst_prompt,
-                    role="user",
-                )
-                analyst_response = await analyst.reply(analyst_msg)
-
                 if self.state_sync:
-                    analyst_content = self._extract_text_content(
-                        analyst_response.content,
-                    )
                     await self.state_sync.on_conference_message(
                         agent_id=analyst.name,
                         content=analyst_content,
@@ -700,21 +907,34 @@ class TradingPipeline:
                     cycle=cycle + 1,
                 )
 
+            usage = transcript.usage.get(cycle)
+            if usage:
+                _log(
+                    "Phase 2.1: Conference discussion - "
+                    f"Conference {cycle + 1} used ~{usage['prompt_tokens']} "
+                    f"prompt / ~{usage['completion_tokens']} completion "
+                    f"tokens in {usage['seconds']:.1f}s",
+                )
+
         # Generate conference summary by PM
         _log(
             "Phase 2.1: Conference discussion - Generating conference summary",
         )
+        await transcript.compact(self.max_comm_cycles)
         summary_prompt = (
             f"The conference discussion for {date} has concluded. "
             f"As Portfolio Manager, provide a concise summary of the key insights, "
             f"concerns, and consensus points discussed about {', '.join(tickers)}. "
             f"Highlight any critical factors that should be considered in the final decision-making."
         )
-        summary_msg = Msg(name="system", content=summary_prompt, role="user")
-        summary_response = await self.pm.reply(summary_msg)
-
-        conference_summary = self._extract_text_content(
-            summary_response.content,
+        conference_summary = await self._conference_turn(
+            self.pm,
+            transcript,
+            self.max_comm_cycles,
+            summary_prompt,
+            include_brief=True,
+            keep_reply=True,
+            hub=hub,
         )
 
         _log(
@@ -730,57 +950,128 @@ class TradingPipeline:
 
         return conference_summary
 
-    def _build_pm_discussion_prompt(
+    async def _conference_turn(
         self,
+        agent: Any,
+        transcript: ConferenceTranscript,
         cycle: int,
-        tickers: List[str],
+        instruction: str,
+        include_brief: bool = False,
+        keep_reply: bool = False,
+        hub: Optional[MsgHub] = None,
+    ) -> str:
+        """
+        Run one conference turn and add the reply to the transcript
+
+        The prompt and reply are removed from the agent's memory again,
+        the transcript is the only record of the discussion the agents
+        see. The instruction and reply are kept aside for the agent's
+        trajectory. With ``keep_reply`` the reply stays in the agent's
+        memory and is broadcast through ``hub``.
+
+        Returns:
+            Reply text
+        """
+        prompt = transcript.render(instruction, include_brief=include_brief)
+        memory = getattr(agent, "memory", None)
+        size_before = await memory.size() if memory else 0
+        prompt_tokens = estimate_tokens(prompt) + estimate_tokens(
+            getattr(agent, "sys_prompt", ""),
+        )
+        if memory:
+            prompt_tokens += estimate_msgs_tokens(await memory.get_memory())
+
+        start = time.perf_counter()
+        response = await agent.reply(
+            Msg(name="system", content=prompt, role="user"),
+        )
+        seconds = time.perf_counter() - start
+        content = self._extract_text_content(response.content)
+
+        if memory:
+            added = await memory.size() - size_before
+            if added > 0:
+                await _forget_msgs(
+                    memory,
+                    (await memory.get_memory())[-added:],
+                )
+            if keep_reply:
+                await memory.add(response)
+        _, conference = self.conference_msgs.setdefault(
+            agent.name,
+            (size_before, []),
+        )
+        conference.append(Msg(name="system", content=instruction, role="user"))
+        if not keep_reply:
+            conference.append(response)
+        if keep_reply and hub is not None:
+            for participant in hub.participants:
+                if participant is not agent:
+                    await participant.observe(response)
+
+        transcript.add(cycle, agent.name, content)
+        transcript.record_usage(
+            cycle,
+            prompt_tokens,
+            estimate_tokens(content),
+            seconds,
+        )
+        return content
+
+    def _build_conference_brief(
+        self,
         date: str,
         prices: Optional[Dict[str, float]],
         analyst_results: List[Dict[str, Any]],
         risk_assessment: Dict[str, Any],
     ) -> str:
-        """Build PM discussion prompt with full context"""
+        """Build the PM's conference context (portfolio, signals, risk)"""
         # Get current portfolio state
         portfolio = self.pm.get_portfolio_state()
 
-        if cycle == 0:
-            # First cycle: provide full context
-            context_lines = [
-                f"As Portfolio Manager, review the following information for {date}:",
-                "",
-                "=== Current Portfolio ===",
-                f"Cash: ${portfolio.get('cash', 0):,.2f}",
-                f"Positions: {json.dumps(portfolio.get('positions', {}), indent=2)}",
-                "",
-                "=== Current Prices ===",
-                json.dumps(prices, indent=2),
+        context_lines = [
+            f"As Portfolio Manager, review the following information for {date}:",
+            "",
+            "=== Current Portfolio ===",
+            f"Cash: ${portfolio.get('cash', 0):,.2f}",
+            f"Positions: {json.dumps(portfolio.get('positions', {}), indent=2)}",
+            "",
+            "=== Current Prices ===",
+            json.dumps(prices, indent=2),
+            "",
+            "=== Analyst Signals ===",
+        ]
+
+        # Add analyst results summary
+        for result in analyst_results:
+            agent_name = result.get("agent", "Unknown")
+            content = result.get("content", "")
+            context_lines.append(f"{agent_name}: {content}")
+
+        context_lines.extend(
+            [
                 "",
-                "=== Analyst Signals ===",
-            ]
-
-            # Add analyst results summary
-            for result in analyst_results:
-                agent_name = result.get("agent", "Unknown")
-                content = result.get("content", "")
-                context_lines.append(f"{agent_name}: {content}")
-
-            context_lines.extend(
-                [
-                    "",
-                    "=== Risk Assessment ===",
-                    str(risk_assessment.get("content", "")),
-                    "",
-                    "Based on the above context, share your key concerns or questions about the opportunities in "
-                    f"{', '.join(tickers)}. Do not make final decisions yet - this is a discussion phase.",
-                ],
-            )
+                "=== Risk Assessment ===",
+                str(risk_assessment.get("content", "")),
+            ],
+        )
+        return "\n".join(context_lines)
 
-            return "\n".join(context_lines)
-        else:
+    def _build_pm_discussion_prompt(
+        self,
+        cycle: int,
+        tickers: List[str],
+    ) -> str:
+        """Build PM discussion instruction"""
+        if cycle == 0:
             return (
-                f"Continue the discussion. Share your thoughts on the perspectives raised "
-                f"and any remaining concerns about {', '.join(tickers)}."
+                "Based on the above context, share your key concerns or questions about the opportunities in "
+                f"{', '.join(tickers)}. Do not make final decisions yet - this is a discussion phase."
             )
+        return (
+            f"Continue the discussion. Share your thoughts on the perspectives raised "
+            f"and any remaining concerns about {', '.join(tickers)}."
+        )
 
     def _build_analyst_discussion_prompt(
         self,
@@ -803,36 +1094,27 @@ class TradingPipeline:
         """
         Collect final predictions from all analysts as simple text responses.
         Analysts provide their predictions in plain text without tool calls.
+        Analysts are asked concurrently; results keep the analyst order.
         """
         _log(
             "Phase 2.2: Analysts generate final structured predictions\n"
             f"  Starting _collect_final_predictions for {len(self.analysts)} analysts",
         )
-        final_predictions = []
 
-        for i, analyst in enumerate(self.analysts):
-            _log(
-                "Phase 2.2: Analysts generate final structured predictions\n"
-                f"  Collecting prediction from analyst {i+1}/{len(self.analysts)}: {analyst.name}",
-            )
-
-            prompt = (
-                f"Based on your analysis, provide your final prediction for {date}. "
-                f"For each ticker ({', '.join(tickers)}), state: "
-                f"TICKER: UP/DOWN/NEUTRAL (confidence: X%). "
-                f"Do not use any tools, just respond with your predictions."
-            )
+        prompt = (
+            f"Based on your analysis, provide your final prediction for {date}. "
+            f"For each ticker ({', '.join(tickers)}), state: "
+            f"TICKER: UP/DOWN/NEUTRAL (confidence: X%). "
+            f"Do not use any tools, just respond with your predictions."
+        )
 
-            msg = Msg(name="system", content=prompt, role="user")
+        async def _predict(analyst: Any) -> Dict[str, Any]:
             _log(
                 "Phase 2.2: Analysts generate final structured predictions\n"
                 f"  Sending prediction request to {analyst.name}",
             )
+            msg = Msg(name="system", content=prompt, role="user")
             response = await analyst.reply(msg)
-            _log(
-                "Phase 2.2: Analysts generate final structured predictions\n"
-                f" Received response from {analyst.name}",
-            )
 
             # Parse predictions from text response
             content = self._extract_text_content(response.content)
@@ -846,21 +1128,17 @@ class TradingPipeline:
                 f"  {analyst.name} final predictions: {predictions_data}",
             )
 
-            final_predictions.append(
-                {
-                    "agent": analyst.name,
-                    "predictions": predictions_data,
-                    "raw_content": content,
-                },
-            )
-
-            # if self.state_sync:
-            #     await self.state_sync.on_agent_complete(
-            #         agent_id=f"{analyst.name}_final_prediction",
-            #         content=content,
-            #     )
+            return {
+                "agent": analyst.name,
+                "predictions": predictions_data,
+                "raw_content": content,
+            }
 
-        return final_predictions
+        return await self.scheduler.run(
+            "final_predictions",
+            self.analysts,
+            _predict,
+        )
 
     def _parse_predictions_from_text(
         self,
@@ -905,31 +1183,35 @@ class TradingPipeline:
 
         return predictions
 
+    def _build_analysis_msg(self, tickers: List[str], date: str) -> Msg:
+        content = (
+            f"Analyze the following stocks for date {date}: {', '.join(tickers)}. "
+            f"Provide investment signals with confidence scores and reasoning."
+        )
+
+        return Msg(
+            name="system",
+            content=content,
+            role="user",
+            metadata={"tickers": tickers, "date": date},
+        )
+
     async def _run_analysts_with_sync(
         self,
         tickers: List[str],
         date: str,
     ) -> List[Dict[str, Any]]:
-        """Run all analysts with real-time sync after each completion"""
-        results = []
-
-        for analyst in self.analysts:
-            content = (
-                f"Analyze the following stocks for date {date}: {', '.join(tickers)}. "
-                f"Provide investment signals with confidence scores and reasoning."
-            )
+        """
+        Run all analysts concurrently with real-time sync after each completion
 
-            msg = Msg(
-                name="system",
-                content=content,
-                role="user",
-                metadata={"tickers": tickers, "date": date},
-            )
+        Sync events are sent in analyst order: an analyst's result is
+        broadcast once it and all analysts before it have finished.
+        """
 
-            result = await analyst.reply(msg)
-            extracted = self._extract_result_from_msg(result)
-            results.append(extracted)
+        async def _analyze(analyst: Any) -> Msg:
+            return await analyst.reply(self._build_analysis_msg(tickers, date))
 
+        async def _on_complete(analyst: Any, result: Msg):
             # Sync retrieved memory first
             await self._sync_memory_if_retrieved(analyst)
 
@@ -941,7 +1223,13 @@ class TradingPipeline:
                     content=text_content,
                 )
 
-        return results
+        results = await self.scheduler.run(
+            "analysts",
+            self.analysts,
+            _analyze,
+            on_complete=_on_complete,
+        )
+        return [self._extract_result_from_msg(result) for result in results]
 
     async def _run_analysts(
         self,
@@ -949,25 +1237,12 @@ class TradingPipeline:
         date: str,
     ) -> List[Dict[str, Any]]:
         """Run all analysts (without sync, for backward compatibility)"""
-        results = []
-
-        for analyst in self.analysts:
-            content = (
-                f"Analyze the following stocks for date {date}: {', '.join(tickers)}. "
-                f"Provide investment signals with confidence scores and reasoning."
-            )
-
-            msg = Msg(
-                name="system",
-                content=content,
-                role="user",
-                metadata={"tickers": tickers, "date": date},
-            )
 
-            result = await analyst.reply(msg)
-            results.append(self._extract_result_from_msg(result))
+        async def _analyze(analyst: Any) -> Msg:
+            return await analyst.reply(self._build_analysis_msg(tickers, date))
 
-        return results
+        results = await self.scheduler.run("analysts", self.analysts, _analyze)
+        return [self._extract_result_from_msg(result) for result in results]
 
     async def _run_risk_manager_with_sync(
         self,
@@ -1144,37 +1419,22 @@ class TradingPipeline:
             initial_portfolio=self.pm.get_portfolio_state(),
         )
 
-        executed_trades = []
+        report = executor.execute_trades(decisions, prices or {}, date)
 
-        for ticker, decision in decisions.items():
-            action = decision.get("action", "hold")
-            quantity = decision.get("quantity", 0)
-
-            if action == "hold" or quantity == 0:
-                continue
-
-            price = prices.get(ticker)
-            if not price or price <= 0:
-                logger.warning(f"No price for {ticker}, skipping trade")
-                continue
-
-            result = executor.execute_trade(
-                ticker=ticker,
-                action=action,
-                quantity=quantity,
-                price=price,
-                current_date=date,
+        for failed in report["failed_trades"]:
+            logger.warning(
+                f"Skipped {failed['ticker']} trade: {failed['reason']}",
             )
 
-            if result.get("status") == "success":
-                executed_trades.append(
-                    {
-                        "ticker": ticker,
-                        "action": action,
-                        "quantity": quantity,
-                        "price": price,
-                    },
-                )
+        executed_trades = [
+            {
+                "ticker": trade["ticker"],
+                "action": trade["action"],
+                "quantity": trade["target_quantity"],
+                "price": trade["price"],
+            }
+            for trade in report["executed_trades"]
+        ]
 
         updated_portfolio = executor.portfolio.copy()
         self.pm.update_portfolio(updated_portfolio)
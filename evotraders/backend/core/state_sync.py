@@ -20,7 +20,7 @@ class StateSync:
 
     Responsibilities:
     1. Receive events from agents/pipeline
-    2. Persist to storage (feed_history)
+    2. Persist to storage (append to the feed log, periodic snapshots)
     3. Broadcast to frontend via WebSocket
     4. Support replay from saved state
     """
@@ -29,6 +29,7 @@ class StateSync:
         self,
         storage: StorageService,
         broadcast_fn: Optional[Callable] = None,
+        snapshot_interval: int = 50,
     ):
         """
         Initialize StateSync
@@ -36,9 +37,12 @@ class StateSync:
         Args:
             storage: Storage service for persistence
             broadcast_fn: Async broadcast function - async def broadcast(event: dict) # noqa: E501
+            snapshot_interval: Persisted events between state snapshots
         """
         self.storage = storage
         self._broadcast_fn = broadcast_fn
+        self.snapshot_interval = snapshot_interval
+        self._events_since_snapshot = 0
         self._state: Dict[str, Any] = {}
         self._enabled = True
         self._simulation_date: Optional[str] = None  # For backtest timestamps
@@ -70,8 +74,9 @@ class StateSync:
         )
 
     def save_state(self):
-        """Save current state to storage"""
+        """Save a snapshot of the current state to storage"""
         self.storage.save_server_state(self._state)
+        self._events_since_snapshot = 0
 
     @property
     def state(self) -> Dict[str, Any]:
@@ -104,10 +109,11 @@ class StateSync:
             else:
                 event["timestamp"] = datetime.now().isoformat()
 
-        # Persist to feed_history
-        if persist:
-            self.storage.add_feed_message(self._state, event)
-            self.save_state()
+        # Persist to the feed log, snapshot the rest of the state periodically
+        if persist and self.storage.add_feed_message(self._state, event):
+            self._events_since_snapshot += 1
+            if self._events_since_snapshot >= self.snapshot_interval:
+                self.save_state()
 
         # Broadcast to frontend
         if self._broadcast_fn:
@@ -363,40 +369,96 @@ class StateSync:
 
     # ========== Replay Support ==========
 
-    async def replay_feed_history(self, delay_ms: int = 100):
+    async def replay_feed_history(
+        self,
+        delay_ms: int = 100,
+        limit: Optional[int] = None,
+    ):
         """
-        Replay events from feed_history
+        Replay events from the feed log in chronological order
 
-        Useful for: frontend reconnection or restoring from saved state
+        Events are read lazily from disk, so long histories are never
+        loaded at once. Useful for: frontend reconnection or restoring
+        from saved state
+
+        Args:
+            delay_ms: Delay between events
+            limit: Number of newest events to replay
+                (default: storage.max_feed_history)
         """
-        feed_history = self._state.get("feed_history", [])
+        limit = limit or self.storage.max_feed_history
+        after_seq = max(0, self.storage.feed_log.last_seq - limit)
 
-        # feed_history is newest-first, need to reverse for chronological replay # noqa: E501
-        for event in reversed(feed_history):
+        count = 0
+        for event in self.storage.iter_feed(after_seq):
             if self._broadcast_fn:
                 await self._broadcast_fn(event)
+            count += 1
             await asyncio.sleep(delay_ms / 1000)
 
-        logger.info(f"Replayed {len(feed_history)} events")
+        logger.info(f"Replayed {count} events")
+
+    def get_feed_page(
+        self,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one page of older feed history for a client
+
+        Args:
+            before: Cursor from the initial state or the previous page
+            limit: Page size, at most max_feed_history
+
+        Returns:
+            Dict with events (newest first), next cursor and has_more
+
+        Raises:
+            ValueError: ``before`` or ``limit`` is not a valid integer
+        """
+        for name, value, lowest in (
+            ("before", before, 0),
+            ("limit", limit, 1),
+        ):
+            if value is not None and (
+                isinstance(value, bool)
+                or not isinstance(value, int)
+                or value < lowest
+            ):
+                raise ValueError(f"Invalid feed page {name}: {value!r}")
+        max_limit = self.storage.max_feed_history
+        return self.storage.load_feed_page(
+            before_seq=before,
+            limit=min(limit or max_limit, max_limit),
+        )
 
     def get_initial_state_payload(
         self,
         include_dashboard: bool = True,
+        feed_limit: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Build initial state payload for new client connections
 
+        Only the newest page of feed history is included; older pages
+        are fetched with ``get_feed_page`` starting at ``feed_cursor``.
+
         Args:
             include_dashboard: Whether to load dashboard files
+            feed_limit: Feed history page size
+                (default: storage.max_feed_history)
 
         Returns:
             Dictionary suitable for sending to frontend
         """
+        feed_page = self.get_feed_page(limit=feed_limit)
         payload = {
             "server_mode": self._state.get("server_mode", "live"),
             "is_mock_mode": self._state.get("is_mock_mode", False),
             "is_backtest": self._state.get("is_backtest", False),
-            "feed_history": self._state.get("feed_history", []),
+            "feed_history": feed_page["events"],
+            "feed_cursor": feed_page["before"],
+            "feed_has_more": feed_page["has_more"],
             "current_date": self._state.get("current_date"),
             "trading_days_total": self._state.get("trading_days_total", 0),
             "trading_days_completed": self._state.get(
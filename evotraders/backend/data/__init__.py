@@ -2,5 +2,12 @@
 from backend.data.historical_price_manager import HistoricalPriceManager
 from backend.data.mock_price_manager import MockPriceManager
 from backend.data.polling_price_manager import PollingPriceManager
+from backend.data.price_store import PricePanel, PriceStore
 
-__all__ = ["MockPriceManager", "PollingPriceManager", "HistoricalPriceManager"]
+__all__ = [
+    "MockPriceManager",
+    "PollingPriceManager",
+    "HistoricalPriceManager",
+    "PricePanel",
+    "PriceStore",
+]
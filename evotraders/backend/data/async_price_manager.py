@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Async Polling Price Manager - Concurrent Finnhub quote polling on asyncio
+
+Quotes are fetched over one pooled async HTTP client, many at a time
+under the shared Finnhub rate limiter, so a poll round takes about one
+round trip instead of one per symbol. Every symbol has its own cadence:
+a symbol whose price moved since its last quote is polled twice as often
+(down to ``min_interval``), a quiet one backs off towards
+``poll_interval``. Callbacks run on the event loop, so consumers can
+update loop state directly instead of hopping back from a thread.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from backend.config.env_config import get_env_float, get_env_int
+from backend.data.polling_price_manager import PollingPriceManager
+from backend.utils.rate_limiter import TokenBucket, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://finnhub.io/api/v1"
+
+
+class AsyncPollingPriceManager(PollingPriceManager):
+    """Price manager polling Finnhub quotes concurrently on the event loop"""
+
+    def __init__(
+        self,
+        api_key: str,
+        poll_interval: int = 30,
+        min_interval: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        hot_move_pct: Optional[float] = None,
+        base_url: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None,
+        max_retries: int = 2,
+    ):
+        """
+        Args:
+            api_key: Finnhub API Key
+            poll_interval: Slowest polling interval per symbol in seconds
+            min_interval: Fastest polling interval of a moving symbol
+                (default: QUOTE_MIN_INTERVAL or poll_interval / 6)
+            concurrency: Quote requests in flight at once
+                (default: QUOTE_CONCURRENCY or 8)
+            hot_move_pct: Price move (%) between two quotes that makes a
+                symbol hot (default: QUOTE_HOT_MOVE_PCT or 0.05)
+            base_url: Quote API root (default: FINNHUB_BASE_URL or Finnhub)
+            limiter: Rate limiter (default: the shared Finnhub limiter)
+            max_retries: Retries of a quote answered with 429
+        """
+        super().__init__(api_key=api_key, poll_interval=poll_interval)
+        self.min_interval = min(
+            poll_interval,
+            min_interval
+            or get_env_float("QUOTE_MIN_INTERVAL", poll_interval / 6),
+        )
+        self.concurrency = max(
+            1,
+            concurrency or get_env_int("QUOTE_CONCURRENCY", 8),
+        )
+        self.hot_move_pct = (
+            hot_move_pct
+            if hot_move_pct is not None
+            else get_env_float("QUOTE_HOT_MOVE_PCT", 0.05)
+        )
+        self.base_url = (
+            base_url or os.getenv("FINNHUB_BASE_URL") or DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.limiter = limiter or get_rate_limiter("finnhub")
+        self.max_retries = max_retries
+
+        self.intervals: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.requests = 0
+        self.errors = 0
+
+    def subscribe(self, symbols: List[str]):
+        """Subscribe to stock symbols, polling new ones right away"""
+        super().subscribe(symbols)
+        for symbol in symbols:
+            self.intervals.setdefault(symbol, float(self.poll_interval))
+            self._next_due.setdefault(symbol, 0.0)
+        if self._wakeup:
+            self._wakeup.set()
+
+    def unsubscribe(self, symbols: List[str]):
+        """Unsubscribe from symbols"""
+        super().unsubscribe(symbols)
+        for symbol in symbols:
+            self.intervals.pop(symbol, None)
+            self._next_due.pop(symbol, None)
+
+    async def _fetch_quote(
+        self,
+        client: httpx.AsyncClient,
+        symbol: str,
+    ) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire_async()
+            self.requests += 1
+            response = await client.get("/quote", params={"symbol": symbol})
+            if response.status_code == 429 and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After", "")
+                delay = (
+                    float(retry_after)
+                    if retry_after.isdigit()
+                    else float(self.poll_interval)
+                )
+                logger.warning(
+                    f"Quote rate limited (429), pausing quotes for {delay}s",
+                )
+                self.limiter.pause(delay)
+                continue
+            response.raise_for_status()
+            return response.json()
+        return {}
+
+    def _reschedule(
+        self,
+        symbol: str,
+        previous: Optional[float],
+        price: Optional[float],
+    ):
+        """Halve the interval of a moving symbol, stretch a quiet one"""
+        interval = self.intervals.get(symbol, float(self.poll_interval))
+        moved = (
+            previous
+            and price
+            and abs(price - previous) / previous * 100 >= self.hot_move_pct
+        )
+        if moved:
+            interval = max(self.min_interval, interval / 2)
+        else:
+            interval = min(float(self.poll_interval), interval * 1.5)
+        self.intervals[symbol] = interval
+        if symbol in self._next_due:
+            self._next_due[symbol] = time.monotonic() + interval
+
+    async def _poll_symbol(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+    ):
+        previous = self.latest_prices.get(symbol)
+        price_data = None
+        try:
+            async with semaphore:
+                quote_data = await self._fetch_quote(client, symbol)
+            price_data = self._process_quote(symbol, quote_data)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to fetch {symbol} price: {e}")
+
+        self._reschedule(
+            symbol,
+            previous,
+            price_data["price"] if price_data else None,
+        )
+        if price_data:
+            self._notify(price_data)
+        self._wakeup.set()
+
+    async def _polling_loop_async(self):
+        logger.info(
+            f"Price polling started (interval: {self.min_interval:g}-"
+            f"{self.poll_interval}s, concurrency: {self.concurrency})",
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency,
+        )
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-Finnhub-Token": self.api_key},
+            limits=limits,
+            timeout=max(5.0, float(self.poll_interval)),
+        ) as client:
+            try:
+                while self.running:
+                    self._wakeup.clear()
+                    now = time.monotonic()
+                    for symbol in list(self.subscribed_symbols):
+                        if self._next_due.get(symbol, now) > now:
+                            continue
+                        # Not due again until this poll reschedules it
+                        self._next_due[symbol] = float("inf")
+                        task = asyncio.create_task(
+                            self._poll_symbol(client, semaphore, symbol),
+                        )
+                        self._inflight.add(task)
+                        task.add_done_callback(self._inflight.discard)
+
+                    next_due = min(self._next_due.values(), default=now)
+                    timeout = min(
+                        max(next_due - time.monotonic(), 0.01),
+                        float(self.poll_interval),
+                    )
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                for task in list(self._inflight):
+                    task.cancel()
+                if self._inflight:
+                    await asyncio.gather(
+                        *self._inflight,
+                        return_exceptions=True,
+                    )
+
+    def start(self):
+        """Start price polling on the running event loop"""
+        if self.running:
+            logger.warning("Price polling already running")
+            return
+
+        if not self.subscribed_symbols:
+            logger.warning("No stocks subscribed")
+            return
+
+        self.running = True
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(
+            self._polling_loop_async(),
+        )
+
+        logger.info(
+            f"Price polling started: {', '.join(self.subscribed_symbols)}",
+        )
+
+    def stop(self):
+        """Stop price polling"""
+        self.running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        logger.info("Price polling stopped")
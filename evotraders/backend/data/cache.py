@@ -1,107 +1,436 @@
 # -*- coding: utf-8 -*-
+"""
+Persistent cache for API responses.
+
+Backed by a single SQLite file so cached data survives restarts. Two
+kinds of entries are stored:
+
+- Dated series (prices, insider trades, company news): individual records
+  plus the date ranges that have been fetched for each ticker. Any
+  sub-range of a covered range is served locally and only the missing
+  gaps need to be fetched. Overlapping and adjacent ranges are merged,
+  so a ticker keeps a few coverage rows however often it is extended.
+- Exact responses (financial metrics, line items, and series queries
+  that cannot be range-served): stored under their full query key.
+
+Entries expire after a per-kind TTL, and the least recently fetched
+tickers are evicted once the payload size exceeds ``max_bytes``.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from typing_extensions import Any
 
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = Path(__file__).parent / "ret_data" / "api_cache.sqlite"
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Historical bars never change; fundamentals and news are refreshed daily
+DEFAULT_TTLS = {
+    "prices": 30 * DAY_SECONDS,
+    "insider_trades": DAY_SECONDS,
+    "company_news": DAY_SECONDS,
+    "financial_metrics": DAY_SECONDS,
+    "line_items": DAY_SECONDS,
+}
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Run eviction after this many writes
+_EVICT_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    kind TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (kind, ticker, source, record_key)
+);
+CREATE INDEX IF NOT EXISTS idx_records_date
+    ON records (kind, ticker, source, date);
+CREATE TABLE IF NOT EXISTS coverage (
+    kind TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    source TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_coverage_series
+    ON coverage (kind, ticker, source);
+CREATE TABLE IF NOT EXISTS responses (
+    kind TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (kind, cache_key)
+);
+"""
+
+
+def _shift_date(date: str, days: int) -> str:
+    dt = datetime.strptime(date[:10], "%Y-%m-%d") + timedelta(days=days)
+    return dt.strftime("%Y-%m-%d")
+
+
+def _subtract_ranges(
+    start_date: str,
+    end_date: str,
+    covered: List[Tuple[str, str]],
+) -> List[Tuple[str, str]]:
+    """Return the parts of [start_date, end_date] not in ``covered``"""
+    gaps = []
+    cursor = start_date
+    for cov_start, cov_end in sorted(covered):
+        if cov_end < cursor:
+            continue
+        if cov_start > end_date:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, _shift_date(cov_start, -1)))
+        cursor = max(cursor, _shift_date(cov_end, 1))
+        if cursor > end_date:
+            return gaps
+    if cursor <= end_date:
+        gaps.append((cursor, end_date))
+    return gaps
+
 
 class Cache:
-    """In-memory cache for API responses."""
+    """Disk-backed, range-aware cache for API responses."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.path = str(path or _DEFAULT_PATH)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _expiry(self, kind: str) -> float:
+        return time.time() - self.ttls.get(kind, DAY_SECONDS)
+
+    # ---------------------------------------------------------------
+    # Dated series
+    # ---------------------------------------------------------------
+
+    def get_missing_ranges(
+        self,
+        kind: str,
+        ticker: str,
+        source: str,
+        start_date: str,
+        end_date: str,
+    ) -> List[Tuple[str, str]]:
+        """Sub-ranges of [start_date, end_date] that still need fetching"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage "
+                "WHERE kind = ? AND ticker = ? AND source = ? "
+                "AND fetched_at >= ? AND end_date >= ? AND start_date <= ?",
+                (
+                    kind,
+                    ticker,
+                    source,
+                    self._expiry(kind),
+                    start_date,
+                    end_date,
+                ),
+            ).fetchall()
+        return _subtract_ranges(start_date, end_date, rows)
+
+    def get_range(
+        self,
+        kind: str,
+        ticker: str,
+        source: str,
+        start_date: str,
+        end_date: str,
+    ) -> list[dict[str, Any]]:
+        """Cached records dated within [start_date, end_date], oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM records "
+                "WHERE kind = ? AND ticker = ? AND source = ? "
+                "AND date >= ? AND date <= ? ORDER BY date",
+                (kind, ticker, source, start_date, end_date),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
 
-    def __init__(self):
-        self._prices_cache = {}
-        self._financial_metrics_cache = {}
-        self._line_items_cache = {}
-        self._insider_trades_cache = {}
-        self._company_news_cache = {}
+    def set_range(
+        self,
+        kind: str,
+        ticker: str,
+        source: str,
+        start_date: str,
+        end_date: str,
+        data: list[dict[str, Any]],
+        date_field: str,
+        key_fields: Tuple[str, ...],
+    ):
+        """
+        Store records fetched for [start_date, end_date].
+
+        The fetch is authoritative for its range: records cached earlier
+        with a date in the range are replaced. Coverage is only recorded
+        up to yesterday, since today's data may still change; today's
+        records are stored but refetched next time. The new coverage is
+        merged with the unexpired ranges it overlaps or touches; the
+        merged range keeps the oldest fetch time of its parts.
+        """
+        rows = []
+        for item in data:
+            date = (item.get(date_field) or end_date)[:10]
+            record_key = "|".join(str(item.get(f)) for f in key_fields)
+            rows.append(
+                (kind, ticker, source, date, record_key, json.dumps(item)),
+            )
+
+        yesterday = _shift_date(datetime.now().strftime("%Y-%m-%d"), -1)
+        covered_end = min(end_date, yesterday)
 
-    def _merge_data(
+        series = (kind, ticker, source)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM records "
+                    "WHERE kind = ? AND ticker = ? AND source = ? "
+                    "AND date >= ? AND date <= ?",
+                    (*series, start_date, end_date),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records "
+                    "(kind, ticker, source, date, record_key, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                if start_date <= covered_end:
+                    self._add_coverage_locked(
+                        series,
+                        start_date,
+                        covered_end,
+                    )
+            self._after_write()
+
+    def _add_coverage_locked(
         self,
-        existing: list[dict] | None,
-        new_data: list[dict],
-        key_field: str,
-    ) -> list[dict]:
-        """Merge existing and new data"""
-        if not existing:
-            return new_data
-
-        # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
-
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend(
-            [
-                item
-                for item in new_data
-                if item[key_field] not in existing_keys
-            ],
+        series: Tuple[str, str, str],
+        start_date: str,
+        end_date: str,
+    ):
+        """Record [start_date, end_date] as covered, merging neighbours"""
+        fetched_at = time.time()
+        kind = series[0]
+        neighbours = self._conn.execute(
+            "SELECT rowid, start_date, end_date, fetched_at FROM coverage "
+            "WHERE kind = ? AND ticker = ? AND source = ? "
+            "AND fetched_at >= ? AND end_date >= ? AND start_date <= ?",
+            (
+                *series,
+                self._expiry(kind),
+                _shift_date(start_date, -1),
+                _shift_date(end_date, 1),
+            ),
+        ).fetchall()
+        for _, row_start, row_end, row_fetched_at in neighbours:
+            start_date = min(start_date, row_start)
+            end_date = max(end_date, row_end)
+            fetched_at = min(fetched_at, row_fetched_at)
+        self._conn.executemany(
+            "DELETE FROM coverage WHERE rowid = ?",
+            [(rowid,) for rowid, *_ in neighbours],
         )
-        return merged
-
-    def get_prices(self, ticker: str) -> list[dict[str, Any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
-
-    def set_prices(self, ticker: str, data: list[dict[str, Any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(
-            self._prices_cache.get(ticker),
-            data,
-            key_field="time",
+        self._conn.execute(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?)",
+            (*series, start_date, end_date, fetched_at),
         )
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, Any]]:
+    # ---------------------------------------------------------------
+    # Exact responses
+    # ---------------------------------------------------------------
+
+    def get_response(
+        self,
+        kind: str,
+        cache_key: str,
+    ) -> list[dict[str, Any]] | None:
+        """Get a cached response stored under its full query key"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM responses "
+                "WHERE kind = ? AND cache_key = ? AND fetched_at >= ?",
+                (kind, cache_key, self._expiry(kind)),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_response(
+        self,
+        kind: str,
+        cache_key: str,
+        data: list[dict[str, Any]],
+    ):
+        """Store a response under its full query key"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (kind, cache_key, json.dumps(data), time.time()),
+                )
+            self._after_write()
+
+    def get_financial_metrics(self, cache_key: str) -> list[dict[str, Any]]:
         """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
-
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, Any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(
-            self._financial_metrics_cache.get(ticker),
-            data,
-            key_field="report_period",
-        )
+        return self.get_response("financial_metrics", cache_key)
+
+    def set_financial_metrics(
+        self,
+        cache_key: str,
+        data: list[dict[str, Any]],
+    ):
+        """Cache financial metrics."""
+        self.set_response("financial_metrics", cache_key, data)
 
-    def get_line_items(self, ticker: str) -> list[dict[str, Any]] | None:
+    def get_line_items(self, cache_key: str) -> list[dict[str, Any]] | None:
         """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
-
-    def set_line_items(self, ticker: str, data: list[dict[str, Any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(
-            self._line_items_cache.get(ticker),
-            data,
-            key_field="report_period",
-        )
+        return self.get_response("line_items", cache_key)
 
-    def get_insider_trades(self, ticker: str) -> list[dict[str, Any]] | None:
-        """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
-
-    def set_insider_trades(self, ticker: str, data: list[dict[str, Any]]):
-        """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(
-            self._insider_trades_cache.get(ticker),
-            data,
-            key_field="filing_date",
-        )  # Could also use transaction_date if preferred
-
-    def get_company_news(self, ticker: str) -> list[dict[str, Any]] | None:
-        """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
-
-    def set_company_news(self, ticker: str, data: list[dict[str, Any]]):
-        """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(
-            self._company_news_cache.get(ticker),
-            data,
-            key_field="date",
-        )
+    def set_line_items(self, cache_key: str, data: list[dict[str, Any]]):
+        """Cache line items."""
+        self.set_response("line_items", cache_key, data)
+
+    # ---------------------------------------------------------------
+    # Eviction
+    # ---------------------------------------------------------------
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes >= _EVICT_EVERY:
+            self._writes = 0
+            self._evict_locked()
+
+    def evict(self):
+        """Drop expired entries, then oldest tickers until under max_bytes"""
+        with self._lock:
+            self._evict_locked()
 
+    def _evict_locked(self):
+        with self._conn:
+            for kind in self.ttls:
+                expiry = self._expiry(kind)
+                self._conn.execute(
+                    "DELETE FROM coverage WHERE kind = ? AND fetched_at < ?",
+                    (kind, expiry),
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE kind = ? AND fetched_at < ?",
+                    (kind, expiry),
+                )
+            # Records are only reachable through unexpired coverage
+            self._conn.execute(
+                "DELETE FROM records WHERE NOT EXISTS ("
+                "SELECT 1 FROM coverage c WHERE c.kind = records.kind "
+                "AND c.ticker = records.ticker "
+                "AND c.source = records.source)",
+            )
 
-# Global cache instance
-_cache = Cache()
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM records",
+            ).fetchone()[0]
+            total += self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM responses",
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            # Oldest-fetched entries first: whole series, then responses
+            candidates = self._conn.execute(
+                "SELECT 'series', kind, ticker || char(31) || source, "
+                "MAX(fetched_at) AS ts FROM coverage "
+                "GROUP BY kind, ticker, source "
+                "UNION ALL "
+                "SELECT 'response', kind, cache_key, fetched_at "
+                "FROM responses ORDER BY ts",
+            ).fetchall()
+            for entry_type, kind, key, _ in candidates:
+                if total <= self.max_bytes:
+                    break
+                if entry_type == "series":
+                    ticker, source = key.split("\x1f", 1)
+                    where = "kind = ? AND ticker = ? AND source = ?"
+                    params = (kind, ticker, source)
+                    total -= self._conn.execute(
+                        "SELECT COALESCE(SUM(LENGTH(payload)), 0) "
+                        f"FROM records WHERE {where}",
+                        params,
+                    ).fetchone()[0]
+                    self._conn.execute(
+                        f"DELETE FROM records WHERE {where}",
+                        params,
+                    )
+                    self._conn.execute(
+                        f"DELETE FROM coverage WHERE {where}",
+                        params,
+                    )
+                else:
+                    where = "kind = ? AND cache_key = ?"
+                    total -= self._conn.execute(
+                        "SELECT COALESCE(SUM(LENGTH(payload)), 0) "
+                        f"FROM responses WHERE {where}",
+                        (kind, key),
+                    ).fetchone()[0]
+                    self._conn.execute(
+                        f"DELETE FROM responses WHERE {where}",
+                        (kind, key),
+                    )
+            logger.info(f"Cache evicted down to {total} bytes")
+
+    def clear(self):
+        """Remove all cached data."""
+        with self._lock:
+            with self._conn:
+                for table in ("records", "coverage", "responses"):
+                    self._conn.execute(f"DELETE FROM {table}")
+
+
+# Global cache instance, created on first use
+_cache: Optional[Cache] = None
 
 
 def get_cache() -> Cache:
     """Get the global cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = Cache(
+            path=os.getenv("DATA_CACHE_PATH") or None,
+            max_bytes=int(
+                os.getenv(
+                    "DATA_CACHE_MAX_MB",
+                    str(DEFAULT_MAX_BYTES // 2**20),
+                ),
+            )
+            * 2**20,
+        )
     return _cache
@@ -4,24 +4,23 @@ Historical Price Manager for backtest mode
 """
 import logging
 from datetime import datetime
-from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
-import pandas as pd
+import numpy as np
 
-logger = logging.getLogger(__name__)
+from backend.data.price_store import PricePanel, PriceStore
 
-# Path to local CSV data directory
-_DATA_DIR = Path(__file__).parent / "ret_data"
+logger = logging.getLogger(__name__)
 
 
 class HistoricalPriceManager:
     """Provides historical prices for backtest mode"""
 
-    def __init__(self):
+    def __init__(self, store: Optional[PriceStore] = None):
         self.subscribed_symbols = []
         self.price_callbacks = []
-        self._price_cache = {}
+        self._store = store or PriceStore()
+        self._panel: Optional[PricePanel] = None
         self._current_date = None
         self.latest_prices = {}
         self.open_prices = {}
@@ -36,81 +35,53 @@ class HistoricalPriceManager:
         for symbol in symbols:
             if symbol not in self.subscribed_symbols:
                 self.subscribed_symbols.append(symbol)
+                self._panel = None
 
     def unsubscribe(self, symbols: List[str]):
         """Unsubscribe from symbols"""
         for symbol in symbols:
             if symbol in self.subscribed_symbols:
                 self.subscribed_symbols.remove(symbol)
-                self._price_cache.pop(symbol, None)
+                self._panel = None
 
     def add_price_callback(self, callback: Callable):
         """Add price update callback"""
         self.price_callbacks.append(callback)
 
-    def _load_from_csv(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Load price data from local CSV file."""
-        csv_path = _DATA_DIR / f"{symbol}.csv"
-        if not csv_path.exists():
-            return None
-
-        try:
-            df = pd.read_csv(csv_path)
-            if df.empty or "time" not in df.columns:
-                return None
-
-            df["Date"] = pd.to_datetime(df["time"])
-            df.set_index("Date", inplace=True)
-            df.sort_index(inplace=True)
-            return df
-        except Exception as e:
-            logger.warning(f"Failed to load CSV for {symbol}: {e}")
-            return None
-
     def preload_data(self, start_date: str, end_date: str):
-        """Preload historical data from local CSV files."""
+        """Load subscribed symbols from the price store into one panel"""
         logger.info(f"Preloading data: {start_date} to {end_date}")
+        self._panel = self._store.load_panel(self.subscribed_symbols)
+        logger.info(
+            f"Loaded {len(self._panel.tickers)} symbols over "
+            f"{len(self._panel.dates)} dates from price store",
+        )
 
-        for symbol in self.subscribed_symbols:
-            if symbol in self._price_cache:
-                continue
-
-            # Load from local CSV file directly
-            df = self._load_from_csv(symbol)
-            if df is not None and not df.empty:
-                self._price_cache[symbol] = df
-                logger.info(f"Loaded {symbol} from CSV: {len(df)} records")
-            else:
-                logger.warning(f"No CSV data for {symbol}")
+    def _get_panel(self) -> PricePanel:
+        if self._panel is None:
+            self._panel = self._store.load_panel(self.subscribed_symbols)
+        return self._panel
 
     def set_date(self, date: str):
         """Set current trading date and update prices"""
         self._current_date = date
-        date_dt = pd.Timestamp(date)
+        panel = self._get_panel()
 
-        for symbol in self.subscribed_symbols:
-            df = self._price_cache.get(symbol)
-            if df is None or df.empty:
+        # Exact date or closest earlier date, for all symbols at once
+        opens = panel.row(date, "open")
+        closes = panel.row(date, "close")
+
+        for col, symbol in enumerate(panel.tickers):
+            open_price = opens[col]
+            close_price = closes[col]
+            if np.isnan(open_price) or np.isnan(close_price):
                 # Keep previous prices if no data available
-                logger.warning(f"No cached data for {symbol} on {date}")
+                logger.warning(f"No data for {symbol} on or before {date}")
                 continue
 
-            # Find exact date or closest earlier date
-            if date_dt in df.index:
-                row = df.loc[date_dt]
-            else:
-                valid_dates = df.index[df.index <= date_dt]
-                if len(valid_dates) == 0:
-                    logger.warning(f"No data for {symbol} on or before {date}")
-                    continue
-                row = df.loc[valid_dates[-1]]
-
-            open_price = float(row["open"])
-            close_price = float(row["close"])
-
-            self.open_prices[symbol] = open_price
-            self.close_prices[symbol] = close_price
-            self.latest_prices[symbol] = open_price
+            self.open_prices[symbol] = float(open_price)
+            self.close_prices[symbol] = float(close_price)
+            self.latest_prices[symbol] = float(open_price)
 
             logger.debug(
                 f"{symbol} @ {date}: open={open_price:.2f}, close={close_price:.2f}",  # noqa: E501
@@ -187,18 +158,10 @@ class HistoricalPriceManager:
         price_type: str = "close",
     ) -> Optional[float]:
         """Get price for a specific date"""
-        df = self._price_cache.get(symbol)
-        if df is None or df.empty:
+        price = self._get_panel().value(symbol, date, price_type)
+        if price is None:
             return self.latest_prices.get(symbol)
-
-        date_dt = pd.Timestamp(date)
-        if date_dt in df.index:
-            return float(df.loc[date_dt, price_type])
-
-        valid_dates = df.index[df.index <= date_dt]
-        if len(valid_dates) == 0:
-            return self.latest_prices.get(symbol)
-        return float(df.loc[valid_dates[-1], price_type])
+        return price
 
     def start(self):
         """Start manager"""
@@ -6,7 +6,7 @@ Supports real-time price fetching via polling
 import logging
 import threading
 import time
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import finnhub
 
@@ -56,61 +56,66 @@ class PollingPriceManager:
         """Add price update callback"""
         self.price_callbacks.append(callback)
 
+    def _process_quote(
+        self,
+        symbol: str,
+        quote_data: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Turn a Finnhub quote into price data, None if it is invalid"""
+        current_price = quote_data.get("c")
+        open_price = quote_data.get("o")
+        timestamp = quote_data.get("t", int(time.time()))
+
+        if not current_price or current_price <= 0:
+            logger.warning(f"{symbol}: Invalid price data")
+            return None
+
+        # Store open price on first fetch
+        if symbol not in self.open_prices and open_price and open_price > 0:
+            self.open_prices[symbol] = open_price
+            logger.info(f"{symbol} open price: ${open_price:.2f}")
+
+        stored_open = self.open_prices.get(symbol, open_price)
+        ret = (
+            ((current_price - stored_open) / stored_open) * 100
+            if stored_open and stored_open > 0
+            else 0
+        )
+
+        self.latest_prices[symbol] = current_price
+
+        logger.debug(f"{symbol}: ${current_price:.2f} [ret: {ret:+.2f}%]")
+
+        return {
+            "symbol": symbol,
+            "price": current_price,
+            "timestamp": timestamp * 1000,
+            "open": stored_open,
+            "high": quote_data.get("h"),
+            "low": quote_data.get("l"),
+            "previous_close": quote_data.get("pc"),
+            "ret": ret,
+            "change": quote_data.get("d"),
+            "change_percent": quote_data.get("dp"),
+        }
+
+    def _notify(self, price_data: Dict[str, Any]):
+        for callback in self.price_callbacks:
+            try:
+                callback(price_data)
+            except Exception as e:
+                logger.error(
+                    f"Price callback error ({price_data['symbol']}): {e}",
+                )
+
     def _fetch_prices(self):
         """Fetch latest prices for all subscribed stocks"""
         for symbol in self.subscribed_symbols:
             try:
                 quote_data = self.finnhub_client.quote(symbol)
-
-                current_price = quote_data.get("c")
-                open_price = quote_data.get("o")
-                timestamp = quote_data.get("t", int(time.time()))
-
-                if not current_price or current_price <= 0:
-                    logger.warning(f"{symbol}: Invalid price data")
-                    continue
-
-                # Store open price on first fetch
-                if (
-                    symbol not in self.open_prices
-                    and open_price
-                    and open_price > 0
-                ):
-                    self.open_prices[symbol] = open_price
-                    logger.info(f"{symbol} open price: ${open_price:.2f}")
-
-                stored_open = self.open_prices.get(symbol, open_price)
-                ret = (
-                    ((current_price - stored_open) / stored_open) * 100
-                    if stored_open > 0
-                    else 0
-                )
-
-                self.latest_prices[symbol] = current_price
-
-                price_data = {
-                    "symbol": symbol,
-                    "price": current_price,
-                    "timestamp": timestamp * 1000,
-                    "open": stored_open,
-                    "high": quote_data.get("h"),
-                    "low": quote_data.get("l"),
-                    "previous_close": quote_data.get("pc"),
-                    "ret": ret,
-                    "change": quote_data.get("d"),
-                    "change_percent": quote_data.get("dp"),
-                }
-
-                for callback in self.price_callbacks:
-                    try:
-                        callback(price_data)
-                    except Exception as e:
-                        logger.error(f"Price callback error ({symbol}): {e}")
-
-                logger.debug(
-                    f"{symbol}: ${current_price:.2f} [ret: {ret:+.2f}%]",
-                )
-
+                price_data = self._process_quote(symbol, quote_data)
+                if price_data:
+                    self._notify(price_data)
             except Exception as e:
                 logger.error(f"Failed to fetch {symbol} price: {e}")
 
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar on-disk price store
+
+Each ticker is stored as one structured NumPy array (``{ticker}.npy``)
+holding date + OHLCV + ret columns, sorted by date. Arrays are opened
+memory-mapped, so loading a few hundred tickers only touches the pages
+that are actually read. ``PricePanel`` aligns many tickers on a shared
+date index so a trading day can be looked up for all tickers at once.
+An array imported from ``{ticker}.csv`` is rebuilt when the CSV's
+modification time or size no longer match the ones recorded at import.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default location shared with the CSV files written by DataUpdater
+_DATA_DIR = Path(__file__).parent / "ret_data"
+
+PRICE_FIELDS = ("open", "close", "high", "low", "volume", "ret")
+
+PRICE_DTYPE = np.dtype(
+    [("date", "datetime64[D]")] + [(field, "f8") for field in PRICE_FIELDS],
+)
+
+
+def _to_day(date: Union[str, pd.Timestamp, np.datetime64]) -> np.datetime64:
+    """Normalize a date-like value to day precision"""
+    return np.datetime64(pd.Timestamp(date).date(), "D")
+
+
+def frame_to_records(df: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a price DataFrame to a sorted structured array.
+
+    The frame must have a ``time`` column (YYYY-MM-DD); missing numeric
+    columns are filled with NaN.
+    """
+    records = np.empty(len(df), dtype=PRICE_DTYPE)
+    records["date"] = pd.to_datetime(df["time"]).values.astype(
+        "datetime64[D]",
+    )
+    for field in PRICE_FIELDS:
+        if field in df.columns:
+            records[field] = pd.to_numeric(
+                df[field],
+                errors="coerce",
+            ).to_numpy(dtype="f8")
+        else:
+            records[field] = np.nan
+    records.sort(order="date")
+    return records
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Convert a structured price array back to a CSV-shaped DataFrame"""
+    df = pd.DataFrame({field: records[field] for field in PRICE_FIELDS})
+    df["time"] = pd.to_datetime(records["date"]).strftime("%Y-%m-%d")
+    return df[["open", "close", "high", "low", "volume", "time", "ret"]]
+
+
+def merge_records(existing: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """
+    Merge two sorted price arrays, new rows win on duplicate dates.
+
+    The next-day ``ret`` column is recomputed over the merged series.
+    """
+    if existing is None or len(existing) == 0:
+        merged = np.array(new, dtype=PRICE_DTYPE)
+    elif len(new) == 0:
+        merged = np.array(existing, dtype=PRICE_DTYPE)
+    else:
+        keep = ~np.isin(existing["date"], new["date"])
+        merged = np.concatenate([existing[keep], new]).astype(PRICE_DTYPE)
+        merged.sort(order="date")
+
+    close = merged["close"]
+    ret = np.full(len(merged), np.nan)
+    if len(merged) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret[:-1] = close[1:] / close[:-1] - 1.0
+    merged["ret"] = ret
+    return merged
+
+
+@dataclass
+class PricePanel:
+    """
+    Dense (dates x tickers) price matrices on a shared date index.
+
+    Rows are forward-filled per ticker, so row ``i`` holds each ticker's
+    latest known bar on or before ``dates[i]`` (NaN before its first bar).
+    """
+
+    tickers: List[str]
+    dates: np.ndarray
+    fields: Dict[str, np.ndarray]
+
+    def __post_init__(self):
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    def row_for(self, date: Union[str, pd.Timestamp]) -> int:
+        """Index of the latest panel date on or before ``date``, or -1"""
+        return int(np.searchsorted(self.dates, _to_day(date), "right")) - 1
+
+    def column_for(self, ticker: str) -> int:
+        """Column index of ``ticker``, or -1 if it is not in the panel"""
+        return self._columns.get(ticker, -1)
+
+    def row(self, date: Union[str, pd.Timestamp], field: str) -> np.ndarray:
+        """Values of ``field`` for all tickers as of ``date``"""
+        idx = self.row_for(date)
+        if idx < 0:
+            return np.full(len(self.tickers), np.nan)
+        return self.fields[field][idx]
+
+    def value(
+        self,
+        ticker: str,
+        date: Union[str, pd.Timestamp],
+        field: str,
+    ) -> Optional[float]:
+        """Single value of ``field`` for ``ticker`` as of ``date``"""
+        col = self.column_for(ticker)
+        idx = self.row_for(date)
+        if col < 0 or idx < 0:
+            return None
+        value = self.fields[field][idx, col]
+        return None if np.isnan(value) else float(value)
+
+
+class PriceStore:
+    """Directory of memory-mapped per-ticker price arrays"""
+
+    def __init__(self, data_dir: Optional[Union[str, Path]] = None):
+        self.data_dir = Path(data_dir) if data_dir else _DATA_DIR
+
+    def path_for(self, ticker: str) -> Path:
+        return self.data_dir / f"{ticker}.npy"
+
+    def csv_path_for(self, ticker: str) -> Path:
+        return self.data_dir / f"{ticker}.csv"
+
+    def source_path_for(self, ticker: str) -> Path:
+        """Stamp of the CSV the array was last imported from"""
+        return self.data_dir / f"{ticker}.npy.src"
+
+    def load(self, ticker: str) -> Optional[np.ndarray]:
+        """
+        Open the price array for ``ticker`` memory-mapped.
+
+        Imports ``{ticker}.csv`` if no array exists yet or the CSV changed
+        since it was imported.
+        """
+        path = self.path_for(ticker)
+        if self._csv_changed(ticker):
+            if not self.import_csv(ticker) and not path.exists():
+                return None
+        elif not path.exists():
+            return None
+
+        try:
+            records = np.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Failed to load price store for {ticker}: {e}")
+            return None
+
+        if records.dtype != PRICE_DTYPE:
+            logger.warning(f"Unexpected price store layout for {ticker}")
+            return None
+        return records
+
+    def import_csv(self, ticker: str) -> bool:
+        """Convert ``{ticker}.csv`` into the columnar format"""
+        csv_path = self.csv_path_for(ticker)
+        if not csv_path.exists():
+            return False
+
+        try:
+            df = pd.read_csv(csv_path)
+        except Exception as e:
+            logger.warning(f"Failed to read CSV for {ticker}: {e}")
+            return False
+        if df.empty or "time" not in df.columns:
+            return False
+
+        self._save(ticker, frame_to_records(df))
+        self._record_source(ticker)
+        logger.info(f"Imported {ticker} from CSV: {len(df)} records")
+        return True
+
+    def write_csv_frame(self, ticker: str, df: pd.DataFrame) -> int:
+        """
+        Store ``df``, just saved as ``{ticker}.csv``, as the whole array
+        for ``ticker`` without reading the CSV back.
+
+        Returns:
+            Number of records stored
+        """
+        records = frame_to_records(df)
+        self._save(ticker, records)
+        self._record_source(ticker)
+        return len(records)
+
+    def _record_source(self, ticker: str):
+        """Mark the array as built from the current ``{ticker}.csv``"""
+        stamp = self._csv_stamp(ticker)
+        self.source_path_for(ticker).write_text(f"{stamp[0]} {stamp[1]}")
+
+    def _csv_stamp(self, ticker: str) -> Optional[Tuple[int, int]]:
+        """Modification time (ns) and size of ``{ticker}.csv``"""
+        try:
+            stat = self.csv_path_for(ticker).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _csv_changed(self, ticker: str) -> bool:
+        """Whether the CSV differs from the one the array was built from"""
+        stamp = self._csv_stamp(ticker)
+        if stamp is None:
+            return False
+        try:
+            recorded = self.source_path_for(ticker).read_text().split()
+        except OSError:
+            return True
+        return recorded != [str(stamp[0]), str(stamp[1])]
+
+    def last_date(self, ticker: str) -> Optional[str]:
+        """Last stored date for ``ticker`` (YYYY-MM-DD)"""
+        records = self.load(ticker)
+        if records is None or len(records) == 0:
+            return None
+        return str(records["date"][-1])
+
+    def write(self, ticker: str, df: pd.DataFrame) -> int:
+        """
+        Merge new rows into the store for ``ticker``.
+
+        Returns:
+            Number of records stored after the merge
+        """
+        new = frame_to_records(df)
+        existing = self.load(ticker)
+        if existing is not None:
+            existing = np.array(existing)
+        merged = merge_records(existing, new)
+        self._save(ticker, merged)
+        return len(merged)
+
+    def _save(self, ticker: str, records: np.ndarray):
+        """Write atomically so memory-mapped readers never see a torn file"""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(ticker)
+        tmp_path = path.with_suffix(".npy.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, records, allow_pickle=False)
+        os.replace(tmp_path, path)
+
+    def load_panel(self, tickers: List[str]) -> PricePanel:
+        """
+        Align ``tickers`` on the union of their trading dates.
+
+        Tickers without data are kept as all-NaN columns.
+        """
+        series = {}
+        for ticker in tickers:
+            records = self.load(ticker)
+            if records is not None and len(records) > 0:
+                series[ticker] = records
+            else:
+                logger.warning(f"No stored price data for {ticker}")
+
+        if series:
+            dates = np.unique(
+                np.concatenate([r["date"] for r in series.values()]),
+            )
+        else:
+            dates = np.array([], dtype="datetime64[D]")
+
+        fields = {
+            field: np.full((len(dates), len(tickers)), np.nan)
+            for field in PRICE_FIELDS
+        }
+        for col, ticker in enumerate(tickers):
+            records = series.get(ticker)
+            if records is None:
+                continue
+            # Forward-fill: latest own bar on or before each panel date
+            idx = np.searchsorted(records["date"], dates, "right") - 1
+            valid = idx >= 0
+            for field in PRICE_FIELDS:
+                fields[field][valid, col] = records[field][idx[valid]]
+
+        return PricePanel(tickers=list(tickers), dates=dates, fields=fields)
@@ -5,7 +5,7 @@ Automatic Incremental Historical Data Update Module
 
 Features:
 1. Fetch stock historical data from configured API (Finnhub or Financial Datasets)
-2. Incrementally update CSV files in ret_data directory
+2. Incrementally update CSV files and the columnar price store in ret_data
 3. Automatically detect last update date, only download new data
 4. Calculate returns (ret)
 5. Support batch updates for multiple stocks
@@ -29,6 +29,7 @@ from dotenv import load_dotenv
 from backend.config.data_config import (
     get_config,
 )
+from backend.data.price_store import PriceStore
 from backend.tools.data_tools import get_prices, prices_to_df
 
 # Add project root directory to path
@@ -74,6 +75,7 @@ class DataUpdater:
 
         # Ensure directory exists
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = PriceStore(self.data_dir)
 
         self.start_date = start_date
 
@@ -112,6 +114,15 @@ class DataUpdater:
         date_range = pd.date_range(start_date, end_date, freq="B")
         return [date.strftime("%Y-%m-%d") for date in date_range]
 
+    def get_last_date(self, ticker: str) -> Optional[datetime]:
+        """Get last data date, preferring the columnar price store."""
+        if self.store.path_for(ticker).exists():
+            last_date_str = self.store.last_date(ticker)
+            if last_date_str:
+                logger.info(f"{ticker} last data date: {last_date_str}")
+                return datetime.strptime(last_date_str, "%Y-%m-%d")
+        return self.get_last_date_from_csv(ticker)
+
     def get_last_date_from_csv(self, ticker: str) -> Optional[datetime]:
         """Get last data date from CSV file."""
         csv_path = self.data_dir / f"{ticker}.csv"
@@ -198,6 +209,11 @@ class DataUpdater:
 
             combined.to_csv(csv_path, index=False)
             logger.info(f"{ticker} data saved to: {csv_path}")
+
+            # The array mirrors the CSV just saved, recomputed returns
+            # included
+            stored = self.store.write_csv_frame(ticker, combined)
+            logger.info(f"{ticker} price store updated: {stored} records")
             return True
 
         except Exception as e:
@@ -219,7 +235,7 @@ class DataUpdater:
             start_date = datetime.strptime(self.start_date, "%Y-%m-%d")
             logger.info(f"Force full update, start date: {start_date.date()}")
         else:
-            last_date = self.get_last_date_from_csv(ticker)
+            last_date = self.get_last_date(ticker)
             if last_date:
                 start_date = last_date + timedelta(days=1)
                 logger.info(
@@ -3,9 +3,13 @@
 AgentScope Native Model Factory
 Uses native AgentScope model classes for LLM calls
 """
+import hashlib
+import json
+import logging
 import os
 from enum import Enum
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 from agentscope.formatter import (
     AnthropicChatFormatter,
     DashScopeChatFormatter,
@@ -15,11 +19,21 @@ from agentscope.formatter import (
 )
 from agentscope.model import (
     AnthropicChatModel,
+    ChatModelBase,
+    ChatResponse,
     DashScopeChatModel,
     GeminiChatModel,
     OllamaChatModel,
     OpenAIChatModel,
 )
+from agentscope.model._model_usage import ChatUsage
+
+logger = logging.getLogger(__name__)
+
+# Default directory for recorded LLM responses
+_DEFAULT_RESPONSE_DIR = (
+    Path(__file__).parent.parent / "data" / "ret_data" / "llm_responses"
+)
 
 
 class ModelProvider(Enum):
@@ -157,6 +171,213 @@ def create_model(
     return model_class(**model_kwargs)
 
 
+class ResponseStore:
+    """
+    Content-addressed on-disk store of chat responses
+
+    Each response is one JSON file at ``{root}/{key[:2]}/{key}.json``,
+    where the key is the SHA-256 of the request. Files are written
+    atomically, so concurrent backtest workers can share one store.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Hash a request (model, formatted messages, tools, options)"""
+        payload = json.dumps(
+            request,
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a recorded response, or None on a miss"""
+        path = self.path_for(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]):
+        """Store a response under its key"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/write counters since the store was opened"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+
+_response_stores: Dict[Path, ResponseStore] = {}
+
+
+def get_response_store(root: Optional[Path] = None) -> ResponseStore:
+    """Get the shared response store for a directory"""
+    root = Path(
+        root or os.getenv("LLM_RESPONSE_DIR") or _DEFAULT_RESPONSE_DIR,
+    )
+    store = _response_stores.get(root)
+    if store is None:
+        store = ResponseStore(root)
+        _response_stores[root] = store
+    return store
+
+
+class RecordedChatModel(ChatModelBase):
+    """
+    Chat model wrapper that records responses or replays recorded ones
+
+    Modes:
+        record: serve recorded responses, call the model on a miss and
+            record its response
+        replay: only serve recorded responses, a miss raises KeyError
+        passthrough: always call the model, nothing is recorded
+    """
+
+    MODES = ("record", "replay", "passthrough")
+
+    def __init__(
+        self,
+        model: ChatModelBase,
+        mode: str,
+        store: ResponseStore,
+    ):
+        super().__init__(model_name=model.model_name, stream=model.stream)
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported LLM response mode: {mode}")
+        self.model = model
+        self.mode = mode
+        self.store = store
+
+    def _key(
+        self,
+        messages: Any,
+        tools: Any,
+        tool_choice: Any,
+        structured_model: Any,
+        kwargs: Dict[str, Any],
+    ) -> str:
+        schema = None
+        if structured_model is not None:
+            schema = structured_model.model_json_schema()
+        return ResponseStore.make_key(
+            {
+                "model": self.model_name,
+                "messages": messages,
+                "tools": tools,
+                "tool_choice": tool_choice,
+                "structured_model": schema,
+                "kwargs": kwargs,
+            },
+        )
+
+    async def __call__(
+        self,
+        messages: Any,
+        tools: Optional[list] = None,
+        tool_choice: Optional[str] = None,
+        structured_model: Any = None,
+        **kwargs: Any,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        key = None
+        if self.mode != "passthrough":
+            key = self._key(
+                messages,
+                tools,
+                tool_choice,
+                structured_model,
+                kwargs,
+            )
+            record = self.store.get(key)
+            if record is not None:
+                usage = record.get("usage")
+                response = ChatResponse(
+                    content=record["content"],
+                    usage=ChatUsage(**usage) if usage else None,
+                    metadata=record.get("metadata"),
+                )
+                return self._as_stream(response) if self.stream else response
+            if self.mode == "replay":
+                raise KeyError(
+                    f"No recorded response for {self.model_name} "
+                    f"({key[:12]})",
+                )
+
+        response = await self.model(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            structured_model=structured_model,
+            **kwargs,
+        )
+        if key is None:
+            return response
+        if self.stream:
+            return self._record_stream(key, response)
+        self._save(key, response)
+        return response
+
+    def _save(self, key: str, response: ChatResponse):
+        usage = None
+        if response.usage is not None:
+            # Token counts and the time the original call took
+            usage = {
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+                "time": response.usage.time,
+            }
+        self.store.put(
+            key,
+            {
+                "model": self.model_name,
+                "content": list(response.content),
+                "usage": usage,
+                "metadata": response.metadata,
+            },
+        )
+
+    async def _as_stream(
+        self,
+        response: ChatResponse,
+    ) -> AsyncGenerator[ChatResponse, None]:
+        yield response
+
+    async def _record_stream(
+        self,
+        key: str,
+        stream: AsyncGenerator[ChatResponse, None],
+    ) -> AsyncGenerator[ChatResponse, None]:
+        last = None
+        async for chunk in stream:
+            last = chunk
+            yield chunk
+        # Streamed chunks are cumulative, the last one is the full response
+        if last is not None:
+            self._save(key, last)
+
+
 def get_agent_model(agent_id: str, stream: bool = False):
     """
     Get model for a specific agent based on environment variables
@@ -167,6 +388,9 @@ def get_agent_model(agent_id: str, stream: bool = False):
 
     fallback to global MODEL_NAME & MODEL_PROVIDER if agent-specific not given
 
+    LLM_RESPONSE_MODE selects "record", "replay" or "passthrough"
+    (default) and LLM_RESPONSE_DIR the response store directory.
+
     Args:
         agent_id: Agent ID (e.g., "sentiment_analyst", "portfolio_manager")
         stream: Whether to use streaming mode
@@ -188,12 +412,21 @@ def get_agent_model(agent_id: str, stream: bool = False):
     if not provider:
         provider = os.getenv("MODEL_PROVIDER", "OPENAI")
 
-    return create_model(
+    model = create_model(
         model_name=model_name,
         provider=provider,
         stream=stream,
     )
 
+    response_mode = os.getenv("LLM_RESPONSE_MODE", "").lower()
+    if response_mode and response_mode != "passthrough":
+        model = RecordedChatModel(
+            model,
+            mode=response_mode,
+            store=get_response_store(),
+        )
+    return model
+
 
 def get_agent_formatter(agent_id: str):
     """
@@ -153,7 +153,7 @@ def create_toolkit(analyst_type: str):
     """Create AgentScope Toolkit with tools for specific analyst type"""
     from agentscope.tool import Toolkit
     from backend.agents.prompt_loader import PromptLoader
-    from backend.tools.analysis_tools import TOOL_REGISTRY
+    from backend.tools.analysis_tools import TOOL_REGISTRY, threaded
 
     # Load analyst persona config
     prompt_loader = PromptLoader()
@@ -168,7 +168,7 @@ def create_toolkit(analyst_type: str):
     for tool_name in tool_names:
         tool_func = TOOL_REGISTRY.get(tool_name)
         if tool_func:
-            toolkit.register_tool_function(tool_func)
+            toolkit.register_tool_function(threaded(tool_func))
 
     return toolkit
 
@@ -283,7 +283,11 @@ async def run_with_gateway(args):
     async with AsyncExitStack() as stack:
         for memory in long_term_memories:
             await stack.enter_async_context(memory)
-        await gateway.start(host=args.host, port=args.port)
+        try:
+            await gateway.start(host=args.host, port=args.port)
+        finally:
+            # Queued memory writes need the memory contexts still open
+            await pipeline.close()
 
 
 def main():
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Broadcaster - WebSocket fan-out with per-client send queues
+
+Every message is JSON-encoded once and put on a bounded queue per
+client. Each client has its own sender task, so a slow socket only delays
+its own queue instead of the event loop or the other clients.
+
+Price ticks are not forwarded one by one. The latest price per symbol is
+kept and the symbols that changed are flushed as one ``price_batch``
+delta frame per interval. When a client's queue is full, price frames
+are dropped first; the client then receives a full price snapshot in
+place of its next delta, so it always converges to the latest prices.
+Other frames are only dropped, oldest first, when a queue holds nothing
+but events.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import websockets
+
+from backend.config.env_config import get_env_int
+
+logger = logging.getLogger(__name__)
+
+PRICE = "price"
+EVENT = "event"
+
+
+def encode(message: Dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False, default=str)
+
+
+class ClientChannel:
+    """Bounded send queue and sender task of one client"""
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_queue: int,
+        snapshot_fn: Callable[[], str],
+        on_closed: Callable[["ClientChannel"], None],
+    ):
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self._snapshot_fn = snapshot_fn
+        self._on_closed = on_closed
+        self._queue: Deque[Tuple[str, str]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Set when a price frame was dropped; the next price frame is
+        # replaced by a full snapshot
+        self.price_resync = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, frame: str, kind: str = EVENT):
+        """Queue an encoded frame, dropping per policy when full"""
+        if kind == PRICE:
+            # Keep at most one pending price frame per client
+            self._drop_price_frame()
+        if len(self._queue) >= self.max_queue:
+            if kind == PRICE:
+                # Events are worth more than a tick the snapshot replaces
+                self.dropped += 1
+                self.price_resync = True
+                return
+            if not self._drop_price_frame():
+                self._queue.popleft()
+                self.dropped += 1
+                logger.debug("Dropped event frame for slow client")
+
+        self._queue.append((kind, frame))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+
+    def _drop_price_frame(self) -> bool:
+        for i, (kind, _) in enumerate(self._queue):
+            if kind == PRICE:
+                del self._queue[i]
+                self.dropped += 1
+                self.price_resync = True
+                return True
+        return False
+
+    async def _run(self):
+        try:
+            while True:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                kind, frame = self._queue.popleft()
+                if kind == PRICE and self.price_resync:
+                    self.price_resync = False
+                    frame = self._snapshot_fn()
+                await self.websocket.send(frame)
+                self.sent += 1
+        except websockets.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.warning(f"Client sender stopped: {e}")
+        finally:
+            self._on_closed(self)
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    async def close(self):
+        self.cancel()
+        if self._task:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
+class Broadcaster:
+    """Fans out encoded frames to all clients through their channels"""
+
+    def __init__(
+        self,
+        max_queue: Optional[int] = None,
+        price_interval_ms: Optional[int] = None,
+    ):
+        """
+        Initialize broadcaster
+
+        Args:
+            max_queue: Frames per client queue (default:
+                BROADCAST_QUEUE_SIZE or 256)
+            price_interval_ms: Price batch interval (default:
+                PRICE_BATCH_INTERVAL_MS or 250)
+        """
+        self.max_queue = max_queue or get_env_int("BROADCAST_QUEUE_SIZE", 256)
+        self.price_interval = (
+            price_interval_ms or get_env_int("PRICE_BATCH_INTERVAL_MS", 250)
+        ) / 1000.0
+
+        self.clients: Dict[Any, ClientChannel] = {}
+        self.latest_prices: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Optional[str] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.frames_encoded = 0
+        self.price_ticks = 0
+        self.price_frames = 0
+        # Counters of clients that disconnected, so totals stay monotonic
+        self._closed_sent = 0
+        self._closed_dropped = 0
+
+    def add_client(self, websocket: Any) -> ClientChannel:
+        channel = ClientChannel(
+            websocket,
+            self.max_queue,
+            snapshot_fn=self.snapshot_frame,
+            on_closed=self._forget,
+        )
+        # The first price frame a new client gets is a full snapshot
+        channel.price_resync = True
+        self.clients[websocket] = channel
+        channel.start()
+        return channel
+
+    async def remove_client(self, websocket: Any):
+        channel = self.clients.get(websocket)
+        if channel:
+            await channel.close()
+
+    def _forget(self, channel: ClientChannel):
+        if self.clients.get(channel.websocket) is channel:
+            del self.clients[channel.websocket]
+            self._closed_sent += channel.sent
+            self._closed_dropped += channel.dropped
+
+    def publish(self, message: Dict[str, Any]):
+        """Encode a message once and queue it for every client"""
+        if not self.clients:
+            return
+        frame = encode(message)
+        self.frames_encoded += 1
+        for channel in list(self.clients.values()):
+            channel.enqueue(frame)
+
+    def send_to(self, websocket: Any, message: Dict[str, Any]):
+        """Queue a message for one client, in order with broadcasts"""
+        channel = self.clients.get(websocket)
+        if channel:
+            channel.enqueue(encode(message))
+            self.frames_encoded += 1
+
+    def update_price(self, symbol: str, data: Dict[str, Any]):
+        """Record a price tick; sent with the next batch"""
+        self.latest_prices[symbol] = data
+        self._dirty[symbol] = data
+        self._snapshot = None
+        self.price_ticks += 1
+
+    def flush_prices(self):
+        """Send the symbols changed since the last flush as one frame"""
+        if not self._dirty:
+            return
+        prices, self._dirty = self._dirty, {}
+        if not self.clients:
+            return
+        frame = encode(
+            {
+                "type": "price_batch",
+                "snapshot": False,
+                "prices": prices,
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+        self.frames_encoded += 1
+        self.price_frames += 1
+        for channel in list(self.clients.values()):
+            channel.enqueue(frame, kind=PRICE)
+
+    def snapshot_frame(self) -> str:
+        """Latest price of every symbol, encoded once per change"""
+        if self._snapshot is None:
+            self._snapshot = encode(
+                {
+                    "type": "price_batch",
+                    "snapshot": True,
+                    "prices": self.latest_prices,
+                    "timestamp": datetime.now().isoformat(),
+                },
+            )
+            self.frames_encoded += 1
+        return self._snapshot
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.price_interval)
+            self.flush_prices()
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def stop(self):
+        """Stop batching prices and cancel all sender tasks"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for channel in list(self.clients.values()):
+            channel.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and drop counters, in total and per client"""
+        clients = [channel.metrics() for channel in self.clients.values()]
+        return {
+            "clients": len(clients),
+            "queue_depth": sum(c["queue_depth"] for c in clients),
+            "max_queue_depth": max(
+                (c["max_queue_depth"] for c in clients),
+                default=0,
+            ),
+            "frames_sent": self._closed_sent + sum(c["sent"] for c in clients),
+            "frames_dropped": self._closed_dropped
+            + sum(c["dropped"] for c in clients),
+            "frames_encoded": self.frames_encoded,
+            "price_ticks": self.price_ticks,
+            "price_frames": self.price_frames,
+            "per_client": clients,
+        }
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+FeedLog - Append-only JSONL log of persisted feed events
+
+Each persisted event is appended as one line ``{"seq": n, "event": {...}}``
+instead of rewriting the whole server state, so the cost of an emit does
+not grow with the feed history. Byte offsets of all lines are indexed on
+open, so pages of history can be read lazily without parsing the file.
+The log is compacted (rewritten with only the newest ``max_entries``
+entries) once it grows past half as many again, so the rewrite is paid
+once per ``max_entries / 2`` appends rather than on every snapshot.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FeedEntry = Tuple[int, Dict[str, Any]]
+
+
+class FeedLog:
+    """Append-only feed event log with lazy paging and compaction"""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 5000,
+        compact_ratio: float = 1.5,
+    ):
+        """
+        Initialize feed log
+
+        Args:
+            path: JSONL file path
+            max_entries: Entries kept when the log is compacted
+            compact_ratio: Compact once the log holds more than this
+                multiple of ``max_entries``
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.compact_at = max(max_entries, int(max_entries * compact_ratio))
+        self._lock = threading.Lock()
+        # (seq, byte offset) of every line, oldest first
+        self._index: List[Tuple[int, int]] = []
+        self._last_seq = 0
+        self._build_index()
+
+    def _build_index(self):
+        """Scan the log once to record the offset of every entry"""
+        if not self.path.exists():
+            return
+
+        offset = 0
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    seq = json.loads(line)["seq"]
+                except (ValueError, KeyError):
+                    logger.warning(
+                        f"Skipping corrupt feed log line at {offset}",
+                    )
+                else:
+                    self._index.append((seq, offset))
+                    self._last_seq = seq
+                    valid_end = offset + len(line)
+                offset += len(line)
+
+        # Drop a torn tail left by a crash mid-append
+        if valid_end < offset:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest entry (0 if empty)"""
+        return self._last_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained entry (0 if empty)"""
+        return self._index[0][0] if self._index else 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """
+        Append an event
+
+        Returns:
+            Sequence number assigned to the event
+        """
+        with self._lock:
+            seq = self._last_seq + 1
+            line = json.dumps(
+                {"seq": seq, "event": event},
+                ensure_ascii=False,
+                default=str,
+            )
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line.encode("utf-8") + b"\n")
+            self._index.append((seq, offset))
+            self._last_seq = seq
+            return seq
+
+    def _read_at(self, f, offset: int) -> Dict[str, Any]:
+        f.seek(offset)
+        return json.loads(f.readline())["event"]
+
+    def page(
+        self,
+        before_seq: Optional[int] = None,
+        limit: int = 200,
+    ) -> List[FeedEntry]:
+        """
+        Read up to ``limit`` entries older than ``before_seq``
+
+        Args:
+            before_seq: Exclusive upper bound (None = from the newest)
+            limit: Maximum number of entries
+
+        Returns:
+            List of (seq, event), newest first
+        """
+        with self._lock:
+            end = len(self._index)
+            if before_seq is not None:
+                end = self._position(before_seq)
+            window = self._index[max(0, end - limit) : end]
+            if not window:
+                return []
+            with open(self.path, "rb") as f:
+                entries = [
+                    (seq, self._read_at(f, offset)) for seq, offset in window
+                ]
+        entries.reverse()
+        return entries
+
+    def iter_from(self, after_seq: int = 0) -> Iterator[FeedEntry]:
+        """Iterate entries newer than ``after_seq`` lazily, oldest first"""
+        with self._lock:
+            window = self._index[self._position(after_seq + 1) :]
+        if not window:
+            return
+        with open(self.path, "rb") as f:
+            for seq, offset in window:
+                yield seq, self._read_at(f, offset)
+
+    def _position(self, seq: int) -> int:
+        """Index of the first entry with sequence number >= ``seq``"""
+        lo, hi = 0, len(self._index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._index[mid][0] < seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def compact(self) -> bool:
+        """
+        Drop all but the newest ``max_entries`` entries once the log
+        holds more than ``compact_at``
+
+        The log is rewritten to a temp file and swapped in atomically.
+        Sequence numbers are preserved, so cursors stay valid.
+
+        Returns:
+            True if the log was compacted
+        """
+        with self._lock:
+            if len(self._index) <= self.compact_at:
+                return False
+
+            keep = self._index[-self.max_entries :]
+            tmp_path = self.path.with_suffix(".jsonl.tmp")
+            new_index = []
+            with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+                for seq, offset in keep:
+                    src.seek(offset)
+                    new_index.append((seq, dst.tell()))
+                    dst.write(src.readline())
+            os.replace(tmp_path, self.path)
+
+            dropped = len(self._index) - len(new_index)
+            self._index = new_index
+        logger.info(f"Feed log compacted: dropped {dropped} old entries")
+        return True
@@ -15,6 +15,7 @@ from backend.utils.msg_adapter import FrontendAdapter
 from backend.utils.terminal_dashboard import get_dashboard
 from backend.core.pipeline import TradingPipeline
 from backend.core.state_sync import StateSync
+from backend.services.broadcaster import Broadcaster
 from backend.services.market import MarketService
 from backend.services.storage import StorageService
 
@@ -52,6 +53,7 @@ class Gateway:
 
         self.connected_clients: Set[WebSocketServerProtocol] = set()
         self.lock = asyncio.Lock()
+        self.broadcaster = Broadcaster()
         self._backtest_task: Optional[asyncio.Task] = None
         self._backtest_start_date: Optional[str] = None
         self._backtest_end_date: Optional[str] = None
@@ -107,7 +109,11 @@ class Gateway:
                 f"{summary.get('totalAssetValue', 0):,.2f}",
             )
 
-        await self.market_service.start(broadcast_func=self.broadcast)
+        self.broadcaster.start()
+        await self.market_service.start(
+            broadcast_func=self.broadcast,
+            price_func=self.broadcaster.update_price,
+        )
 
         if self.scheduler_callback:
             await self.scheduler_callback(callback=self.on_strategy_trigger)
@@ -138,12 +144,14 @@ class Gateway:
         """Handle WebSocket client connection"""
         async with self.lock:
             self.connected_clients.add(websocket)
+            self.broadcaster.add_client(websocket)
 
         await self._send_initial_state(websocket)
         await self._handle_client_messages(websocket)
 
         async with self.lock:
             self.connected_clients.discard(websocket)
+        await self.broadcaster.remove_client(websocket)
 
     async def _send_initial_state(self, websocket: WebSocketServerProtocol):
         state_payload = self.state_sync.get_initial_state_payload(
@@ -160,12 +168,12 @@ class Gateway:
             if "portfolio" in state_payload:
                 state_payload["portfolio"].update(live_returns)
 
-        await websocket.send(
-            json.dumps(
-                {"type": "initial_state", "state": state_payload},
-                ensure_ascii=False,
-                default=str,
-            ),
+        if self.broadcaster.latest_prices:
+            state_payload["realtime_prices"] = self.broadcaster.latest_prices
+
+        self.broadcaster.send_to(
+            websocket,
+            {"type": "initial_state", "state": state_payload},
         )
 
     async def _handle_client_messages(
@@ -178,17 +186,25 @@ class Gateway:
                 msg_type = data.get("type", "unknown")
 
                 if msg_type == "ping":
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "type": "pong",
-                                "timestamp": datetime.now().isoformat(),
-                            },
-                            ensure_ascii=False,
-                        ),
+                    self.broadcaster.send_to(
+                        websocket,
+                        {
+                            "type": "pong",
+                            "timestamp": datetime.now().isoformat(),
+                        },
                     )
                 elif msg_type == "get_state":
                     await self._send_initial_state(websocket)
+                elif msg_type == "get_feed_history":
+                    await self._send_feed_page(websocket, data)
+                elif msg_type == "get_broadcast_metrics":
+                    self.broadcaster.send_to(
+                        websocket,
+                        {
+                            "type": "broadcast_metrics",
+                            **self.get_broadcast_metrics(),
+                        },
+                    )
                 elif msg_type == "start_backtest":
                     await self._handle_start_backtest(data)
 
@@ -197,6 +213,32 @@ class Gateway:
         except json.JSONDecodeError:
             pass
 
+    async def _send_feed_page(
+        self,
+        websocket: WebSocketServerProtocol,
+        data: Dict[str, Any],
+    ):
+        try:
+            page = self.state_sync.get_feed_page(
+                before=data.get("before"),
+                limit=data.get("limit"),
+            )
+        except ValueError as e:
+            self.broadcaster.send_to(
+                websocket,
+                {
+                    "type": "error",
+                    "status": 400,
+                    "request": "get_feed_history",
+                    "message": str(e),
+                },
+            )
+            return
+        self.broadcaster.send_to(
+            websocket,
+            {"type": "feed_history_page", **page},
+        )
+
     async def _handle_start_backtest(self, data: Dict[str, Any]):
         if not self.is_backtest:
             return
@@ -207,31 +249,19 @@ class Gateway:
             )
 
     async def broadcast(self, message: Dict[str, Any]):
-        """Broadcast message to all connected clients"""
-        if not self.connected_clients:
-            return
-
-        message_json = json.dumps(message, ensure_ascii=False, default=str)
-
-        async with self.lock:
-            tasks = [
-                self._send_to_client(client, message_json)
-                for client in self.connected_clients.copy()
-            ]
+        """
+        Broadcast message to all connected clients
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        The message is encoded once and queued per client; slow clients
+        do not hold up the caller or each other.
+        """
+        self.broadcaster.publish(message)
+        # Let the sender tasks run between back-to-back broadcasts
+        await asyncio.sleep(0)
 
-    async def _send_to_client(
-        self,
-        client: WebSocketServerProtocol,
-        message: str,
-    ):
-        try:
-            await client.send(message)
-        except websockets.ConnectionClosed:
-            async with self.lock:
-                self.connected_clients.discard(client)
+    def get_broadcast_metrics(self) -> Dict[str, Any]:
+        """Send queue depths and dropped frames of connected clients"""
+        return self.broadcaster.metrics()
 
     async def _market_status_monitor(self):
         """Periodically check and broadcast market status changes"""
@@ -535,6 +565,7 @@ class Gateway:
     def stop(self):
         self.state_sync.save_state()
         self.market_service.stop()
+        self.broadcaster.stop()
         if self._backtest_task:
             self._backtest_task.cancel()
         if self._market_status_task:
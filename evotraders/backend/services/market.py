@@ -52,6 +52,7 @@ class MarketService:
         self.running = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._broadcast_func: Optional[Callable] = None
+        self._price_func: Optional[Callable] = None
         self._price_manager: Optional[Any] = None
         self._current_date: Optional[str] = None
 
@@ -70,14 +71,28 @@ class MarketService:
             return "MOCK"
         return "LIVE"
 
-    async def start(self, broadcast_func: Callable):
-        """Start market data service"""
+    async def start(
+        self,
+        broadcast_func: Callable,
+        price_func: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        """
+        Start market data service
+
+        Args:
+            broadcast_func: Async function broadcasting a message
+            price_func: Optional sync ``(symbol, price_entry)`` sink called
+                on the event loop for every tick, e.g. a batching
+                broadcaster. Without it, every tick is broadcast as a
+                ``price_update`` message.
+        """
         if self.running:
             return
 
         self.running = True
         self._loop = asyncio.get_running_loop()
         self._broadcast_func = broadcast_func
+        self._price_func = price_func
 
         if self.backtest_mode:
             self._start_backtest_mode()
@@ -90,19 +105,34 @@ class MarketService:
             f"Market service started: {self.mode_name}, tickers={self.tickers}",  # noqa: E501
         )
 
-    def _make_price_callback(self) -> Callable:
-        """Create thread-safe price callback"""
+    def _make_price_callback(self, on_loop: bool = False) -> Callable:
+        """
+        Create price callback
+
+        Args:
+            on_loop: The price manager calls back on the event loop, so
+                ticks are handed on directly instead of thread-safely
+        """
 
         def callback(price_data: Dict[str, Any]):
             symbol = price_data["symbol"]
             self.cache[symbol] = price_data
 
             loop = self._loop
-            if loop and loop.is_running() and self._broadcast_func:
-                asyncio.run_coroutine_threadsafe(
-                    self._broadcast_price_update(price_data),
-                    loop,
-                )
+            if not (loop and loop.is_running()):
+                return
+            if self._price_func:
+                entry = self._price_entry(price_data)
+                if on_loop:
+                    self._price_func(symbol, entry)
+                else:
+                    loop.call_soon_threadsafe(self._price_func, symbol, entry)
+            elif self._broadcast_func:
+                coro = self._broadcast_price_update(price_data)
+                if on_loop:
+                    loop.create_task(coro)
+                else:
+                    asyncio.run_coroutine_threadsafe(coro, loop)
 
         return callback
 
@@ -121,15 +151,17 @@ class MarketService:
         self._price_manager.start()
 
     def _start_real_mode(self):
-        from backend.data.polling_price_manager import PollingPriceManager
+        from backend.data.async_price_manager import AsyncPollingPriceManager
 
         if not self.api_key:
             raise ValueError("API key required for live mode")
-        self._price_manager = PollingPriceManager(
+        self._price_manager = AsyncPollingPriceManager(
             api_key=self.api_key,
             poll_interval=self.poll_interval,
         )
-        self._price_manager.add_price_callback(self._make_price_callback())
+        self._price_manager.add_price_callback(
+            self._make_price_callback(on_loop=True),
+        )
         self._price_manager.subscribe(self.tickers)
         self._price_manager.start()
 
@@ -150,26 +182,31 @@ class MarketService:
 
         self._price_manager.start()
 
-    async def _broadcast_price_update(self, price_data: Dict[str, Any]):
-        """Broadcast price update to frontend"""
-        if not self._broadcast_func:
-            return
-
-        symbol = price_data["symbol"]
+    @staticmethod
+    def _price_entry(price_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Price, open, return since open (%) and timestamp of a tick"""
         price = price_data["price"]
         open_price = price_data.get("open", price)
         ret = (
             ((price - open_price) / open_price) * 100 if open_price > 0 else 0
         )
+        return {
+            "price": price,
+            "open": open_price,
+            "ret": ret,
+            "timestamp": price_data.get("timestamp"),
+        }
+
+    async def _broadcast_price_update(self, price_data: Dict[str, Any]):
+        """Broadcast price update to frontend"""
+        if not self._broadcast_func:
+            return
 
         await self._broadcast_func(
             {
                 "type": "price_update",
-                "symbol": symbol,
-                "price": price,
-                "open": open_price,
-                "ret": ret,
-                "timestamp": price_data.get("timestamp"),
+                "symbol": price_data["symbol"],
+                **self._price_entry(price_data),
                 "realtime_prices": {
                     t: self._get_cached_price(t) for t in self.tickers
                 },
@@ -197,6 +234,7 @@ class MarketService:
             self._price_manager = None
         self._loop = None
         self._broadcast_func = None
+        self._price_func = None
 
     # Backtest methods
     def set_backtest_date(self, date: str):
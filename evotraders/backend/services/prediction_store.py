@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+PredictionStore - Columnar history of evaluated analyst signals
+
+Every evaluated signal is one fixed-size record of the sparse
+(analyst x ticker x date) cube: analyst and ticker indices, the trading
+day, an int8 signal code and an int8 outcome code. Records are appended
+to ``records.bin`` as raw bytes and held in memory as one structured
+array, so win/hit rates and rolling-window stats are bincounts over
+columns instead of loops over per-analyst dicts. Analyst and ticker
+labels live in ``labels.json``, rewritten only when a new one appears.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("analyst", "<i2"),
+        ("ticker", "<i4"),
+        ("day", "<i4"),  # days since 1970-01-01
+        ("signal", "i1"),
+        ("outcome", "i1"),
+    ],
+)
+
+# Signal codes
+LONG = 1
+SHORT = -1
+HOLD = 0
+
+# Outcome codes; holds are always NOT_EVALUATED
+WIN = 1
+LOSS = 0
+UNKNOWN = -1
+NOT_EVALUATED = -2
+
+SIGNAL_CODES = {"long": LONG, "short": SHORT, "hold": HOLD}
+SIGNAL_DISPLAY = {LONG: "bull", SHORT: "bear", HOLD: "neutral"}
+
+
+def day_number(date: str) -> int:
+    """YYYY-MM-DD as days since 1970-01-01"""
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+def day_string(day: int) -> str:
+    return str(np.datetime64(int(day), "D"))
+
+
+class PredictionStore:
+    """Append-only columnar store of evaluated analyst signals"""
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Initialize prediction store
+
+        Args:
+            directory: Directory holding records.bin and labels.json;
+                None keeps the store in memory only
+        """
+        self.directory = Path(directory) if directory else None
+        self.analysts: List[str] = []
+        self.tickers: List[str] = []
+        self._analyst_index: Dict[str, int] = {}
+        self._ticker_index: Dict[str, int] = {}
+        # Totals carried over from leaderboards without a store, by analyst
+        self.offsets: Dict[str, Dict[str, int]] = {}
+
+        self._records = np.zeros(0, dtype=RECORD_DTYPE)
+        self._size = 0
+        self._load()
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records, oldest first"""
+        return self._records[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _path(self, name: str) -> Optional[Path]:
+        return self.directory / name if self.directory else None
+
+    def _load(self):
+        labels_path = self._path("labels.json")
+        if not labels_path or not labels_path.exists():
+            return
+        try:
+            with open(labels_path, "r", encoding="utf-8") as f:
+                labels = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load prediction labels: {e}")
+            return
+
+        self.analysts = list(labels.get("analysts", []))
+        self.tickers = list(labels.get("tickers", []))
+        self.offsets = labels.get("offsets", {})
+        self._analyst_index = {a: i for i, a in enumerate(self.analysts)}
+        self._ticker_index = {t: i for i, t in enumerate(self.tickers)}
+
+        records_path = self._path("records.bin")
+        if records_path.exists():
+            raw = records_path.read_bytes()
+            # Drop a torn last record from a crash mid-append
+            usable = len(raw) - len(raw) % RECORD_DTYPE.itemsize
+            self._records = np.frombuffer(
+                raw[:usable],
+                dtype=RECORD_DTYPE,
+            ).copy()
+            self._size = len(self._records)
+
+    def _save_labels(self):
+        path = self._path("labels.json")
+        if not path:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "analysts": self.analysts,
+                    "tickers": self.tickers,
+                    "offsets": self.offsets,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+
+    def _indices(
+        self,
+        labels: Sequence[str],
+        names: List[str],
+        index: Dict[str, int],
+    ) -> np.ndarray:
+        for label in labels:
+            if label not in index:
+                index[label] = len(names)
+                names.append(label)
+        return np.array([index[label] for label in labels], dtype=np.int64)
+
+    def append(
+        self,
+        analysts: Sequence[str],
+        tickers: Sequence[str],
+        date: str,
+        signals: np.ndarray,
+        outcomes: np.ndarray,
+    ):
+        """Append one day of evaluated signals"""
+        n = len(analysts)
+        if not n:
+            return
+        known = (len(self.analysts), len(self.tickers))
+
+        batch = np.empty(n, dtype=RECORD_DTYPE)
+        batch["analyst"] = self._indices(
+            analysts,
+            self.analysts,
+            self._analyst_index,
+        )
+        batch["ticker"] = self._indices(
+            tickers,
+            self.tickers,
+            self._ticker_index,
+        )
+        batch["day"] = day_number(date)
+        batch["signal"] = signals
+        batch["outcome"] = outcomes
+
+        if known != (len(self.analysts), len(self.tickers)):
+            self._save_labels()
+
+        needed = self._size + n
+        if needed > len(self._records):
+            grown = np.zeros(max(needed, 2 * len(self._records)), RECORD_DTYPE)
+            grown[: self._size] = self.records
+            self._records = grown
+        self._records[self._size : needed] = batch
+        self._size = needed
+
+        path = self._path("records.bin")
+        if path:
+            with open(path, "ab") as f:
+                f.write(batch.tobytes())
+
+    def set_offsets(self, offsets: Dict[str, Dict[str, int]]):
+        """Totals to add to the aggregates, e.g. from a legacy leaderboard"""
+        self.offsets = offsets
+        self._save_labels()
+
+    def clear(self):
+        """Drop all records, labels and offsets"""
+        self.analysts, self.tickers = [], []
+        self._analyst_index, self._ticker_index = {}, {}
+        self.offsets = {}
+        self._records = np.zeros(0, dtype=RECORD_DTYPE)
+        self._size = 0
+        for name in ("records.bin", "labels.json"):
+            path = self._path(name)
+            if path and path.exists():
+                path.unlink()
+
+    def window_start(self, window: int) -> Optional[str]:
+        """First date of the last ``window`` trading days with records"""
+        days = np.unique(self.records["day"])
+        if not len(days):
+            return None
+        return day_string(days[-min(window, len(days))])
+
+    def aggregates(
+        self,
+        since: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Signal counts and win rate per analyst
+
+        Args:
+            since: Only count records on or after this date (YYYY-MM-DD);
+                offsets are only included for the full history
+
+        Returns:
+            {analyst: {bull: {n, win, unknown}, bear: {...}, hold,
+            evaluated, wins, win_rate}}
+        """
+        records = self.records
+        if since is not None:
+            records = records[records["day"] >= day_number(since)]
+        return self._aggregate(records, with_offsets=since is None)
+
+    def _aggregate(
+        self,
+        records: np.ndarray,
+        with_offsets: bool,
+    ) -> Dict[str, Dict[str, Any]]:
+        size = len(self.analysts)
+        analyst = records["analyst"]
+        signal = records["signal"]
+        outcome = records["outcome"]
+
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(analyst[mask], minlength=size)
+
+        counts = {
+            "bull_n": count(signal == LONG),
+            "bull_win": count((signal == LONG) & (outcome == WIN)),
+            "bull_unknown": count((signal == LONG) & (outcome == UNKNOWN)),
+            "bear_n": count(signal == SHORT),
+            "bear_win": count((signal == SHORT) & (outcome == WIN)),
+            "bear_unknown": count((signal == SHORT) & (outcome == UNKNOWN)),
+            "hold": count(signal == HOLD),
+        }
+
+        result = {}
+        for i, name in enumerate(self.analysts):
+            row = {key: int(values[i]) for key, values in counts.items()}
+            if with_offsets:
+                for key, value in self.offsets.get(name, {}).items():
+                    row[key] = row.get(key, 0) + value
+            result[name] = row
+        if with_offsets:
+            for name, offset in self.offsets.items():
+                result.setdefault(name, dict(offset))
+
+        for name, row in result.items():
+            evaluated = (
+                row.get("bull_n", 0)
+                - row.get("bull_unknown", 0)
+                + row.get("bear_n", 0)
+                - row.get("bear_unknown", 0)
+            )
+            wins = row.get("bull_win", 0) + row.get("bear_win", 0)
+            result[name] = {
+                "bull": {
+                    "n": row.get("bull_n", 0),
+                    "win": row.get("bull_win", 0),
+                    "unknown": row.get("bull_unknown", 0),
+                },
+                "bear": {
+                    "n": row.get("bear_n", 0),
+                    "win": row.get("bear_win", 0),
+                    "unknown": row.get("bear_unknown", 0),
+                },
+                "hold": row.get("hold", 0),
+                "evaluated": evaluated,
+                "wins": wins,
+                "win_rate": wins / evaluated if evaluated > 0 else None,
+            }
+        return result
+
+    def rolling_win_rates(self, window: int) -> Dict[str, Any]:
+        """
+        Win rate per analyst over a rolling window of trading days
+
+        Returns:
+            {"dates": [...], "win_rates": (analysts x dates) array with
+            NaN where an analyst had no evaluated signal in the window}
+        """
+        records = self.records
+        evaluated = (records["signal"] != HOLD) & (records["outcome"] >= 0)
+        records = records[evaluated]
+        days, day_pos = np.unique(records["day"], return_inverse=True)
+        shape = (len(self.analysts), len(days))
+
+        flat = records["analyst"].astype(np.int64) * len(days) + day_pos
+        total = np.bincount(flat, minlength=shape[0] * shape[1])
+        wins = np.bincount(
+            flat,
+            weights=records["outcome"] == WIN,
+            minlength=shape[0] * shape[1],
+        )
+
+        def windowed(values: np.ndarray) -> np.ndarray:
+            cum = np.cumsum(values.reshape(shape), axis=1)
+            cum = np.concatenate([np.zeros((shape[0], 1)), cum], axis=1)
+            start = np.maximum(np.arange(shape[1]) - window + 1, 0)
+            return cum[:, 1:] - cum[:, start]
+
+        total_w = windowed(total)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(total_w > 0, windowed(wins) / total_w, np.nan)
+        return {
+            "dates": [day_string(day) for day in days],
+            "win_rates": rates,
+        }
+
+    def recent_signals(
+        self,
+        analyst: str,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Latest signals of an analyst in the leaderboard format"""
+        index = self._analyst_index.get(analyst)
+        if index is None:
+            return []
+        rows = np.flatnonzero(self.records["analyst"] == index)[-limit:]
+        selected = self.records[rows]
+
+        signals = []
+        for ticker, day, signal, outcome in zip(
+            selected["ticker"].tolist(),
+            selected["day"].tolist(),
+            selected["signal"].tolist(),
+            selected["outcome"].tolist(),
+        ):
+            if outcome == WIN:
+                is_correct: Any = True
+            elif outcome == LOSS:
+                is_correct = False
+            elif outcome == UNKNOWN:
+                is_correct = "unknown"
+            else:
+                is_correct = None
+            signals.append(
+                {
+                    "ticker": self.tickers[ticker],
+                    "signal": SIGNAL_DISPLAY.get(signal, "neutral"),
+                    "date": day_string(day),
+                    "is_correct": is_correct,
+                },
+            )
+        return signals
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+SeriesStore - Append-only time series for dashboard histories
+
+Each series (equity history, trades, ...) is a JSONL file with one item
+per line, loaded once and then kept in memory. Persisting a series only
+appends the items added since the last write, so the per-cycle cost does
+not grow with the history length. A series that was changed other than
+by appending is rewritten atomically.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(item: Any) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+
+class SeriesStore:
+    """Directory of append-only JSONL series"""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize series store
+
+        Args:
+            directory: Directory holding one ``{name}.jsonl`` per series
+        """
+        self.directory = Path(directory)
+        self._series: Dict[str, List[Any]] = {}
+
+    def path_for(self, name: str) -> Path:
+        return self.directory / f"{name}.jsonl"
+
+    def get(self, name: str) -> List[Any]:
+        """
+        Get the persisted items of a series, oldest first
+
+        The returned list is owned by the store; copy it before mutating.
+        """
+        items = self._series.get(name)
+        if items is None:
+            items = self._load(name)
+            self._series[name] = items
+        return items
+
+    def _load(self, name: str) -> List[Any]:
+        path = self.path_for(name)
+        if not path.exists():
+            return []
+
+        items = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-append
+                    logger.warning(f"Skipping corrupt line in {path.name}")
+        return items
+
+    def sync(self, name: str, items: List[Any]) -> int:
+        """
+        Persist ``items`` as the new content of a series
+
+        Only the tail beyond the persisted items is appended if ``items``
+        extends them; otherwise the series is rewritten.
+
+        Returns:
+            Number of lines written
+        """
+        persisted = self.get(name)
+        n = len(persisted)
+
+        if len(items) >= n and (n == 0 or items[n - 1] == persisted[n - 1]):
+            new_items = items[n:]
+            if not new_items:
+                return 0
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path_for(name), "a", encoding="utf-8") as f:
+                f.write("".join(_dumps(item) + "\n" for item in new_items))
+            persisted.extend(new_items)
+            return len(new_items)
+
+        self._rewrite(name, items)
+        return len(items)
+
+    def _rewrite(self, name: str, items: List[Any]):
+        """Replace a series atomically"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(name)
+        tmp_path = path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(_dumps(item) + "\n" for item in items))
+        os.replace(tmp_path, path)
+        self._series[name] = list(items)
+        logger.debug(f"Series rewritten: {name} ({len(items)} items)")
@@ -4,14 +4,37 @@ Storage Service - Data persistence and dashboard file management
 Handles reading/writing dashboard JSON files and portfolio state
 """
 # pylint: disable=R0904
+import hashlib
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .feed_log import FeedLog
+from .prediction_store import PredictionStore
+from .series_store import SeriesStore
+
 logger = logging.getLogger(__name__)
 
+# Internal state entries that only grow, stored as append-only series
+SERIES_KEYS = (
+    "equity_history",
+    "baseline_history",
+    "baseline_vw_history",
+    "momentum_history",
+    "all_trades",
+)
+
+# summary.json fields served from the series instead of the file
+SUMMARY_SERIES = {
+    "equity": "equity_history",
+    "baseline": "baseline_history",
+    "baseline_vw": "baseline_vw_history",
+    "momentum": "momentum_history",
+}
+
 
 class StorageService:
     """
@@ -21,9 +44,15 @@ class StorageService:
     1. Load/save dashboard JSON files
         (summary, holdings, stats, trades, leaderboard)
     2. Load/save internal state (_internal_state.json)
-    3. Load/save server state (server_state.json) with feed history
+    3. Load/save server state snapshots (server_state.json) and the
+        append-only feed log (feed_log.jsonl)
     4. Manage portfolio state persistence
     5. Support loading from saved state to resume execution
+
+    Growing histories (equity/baseline/momentum, all trades) are kept in
+    append-only series under ``history/`` and merged into the internal
+    state and summary on load. JSON files are written compactly, through
+    a temp file + rename, and only when their content changed.
     """
 
     def __init__(
@@ -54,16 +83,26 @@ class StorageService:
             "leaderboard": self.dashboard_dir / "leaderboard.json",
         }
 
-        # Internal state file
+        # Internal state file and append-only histories
         self.internal_state_file = self.dashboard_dir / "_internal_state.json"
+        self.series = SeriesStore(self.dashboard_dir / "history")
+        # Evaluated analyst signals behind the leaderboard
+        self.predictions = PredictionStore(self.dashboard_dir / "predictions")
+
+        # Internal state, read from file once and then kept in memory
+        self._internal_state: Optional[Dict[str, Any]] = None
+
+        # Digest of the last content written per file (dirty tracking)
+        self._written_digests: Dict[Path, str] = {}
 
         # Server state directory and file
         self.state_dir = self.dashboard_dir.parent / "state"
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.server_state_file = self.state_dir / "server_state.json"
 
-        # Feed history (for agent messages)
+        # Feed history (for agent messages), newest entries kept in memory
         self.max_feed_history = 200
+        self.feed_log = FeedLog(self.state_dir / "feed_log.jsonl")
 
         # File modification time cache (for change detection)
         self.file_mtimes: Dict[str, float] = {}
@@ -93,11 +132,17 @@ class StorageService:
 
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                data = json.load(f)
         except Exception as e:
             logger.error(f"Failed to load {file_type}.json: {e}")
             return None
 
+        if file_type == "summary" and isinstance(data, dict):
+            for field, series_key in SUMMARY_SERIES.items():
+                if field not in data:
+                    data[field] = list(self.series.get(series_key))
+        return data
+
     def save_file(self, file_type: str, data: Any):
         """
         Save dashboard JSON file
@@ -111,12 +156,37 @@ class StorageService:
             logger.error(f"Unknown file type: {file_type}")
             return
 
+        # Histories are persisted as series and merged back on load
+        if file_type == "summary" and isinstance(data, dict):
+            data = {k: v for k, v in data.items() if k not in SUMMARY_SERIES}
+
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._write_json(file_path, data)
         except Exception as e:
             logger.error(f"Failed to save {file_type}.json: {e}")
 
+    def _write_json(self, file_path: Path, data: Any) -> bool:
+        """
+        Write compact JSON atomically, skipping unchanged content
+
+        Returns:
+            True if the file was written
+        """
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if (
+            self._written_digests.get(file_path) == digest
+            and file_path.exists()
+        ):
+            return False
+
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+        self._written_digests[file_path] = digest
+        return True
+
     def check_file_updates(self) -> Dict[str, bool]:
         """
         Check which dashboard files have been updated since last check
@@ -148,11 +218,21 @@ class StorageService:
 
     def load_internal_state(self) -> Dict[str, Any]:
         """
-        Load internal state from file
+        Load internal state, read from file on first use
+
+        The state stays in memory and is shared by all callers, so
+        cycles append to its histories without copying them; call
+        ``save_internal_state`` after changing it.
 
         Returns:
             Internal state dictionary with default values
         """
+        if self._internal_state is None:
+            self._internal_state = self._read_internal_state()
+        return self._internal_state
+
+    def _read_internal_state(self) -> Dict[str, Any]:
+        """Read internal state from file, filling in defaults"""
         default_state = {
             "baseline_state": {"initialized": False, "initial_allocation": {}},
             "baseline_vw_state": {
@@ -179,7 +259,7 @@ class StorageService:
         }
 
         if not self.internal_state_file.exists():
-            return default_state
+            return self._attach_series(default_state)
 
         try:
             with open(self.internal_state_file, "r", encoding="utf-8") as f:
@@ -190,13 +270,23 @@ class StorageService:
                 data.setdefault(key, value)
 
             logger.info("Loaded internal state from file")
-            return data
+            return self._attach_series(data)
 
         except Exception as e:
             logger.warning(
                 f"Failed to load internal state, using defaults: {e}",
             )
-            return default_state
+            return self._attach_series(default_state)
+
+    def _attach_series(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill the growing histories in from their series"""
+        for key in SERIES_KEYS:
+            embedded = state.get(key)
+            # State files written before the series existed embed them
+            if embedded and not self.series.get(key):
+                self.series.sync(key, embedded)
+            state[key] = list(self.series.get(key))
+        return state
 
     def save_internal_state(self, state: Dict[str, Any]):
         """
@@ -208,9 +298,15 @@ class StorageService:
         if not state:
             return
 
+        self._internal_state = state
         try:
-            with open(self.internal_state_file, "w", encoding="utf-8") as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
+            for key in SERIES_KEYS:
+                if key in state:
+                    self.series.sync(key, state[key])
+            self._write_json(
+                self.internal_state_file,
+                {k: v for k, v in state.items() if k not in SERIES_KEYS},
+            )
         except Exception as e:
             logger.error(f"Failed to save internal state: {e}")
 
@@ -290,6 +386,7 @@ class StorageService:
         self.save_file("trades", [])
 
         # Leaderboard with model info
+        self.predictions.clear()
         self.generate_leaderboard()
 
         logger.info("Initialized empty dashboard")
@@ -696,14 +793,15 @@ class StorageService:
         """Generate trades.json"""
         all_trades = state.get("all_trades", [])
 
+        # Trades are appended in date order, so the newest are at the tail
         sorted_trades = sorted(
-            all_trades,
+            all_trades[-100:],
             key=lambda x: x.get("ts", 0),
             reverse=True,
         )
 
         trades = []
-        for trade in sorted_trades[:100]:
+        for trade in sorted_trades:
             trades.append(
                 {
                     "id": trade.get("id"),
@@ -752,19 +850,32 @@ class StorageService:
             "trading_days_completed": 0,
         }
 
-        if not self.server_state_file.exists():
-            return default_state
-
-        with open(self.server_state_file, "r", encoding="utf-8") as f:
-            saved_state = json.load(f)
+        if self.server_state_file.exists():
+            with open(self.server_state_file, "r", encoding="utf-8") as f:
+                saved_state = json.load(f)
+        else:
+            saved_state = {}
 
         # Merge with defaults to ensure all fields exist
         for key, value in default_state.items():
             saved_state.setdefault(key, value)
 
-        logger.info(f"Server state loaded from: {self.server_state_file}")
+        # Snapshots written before the feed log existed embed the history
+        legacy_feed = saved_state.pop("feed_history", [])
+        if legacy_feed and not len(self.feed_log):
+            for event in reversed(legacy_feed):
+                self.feed_log.append(event)
+            logger.info(f"Migrated {len(legacy_feed)} feed messages to log")
+
+        # Snapshot + tail of the log
+        tail = self.feed_log.page(limit=self.max_feed_history)
+        saved_state["feed_history"] = [event for _, event in tail]
+
+        if self.server_state_file.exists():
+            logger.info(f"Server state loaded from: {self.server_state_file}")
         logger.info(
-            f"Feed history: {len(saved_state.get('feed_history', []))} messages",  # noqa: E501
+            f"Feed history: {len(saved_state['feed_history'])} messages "
+            f"(log: {len(self.feed_log)})",
         )
         logger.info(
             f"Holdings: {len(saved_state.get('holdings', []))} items",
@@ -775,21 +886,20 @@ class StorageService:
 
     def save_server_state(self, state: Dict[str, Any]):
         """
-        Save server state to file
+        Save a server state snapshot to file
+
+        Feed history lives in the feed log, so the snapshot only records
+        the log position it is consistent with. Old log entries are
+        compacted away here once the log passes its high-water mark.
 
         Args:
             state: Server state dictionary
         """
         state_to_save = {
-            **state,
-            "last_saved": datetime.now().isoformat(),
+            key: value for key, value in state.items() if key != "feed_history"
         }
-
-        # Limit feed_history size
-        if "feed_history" in state_to_save:
-            state_to_save["feed_history"] = state_to_save["feed_history"][
-                : self.max_feed_history
-            ]
+        state_to_save["feed_seq"] = self.feed_log.last_seq
+        state_to_save["last_saved"] = datetime.now().isoformat()
 
         # Limit trades
         if "trades" in state_to_save:
@@ -806,6 +916,8 @@ class StorageService:
 
         logger.debug(f"Server state saved to: {self.server_state_file}")
 
+        self.feed_log.compact()
+
     def add_feed_message(
         self,
         state: Dict[str, Any],
@@ -814,6 +926,9 @@ class StorageService:
         """
         Add a message to feed history
 
+        The message is appended to the feed log and to the bounded
+        in-memory ``feed_history``; no state file is rewritten.
+
         Args:
             state: Server state dictionary to update
             event: Event dictionary with type, content, etc.
@@ -846,6 +961,7 @@ class StorageService:
 
         # Store event directly (flat structure, no metadata wrapper)
         feed_msg = dict(event)
+        self.feed_log.append(feed_msg)
 
         # Insert at beginning (newest first)
         if "feed_history" not in state:
@@ -861,6 +977,38 @@ class StorageService:
 
         return True
 
+    def load_feed_page(
+        self,
+        before_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read one page of feed history from the feed log
+
+        Args:
+            before_seq: Cursor returned by the previous page (None = newest)
+            limit: Page size (default: max_feed_history)
+
+        Returns:
+            Dict with events (newest first), the cursor for the next older
+            page and whether older entries exist
+        """
+        entries = self.feed_log.page(
+            before_seq=before_seq,
+            limit=limit or self.max_feed_history,
+        )
+        cursor = entries[-1][0] if entries else before_seq
+        return {
+            "events": [event for _, event in entries],
+            "before": cursor,
+            "has_more": bool(entries) and cursor > self.feed_log.first_seq,
+        }
+
+    def iter_feed(self, after_seq: int = 0):
+        """Iterate feed events newer than ``after_seq``, oldest first"""
+        for _, event in self.feed_log.iter_from(after_seq):
+            yield event
+
     def _get_default_stats(self) -> Dict[str, Any]:
         """Get default stats structure"""
         return {
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Test concurrent analyst fan-out in the trading pipeline
+"""
+import asyncio
+
+import pytest
+from agentscope.message import Msg
+
+from backend.core.agent_scheduler import AgentScheduler
+from backend.core.pipeline import TradingPipeline
+
+
+class FakeAnalyst:
+    def __init__(self, name: str, delay: float, tracker: dict):
+        self.name = name
+        self.delay = delay
+        self.tracker = tracker
+
+    async def reply(self, msg):
+        self.tracker["running"] += 1
+        self.tracker["peak"] = max(
+            self.tracker["peak"],
+            self.tracker["running"],
+        )
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.tracker["running"] -= 1
+        return Msg(self.name, f"{self.name}: AAPL UP", "assistant")
+
+
+class RecordingSync:
+    def __init__(self):
+        self.completed = []
+
+    async def on_agent_complete(self, agent_id, content):
+        self.completed.append(agent_id)
+
+
+def _make_analysts(delays):
+    tracker = {"running": 0, "peak": 0}
+    analysts = [
+        FakeAnalyst(f"analyst_{i}", delay, tracker)
+        for i, delay in enumerate(delays)
+    ]
+    return analysts, tracker
+
+
+@pytest.mark.asyncio
+async def test_analysts_run_concurrently_with_stable_sync_order():
+    # Later analysts finish first
+    analysts, tracker = _make_analysts([0.06, 0.04, 0.02, 0.01])
+    sync = RecordingSync()
+    pipeline = TradingPipeline(
+        analysts=analysts,
+        risk_manager=None,
+        portfolio_manager=None,
+        state_sync=sync,
+        scheduler=AgentScheduler(max_concurrency=4),
+    )
+
+    results = await pipeline._run_analysts_with_sync(["AAPL"], "2025-01-02")
+
+    assert tracker["peak"] == 4
+    assert [r["agent"] for r in results] == [a.name for a in analysts]
+    assert sync.completed == [a.name for a in analysts]
+
+    report = pipeline.scheduler.phase_report("analysts")
+    assert report["critical_agent"] == "analyst_0"
+    assert report["wall"] < report["sequential"]
+
+
+@pytest.mark.asyncio
+async def test_provider_limit_bounds_fan_out():
+    analysts, tracker = _make_analysts([0.01] * 6)
+    scheduler = AgentScheduler(
+        max_concurrency=4,
+        provider_limits={"openai": 2},
+        provider_fn=lambda agent: "OPENAI",
+    )
+    pipeline = TradingPipeline(
+        analysts=analysts,
+        risk_manager=None,
+        portfolio_manager=None,
+        scheduler=scheduler,
+    )
+
+    predictions = await pipeline._collect_final_predictions(
+        ["AAPL"],
+        "2025-01-02",
+    )
+
+    assert tracker["peak"] == 2
+    assert [p["agent"] for p in predictions] == [a.name for a in analysts]
+    assert predictions[0]["predictions"][0]["direction"] == "up"
+    assert len(scheduler.phase_report("final_predictions")["agents"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_analysts():
+    class FailingAnalyst(FakeAnalyst):
+        async def reply(self, msg):
+            raise RuntimeError("model down")
+
+    analysts, tracker = _make_analysts([0.5, 0.5])
+    analysts.insert(0, FailingAnalyst("broken", 0, tracker))
+    scheduler = AgentScheduler(max_concurrency=3)
+
+    with pytest.raises(RuntimeError):
+        await scheduler.run("analysts", analysts, lambda a: a.reply(None))
+    assert tracker["running"] == 0
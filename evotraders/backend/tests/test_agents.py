@@ -3,7 +3,7 @@
 import json
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from agentscope.message import Msg
@@ -450,6 +450,116 @@ class TestStorageService:
             assert aapl_holding["quantity"] == 100
             assert aapl_holding["currentPrice"] == 500.0
 
+    def test_histories_are_appended_incrementally(self):
+        from backend.services.storage import StorageService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = StorageService(
+                dashboard_dir=Path(tmpdir),
+                initial_cash=100000.0,
+            )
+            portfolio = {"cash": 100000.0, "positions": {}, "margin_used": 0.0}
+
+            for date in ["2024-01-15", "2024-01-16", "2024-01-17"]:
+                storage.update_dashboard_after_cycle(
+                    portfolio=portfolio,
+                    prices={},
+                    date=date,
+                )
+
+            # One line per point, histories kept out of the JSON files
+            equity_file = storage.series.path_for("equity_history")
+            assert len(equity_file.read_text().splitlines()) == 4
+            with open(storage.internal_state_file, encoding="utf-8") as f:
+                assert "equity_history" not in json.load(f)
+            with open(storage.files["summary"], encoding="utf-8") as f:
+                raw_summary = f.read()
+            assert "\n" not in raw_summary
+            assert "equity" not in json.loads(raw_summary)
+
+            # A fresh instance merges the series back in
+            reloaded = StorageService(
+                dashboard_dir=Path(tmpdir),
+                initial_cash=100000.0,
+            )
+            assert len(reloaded.load_file("summary")["equity"]) == 4
+            state = reloaded.load_internal_state()
+            assert len(state["momentum_history"]) == 4
+
+    def test_unchanged_files_are_not_rewritten(self):
+        from backend.services.storage import StorageService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = StorageService(
+                dashboard_dir=Path(tmpdir),
+                initial_cash=100000.0,
+            )
+            stats = {"totalTrades": 1}
+
+            storage.save_file("stats", stats)
+            storage.files["stats"].write_text("{}")
+            storage.save_file("stats", stats)
+            assert storage.files["stats"].read_text() == "{}"
+
+            storage.save_file("stats", {"totalTrades": 2})
+            assert storage.load_file("stats") == {"totalTrades": 2}
+
+    def test_legacy_internal_state_is_migrated(self):
+        from backend.services.storage import StorageService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = StorageService(
+                dashboard_dir=Path(tmpdir),
+                initial_cash=100000.0,
+            )
+            history = [{"t": 1000, "v": 100000}, {"t": 2000, "v": 101000}]
+            with open(storage.internal_state_file, "w", encoding="utf-8") as f:
+                json.dump({"equity_history": history}, f, indent=2)
+
+            state = storage.load_internal_state()
+            assert state["equity_history"] == history
+
+            state["equity_history"].append({"t": 3000, "v": 102000})
+            storage.save_internal_state(state)
+            lines = storage.series.path_for("equity_history").read_text()
+            assert len(lines.splitlines()) == 3
+
+    def test_cycles_append_to_the_state_in_memory(self):
+        from backend.services.storage import StorageService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = StorageService(
+                dashboard_dir=Path(tmpdir),
+                initial_cash=100000.0,
+            )
+            portfolio = {"cash": 100000.0, "positions": {}, "margin_used": 0.0}
+            storage.update_dashboard_after_cycle(
+                portfolio=portfolio,
+                prices={},
+                date="2024-01-15",
+            )
+            state = storage.load_internal_state()
+            equity = state["equity_history"]
+
+            # Later cycles neither reread the state nor copy its histories
+            with patch.object(
+                StorageService,
+                "_read_internal_state",
+                side_effect=AssertionError("state reread"),
+            ):
+                for date in ["2024-01-16", "2024-01-17"]:
+                    storage.update_dashboard_after_cycle(
+                        portfolio=portfolio,
+                        prices={},
+                        date=date,
+                    )
+
+            assert storage.load_internal_state() is state
+            assert state["equity_history"] is equity
+            assert len(equity) == 4
+            lines = storage.series.path_for("equity_history").read_text()
+            assert len(lines.splitlines()) == 4
+
 
 class TestTradeExecutor:
     def test_execute_trade_long(self):
@@ -519,6 +629,150 @@ class TestTradeExecutor:
         assert result["status"] == "success"
         assert result["message"] == "No trade needed"
 
+    def test_execute_trades_batch_matches_sequential(self):
+        from backend.utils.trade_executor import PortfolioTradeExecutor
+
+        portfolio = {
+            "cash": 2000.0,
+            "positions": {
+                "AAPL": {
+                    "long": 0,
+                    "short": 10,
+                    "long_cost_basis": 0.0,
+                    "short_cost_basis": 90.0,
+                },
+                "MSFT": {
+                    "long": 5,
+                    "short": 0,
+                    "long_cost_basis": 200.0,
+                    "short_cost_basis": 0.0,
+                },
+            },
+            "margin_requirement": 0.5,
+            "margin_used": 450.0,
+        }
+        decisions = {
+            "AAPL": {"action": "long", "quantity": 15},
+            "MSFT": {"action": "short", "quantity": 8},
+            # Fails: the cash left after AAPL and MSFT does not cover it
+            "NVDA": {"action": "long", "quantity": 100},
+            "GOOGL": {"action": "long", "quantity": 3},
+        }
+        prices = {"AAPL": 100.0, "MSFT": 210.0, "NVDA": 500.0, "GOOGL": 150.0}
+
+        batch = PortfolioTradeExecutor(initial_portfolio=portfolio)
+        report = batch.execute_trades(decisions, prices, "2024-01-15")
+
+        sequential = PortfolioTradeExecutor(initial_portfolio=portfolio)
+        for ticker, decision in decisions.items():
+            sequential.execute_trade(
+                ticker,
+                decision["action"],
+                decision["quantity"],
+                prices[ticker],
+                "2024-01-15",
+            )
+
+        assert batch.portfolio == sequential.portfolio
+        assert [t["ticker"] for t in report["executed_trades"]] == [
+            "AAPL",
+            "MSFT",
+            "GOOGL",
+        ]
+        assert report["executed_trades"][0]["trades"] == [
+            "Cover 10 shares",
+            "Buy 5 shares",
+        ]
+        assert report["failed_trades"][0]["ticker"] == "NVDA"
+        assert batch.portfolio["positions"]["MSFT"]["short"] == 3
+
+    def test_portfolio_history_stores_deltas(self):
+        from backend.utils.trade_executor import PortfolioTradeExecutor
+
+        executor = PortfolioTradeExecutor(
+            initial_portfolio={
+                "cash": 100000.0,
+                "positions": {},
+                "margin_requirement": 0.25,
+                "margin_used": 0.0,
+            },
+        )
+        prices = {"AAPL": 150.0, "MSFT": 300.0}
+
+        executor.execute_trades(
+            {
+                "AAPL": {"action": "long", "quantity": 10},
+                "MSFT": {"action": "long", "quantity": 5},
+            },
+            prices,
+            "2024-01-15",
+        )
+        day_one = executor.portfolio
+        executor.execute_trades(
+            {"AAPL": {"action": "short", "quantity": 4}},
+            prices,
+            "2024-01-16",
+        )
+
+        assert list(executor.portfolio_history[1]["positions"]) == ["AAPL"]
+        assert executor.portfolio_at(0) == day_one
+        assert executor.portfolio_at(-1) == executor.portfolio
+
+    def test_portfolio_history_rebased_when_portfolio_is_set(self):
+        from backend.utils.trade_executor import PortfolioTradeExecutor
+
+        executor = PortfolioTradeExecutor()
+        prices = {"AAPL": 150.0, "MSFT": 300.0}
+        executor.execute_trades(
+            {"AAPL": {"action": "long", "quantity": 10}},
+            prices,
+            "2024-01-15",
+        )
+        day_one = executor.portfolio
+
+        executor.portfolio = {
+            "cash": 50000.0,
+            "positions": {"MSFT": {"long": 20, "long_cost_basis": 250.0}},
+            "margin_requirement": 0.0,
+            "margin_used": 0.0,
+        }
+        executor.execute_trades(
+            {"MSFT": {"action": "long", "quantity": 5}},
+            prices,
+            "2024-01-16",
+        )
+
+        assert executor.portfolio_at(0) == day_one
+        assert executor.portfolio_at(1) == executor.portfolio
+        assert "AAPL" not in executor.portfolio_at(1)["positions"]
+
+    def test_fractional_quantities_are_rejected(self):
+        from backend.utils.trade_executor import (
+            PortfolioBook,
+            PortfolioTradeExecutor,
+        )
+
+        executor = PortfolioTradeExecutor()
+        report = executor.execute_trades(
+            {
+                "AAPL": {"action": "long", "quantity": 2.5},
+                "MSFT": {"action": "long", "quantity": 3.0},
+            },
+            {"AAPL": 150.0, "MSFT": 300.0},
+            "2024-01-15",
+        )
+
+        assert report["failed_trades"][0]["ticker"] == "AAPL"
+        assert "whole number" in report["failed_trades"][0]["reason"]
+        assert executor.portfolio["positions"]["MSFT"]["long"] == 3
+        assert "AAPL" not in executor.portfolio["positions"]
+        result = executor.execute_trade("AAPL", "long", 0.5, 150.0)
+        assert result["status"] == "failed"
+        with pytest.raises(ValueError):
+            PortfolioBook.from_portfolio(
+                {"cash": 0.0, "positions": {"AAPL": {"long": 1.5}}},
+            )
+
 
 class TestPipelineExecution:
     def test_execute_decisions(self):
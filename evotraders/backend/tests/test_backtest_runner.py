@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Test parallel backtest sharding, report merging and LLM response replay
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from agentscope.model import ChatModelBase, ChatResponse
+from agentscope.model._model_usage import ChatUsage
+
+from backend.core import backtest_runner
+from backend.core.backtest_runner import (
+    BacktestJob,
+    build_jobs,
+    merge_reports,
+    run_backtest_job,
+    shard_dates,
+)
+from backend.llm.models import RecordedChatModel, ResponseStore
+
+
+class FakeModel(ChatModelBase):
+    def __init__(self):
+        super().__init__(model_name="fake", stream=False)
+        self.calls = 0
+
+    async def __call__(self, messages, **kwargs):
+        self.calls += 1
+        return ChatResponse(
+            content=[{"type": "text", "text": f"answer {self.calls}"}],
+            usage=ChatUsage(input_tokens=12, output_tokens=3, time=0.5),
+        )
+
+
+def _leaderboard(bull_win: int, bear_win: int):
+    return [
+        {"agentId": "portfolio_manager", "rank": None},
+        {
+            "agentId": "technical_analyst",
+            "rank": 1,
+            "bull": {"n": 4, "win": bull_win, "unknown": 0},
+            "bear": {"n": 2, "win": bear_win, "unknown": 0},
+        },
+    ]
+
+
+def test_shard_dates_are_contiguous_and_balanced():
+    dates = [f"2025-01-{d:02d}" for d in range(1, 11)]
+
+    shards = shard_dates(dates, 3)
+    assert [len(s) for s in shards] == [4, 3, 3]
+    assert sum(shards, []) == dates
+    assert shard_dates(dates[:2], 5) == [[dates[0]], [dates[1]]]
+
+
+def test_build_jobs_expands_configs_and_shards():
+    jobs = build_jobs(
+        "2025-02-03",
+        "2025-02-14",
+        [
+            {"name": "base", "tickers": ["AAPL"]},
+            {"name": "cheap", "tickers": ["AAPL"], "env": {"MODEL_NAME": "m"}},
+        ],
+        num_shards=2,
+    )
+
+    assert [job.name for job in jobs] == [
+        "base_shard1",
+        "base_shard2",
+        "cheap_shard1",
+        "cheap_shard2",
+    ]
+    assert (jobs[0].start_date, jobs[0].end_date) == (
+        "2025-02-03",
+        "2025-02-07",
+    )
+    assert jobs[3].env == {"MODEL_NAME": "m"}
+
+
+def test_merge_reports_ranks_runs_and_sums_leaderboard():
+    results = [
+        {"name": "a", "total_return": 1.5, "leaderboard": _leaderboard(3, 1)},
+        {"name": "b", "total_return": 4.0, "leaderboard": _leaderboard(1, 1)},
+        {"name": "c", "error": "RuntimeError: boom"},
+    ]
+
+    report = merge_reports(results)
+
+    assert [run["name"] for run in report["runs"]] == ["b", "a"]
+    assert report["runs"][0]["rank"] == 1
+    assert [f["name"] for f in report["failed"]] == ["c"]
+
+    analyst = report["leaderboard"][1]
+    assert analyst["bull"] == {"n": 8, "win": 4, "unknown": 0}
+    assert analyst["winRate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_recorded_model_replays_without_calling_llm(tmp_path):
+    messages = [{"role": "user", "content": "Buy or sell?"}]
+    store = ResponseStore(tmp_path)
+
+    recorder = RecordedChatModel(FakeModel(), mode="record", store=store)
+    recorded = await recorder(messages)
+    # A recorded prompt is served from the store in record mode too
+    assert (await recorder(messages)).content == recorded.content
+    assert recorder.model.calls == 1
+    assert store.stats() == {"hits": 1, "misses": 1, "writes": 1}
+
+    replayer = RecordedChatModel(FakeModel(), mode="replay", store=store)
+    replayed = await replayer(messages)
+    assert replayed.content == recorded.content
+    assert replayer.model.calls == 0
+    # Token usage of the original call is replayed as well
+    assert replayed.usage.input_tokens == 12
+    assert replayed.usage.output_tokens == 3
+    assert replayed.usage.time == 0.5
+
+    with pytest.raises(KeyError):
+        await replayer([{"role": "user", "content": "Something else"}])
+
+    # Tools are part of the key
+    with pytest.raises(KeyError):
+        await replayer(messages, tools=[{"type": "function"}])
+
+
+@pytest.mark.asyncio
+async def test_passthrough_never_touches_store(tmp_path):
+    store = ResponseStore(tmp_path)
+    model = RecordedChatModel(FakeModel(), mode="passthrough", store=store)
+
+    await model([{"role": "user", "content": "hi"}])
+    await model([{"role": "user", "content": "hi"}])
+
+    assert model.model.calls == 2
+    assert store.stats() == {"hits": 0, "misses": 0, "writes": 0}
+
+
+async def _env_job(job, run_dir):
+    return {
+        "pid": os.getpid(),
+        "model": os.environ.get("MODEL_NAME"),
+        "llm_mode": os.environ.get("LLM_RESPONSE_MODE"),
+    }
+
+
+def test_job_env_does_not_leak_into_later_jobs_of_a_worker(monkeypatch):
+    monkeypatch.delenv("MODEL_NAME", raising=False)
+    monkeypatch.delenv("LLM_RESPONSE_MODE", raising=False)
+    # Forked workers see the patched job runner
+    monkeypatch.setattr(backtest_runner, "_run_job", _env_job)
+    dates = ("2025-01-02", "2025-01-03")
+    tuned = BacktestJob("tuned", *dates, ["AAPL"], env={"MODEL_NAME": "m"})
+    base = BacktestJob("base", *dates, ["AAPL"])
+
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("fork"),
+    ) as executor:
+        first = executor.submit(run_backtest_job, tuned, "out", "record")
+        first = first.result()
+        second = executor.submit(run_backtest_job, base, "out").result()
+
+    assert first["pid"] == second["pid"]
+    assert (first["model"], first["llm_mode"]) == ("m", "record")
+    assert (second["model"], second["llm_mode"]) == (None, None)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Test per-client send queues and price batching of the Broadcaster
+"""
+import asyncio
+import json
+
+import pytest
+
+from backend.services.broadcaster import Broadcaster
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.release = asyncio.Event()
+        if not delay:
+            self.release.set()
+
+    async def send(self, frame: str):
+        await self.release.wait()
+        self.frames.append(json.loads(frame))
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    broadcaster = Broadcaster(max_queue=4, price_interval_ms=1000)
+    fast, slow = FakeSocket(), FakeSocket(delay=1)
+    broadcaster.add_client(fast)
+    broadcaster.add_client(slow)
+
+    for i in range(10):
+        broadcaster.publish({"type": "agent_message", "n": i})
+        await asyncio.sleep(0)
+    await _drain()
+
+    assert [f["n"] for f in fast.frames] == list(range(10))
+    assert slow.frames == []
+    # Encoded once per message, not once per client
+    assert broadcaster.frames_encoded == 10
+
+    metrics = broadcaster.metrics()
+    assert metrics["clients"] == 2
+    assert metrics["frames_dropped"] > 0
+    assert metrics["max_queue_depth"] == 4
+
+    slow.release.set()
+    await _drain()
+    # The slow client keeps the newest events
+    assert slow.frames[-1]["n"] == 9
+    broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_price_ticks_batched_and_coalesced():
+    broadcaster = Broadcaster(max_queue=8, price_interval_ms=1000)
+    client = FakeSocket()
+    broadcaster.add_client(client)
+
+    broadcaster.update_price("AAPL", {"price": 1.0})
+    broadcaster.update_price("AAPL", {"price": 2.0})
+    broadcaster.update_price("MSFT", {"price": 3.0})
+    broadcaster.flush_prices()
+    await _drain()
+
+    # New clients start with a full snapshot
+    assert client.frames[0]["snapshot"] is True
+
+    broadcaster.update_price("MSFT", {"price": 4.0})
+    broadcaster.flush_prices()
+    await _drain()
+
+    delta = client.frames[-1]
+    assert delta["type"] == "price_batch"
+    assert delta["snapshot"] is False
+    assert delta["prices"] == {"MSFT": {"price": 4.0}}
+    assert broadcaster.metrics()["price_ticks"] == 4
+    broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_lagging_client_resyncs_from_snapshot():
+    broadcaster = Broadcaster(max_queue=8, price_interval_ms=1000)
+    client = FakeSocket(delay=1)
+    channel = broadcaster.add_client(client)
+    channel.price_resync = False
+
+    for i, symbol in enumerate(["AAPL", "MSFT", "NVDA"]):
+        broadcaster.update_price(symbol, {"price": float(i)})
+        broadcaster.flush_prices()
+    await _drain()
+
+    # Only one price frame is ever pending per client
+    assert channel.depth <= 2
+
+    client.release.set()
+    await _drain()
+
+    prices = {}
+    for frame in client.frames:
+        prices.update(frame["prices"])
+    assert prices == broadcaster.latest_prices
+    assert client.frames[-1]["snapshot"] is True
+    broadcaster.stop()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Test the conference transcript and conference cycles in the pipeline
+"""
+import pytest
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+
+from backend.core.conference import ConferenceTranscript, estimate_tokens
+from backend.core.pipeline import TradingPipeline
+
+
+class FakeAgent:
+    def __init__(self, name: str, words: int = 60):
+        self.name = name
+        self.sys_prompt = f"You are {name}."
+        self.memory = InMemoryMemory()
+        self.words = words
+        self.prompts = []
+
+    async def reply(self, msg):
+        self.prompts.append(msg.content)
+        await self.memory.add(msg)
+        response = Msg(
+            self.name,
+            " ".join([f"{self.name}-{len(self.prompts)}"] * self.words),
+            "assistant",
+        )
+        await self.memory.add(response)
+        return response
+
+    def get_portfolio_state(self):
+        return {"cash": 100000.0, "positions": {}}
+
+
+class IdMemory:
+    """Memory deleting by message id, as agentscope >= 1.0.12 does"""
+
+    def __init__(self):
+        self.msgs = []
+
+    async def add(self, msg):
+        self.msgs.append(msg)
+
+    async def size(self):
+        return len(self.msgs)
+
+    async def get_memory(self):
+        return list(self.msgs)
+
+    async def delete(self, msg_ids):
+        self.msgs = [msg for msg in self.msgs if msg.id not in msg_ids]
+
+
+@pytest.mark.asyncio
+async def test_transcript_compacts_oldest_cycles():
+    transcript = ConferenceTranscript(header="Day", token_budget=100)
+    for cycle in range(3):
+        await transcript.compact(cycle)
+        for speaker in ("pm", "analyst"):
+            transcript.add(cycle, speaker, f"cycle {cycle} " + "x " * 200)
+
+    assert transcript.summarized_cycles == 2
+    assert {turn.cycle for turn in transcript.turns} == {2}
+    assert "Cycle 1:" in transcript.summary
+    assert "Cycle 2:" in transcript.summary
+
+    # The current cycle is never summarized, whatever its size
+    await transcript.compact(2)
+    assert transcript.summarized_cycles == 2
+
+
+def test_transcript_prompt_prefix_is_stable():
+    transcript = ConferenceTranscript(
+        header="Day",
+        brief="Signals",
+        token_budget=10000,
+    )
+    transcript.add(0, "pm", "Concerns about AAPL")
+    first = transcript.render("Your view?")
+    transcript.add(0, "analyst", "AAPL looks fine")
+    second = transcript.render("Your view?")
+
+    prefix = first[: first.index("=== Your Turn ===")]
+    assert second.startswith(prefix)
+    assert "Signals" not in first
+    assert "Signals" in transcript.render("Agenda?", include_brief=True)
+
+
+@pytest.mark.asyncio
+async def test_conference_keeps_agent_memory_flat(monkeypatch):
+    monkeypatch.setenv("CONFERENCE_TOKEN_BUDGET", "600")
+    pm = FakeAgent("portfolio_manager")
+    analysts = [FakeAgent(f"analyst_{i}") for i in range(3)]
+    for agent in [pm] + analysts:
+        await agent.memory.add(Msg("system", "analysis", "user"))
+
+    pipeline = TradingPipeline(
+        analysts=analysts,
+        risk_manager=None,
+        portfolio_manager=pm,
+        max_comm_cycles=4,
+    )
+    summary = await pipeline._run_conference_cycles(
+        tickers=["AAPL"],
+        date="2025-01-02",
+        prices={"AAPL": 100.0},
+        analyst_results=[{"agent": "analyst_0", "content": "AAPL UP"}],
+        risk_assessment={"content": "Low risk"},
+    )
+
+    assert summary.startswith("portfolio_manager-5")
+    for analyst in analysts:
+        assert await analyst.memory.size() == 1
+    # Only the closing summary stays in the PM's memory
+    assert await pm.memory.size() == 2
+
+    transcript = pipeline.conference_transcript
+    assert transcript.summarized_cycles > 0
+    usage = transcript.usage_report()
+    assert [u["cycle"] for u in usage] == [1, 2, 3, 4, 5]
+    assert all(u["completion_tokens"] > 0 for u in usage)
+
+    # Prompts stay bounded by the budget instead of growing every cycle
+    longest = max(estimate_tokens(p) for p in analysts[-1].prompts)
+    assert longest < 600 + estimate_tokens(transcript.summary) + 200
+
+    # The conference turns stay in the trajectories for long-term memory
+    trajectories = await pipeline._capture_agent_trajectories()
+    analyst_msgs = trajectories["analyst_0"]
+    assert len(analyst_msgs) == 1 + 2 * 4
+    assert analyst_msgs[0].content == "analysis"
+    assert analyst_msgs[2].content.startswith("analyst_0-1")
+    pm_msgs = trajectories["portfolio_manager"]
+    # Four turns, then the summary instruction before the kept summary
+    assert len(pm_msgs) == 1 + 2 * 4 + 2
+    assert pm_msgs[-1].content == summary
+
+
+@pytest.mark.asyncio
+async def test_conference_turn_trims_memory_deleting_by_id():
+    agent = FakeAgent("analyst_0")
+    agent.memory = IdMemory()
+    await agent.memory.add(Msg("system", "analysis", "user"))
+    pipeline = TradingPipeline(
+        analysts=[agent],
+        risk_manager=None,
+        portfolio_manager=FakeAgent("portfolio_manager"),
+    )
+
+    await pipeline._conference_turn(
+        agent,
+        ConferenceTranscript(header="Day"),
+        0,
+        "Agenda?",
+    )
+
+    assert [msg.content for msg in await agent.memory.get_memory()] == [
+        "analysis",
+    ]
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Test the persistent, range-aware API cache
+"""
+import time
+
+from backend.data.cache import Cache
+from backend.data.schema import InsiderTrade
+
+
+def _price(date: str) -> dict:
+    return {
+        "open": 1.0,
+        "close": 1.0,
+        "high": 1.0,
+        "low": 1.0,
+        "volume": 1,
+        "time": date,
+    }
+
+
+def _store(cache, start, end, dates):
+    cache.set_range(
+        "prices",
+        "AAPL",
+        "finnhub",
+        start,
+        end,
+        [_price(d) for d in dates],
+        date_field="time",
+        key_fields=("time",),
+    )
+
+
+def _missing(cache, start, end):
+    return cache.get_missing_ranges("prices", "AAPL", "finnhub", start, end)
+
+
+def _dates(cache, start, end):
+    records = cache.get_range("prices", "AAPL", "finnhub", start, end)
+    return [r["time"] for r in records]
+
+
+def test_sub_range_served_and_gaps_reported():
+    cache = Cache(":memory:")
+    _store(cache, "2024-01-01", "2024-01-31", ["2024-01-02", "2024-01-15"])
+
+    assert _missing(cache, "2024-01-10", "2024-01-20") == []
+    assert _missing(cache, "2023-12-20", "2024-02-05") == [
+        ("2023-12-20", "2023-12-31"),
+        ("2024-02-01", "2024-02-05"),
+    ]
+    assert _dates(cache, "2024-01-10", "2024-01-20") == ["2024-01-15"]
+
+
+def test_cache_survives_restart(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    _store(Cache(path), "2024-01-01", "2024-01-05", ["2024-01-02"])
+    Cache(path).set_response("financial_metrics", "AAPL_ttm", [{"a": 1}])
+
+    reopened = Cache(path)
+    assert _missing(reopened, "2024-01-01", "2024-01-05") == []
+    assert reopened.get_financial_metrics("AAPL_ttm") == [{"a": 1}]
+
+
+def test_ttl_and_size_eviction():
+    cache = Cache(":memory:", ttls={"financial_metrics": 0})
+    cache.set_response("financial_metrics", "old", [{"a": 1}])
+    time.sleep(0.01)
+    assert cache.get_financial_metrics("old") is None
+
+    cache = Cache(":memory:", max_bytes=50)
+    _store(cache, "2024-01-01", "2024-01-05", ["2024-01-02", "2024-01-03"])
+    cache.set_response("line_items", "new", [{"b": 2}])
+    cache.evict()
+
+    assert _dates(cache, "2024-01-01", "2024-01-05") == []
+    assert cache.get_line_items("new") == [{"b": 2}]
+
+
+def test_overlapping_coverage_is_merged():
+    cache = Cache(":memory:")
+    _store(cache, "2024-01-01", "2024-01-10", ["2024-01-02"])
+    _store(cache, "2024-01-05", "2024-01-20", ["2024-01-15"])
+    # Adjacent to the merged range
+    _store(cache, "2024-01-21", "2024-01-31", ["2024-01-25"])
+    # Apart from it
+    _store(cache, "2024-03-01", "2024-03-05", [])
+
+    rows = cache._conn.execute(
+        "SELECT start_date, end_date FROM coverage ORDER BY start_date",
+    ).fetchall()
+    assert rows == [
+        ("2024-01-01", "2024-01-31"),
+        ("2024-03-01", "2024-03-05"),
+    ]
+    assert _dates(cache, "2024-01-01", "2024-01-31") == [
+        "2024-01-02",
+        "2024-01-15",
+        "2024-01-25",
+    ]
+
+
+def test_refetched_range_replaces_its_records():
+    cache = Cache(":memory:")
+    _store(cache, "2024-01-01", "2024-01-10", ["2024-01-02", "2024-01-03"])
+    _store(cache, "2024-01-03", "2024-01-04", ["2024-01-04"])
+
+    assert _dates(cache, "2024-01-01", "2024-01-10") == [
+        "2024-01-02",
+        "2024-01-04",
+    ]
+
+
+def test_insider_trades_differing_in_any_field_are_kept():
+    trade = {field: None for field in InsiderTrade.model_fields}
+    trade.update(
+        ticker="AAPL",
+        name="Jane Doe",
+        filing_date="2024-01-05",
+        transaction_date="2024-01-04",
+        transaction_shares=100.0,
+    )
+    # A buy and a sell of the same size on the same day
+    buy = {**trade, "shares_owned_before_transaction": 900.0}
+    sell = {**trade, "shares_owned_before_transaction": 1100.0}
+
+    cache = Cache(":memory:")
+    cache.set_range(
+        "insider_trades",
+        "AAPL",
+        "finnhub",
+        "2024-01-01",
+        "2024-01-10",
+        [buy, sell],
+        date_field="filing_date",
+        key_fields=tuple(InsiderTrade.model_fields),
+    )
+
+    trades = cache.get_range(
+        "insider_trades",
+        "AAPL",
+        "finnhub",
+        "2024-01-01",
+        "2024-01-10",
+    )
+    assert len(trades) == 2
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Test async prefetching and provider rate limiting
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.tools import data_prefetch
+from backend.utils.rate_limiter import TokenBucket
+
+
+def test_token_bucket_smooths_bursts():
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two tokens are free, the next two wait 0.1s each
+    assert time.monotonic() - start >= 0.18
+
+
+def test_token_bucket_pause_holds_callers():
+    bucket = TokenBucket(rate_per_minute=6000, capacity=5)
+    bucket.pause(0.1)
+
+    start = time.monotonic()
+    bucket.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_fetch_deduplicates_inflight_requests():
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(ticker, end_date):
+        calls.append(ticker)
+        release.wait(1)
+        return [ticker, end_date]
+
+    tasks = [
+        asyncio.create_task(
+            data_prefetch.fetch(
+                slow_fetch,
+                ticker="AAPL",
+                end_date="2024-01-02",
+            ),
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == ["AAPL"]
+    assert results == [["AAPL", "2024-01-02"]] * 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reports_failures(monkeypatch):
+    def fail(**kwargs):
+        raise ValueError("no api key")
+
+    for name in (
+        "get_prices",
+        "get_financial_metrics",
+        "get_insider_trades",
+        "get_company_news",
+    ):
+        monkeypatch.setattr(data_prefetch, name, fail)
+
+    result = await data_prefetch.prefetch(["AAPL", "MSFT"], "2024-01-02")
+
+    assert result["requested"] == 10
+    assert len(result["failed"]) == 10
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Test the shared technical indicator engine
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backend.data.schema import Price
+from backend.tools.indicator_engine import IndicatorEngine
+
+
+def _make_fetcher(calls):
+    dates = pd.bdate_range("2024-01-01", "2024-12-31")
+    closes = {
+        "AAPL": 100 + np.arange(len(dates), dtype=float),
+        "MSFT": 200 - 0.1 * np.arange(len(dates), dtype=float),
+    }
+
+    def fetch(ticker, start_date, end_date):
+        calls.append((ticker, start_date, end_date))
+        return [
+            Price(
+                open=close,
+                close=close,
+                high=close,
+                low=close,
+                volume=1,
+                time=date.strftime("%Y-%m-%d"),
+            )
+            for date, close in zip(dates, closes[ticker])
+            if start_date <= date.strftime("%Y-%m-%d") <= end_date
+        ]
+
+    return fetch
+
+
+def test_snapshot_cached_per_date_and_tickers():
+    """Same date and ticker set should not refetch or recompute"""
+    calls = []
+    engine = IndicatorEngine(price_fetcher=_make_fetcher(calls))
+
+    first = engine.snapshot(["AAPL", "MSFT"], "2024-06-03")
+    second = engine.snapshot(["MSFT", "AAPL"], "2024-06-03")
+
+    assert first is second
+    assert len(calls) == 2
+    assert first["trend"]["AAPL"]["price"] > first["trend"]["AAPL"]["sma_20"]
+    assert first["momentum"]["MSFT"]["mom_5"] < 0
+
+
+def test_snapshot_fetches_only_new_bars():
+    """Advancing one day should only request the missing tail"""
+    calls = []
+    engine = IndicatorEngine(price_fetcher=_make_fetcher(calls))
+
+    engine.snapshot(["AAPL"], "2024-06-03")
+    engine.snapshot(["AAPL"], "2024-06-04")
+
+    assert calls[-1] == ("AAPL", "2024-06-04", "2024-06-04")
+    assert engine.snapshot(["AAPL"], "2024-06-04")["volatility"]["AAPL"]
+
+
+def test_insufficient_data_is_none():
+    calls = []
+    engine = IndicatorEngine(price_fetcher=_make_fetcher(calls))
+
+    snapshot = engine.snapshot(["AAPL"], "2024-01-05")
+
+    assert snapshot["trend"]["AAPL"] is None
+
+
+def test_fetch_of_one_ticker_does_not_block_others():
+    """Only callers needing the same ticker wait for its fetch"""
+    calls = []
+    fetch = _make_fetcher(calls)
+    aapl_started = threading.Event()
+    release = threading.Event()
+
+    def slow_aapl(ticker, start_date, end_date):
+        if ticker == "AAPL":
+            aapl_started.set()
+            release.wait(5)
+        return fetch(ticker, start_date, end_date)
+
+    engine = IndicatorEngine(price_fetcher=slow_aapl)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        slow = pool.submit(engine.snapshot, ["AAPL"], "2024-06-03")
+        assert aapl_started.wait(5)
+        waiting = pool.submit(engine.snapshot, ["AAPL"], "2024-06-03")
+        fast = pool.submit(engine.snapshot, ["MSFT"], "2024-06-03")
+
+        assert fast.result(timeout=5)["trend"]["MSFT"]
+        assert not slow.done()
+        release.set()
+        assert waiting.result(timeout=5) is slow.result(timeout=5)
+
+    # The waiting caller reused the fetched history
+    assert [call[0] for call in calls] == ["MSFT", "AAPL"]
@@ -3,10 +3,16 @@
 import asyncio
 import time
 from unittest.mock import MagicMock, AsyncMock, patch
+import pandas as pd
 import pytest
 from backend.services.market import MarketService
 from backend.data.mock_price_manager import MockPriceManager
 from backend.data.polling_price_manager import PollingPriceManager
+from backend.data.async_price_manager import AsyncPollingPriceManager
+from backend.data.historical_price_manager import HistoricalPriceManager
+from backend.data.price_store import PriceStore
+from backend.data.ret_data_updater import DataUpdater
+from backend.utils.rate_limiter import TokenBucket
 
 
 class TestMockPriceManager:
@@ -223,6 +229,191 @@ class TestPollingPriceManager:
         assert len(manager.open_prices) == 0
 
 
+class TestAsyncPollingPriceManager:
+    @staticmethod
+    def _manager(**kwargs):
+        return AsyncPollingPriceManager(
+            api_key="test_key",
+            limiter=TokenBucket(rate_per_minute=60000, capacity=100),
+            **kwargs,
+        )
+
+    def test_moving_symbol_polled_faster(self):
+        manager = self._manager(poll_interval=12, min_interval=2)
+        manager.subscribe(["AAPL", "MSFT"])
+
+        manager._reschedule("AAPL", 100.0, 101.0)
+        manager._reschedule("AAPL", 101.0, 102.0)
+        manager._reschedule("MSFT", 100.0, 100.0)
+
+        assert manager.intervals["AAPL"] == 3
+        assert manager.intervals["MSFT"] == 12
+
+        for _ in range(5):
+            manager._reschedule("AAPL", 102.0, 102.0)
+        assert manager.intervals["AAPL"] == 12
+
+    @pytest.mark.asyncio
+    async def test_quotes_fetched_concurrently_on_loop(self):
+        manager = self._manager(poll_interval=30, concurrency=10)
+        symbols = [f"S{i}" for i in range(10)]
+        inflight = []
+
+        async def fake_quote(client, symbol):
+            inflight.append(symbol)
+            await asyncio.sleep(0.2)
+            return {"c": 100.0, "o": 99.0, "t": 1}
+
+        loop = asyncio.get_running_loop()
+        ticks = []
+        manager.add_price_callback(
+            lambda data: ticks.append((data, asyncio.get_running_loop())),
+        )
+        manager.subscribe(symbols)
+
+        with patch.object(manager, "_fetch_quote", side_effect=fake_quote):
+            start = time.monotonic()
+            manager.start()
+            while len(ticks) < len(symbols):
+                await asyncio.sleep(0.01)
+            elapsed = time.monotonic() - start
+            manager.stop()
+
+        # One round trip for the whole watchlist, not one per symbol
+        assert elapsed < 1.0
+        assert sorted(inflight) == sorted(symbols)
+        assert all(tick_loop is loop for _, tick_loop in ticks)
+        assert ticks[0][0]["open"] == 99.0
+
+
+class TestHistoricalPriceManager:
+    @staticmethod
+    def _write_csv(data_dir, symbol, rows):
+        lines = ["open,close,high,low,volume,time,ret"]
+        for time_str, open_price, close_price in rows:
+            lines.append(
+                f"{open_price},{close_price},{close_price},{open_price},"
+                f"100,{time_str},",
+            )
+        (data_dir / f"{symbol}.csv").write_text("\n".join(lines) + "\n")
+
+    def test_csv_imported_into_store(self, tmp_path):
+        self._write_csv(
+            tmp_path,
+            "AAPL",
+            [("2024-01-02", 10.0, 11.0), ("2024-01-03", 11.0, 12.0)],
+        )
+        store = PriceStore(tmp_path)
+
+        records = store.load("AAPL")
+
+        assert (tmp_path / "AAPL.npy").exists()
+        assert len(records) == 2
+        assert store.last_date("AAPL") == "2024-01-03"
+
+    def test_store_rebuilt_when_csv_changes(self, tmp_path):
+        self._write_csv(tmp_path, "AAPL", [("2024-01-02", 10.0, 11.0)])
+        store = PriceStore(tmp_path)
+        assert store.last_date("AAPL") == "2024-01-02"
+        built_at = (tmp_path / "AAPL.npy").stat().st_mtime_ns
+
+        # Unchanged CSV: the array is reused as is
+        store.load("AAPL")
+        assert (tmp_path / "AAPL.npy").stat().st_mtime_ns == built_at
+
+        self._write_csv(
+            tmp_path,
+            "AAPL",
+            [("2024-01-02", 10.0, 11.0), ("2024-01-03", 11.0, 12.0)],
+        )
+        records = store.load("AAPL")
+
+        assert len(records) == 2
+        assert store.last_date("AAPL") == "2024-01-03"
+
+    def test_set_date_forward_fills(self, tmp_path):
+        self._write_csv(
+            tmp_path,
+            "AAPL",
+            [("2024-01-02", 10.0, 11.0), ("2024-01-04", 12.0, 13.0)],
+        )
+        self._write_csv(
+            tmp_path,
+            "MSFT",
+            [("2024-01-03", 20.0, 21.0)],
+        )
+        manager = HistoricalPriceManager(store=PriceStore(tmp_path))
+        manager.subscribe(["AAPL", "MSFT"])
+        manager.preload_data("2024-01-02", "2024-01-04")
+
+        manager.set_date("2024-01-02")
+        assert manager.open_prices == {"AAPL": 10.0}
+
+        manager.set_date("2024-01-03")
+        assert manager.open_prices == {"AAPL": 10.0, "MSFT": 20.0}
+        assert manager.close_prices["AAPL"] == 11.0
+
+        manager.set_date("2024-01-05")
+        assert manager.open_prices == {"AAPL": 12.0, "MSFT": 20.0}
+        assert manager.get_price_for_date("AAPL", "2024-01-03") == 11.0
+        # Falls back to the latest price before the first bar
+        assert manager.get_price_for_date("MSFT", "2024-01-02") == 20.0
+
+    def test_store_write_merges_incrementally(self, tmp_path):
+        self._write_csv(
+            tmp_path,
+            "AAPL",
+            [("2024-01-02", 10.0, 10.0), ("2024-01-03", 11.0, 11.0)],
+        )
+        store = PriceStore(tmp_path)
+        store.load("AAPL")
+
+        new_rows = pd.DataFrame(
+            {
+                "time": ["2024-01-03", "2024-01-04"],
+                "open": [11.5, 12.0],
+                "close": [11.0, 12.1],
+            },
+        )
+        assert store.write("AAPL", new_rows) == 3
+
+        records = store.load("AAPL")
+        assert list(records["open"]) == [10.0, 11.5, 12.0]
+        assert records["ret"][0] == pytest.approx(0.1)
+        assert records["ret"][1] == pytest.approx(0.1)
+
+    def test_updater_saves_store_without_reimporting_csv(self, tmp_path):
+        self._write_csv(
+            tmp_path,
+            "AAPL",
+            [("2024-01-02", 10.0, 10.0), ("2024-01-03", 11.0, 11.0)],
+        )
+        updater = DataUpdater.__new__(DataUpdater)
+        updater.data_dir = tmp_path
+        updater.store = PriceStore(tmp_path)
+        updater.store.load("AAPL")
+
+        new_rows = pd.DataFrame(
+            {
+                "open": [12.0],
+                "close": [12.1],
+                "high": [12.1],
+                "low": [12.0],
+                "volume": [100],
+                "time": ["2024-01-04"],
+                "ret": [None],
+            },
+        )
+        with patch.object(PriceStore, "import_csv") as import_csv:
+            assert updater.merge_and_save("AAPL", new_rows)
+            records = updater.store.load("AAPL")
+
+        import_csv.assert_not_called()
+        assert list(records["open"]) == [10.0, 11.0, 12.0]
+        # The last old row's return is recomputed with the new close
+        assert records["ret"][1] == pytest.approx(0.1)
+
+
 class TestMarketService:
     def test_init_mock_mode(self):
         service = MarketService(
@@ -396,6 +587,29 @@ class TestMarketService:
         assert len(received_prices) >= 1
         assert received_prices[0]["type"] == "price_update"
 
+    @pytest.mark.asyncio
+    async def test_price_func_receives_ticks_instead_of_broadcasts(self):
+        service = MarketService(
+            tickers=["AAPL"],
+            poll_interval=1,
+            mock_mode=True,
+        )
+        broadcast_func = AsyncMock()
+        ticks = []
+
+        await service.start(
+            broadcast_func,
+            price_func=lambda symbol, entry: ticks.append((symbol, entry)),
+        )
+        await asyncio.sleep(1.5)
+        service.stop()
+
+        assert ticks
+        symbol, entry = ticks[0]
+        assert symbol == "AAPL"
+        assert set(entry) == {"price", "open", "ret", "timestamp"}
+        broadcast_func.assert_not_called()
+
 
 class TestMarketServiceIntegration:
     @pytest.mark.asyncio
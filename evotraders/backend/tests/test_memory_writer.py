@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Test background long-term memory writes and the daily memory prefetch
+"""
+import asyncio
+import time
+
+import pytest
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+
+from backend.core.memory_writer import LongTermMemoryWriter
+from backend.core.pipeline import TradingPipeline
+
+
+class FakeApp:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def async_execute(self, name, workspace_id, trajectories):
+        await asyncio.sleep(self.delay)
+        self.calls.append((name, workspace_id, trajectories))
+
+
+class FakeReMe:
+    """Long-term memory with a ReMe-style app and workspace"""
+
+    def __init__(self, workspace_id: str, delay: float = 0.0):
+        self.app = FakeApp(delay)
+        self.workspace_id = workspace_id
+        self.queries = []
+
+    async def retrieve(self, msg):
+        self.queries.append(msg.content)
+        await asyncio.sleep(0.05)
+        return f"lessons for {self.workspace_id}"
+
+
+class FakeMemory:
+    """Long-term memory with only ``record``"""
+
+    def __init__(self):
+        self.recorded = []
+
+    async def record(self, msgs, score):
+        if score < 0:
+            raise RuntimeError("backend down")
+        self.recorded.append((len(msgs), score))
+
+
+class FakeAgent:
+    def __init__(self, name: str, long_term_memory=None):
+        self.name = name
+        self.memory = InMemoryMemory()
+        self.long_term_memory = long_term_memory
+        self._static_control = long_term_memory is not None
+
+
+def _msgs(n: int):
+    return [Msg("system", f"step {i}", "user") for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_records_per_backend():
+    reme = FakeReMe("analyst_0")
+    plain = FakeMemory()
+    writer = LongTermMemoryWriter(max_queue=8)
+
+    await writer.submit("analyst_0", reme, _msgs(2), 1.0)
+    await writer.submit("analyst_0", reme, _msgs(3), 0.0)
+    await writer.submit("risk_manager", plain, _msgs(1), 1.0)
+    await writer.submit("risk_manager", plain, _msgs(1), -1.0)
+    await writer.flush()
+
+    # Everything queued for the ReMe memory went in one request
+    assert len(reme.app.calls) == 1
+    name, workspace_id, trajectories = reme.app.calls[0]
+    assert (name, workspace_id) == ("summary_task_memory", "analyst_0")
+    assert [len(t["messages"]) for t in trajectories] == [2, 3]
+    assert trajectories[0]["messages"][0] == {
+        "role": "user",
+        "content": "step 0",
+    }
+    assert [t["score"] for t in trajectories] == [1.0, 0.0]
+
+    # A failing write is counted, not raised
+    assert plain.recorded == [(1, 1.0)]
+    stats = writer.stats()
+    assert stats["records"] == 3
+    assert stats["failures"] == 1
+    assert stats["pending"] == 0
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_reflection_does_not_wait_for_memory_writes():
+    analyst = FakeAgent("analyst_0", FakeReMe("analyst_0", delay=0.3))
+    risk = FakeAgent("risk_manager")
+    pm = FakeAgent("portfolio_manager", FakeReMe("pm", delay=0.3))
+    pipeline = TradingPipeline(
+        analysts=[analyst],
+        risk_manager=risk,
+        portfolio_manager=pm,
+    )
+
+    start = time.perf_counter()
+    await pipeline._record_to_long_term_memory(
+        date="2025-01-02",
+        agent_trajectories={
+            "analyst_0": _msgs(2),
+            "risk_manager": _msgs(2),
+            "portfolio_manager": _msgs(4),
+        },
+        trade_pnl=[],
+        total_pnl=10.0,
+        score=1.0,
+    )
+    assert time.perf_counter() - start < 0.1
+
+    await pipeline.close()
+    assert len(analyst.long_term_memory.app.calls) == 1
+    pm_trajectory = pm.long_term_memory.app.calls[0][2][0]["messages"]
+    assert pm_trajectory[-1]["content"].startswith("[Outcome] Trading day")
+    assert pipeline.memory_writer.stats()["records"] == 2
+
+
+@pytest.mark.asyncio
+async def test_memories_prefetched_once_per_day():
+    analysts = [
+        FakeAgent(f"analyst_{i}", FakeReMe(f"analyst_{i}")) for i in range(4)
+    ]
+    pipeline = TradingPipeline(
+        analysts=analysts,
+        risk_manager=FakeAgent("risk_manager"),
+        portfolio_manager=FakeAgent("portfolio_manager"),
+    )
+
+    start = time.perf_counter()
+    await pipeline._prefetch_long_term_memory(["AAPL"], "2025-01-02")
+    # Retrievals run concurrently
+    assert time.perf_counter() - start < 0.15
+
+    for analyst in analysts:
+        assert analyst.memory_prefetched
+        msgs = await analyst.memory.get_memory()
+        assert msgs[0].name == "long_term_memory"
+        assert f"lessons for {analyst.name}" in msgs[0].content
+        assert "2025-01-02" in analyst.long_term_memory.queries[0]
+    assert (
+        pipeline._memory_report(pipeline.memory_writer.stats())["retrieved"]
+        == 4
+    )
+
+    await pipeline._clear_all_agent_memory()
+    assert not any(a.memory_prefetched for a in analysts)
+    assert pipeline.retrieved_memories == {}
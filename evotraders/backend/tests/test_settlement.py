@@ -2,11 +2,17 @@
 """
 Test Settlement Coordinator and Baseline Calculations
 """
+import numpy as np
+import pandas as pd
 
+from backend.services.prediction_store import PredictionStore
+from backend.services.storage import StorageService
 from backend.utils.baselines import (
     BaselineCalculator,
+    BaselineEngine,
     calculate_momentum_scores,
 )
+from backend.utils.settlement import SettlementCoordinator
 from backend.utils.analyst_tracker import (
     AnalystPerformanceTracker,
     update_leaderboard_with_evaluations,
@@ -70,6 +76,116 @@ def test_momentum_scores():
     assert scores["MSFT"] < 0
 
 
+def _price_panel(days=70, n=5):
+    rng = np.random.default_rng(7)
+    dates = [
+        d.strftime("%Y-%m-%d")
+        for d in pd.bdate_range("2024-01-02", periods=days)
+    ]
+    tickers = [f"T{i}" for i in range(n)]
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.02, (days, n)), axis=0))
+    caps = rng.uniform(1e9, 1e12, n)
+    return dates, tickers, prices, caps
+
+
+def test_baseline_engine_matches_daily_calculator():
+    """Vectorized window pass reproduces the per-day calculator"""
+    dates, tickers, prices, caps = _price_panel()
+
+    calculator = BaselineCalculator(initial_capital=100000.0)
+    history = {}
+    expected = []
+    for row, date in enumerate(dates):
+        day_prices = dict(zip(tickers, prices[row]))
+        for ticker, price in day_prices.items():
+            history.setdefault(ticker, []).append((date, price))
+        last = calculator.momentum_last_rebalance_date
+        values = calculator.get_all_baseline_values(
+            tickers,
+            day_prices,
+            dict(zip(tickers, caps)),
+            calculate_momentum_scores(tickers, history, lookback_days=20),
+            date,
+            rebalance_momentum=last is None or last[:7] != date[:7],
+        )
+        expected.append(list(values.values()))
+
+    values = BaselineEngine(100000.0).run(dates, tickers, prices, caps)
+
+    np.testing.assert_allclose(
+        np.stack(list(values.values()), axis=1),
+        np.array(expected),
+    )
+
+
+def test_baseline_engine_steps_resume_from_exported_state():
+    """Daily steps plus a restored engine continue the same curves"""
+    dates, tickers, prices, caps = _price_panel()
+    full = BaselineEngine(100000.0).run(dates, tickers, prices, caps)
+
+    engine = BaselineEngine(100000.0)
+    for row, date in enumerate(dates[:30]):
+        values = engine.step(
+            date,
+            tickers,
+            dict(zip(tickers, prices[row])),
+            dict(zip(tickers, caps)),
+        )
+    assert values["momentum"] == full["momentum"][29]
+
+    restored = BaselineEngine(100000.0)
+    restored.load_state(engine.export_state())
+    rest = restored.run(dates[30:], tickers, prices[30:], caps)
+
+    for name, curve in rest.items():
+        np.testing.assert_allclose(curve, full[name][30:])
+
+
+def test_baseline_engine_momentum_ranks_requested_tickers():
+    """Tickers seen earlier but not passed in are never bought"""
+    dates, tickers, prices, caps = _price_panel(n=6)
+    february = next(i for i, d in enumerate(dates) if d >= "2024-02")
+
+    engine = BaselineEngine(100000.0)
+    engine.run(dates[:february], tickers, prices[:february], caps)
+    engine.run(dates[february:], tickers[:2], prices[february:, :2])
+
+    held = [t for t, s in zip(engine.tickers, engine.momentum_shares) if s]
+    # Top half of the two requested tickers, fully invested
+    assert len(held) == 1
+    assert held[0] in tickers[:2]
+    assert abs(engine.momentum_cash) < 1e-6
+
+
+def test_settlement_persists_baselines(tmp_path):
+    """Baseline state survives a coordinator restart"""
+    dates, tickers, prices, caps = _price_panel(days=3, n=2)
+    storage = StorageService(dashboard_dir=tmp_path / "team_dashboard")
+
+    coordinator = SettlementCoordinator(storage, initial_capital=100000.0)
+    for row, date in enumerate(dates):
+        result = coordinator.run_daily_settlement(
+            date=date,
+            tickers=tickers,
+            open_prices=dict(zip(tickers, prices[row])),
+            close_prices=dict(zip(tickers, prices[row])),
+            market_caps=dict(zip(tickers, caps)),
+            agent_portfolio={"cash": 100000.0, "positions": {}},
+            analyst_results=[],
+        )
+
+    restarted = SettlementCoordinator(storage, initial_capital=100000.0)
+    intraday = restarted.update_intraday_values(
+        tickers,
+        dict(zip(tickers, prices[-1])),
+        {},
+        {"cash": 100000.0, "positions": {}},
+    )
+    for name, value in result["baseline_values"].items():
+        assert intraday[name] == value
+    assert restarted.baselines.history_dates == dates
+
+
 def test_analyst_tracker_predictions():
     """Test analyst prediction recording with structured format"""
     tracker = AnalystPerformanceTracker()
@@ -138,6 +254,27 @@ def test_analyst_evaluation():
         assert signal["date"] == "2024-01-15"
 
 
+def test_analyst_evaluation_skips_unknown_predictions(caplog):
+    """Unknown prediction strings are logged, not counted as hold"""
+    tracker = AnalystPerformanceTracker()
+    tracker.daily_predictions = {
+        "technical_analyst": {"AAPL": "long", "MSFT": "buy"},
+    }
+
+    evaluations = tracker.evaluate_predictions(
+        {"AAPL": 100.0, "MSFT": 200.0},
+        {"AAPL": 105.0, "MSFT": 195.0},
+        "2024-01-15",
+    )
+
+    eval_result = evaluations["technical_analyst"]
+    assert eval_result["total_predictions"] == 1
+    assert eval_result["hold"] == 0
+    assert [s["ticker"] for s in eval_result["signals"]] == ["AAPL"]
+    assert len(tracker.store) == 1
+    assert "'buy'" in caplog.text
+
+
 def test_leaderboard_update():
     """Test leaderboard update with evaluations"""
     leaderboard = [
@@ -193,3 +330,107 @@ def test_leaderboard_update():
         assert "signal" in signal
         assert "date" in signal
         assert "is_correct" in signal
+
+
+def _evaluate_days(tracker, days):
+    """Run tracker over [(date, predictions, open, close), ...]"""
+    for date, predictions, open_prices, close_prices in days:
+        tracker.daily_predictions = predictions
+        tracker.evaluate_predictions(open_prices, close_prices, date)
+
+
+def test_prediction_store_aggregates_and_persistence(tmp_path):
+    """Store aggregates match accumulated evaluations and survive reload"""
+    store = PredictionStore(tmp_path / "predictions")
+    tracker = AnalystPerformanceTracker(store)
+    leaderboard = [
+        {
+            "agentId": "technical_analyst",
+            "rank": 0,
+            "winRate": None,
+            "bull": {"n": 0, "win": 0, "unknown": 0},
+            "bear": {"n": 0, "win": 0, "unknown": 0},
+            "signals": [],
+        },
+    ]
+
+    days = [
+        (
+            f"2024-01-{day:02d}",
+            {"technical_analyst": {"AAPL": "long", "MSFT": "short"}},
+            {"AAPL": 100.0, "MSFT": 200.0},
+            {"AAPL": 100.0 + day % 3 - 1, "MSFT": 200.0 + day % 2},
+        )
+        for day in range(1, 31)
+    ]
+    legacy = [dict(leaderboard[0], signals=[])]
+    for date, predictions, open_prices, close_prices in days:
+        tracker.daily_predictions = predictions
+        evaluations = tracker.evaluate_predictions(
+            open_prices,
+            close_prices,
+            date,
+        )
+        update_leaderboard_with_evaluations(legacy, evaluations)
+
+    rendered = tracker.render_leaderboard(leaderboard, signal_limit=10)
+    assert rendered[0]["bull"] == legacy[0]["bull"]
+    assert rendered[0]["bear"] == legacy[0]["bear"]
+    assert rendered[0]["winRate"] == legacy[0]["winRate"]
+    assert rendered[0]["signals"] == legacy[0]["signals"][-10:]
+    assert rendered[0]["recentWinRate"] is not None
+
+    reloaded = PredictionStore(tmp_path / "predictions")
+    assert len(reloaded) == 60
+    assert reloaded.aggregates() == store.aggregates()
+
+    rolling = reloaded.rolling_win_rates(window=5)
+    assert rolling["dates"][0] == "2024-01-01"
+    assert rolling["win_rates"].shape == (1, 30)
+    window = reloaded.aggregates(since=rolling["dates"][-5])
+    assert (
+        rolling["win_rates"][0, -1] == window["technical_analyst"]["win_rate"]
+    )
+
+
+def test_leaderboard_seeded_from_legacy_totals():
+    """Totals of a leaderboard kept without a store carry over"""
+    leaderboard = [
+        {
+            "agentId": "technical_analyst",
+            "rank": 1,
+            "winRate": 0.6,
+            "bull": {"n": 7, "win": 5, "unknown": 1},
+            "bear": {"n": 4, "win": 1, "unknown": 0},
+            "signals": [
+                {
+                    "ticker": "AAPL",
+                    "signal": "bull",
+                    "date": "2024-01-02",
+                    "is_correct": True,
+                },
+            ],
+        },
+    ]
+    tracker = AnalystPerformanceTracker()
+    tracker.seed_from_leaderboard(leaderboard)
+    _evaluate_days(
+        tracker,
+        [
+            (
+                "2024-01-03",
+                {"technical_analyst": {"AAPL": "long"}},
+                {"AAPL": 100.0},
+                {"AAPL": 101.0},
+            ),
+        ],
+    )
+
+    rendered = tracker.render_leaderboard(leaderboard)
+    assert rendered[0]["bull"] == {"n": 8, "win": 6, "unknown": 1}
+    assert rendered[0]["bear"] == {"n": 4, "win": 1, "unknown": 0}
+    assert rendered[0]["winRate"] == round(7 / 11, 4)
+    assert [s["date"] for s in rendered[0]["signals"]] == [
+        "2024-01-02",
+        "2024-01-03",
+    ]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Test StateSync persistence through the append-only feed log
+"""
+import json
+
+import pytest
+
+from backend.core.state_sync import StateSync
+from backend.services.feed_log import FeedLog
+from backend.services.storage import StorageService
+
+
+def _make_sync(tmp_path, snapshot_interval=50):
+    storage = StorageService(dashboard_dir=tmp_path / "dashboard")
+    sync = StateSync(storage, snapshot_interval=snapshot_interval)
+    sync.load_state()
+    return sync
+
+
+@pytest.mark.asyncio
+async def test_emit_appends_without_rewriting_snapshot(tmp_path):
+    sync = _make_sync(tmp_path, snapshot_interval=10)
+
+    for i in range(5):
+        await sync.on_system_message(f"msg {i}")
+    assert not sync.storage.server_state_file.exists()
+    assert len(sync.storage.feed_log) == 5
+
+    for i in range(5, 10):
+        await sync.on_system_message(f"msg {i}")
+    with open(sync.storage.server_state_file, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert "feed_history" not in snapshot
+    assert snapshot["feed_seq"] == 10
+
+    # Non-persisted events never touch the log
+    await sync.on_conference_cycle_start(1, 2)
+    assert len(sync.storage.feed_log) == 10
+
+
+@pytest.mark.asyncio
+async def test_load_replays_log_tail_after_snapshot(tmp_path):
+    sync = _make_sync(tmp_path, snapshot_interval=3)
+    for i in range(4):
+        await sync.on_system_message(f"msg {i}")
+
+    # Restart: snapshot was taken at seq 3, msg 3 only exists in the log
+    restored = _make_sync(tmp_path)
+    contents = [e["content"] for e in restored.state["feed_history"]]
+    assert contents == ["msg 3", "msg 2", "msg 1", "msg 0"]
+
+
+@pytest.mark.asyncio
+async def test_replay_and_paging_read_lazily(tmp_path):
+    sync = _make_sync(tmp_path)
+    for i in range(7):
+        await sync.on_system_message(f"msg {i}")
+
+    replayed = []
+
+    async def capture(event):
+        replayed.append(event["content"])
+
+    sync.set_broadcast_fn(capture)
+    await sync.replay_feed_history(delay_ms=0, limit=3)
+    assert replayed == ["msg 4", "msg 5", "msg 6"]
+
+    payload = sync.get_initial_state_payload(
+        include_dashboard=False,
+        feed_limit=3,
+    )
+    assert [e["content"] for e in payload["feed_history"]] == [
+        "msg 6",
+        "msg 5",
+        "msg 4",
+    ]
+    assert payload["feed_has_more"]
+
+    page = sync.get_feed_page(before=payload["feed_cursor"], limit=10)
+    assert [e["content"] for e in page["events"]] == [
+        "msg 3",
+        "msg 2",
+        "msg 1",
+        "msg 0",
+    ]
+    assert not page["has_more"]
+
+
+@pytest.mark.parametrize(
+    "before, limit",
+    [("12", None), (-1, None), (True, None), (3.5, None), (None, "10")],
+)
+def test_feed_page_rejects_bad_cursor(tmp_path, before, limit):
+    sync = _make_sync(tmp_path)
+    with pytest.raises(ValueError):
+        sync.get_feed_page(before=before, limit=limit)
+
+
+def test_legacy_snapshot_feed_is_migrated(tmp_path):
+    storage = StorageService(dashboard_dir=tmp_path / "dashboard")
+    legacy = {
+        "feed_history": [
+            {"type": "system", "content": "newest"},
+            {"type": "system", "content": "oldest"},
+        ],
+    }
+    with open(storage.server_state_file, "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+
+    state = storage.load_server_state()
+    assert [e["content"] for e in state["feed_history"]] == [
+        "newest",
+        "oldest",
+    ]
+    assert len(storage.feed_log) == 2
+
+
+def test_feed_log_compaction_keeps_cursors(tmp_path):
+    log = FeedLog(tmp_path / "feed.jsonl", max_entries=3)
+    for i in range(6):
+        log.append({"n": i})
+
+    assert log.compact()
+    assert len(log) == 3
+    assert [seq for seq, _ in log.page(before_seq=6)] == [5, 4]
+
+    # Reopening rebuilds the same index and keeps numbering
+    reopened = FeedLog(tmp_path / "feed.jsonl")
+    assert reopened.append({"n": 6}) == 7
+    assert [event["n"] for _, event in reopened.iter_from(4)] == [4, 5, 6]
+
+
+def test_feed_log_compacts_past_its_high_water_mark(tmp_path):
+    log = FeedLog(tmp_path / "feed.jsonl", max_entries=4)
+    for i in range(6):
+        log.append({"n": i})
+
+    # Up to 1.5x max_entries the log is left alone
+    assert not log.compact()
+    assert len(log) == 6
+
+    log.append({"n": 6})
+    assert log.compact()
+    assert [event["n"] for _, event in log.iter_from(0)] == [3, 4, 5, 6]
@@ -7,9 +7,10 @@ Returns human-readable text format for easy LLM consumption.
 """
 # flake8: noqa: E501
 # pylint: disable=C0301,W0613
+import asyncio
 import logging
 import traceback
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps
 from statistics import median
 from typing import List, Optional
@@ -24,10 +25,9 @@ from backend.tools.data_tools import (
     get_financial_metrics,
     get_insider_trades,
     get_market_cap,
-    get_prices,
-    prices_to_df,
     search_line_items,
 )
+from backend.tools.indicator_engine import get_indicator_engine
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +62,22 @@ def safe(func):
     return wrapper
 
 
+def threaded(func):
+    """
+    Wrap a sync tool as a coroutine that runs it in a worker thread.
+
+    Tools block on data fetches and pandas work. Run in a thread, the tool
+    calls of concurrent analysts (and parallel tool calls of one analyst)
+    overlap instead of blocking the event loop one after another.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
 def _fmt(val, fmt=".2f", suffix="") -> str:
     """Format value with handling for None."""
     if val is None:
@@ -366,47 +382,20 @@ def analyze_trend_following(
     current_date = _resolved_date(current_date)
     lines = [f"=== Trend Following Analysis ({current_date}) ===\n"]
 
-    end_dt = datetime.strptime(current_date, "%Y-%m-%d")
-    extended_start = (end_dt - timedelta(days=250)).strftime("%Y-%m-%d")
+    indicators = get_indicator_engine().snapshot(tickers, current_date)
 
     for ticker in tickers:
-        prices = get_prices(
-            ticker=ticker,
-            start_date=extended_start,
-            end_date=current_date,
-        )
-        if not prices or len(prices) < 10:
+        ind = indicators["trend"].get(ticker)
+        if ind is None:
             lines.append(f"{ticker}: Insufficient price data\n")
             continue
 
-        df = prices_to_df(prices)
-        n = len(df)
-
-        # Calculate moving averages
-        sma_20_win = min(20, n // 2)
-        sma_50_win = min(50, n - 5) if n > 25 else min(25, n - 5)
-        sma_200_win = min(200, n - 10) if n > 200 else None
-
-        df["SMA_20"] = df["close"].rolling(window=sma_20_win).mean()
-        df["SMA_50"] = df["close"].rolling(window=sma_50_win).mean()
-        if sma_200_win:
-            df["SMA_200"] = df["close"].rolling(window=sma_200_win).mean()
-
-        df["EMA_12"] = df["close"].ewm(span=min(12, n // 3)).mean()
-        df["EMA_26"] = df["close"].ewm(span=min(26, n // 2)).mean()
-        df["MACD"] = df["EMA_12"] - df["EMA_26"]
-        df["MACD_signal"] = df["MACD"].ewm(span=9).mean()
-
-        current_price = _safe_float(df["close"].iloc[-1])
-        sma_20 = _safe_float(df["SMA_20"].iloc[-1])
-        sma_50 = _safe_float(df["SMA_50"].iloc[-1])
-        sma_200 = (
-            _safe_float(df["SMA_200"].iloc[-1])
-            if "SMA_200" in df.columns
-            else None
-        )
-        macd = _safe_float(df["MACD"].iloc[-1])
-        macd_signal = _safe_float(df["MACD_signal"].iloc[-1])
+        current_price = _safe_float(ind["price"])
+        sma_20 = _safe_float(ind["sma_20"])
+        sma_50 = _safe_float(ind["sma_50"])
+        sma_200 = _safe_float(ind["sma_200"]) if "sma_200" in ind else None
+        macd = _safe_float(ind["macd"])
+        macd_signal = _safe_float(ind["macd_signal"])
 
         # Determine trend
         if sma_200:
@@ -461,41 +450,19 @@ def analyze_mean_reversion(
     current_date = _resolved_date(current_date)
     lines = [f"=== Mean Reversion Analysis ({current_date}) ===\n"]
 
-    end_dt = datetime.strptime(current_date, "%Y-%m-%d")
-    extended_start = (end_dt - timedelta(days=60)).strftime("%Y-%m-%d")
+    indicators = get_indicator_engine().snapshot(tickers, current_date)
 
     for ticker in tickers:
-        prices = get_prices(
-            ticker=ticker,
-            start_date=extended_start,
-            end_date=current_date,
-        )
-        if not prices or len(prices) < 5:
+        ind = indicators["mean_reversion"].get(ticker)
+        if ind is None:
             lines.append(f"{ticker}: Insufficient price data\n")
             continue
 
-        df = prices_to_df(prices)
-        n = len(df)
-
-        # Bollinger Bands
-        window = min(20, n - 2)
-        df["SMA"] = df["close"].rolling(window=window).mean()
-        df["STD"] = df["close"].rolling(window=window).std()
-        df["Upper_Band"] = df["SMA"] + (2 * df["STD"])
-        df["Lower_Band"] = df["SMA"] - (2 * df["STD"])
-
-        # RSI
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["RSI"] = 100 - (100 / (1 + rs))
-
-        current_price = _safe_float(df["close"].iloc[-1])
-        sma = _safe_float(df["SMA"].iloc[-1])
-        upper = _safe_float(df["Upper_Band"].iloc[-1])
-        lower = _safe_float(df["Lower_Band"].iloc[-1])
-        rsi = _safe_float(df["RSI"].iloc[-1])
+        current_price = _safe_float(ind["price"])
+        sma = _safe_float(ind["sma"])
+        upper = _safe_float(ind["upper"])
+        lower = _safe_float(ind["lower"])
+        rsi = _safe_float(ind["rsi"])
         deviation = (current_price - sma) / sma * 100
 
         # Signal interpretation
@@ -547,56 +514,19 @@ def analyze_momentum(
     current_date = _resolved_date(current_date)
     lines = [f"=== Momentum Analysis ({current_date}) ===\n"]
 
-    end_dt = datetime.strptime(current_date, "%Y-%m-%d")
-    extended_start = (end_dt - timedelta(days=45)).strftime("%Y-%m-%d")
+    indicators = get_indicator_engine().snapshot(tickers, current_date)
 
     for ticker in tickers:
-        prices = get_prices(
-            ticker=ticker,
-            start_date=extended_start,
-            end_date=current_date,
-        )
-        if not prices or len(prices) < 5:
+        ind = indicators["momentum"].get(ticker)
+        if ind is None:
             lines.append(f"{ticker}: Insufficient price data\n")
             continue
 
-        df = prices_to_df(prices)
-        n = len(df)
-        df["returns"] = df["close"].pct_change()
-
-        # Adaptive periods
-        short_p = min(5, n // 3)
-        med_p = min(10, n // 2)
-        long_p = min(20, n - 2)
-
-        current_price = _safe_float(df["close"].iloc[-1])
-        mom_5 = (
-            _safe_float(
-                (df["close"].iloc[-1] / df["close"].iloc[-short_p - 1] - 1)
-                * 100,
-            )
-            if n > short_p
-            else 0
-        )
-        mom_10 = (
-            _safe_float(
-                (df["close"].iloc[-1] / df["close"].iloc[-med_p - 1] - 1)
-                * 100,
-            )
-            if n > med_p
-            else 0
-        )
-        mom_20 = (
-            _safe_float(
-                (df["close"].iloc[-1] / df["close"].iloc[-long_p - 1] - 1)
-                * 100,
-            )
-            if n > long_p
-            else 0
-        )
-        volatility = _safe_float(
-            df["returns"].tail(20).std() * np.sqrt(252) * 100,
-        )
+        current_price = _safe_float(ind["price"])
+        mom_5 = _safe_float(ind["mom_5"])
+        mom_10 = _safe_float(ind["mom_10"])
+        mom_20 = _safe_float(ind["mom_20"])
+        volatility = _safe_float(ind["volatility"])
 
         # Overall momentum signal
         avg_mom = (mom_5 + mom_10 + mom_20) / 3
@@ -642,38 +572,18 @@ def analyze_volatility(
     current_date = _resolved_date(current_date)
     lines = [f"=== Volatility Analysis ({current_date}) ===\n"]
 
-    end_dt = datetime.strptime(current_date, "%Y-%m-%d")
-    extended_start = (end_dt - timedelta(days=90)).strftime("%Y-%m-%d")
+    indicators = get_indicator_engine().snapshot(tickers, current_date)
 
     for ticker in tickers:
-        prices = get_prices(
-            ticker=ticker,
-            start_date=extended_start,
-            end_date=current_date,
-        )
-        if not prices or len(prices) < 5:
+        ind = indicators["volatility"].get(ticker)
+        if ind is None:
             lines.append(f"{ticker}: Insufficient price data\n")
             continue
 
-        df = prices_to_df(prices)
-        n = len(df)
-        df["returns"] = df["close"].pct_change()
-
-        # Adaptive windows
-        short_w = min(10, n // 2)
-        med_w = min(20, n - 2)
-        long_w = min(60, n - 1) if n > 30 else med_w
-
-        current_price = _safe_float(df["close"].iloc[-1])
-        vol_10 = _safe_float(
-            df["returns"].tail(short_w).std() * np.sqrt(252) * 100,
-        )
-        vol_20 = _safe_float(
-            df["returns"].tail(med_w).std() * np.sqrt(252) * 100,
-        )
-        vol_60 = _safe_float(
-            df["returns"].tail(long_w).std() * np.sqrt(252) * 100,
-        )
+        current_price = _safe_float(ind["price"])
+        vol_10 = _safe_float(ind["vol_10"])
+        vol_20 = _safe_float(ind["vol_20"])
+        vol_60 = _safe_float(ind["vol_60"])
 
         # Risk assessment
         if vol_20 > 50:
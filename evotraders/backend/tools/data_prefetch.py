@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Async batched prefetching for the data tools.
+
+The fetchers in data_tools are blocking, so they run in worker threads
+under a concurrency bound while the event loop keeps serving the
+gateway. Identical requests already in flight are shared instead of
+issued twice, and every fetch goes through the provider rate limiter and
+the persistent cache. Calling ``prefetch`` once per trading cycle warms
+the cache, so the analysis tools the agents call afterwards are served
+locally.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config.env_config import get_env_int
+from backend.tools.data_tools import (
+    get_company_news,
+    get_financial_metrics,
+    get_insider_trades,
+    get_prices,
+)
+from backend.tools.indicator_engine import MAX_LOOKBACK_DAYS
+
+logger = logging.getLogger(__name__)
+
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+
+async def fetch(
+    func: Callable,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    **kwargs,
+) -> Any:
+    """
+    Run a blocking data_tools fetcher in a worker thread.
+
+    Concurrent calls with the same function and arguments share one fetch.
+    """
+    key = (func, tuple(sorted(kwargs.items())))
+    future = _inflight.get(key)
+    if future is None:
+
+        async def _run():
+            if semaphore is None:
+                return await asyncio.to_thread(func, **kwargs)
+            async with semaphore:
+                return await asyncio.to_thread(func, **kwargs)
+
+        future = asyncio.ensure_future(_run())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so one cancelled caller does not cancel the shared fetch
+    return await asyncio.shield(future)
+
+
+def _prefetch_requests(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+) -> List[tuple]:
+    """The data the analyst tools read for each ticker on ``end_date``"""
+    requests = []
+    for ticker in dict.fromkeys(tickers):
+        requests.extend(
+            [
+                (
+                    get_prices,
+                    {
+                        "ticker": ticker,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                    },
+                ),
+                (
+                    get_financial_metrics,
+                    {"ticker": ticker, "end_date": end_date},
+                ),
+                (
+                    get_financial_metrics,
+                    {"ticker": ticker, "end_date": end_date, "limit": 8},
+                ),
+                (
+                    get_insider_trades,
+                    {"ticker": ticker, "end_date": end_date, "limit": 1000},
+                ),
+                (
+                    get_company_news,
+                    {"ticker": ticker, "end_date": end_date, "limit": 10},
+                ),
+            ],
+        )
+    return requests
+
+
+async def prefetch(
+    tickers: List[str],
+    end_date: str,
+    start_date: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch prices, financial metrics, insider trades and news for all
+    tickers concurrently.
+
+    Args:
+        tickers: Stock tickers to prefetch
+        end_date: Trading date (YYYY-MM-DD)
+        start_date: Price history start, defaults to the longest
+            technical indicator lookback before ``end_date``
+        max_concurrency: Worker threads used at once
+            (default: PREFETCH_CONCURRENCY or 8)
+
+    Returns:
+        Dict with the number of requests and the failed ones
+    """
+    if start_date is None:
+        start_date = (
+            datetime.strptime(end_date, "%Y-%m-%d")
+            - timedelta(days=MAX_LOOKBACK_DAYS)
+        ).strftime("%Y-%m-%d")
+    semaphore = asyncio.Semaphore(
+        max_concurrency or get_env_int("PREFETCH_CONCURRENCY", 8),
+    )
+
+    requests = _prefetch_requests(tickers, start_date, end_date)
+    results = await asyncio.gather(
+        *(fetch(func, semaphore, **kwargs) for func, kwargs in requests),
+        return_exceptions=True,
+    )
+
+    failed = []
+    for (func, kwargs), result in zip(requests, results):
+        if isinstance(result, Exception):
+            failed.append(f"{func.__name__}({kwargs['ticker']}): {result}")
+
+    if failed:
+        logger.warning(
+            f"Prefetch {end_date}: {len(failed)}/{len(requests)} requests "
+            f"failed, first error: {failed[0]}",
+        )
+    else:
+        logger.info(f"Prefetch {end_date}: {len(requests)} requests done")
+
+    return {"requested": len(requests), "failed": failed}
@@ -9,12 +9,15 @@ The data source is automatically determined based on available API keys:
 - Priority: FINNHUB_API_KEY > FINANCIAL_DATASETS_API_KEY
 """
 import datetime
-import time
+import functools
+import logging
+import threading
 
 import finnhub
 import pandas as pd
 import pandas_market_calendars as mcal
 import requests
+from requests.adapters import HTTPAdapter
 
 from backend.config.data_config import (
     get_config,
@@ -34,9 +37,9 @@ from backend.data.schema import (
     Price,
     PriceResponse,
 )
+from backend.utils.rate_limiter import get_rate_limiter
 
-# Global cache instance
-_cache = get_cache()
+logger = logging.getLogger(__name__)
 
 
 def get_last_tradeday(date: str) -> str:
@@ -93,6 +96,69 @@ def get_last_tradeday(date: str) -> str:
     return prev_date.strftime("%Y-%m-%d")
 
 
+_session_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def _get_session() -> requests.Session:
+    """Shared HTTP session with a connection pool sized for prefetching."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+@functools.lru_cache(maxsize=4)
+def _get_finnhub_client(api_key: str) -> finnhub.Client:
+    """Shared Finnhub client (and its pooled session) per API key."""
+    return finnhub.Client(api_key=api_key)
+
+
+def _retry_delay(attempt: int, response: requests.Response | None) -> float:
+    """Delay before retrying a 429: Retry-After if given, else linear backoff."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    # Linear backoff: 60s, 90s, 120s, 150s...
+    return 60 + (30 * attempt)
+
+
+def _call_finnhub(
+    api_key: str,
+    method: str,
+    *args,
+    max_retries: int = 3,
+    **kwargs,
+):
+    """Call a Finnhub client method under the shared Finnhub rate limit."""
+    limiter = get_rate_limiter("finnhub")
+    client = _get_finnhub_client(api_key)
+    for attempt in range(max_retries):
+        limiter.acquire()
+        try:
+            return getattr(client, method)(*args, **kwargs)
+        except finnhub.FinnhubAPIException as e:
+            if e.status_code != 429:
+                raise
+            delay = _retry_delay(attempt, e.response)
+            logger.warning(
+                f"Finnhub rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Pausing requests for {delay}s",
+            )
+            limiter.pause(delay)
+
+    # Last attempt: a 429 is raised to the caller
+    limiter.acquire()
+    return getattr(client, method)(*args, **kwargs)
+
+
 def _make_api_request(
     url: str,
     headers: dict,
@@ -101,7 +167,11 @@ def _make_api_request(
     max_retries: int = 3,
 ) -> requests.Response:
     """
-    Make an API request with rate limiting handling and moderate backoff.
+    Make an API request with proactive rate limiting and moderate backoff.
+
+    Requests go through a shared pooled session and take a token from the
+    Financial Datasets rate limiter first. A 429 pauses the limiter, so
+    concurrent prefetch workers back off together.
 
     Args:
         url: The URL to request
@@ -116,60 +186,39 @@ def _make_api_request(
     Raises:
         Exception: If the request fails with a non-429 error
     """
+    session = _get_session()
+    limiter = get_rate_limiter("financial_datasets")
     for attempt in range(max_retries + 1):  # +1 for initial attempt
+        limiter.acquire()
         if method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
+            response = session.post(url, headers=headers, json=json_data)
         else:
-            response = requests.get(url, headers=headers)
+            response = session.get(url, headers=headers)
 
         if response.status_code == 429 and attempt < max_retries:
-            # Linear backoff: 60s, 90s, 120s, 150s...
-            delay = 60 + (30 * attempt)
-            print(
-                f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay}s before retrying...",
+            delay = _retry_delay(attempt, response)
+            logger.warning(
+                f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Pausing requests for {delay}s",
             )
-            time.sleep(delay)
+            limiter.pause(delay)
             continue
 
         # Return the response (whether success, other errors, or final 429)
         return response
 
 
-def get_prices(
+def _fetch_prices(
     ticker: str,
     start_date: str,
     end_date: str,
+    data_source: str,
+    api_key: str,
 ) -> list[Price]:
-    """
-    Fetch price data from cache or API.
-
-    Uses centralized data source configuration (FINNHUB_API_KEY prioritized).
-
-    Args:
-        ticker: Stock ticker symbol
-        start_date: Start date (YYYY-MM-DD)
-        end_date: End date (YYYY-MM-DD)
-
-    Returns:
-        list[Price]: List of Price objects
-    """
-    config = get_config()
-    data_source = config.source
-    api_key = config.api_key
-
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date}_{end_date}_{data_source}"
-
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
-
+    """Fetch price data for [start_date, end_date] from the API."""
     prices = []
 
     if data_source == "finnhub":
         # Use Finnhub API
-        client = finnhub.Client(api_key=api_key)
-
         # Convert dates to timestamps
         start_timestamp = int(
             datetime.datetime.strptime(start_date, "%Y-%m-%d").timestamp(),
@@ -182,7 +231,9 @@ def get_prices(
         )
 
         # Fetch candle data from Finnhub
-        candles = client.stock_candles(
+        candles = _call_finnhub(
+            api_key,
+            "stock_candles",
             ticker,
             "D",
             start_timestamp,
@@ -190,7 +241,7 @@ def get_prices(
         )
 
         # Convert to Price objects
-        for i in range(len(candles["t"])):
+        for i in range(len(candles.get("t") or [])):
             price = Price(
                 open=candles["o"][i],
                 close=candles["c"][i],
@@ -218,14 +269,69 @@ def get_prices(
         price_response = PriceResponse(**response.json())
         prices = price_response.prices
 
-    if not prices:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
     return prices
 
 
+def get_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+) -> list[Price]:
+    """
+    Fetch price data from cache or API.
+
+    Uses centralized data source configuration (FINNHUB_API_KEY prioritized).
+    Each ticker's series is cached once; only date ranges not yet covered
+    by the cache are fetched from the API.
+
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+
+    Returns:
+        list[Price]: List of Price objects
+    """
+    config = get_config()
+    data_source = config.source
+    api_key = config.api_key
+    cache = get_cache()
+
+    for gap_start, gap_end in cache.get_missing_ranges(
+        "prices",
+        ticker,
+        data_source,
+        start_date,
+        end_date,
+    ):
+        prices = _fetch_prices(
+            ticker,
+            gap_start,
+            gap_end,
+            data_source,
+            api_key,
+        )
+        cache.set_range(
+            "prices",
+            ticker,
+            data_source,
+            gap_start,
+            gap_end,
+            [p.model_dump() for p in prices],
+            date_field="time",
+            key_fields=("time",),
+        )
+
+    cached_data = cache.get_range(
+        "prices",
+        ticker,
+        data_source,
+        start_date,
+        end_date,
+    )
+    return [Price(**price) for price in cached_data]
+
+
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -254,18 +360,22 @@ def get_financial_metrics(
     cache_key = f"{ticker}_{period}_{end_date}_{limit}_{data_source}"
 
     # Check cache first - simple exact match
-    if cached_data := _cache.get_financial_metrics(cache_key):
+    cache = get_cache()
+    if cached_data := cache.get_financial_metrics(cache_key):
         return [FinancialMetrics(**metric) for metric in cached_data]
 
     financial_metrics = []
 
     if data_source == "finnhub":
         # Use Finnhub API - Basic Financials
-        client = finnhub.Client(api_key=api_key)
-
         # Fetch basic financials from Finnhub
         # metric='all' returns all available metrics
-        financials = client.company_basic_financials(ticker, "all")
+        financials = _call_finnhub(
+            api_key,
+            "company_basic_financials",
+            ticker,
+            "all",
+        )
 
         if not financials or "metric" not in financials:
             return []
@@ -298,7 +408,7 @@ def get_financial_metrics(
         return []
 
     # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(
+    cache.set_financial_metrics(
         cache_key,
         [m.model_dump() for m in financial_metrics],
     )
@@ -368,6 +478,13 @@ def search_line_items(
 ) -> list[LineItem]:
     """Fetch line items from Financial Datasets API (only supported source)."""
     api_key = get_api_key()
+    cache = get_cache()
+    cache_key = (
+        f"{ticker}_{','.join(sorted(line_items))}_{end_date}_{period}_{limit}"
+    )
+    if cached_data := cache.get_line_items(cache_key):
+        return [LineItem(**item) for item in cached_data]
+
     headers = {"X-API-KEY": api_key}
 
     url = "https://api.financialdatasets.ai/financials/search/line-items"
@@ -389,25 +506,30 @@ def search_line_items(
     if not search_results:
         return []
 
-    return search_results[:limit]
+    search_results = search_results[:limit]
+    cache.set_line_items(
+        cache_key,
+        [item.model_dump() for item in search_results],
+    )
+    return search_results
 
 
 def _fetch_finnhub_insider_trades(
     ticker: str,
     start_date: str | None,
     end_date: str,
-    limit: int,
+    limit: int | None,
     api_key: str,
 ) -> list[InsiderTrade]:
-    """Fetch insider trades from Finnhub API."""
-    client = finnhub.Client(api_key=api_key)
-
+    """Fetch insider trades from Finnhub API (all results if limit is None)."""
     from_date = start_date or (
         datetime.datetime.strptime(end_date, "%Y-%m-%d")
         - datetime.timedelta(days=365)
     ).strftime("%Y-%m-%d")
 
-    insider_data = client.stock_insider_transactions(
+    insider_data = _call_finnhub(
+        api_key,
+        "stock_insider_transactions",
         ticker,
         from_date,
         end_date,
@@ -468,67 +590,113 @@ def _fetch_fd_insider_trades(
     return all_trades
 
 
-def get_insider_trades(
+def _get_dated_series(
+    kind: str,
     ticker: str,
     end_date: str,
-    start_date: str | None = None,
-    limit: int = 1000,
-) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
+    start_date: str | None,
+    limit: int,
+    fetchers: dict,
+    date_field: str,
+    key_fields: tuple,
+) -> list[dict]:
+    """
+    Fetch a dated series (insider trades, news) through the cache.
+
+    With a start date, each ticker's records are cached once and only
+    uncovered date ranges are fetched. Finnhub results are fetched
+    untruncated so coverage is complete, then cut to ``limit`` newest.
+    Without a start date the query is cached under its exact key.
+    """
     config = get_config()
     data_source = config.source
     api_key = config.api_key
-
-    cache_key = (
-        f"{ticker}_{start_date or 'none'}_{end_date}_{limit}_{data_source}"
-    )
-
-    if cached_data := _cache.get_insider_trades(cache_key):
-        return [InsiderTrade(**trade) for trade in cached_data]
-
-    if data_source == "finnhub":
-        all_trades = _fetch_finnhub_insider_trades(
+    fetch = fetchers[data_source]
+    cache = get_cache()
+
+    if start_date is None:
+        cache_key = f"{ticker}_none_{end_date}_{limit}_{data_source}"
+        if cached_data := cache.get_response(kind, cache_key):
+            return cached_data
+        items = fetch(ticker, None, end_date, limit, api_key)
+        data = [item.model_dump() for item in items]
+        if data:
+            cache.set_response(kind, cache_key, data)
+        return data
+
+    fetch_limit = None if data_source == "finnhub" else limit
+    for gap_start, gap_end in cache.get_missing_ranges(
+        kind,
+        ticker,
+        data_source,
+        start_date,
+        end_date,
+    ):
+        items = fetch(ticker, gap_start, gap_end, fetch_limit, api_key)
+        cache.set_range(
+            kind,
             ticker,
-            start_date,
-            end_date,
-            limit,
-            api_key,
-        )
-    else:
-        all_trades = _fetch_fd_insider_trades(
-            ticker,
-            start_date,
-            end_date,
-            limit,
-            api_key,
+            data_source,
+            gap_start,
+            gap_end,
+            [item.model_dump() for item in items],
+            date_field=date_field,
+            key_fields=key_fields,
         )
 
-    if not all_trades:
-        return []
+    # APIs return newest first
+    data = cache.get_range(kind, ticker, data_source, start_date, end_date)
+    data.reverse()
+    if data_source == "finnhub":
+        data = data[:limit]
+    return data
 
-    _cache.set_insider_trades(
-        cache_key,
-        [trade.model_dump() for trade in all_trades],
+
+def get_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[InsiderTrade]:
+    """Fetch insider trades from cache or API."""
+    trades = _get_dated_series(
+        "insider_trades",
+        ticker,
+        end_date,
+        start_date,
+        limit,
+        fetchers={
+            "finnhub": _fetch_finnhub_insider_trades,
+            "financial_datasets": _fetch_fd_insider_trades,
+        },
+        date_field="filing_date",
+        # Every field: Finnhub reports a buy and a sell of the same size
+        # on one day with equal absolute shares
+        key_fields=tuple(InsiderTrade.model_fields),
     )
-    return all_trades
+    return [InsiderTrade(**trade) for trade in trades]
 
 
 def _fetch_finnhub_company_news(
     ticker: str,
     start_date: str | None,
     end_date: str,
-    limit: int,
+    limit: int | None,
     api_key: str,
 ) -> list[CompanyNews]:
-    """Fetch company news from Finnhub API."""
-    client = finnhub.Client(api_key=api_key)
-
+    """Fetch company news from Finnhub API (all results if limit is None)."""
     from_date = start_date or (
         datetime.datetime.strptime(end_date, "%Y-%m-%d")
         - datetime.timedelta(days=30)
     ).strftime("%Y-%m-%d")
 
-    news_data = client.company_news(ticker, _from=from_date, to=end_date)
+    news_data = _call_finnhub(
+        api_key,
+        "company_news",
+        ticker,
+        _from=from_date,
+        to=end_date,
+    )
 
     if not news_data:
         return []
@@ -609,42 +777,20 @@ def get_company_news(
     limit: int = 1000,
 ) -> list[CompanyNews]:
     """Fetch company news from cache or API."""
-    config = get_config()
-    data_source = config.source
-    api_key = config.api_key
-
-    cache_key = (
-        f"{ticker}_{start_date or 'none'}_{end_date}_{limit}_{data_source}"
-    )
-
-    if cached_data := _cache.get_company_news(cache_key):
-        return [CompanyNews(**news) for news in cached_data]
-
-    if data_source == "finnhub":
-        all_news = _fetch_finnhub_company_news(
-            ticker,
-            start_date,
-            end_date,
-            limit,
-            api_key,
-        )
-    else:
-        all_news = _fetch_fd_company_news(
-            ticker,
-            start_date,
-            end_date,
-            limit,
-            api_key,
-        )
-
-    if not all_news:
-        return []
-
-    _cache.set_company_news(
-        cache_key,
-        [news.model_dump() for news in all_news],
+    news = _get_dated_series(
+        "company_news",
+        ticker,
+        end_date,
+        start_date,
+        limit,
+        fetchers={
+            "finnhub": _fetch_finnhub_company_news,
+            "financial_datasets": _fetch_fd_company_news,
+        },
+        date_field="date",
+        key_fields=("date", "url", "title"),
     )
-    return all_news
+    return [CompanyNews(**item) for item in news]
 
 
 def _convert_finnhub_insider_trade(ticker: str, trade: dict) -> InsiderTrade:
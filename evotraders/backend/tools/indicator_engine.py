@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+Shared technical indicator engine for the analysis tools.
+
+Computes trend, mean reversion, momentum and volatility indicators for a
+whole ticker panel at once and caches the result per (date, tickers), so
+every analyst calling a technical tool on the same trading day reads the
+same precomputed values. Close histories are kept per ticker and only
+extended with the missing tail when the backtest advances.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.tools.data_tools import get_prices, prices_to_df
+
+logger = logging.getLogger(__name__)
+
+# Calendar-day lookback and minimum bar count for each indicator family
+LOOKBACKS = {
+    "trend": (250, 10),
+    "mean_reversion": (60, 5),
+    "momentum": (45, 5),
+    "volatility": (90, 5),
+}
+MAX_LOOKBACK_DAYS = max(days for days, _ in LOOKBACKS.values())
+
+# Indicator values keyed by family, then ticker (None = insufficient data)
+IndicatorSnapshot = Dict[str, Dict[str, Optional[Dict[str, float]]]]
+
+
+@dataclass
+class _CloseHistory:
+    """Close prices for one ticker over [start, end]"""
+
+    start: str
+    end: str
+    closes: pd.Series
+
+
+def _shift_date(date: str, days: int) -> str:
+    dt = datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)
+    return dt.strftime("%Y-%m-%d")
+
+
+def _group_by_length(
+    windows: Dict[str, np.ndarray],
+) -> Iterator[Tuple[int, List[str], pd.DataFrame]]:
+    """
+    Stack per-ticker close windows of equal length into (n x k) frames.
+
+    Indicator windows adapt to the number of bars available, so only
+    tickers with the same bar count can share one vectorized pass.
+    """
+    groups: Dict[int, List[str]] = {}
+    for ticker, values in windows.items():
+        groups.setdefault(len(values), []).append(ticker)
+
+    for n, tickers in groups.items():
+        matrix = np.column_stack([windows[t] for t in tickers])
+        yield n, tickers, pd.DataFrame(matrix, columns=tickers)
+
+
+def _trend(n: int, close: pd.DataFrame) -> Dict[str, pd.Series]:
+    sma_20_win = min(20, n // 2)
+    sma_50_win = min(50, n - 5) if n > 25 else min(25, n - 5)
+    sma_200_win = min(200, n - 10) if n > 200 else None
+
+    ema_12 = close.ewm(span=min(12, n // 3)).mean()
+    ema_26 = close.ewm(span=min(26, n // 2)).mean()
+    macd = ema_12 - ema_26
+
+    values = {
+        "price": close.iloc[-1],
+        "sma_20": close.rolling(window=sma_20_win).mean().iloc[-1],
+        "sma_50": close.rolling(window=sma_50_win).mean().iloc[-1],
+        "macd": macd.iloc[-1],
+        "macd_signal": macd.ewm(span=9).mean().iloc[-1],
+    }
+    if sma_200_win:
+        values["sma_200"] = close.rolling(window=sma_200_win).mean().iloc[-1]
+    return values
+
+
+def _mean_reversion(n: int, close: pd.DataFrame) -> Dict[str, pd.Series]:
+    window = min(20, n - 2)
+    sma = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = 100 - (100 / (1 + gain / loss))
+
+    return {
+        "price": close.iloc[-1],
+        "sma": sma.iloc[-1],
+        "upper": (sma + 2 * std).iloc[-1],
+        "lower": (sma - 2 * std).iloc[-1],
+        "rsi": rsi.iloc[-1],
+    }
+
+
+def _momentum(n: int, close: pd.DataFrame) -> Dict[str, pd.Series]:
+    returns = close.pct_change()
+    last = close.iloc[-1]
+
+    def _period_return(period: int):
+        if n <= period:
+            return pd.Series(0.0, index=close.columns)
+        return (last / close.iloc[-period - 1] - 1) * 100
+
+    return {
+        "price": last,
+        "mom_5": _period_return(min(5, n // 3)),
+        "mom_10": _period_return(min(10, n // 2)),
+        "mom_20": _period_return(min(20, n - 2)),
+        "volatility": returns.tail(20).std() * np.sqrt(252) * 100,
+    }
+
+
+def _volatility(n: int, close: pd.DataFrame) -> Dict[str, pd.Series]:
+    returns = close.pct_change()
+    short_w = min(10, n // 2)
+    med_w = min(20, n - 2)
+    long_w = min(60, n - 1) if n > 30 else med_w
+
+    return {
+        "price": close.iloc[-1],
+        "vol_10": returns.tail(short_w).std() * np.sqrt(252) * 100,
+        "vol_20": returns.tail(med_w).std() * np.sqrt(252) * 100,
+        "vol_60": returns.tail(long_w).std() * np.sqrt(252) * 100,
+    }
+
+
+_CALCULATORS = {
+    "trend": _trend,
+    "mean_reversion": _mean_reversion,
+    "momentum": _momentum,
+    "volatility": _volatility,
+}
+
+
+class IndicatorEngine:
+    """Computes and caches technical indicators for a ticker panel"""
+
+    def __init__(
+        self,
+        price_fetcher: Callable = get_prices,
+        max_snapshots: int = 16,
+    ):
+        self._fetch_prices = price_fetcher
+        self._max_snapshots = max_snapshots
+        self._history: Dict[str, _CloseHistory] = {}
+        self._snapshots: OrderedDict = OrderedDict()
+        # Guards the caches; fetches only hold the lock of their ticker
+        self._lock = threading.Lock()
+        self._ticker_locks: Dict[str, threading.Lock] = {}
+
+    def snapshot(
+        self,
+        tickers: List[str],
+        current_date: str,
+    ) -> IndicatorSnapshot:
+        """Get all indicator families for ``tickers`` as of ``current_date``"""
+        key = (current_date, tuple(sorted(set(tickers))))
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None:
+                self._snapshots.move_to_end(key)
+                return cached
+
+        snapshot = self._compute(list(key[1]), current_date)
+        with self._lock:
+            # Another caller may have computed the same snapshot meanwhile
+            snapshot = self._snapshots.setdefault(key, snapshot)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def clear(self):
+        """Drop cached histories and snapshots"""
+        with self._lock:
+            self._history.clear()
+            self._snapshots.clear()
+
+    def _compute(
+        self,
+        tickers: List[str],
+        current_date: str,
+    ) -> IndicatorSnapshot:
+        closes = {
+            ticker: self._get_closes(ticker, current_date)
+            for ticker in tickers
+        }
+        end_ts = pd.Timestamp(current_date)
+
+        snapshot: IndicatorSnapshot = {}
+        for family, (lookback_days, min_bars) in LOOKBACKS.items():
+            start_ts = pd.Timestamp(_shift_date(current_date, -lookback_days))
+            windows = {}
+            results: Dict[str, Optional[Dict[str, float]]] = {}
+            for ticker, series in closes.items():
+                index = series.index
+                window = series[(index >= start_ts) & (index <= end_ts)]
+                if len(window) < min_bars:
+                    results[ticker] = None
+                else:
+                    windows[ticker] = window.to_numpy(dtype="f8")
+
+            calculator = _CALCULATORS[family]
+            for n, group, close in _group_by_length(windows):
+                values = calculator(n, close)
+                for ticker in group:
+                    results[ticker] = {
+                        name: float(series[ticker])
+                        for name, series in values.items()
+                    }
+            snapshot[family] = results
+        return snapshot
+
+    def _get_closes(self, ticker: str, current_date: str) -> pd.Series:
+        """Close history covering the max lookback, extended incrementally"""
+        with self._lock:
+            lock = self._ticker_locks.setdefault(ticker, threading.Lock())
+        with lock:
+            return self._extend_closes(ticker, current_date)
+
+    def _extend_closes(self, ticker: str, current_date: str) -> pd.Series:
+        start_date = _shift_date(current_date, -MAX_LOOKBACK_DAYS)
+        history = self._history.get(ticker)
+
+        if history is None or start_date < history.start:
+            closes = self._fetch_closes(ticker, start_date, current_date)
+            history = _CloseHistory(start_date, current_date, closes)
+            self._history[ticker] = history
+        elif current_date > history.end:
+            # Only fetch the bars added since the last trading day
+            new_closes = self._fetch_closes(
+                ticker,
+                _shift_date(history.end, 1),
+                current_date,
+            )
+            closes = pd.concat([history.closes, new_closes])
+            closes = closes[~closes.index.duplicated(keep="last")]
+            closes = closes[closes.index >= pd.Timestamp(start_date)]
+            history.closes = closes.sort_index()
+            history.start = start_date
+            history.end = current_date
+
+        return history.closes
+
+    def _fetch_closes(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+    ) -> pd.Series:
+        prices = self._fetch_prices(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        if not prices:
+            return pd.Series(dtype="f8", index=pd.DatetimeIndex([]))
+        return prices_to_df(prices)["close"]
+
+
+# Global engine instance shared by all analyst toolkits
+_engine = IndicatorEngine()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Get the global indicator engine instance."""
+    return _engine
@@ -7,8 +7,24 @@ Tracks analyst predictions and calculates win rates for leaderboard
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from backend.services.prediction_store import (
+    HOLD,
+    LONG,
+    LOSS,
+    NOT_EVALUATED,
+    SIGNAL_CODES,
+    SIGNAL_DISPLAY,
+    UNKNOWN,
+    WIN,
+    PredictionStore,
+)
+
 logger = logging.getLogger(__name__)
 
+_DISPLAY_CODES = {name: code for code, name in SIGNAL_DISPLAY.items()}
+
 
 class AnalystPerformanceTracker:
     """
@@ -17,11 +33,17 @@ class AnalystPerformanceTracker:
     Workflow:
     1. Record analyst predictions for each ticker before market close
     2. After market close, evaluate predictions against actual returns
-    3. Update leaderboard with win rates and statistics
+       and append them to the prediction store
+    3. Render the leaderboard from the store aggregates
     """
 
-    def __init__(self):
+    def __init__(self, store: Optional[PredictionStore] = None):
+        """
+        Args:
+            store: History of evaluated signals (default: in memory)
+        """
         self.daily_predictions = {}
+        self.store = store if store is not None else PredictionStore()
 
     def record_analyst_predictions(
         self,
@@ -80,6 +102,9 @@ class AnalystPerformanceTracker:
         """
         Evaluate analyst predictions against actual market moves
 
+        The day's signals are scored in one vectorized pass and appended
+        to the prediction store.
+
         Args:
             open_prices: Opening prices for each ticker
             close_prices: Closing prices for each ticker
@@ -88,127 +113,174 @@ class AnalystPerformanceTracker:
         Returns:
             Dict mapping analyst_id to evaluation results
         """
+        open_prices = open_prices or {}
+        analysts: List[str] = []
+        tickers: List[str] = []
+        signal_codes: List[int] = []
+        for analyst_id, predictions in self.daily_predictions.items():
+            for ticker, prediction in predictions.items():
+                code = SIGNAL_CODES.get(prediction)
+                if code is None:
+                    logger.warning(
+                        f"Skipping unknown prediction {prediction!r} of "
+                        f"{analyst_id} for {ticker}",
+                    )
+                    continue
+                analysts.append(analyst_id)
+                tickers.append(ticker)
+                signal_codes.append(code)
+
+        signals = np.array(signal_codes, dtype=np.int8)
+        open_arr = np.array(
+            [open_prices.get(t) or 0.0 for t in tickers],
+            dtype=np.float64,
+        )
+        close_arr = np.array(
+            [close_prices.get(t) or 0.0 for t in tickers],
+            dtype=np.float64,
+        )
+
+        # Cannot evaluate if prices are missing
+        priced = (open_arr > 0) & (close_arr > 0)
+        rose = close_arr > open_arr
+        correct = np.where(signals == LONG, rose, close_arr < open_arr)
+        outcomes = np.where(
+            signals == HOLD,
+            NOT_EVALUATED,
+            np.where(priced, np.where(correct, WIN, LOSS), UNKNOWN),
+        ).astype(np.int8)
+
+        day_store = PredictionStore()
+        day_store.append(analysts, tickers, date, signals, outcomes)
+        self.store.append(analysts, tickers, date, signals, outcomes)
+
         evaluation_results = {}
+        for analyst_id, stats in day_store.aggregates().items():
+            evaluation_results[analyst_id] = {
+                "total_predictions": stats["evaluated"],
+                "correct_predictions": stats["wins"],
+                "win_rate": stats["win_rate"],
+                "bull": stats["bull"],
+                "bear": stats["bear"],
+                "hold": stats["hold"],
+                "signals": day_store.recent_signals(
+                    analyst_id,
+                    limit=len(analysts),
+                ),
+            }
+        # Analysts without any prediction that day
+        for analyst_id in self.daily_predictions:
+            evaluation_results.setdefault(
+                analyst_id,
+                {
+                    "total_predictions": 0,
+                    "correct_predictions": 0,
+                    "win_rate": None,
+                    "bull": {"n": 0, "win": 0, "unknown": 0},
+                    "bear": {"n": 0, "win": 0, "unknown": 0},
+                    "hold": 0,
+                    "signals": [],
+                },
+            )
 
-        # Map internal signal types to frontend display names
-        signal_display_map = {
-            "long": "bull",
-            "short": "bear",
-            "hold": "neutral",
-        }
+        return evaluation_results
 
-        for analyst_id, predictions in self.daily_predictions.items():
-            correct_long = 0
-            correct_short = 0
-            incorrect_long = 0
-            incorrect_short = 0
-            unknown_long = 0
-            unknown_short = 0
-            hold_count = 0
+    def seed_from_leaderboard(self, leaderboard: List[Dict[str, Any]]):
+        """
+        Carry totals of a leaderboard kept without a store into the store
 
-            # Individual signal records for frontend display
-            individual_signals: List[Dict[str, Any]] = []
+        Its recent signals become records and the remaining counts become
+        offsets, so rendering from the store keeps the earlier stats.
+        """
+        if len(self.store) or self.store.offsets:
+            return
 
-            for ticker, prediction in predictions.items():
-                open_price = open_prices.get(ticker, 0)
-                close_price = close_prices.get(ticker, 0)
-
-                signal_type = signal_display_map.get(prediction, "neutral")
-
-                # Cannot evaluate if prices are missing
-                if open_price <= 0 or close_price <= 0:
-                    if prediction == "long":
-                        unknown_long += 1
-                    elif prediction == "short":
-                        unknown_short += 1
-
-                    individual_signals.append(
-                        {
-                            "ticker": ticker,
-                            "signal": signal_type,
-                            "date": date,
-                            "is_correct": "unknown",
-                        },
+        offsets: Dict[str, Dict[str, int]] = {}
+        for entry in leaderboard:
+            agent_id = entry.get("agentId")
+            if not agent_id or entry.get("rank") is None:
+                continue
+            for signal in entry.get("signals") or []:
+                code = _DISPLAY_CODES.get(signal.get("signal"))
+                if code is None:
+                    logger.warning(
+                        f"Skipping unknown signal {signal.get('signal')!r} "
+                        f"of {agent_id} in the leaderboard",
                     )
                     continue
+                is_correct = signal.get("is_correct")
+                if code == HOLD:
+                    outcome = NOT_EVALUATED
+                elif is_correct is True:
+                    outcome = WIN
+                elif is_correct is False:
+                    outcome = LOSS
+                else:
+                    outcome = UNKNOWN
+                self.store.append(
+                    [agent_id],
+                    [signal.get("ticker", "")],
+                    signal.get("date"),
+                    np.array([code], dtype=np.int8),
+                    np.array([outcome], dtype=np.int8),
+                )
+
+            seeded = self.store.aggregates().get(agent_id)
+            offset = {}
+            for side in ("bull", "bear"):
+                totals = entry.get(side) or {}
+                for key in ("n", "win", "unknown"):
+                    have = seeded[side][key] if seeded else 0
+                    extra = totals.get(key, 0) - have
+                    if extra:
+                        offset[f"{side}_{key}"] = extra
+            if offset:
+                offsets[agent_id] = offset
+
+        if offsets:
+            self.store.set_offsets(offsets)
+
+    def render_leaderboard(
+        self,
+        leaderboard: List[Dict[str, Any]],
+        signal_limit: int = 100,
+        recent_window: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fill leaderboard entries from the store aggregates and re-rank
 
-                actual_return = (close_price - open_price) / open_price
-
-                if prediction == "long":
-                    is_correct = actual_return > 0
-                    if is_correct:
-                        correct_long += 1
-                    else:
-                        incorrect_long += 1
-
-                    individual_signals.append(
-                        {
-                            "ticker": ticker,
-                            "signal": signal_type,
-                            "date": date,
-                            "is_correct": is_correct,
-                        },
-                    )
-
-                elif prediction == "short":
-                    is_correct = actual_return < 0
-                    if is_correct:
-                        correct_short += 1
-                    else:
-                        incorrect_short += 1
-
-                    individual_signals.append(
-                        {
-                            "ticker": ticker,
-                            "signal": signal_type,
-                            "date": date,
-                            "is_correct": is_correct,
-                        },
-                    )
+        Args:
+            leaderboard: Current leaderboard entries
+            signal_limit: Recent signals shown per analyst
+            recent_window: Trading days of the recentWinRate window
 
-                elif prediction == "hold":
-                    hold_count += 1
-                    individual_signals.append(
-                        {
-                            "ticker": ticker,
-                            "signal": signal_type,
-                            "date": date,
-                            "is_correct": None,
-                        },
-                    )
+        Returns:
+            Updated leaderboard
+        """
+        totals = self.store.aggregates()
+        since = self.store.window_start(recent_window)
+        recent = self.store.aggregates(since=since) if since else {}
 
-            total_long = correct_long + incorrect_long + unknown_long
-            total_short = correct_short + incorrect_short + unknown_short
-            evaluated_long = correct_long + incorrect_long
-            evaluated_short = correct_short + incorrect_short
-            total_evaluated = evaluated_long + evaluated_short
-            correct_predictions = correct_long + correct_short
-
-            win_rate = (
-                correct_predictions / total_evaluated
-                if total_evaluated > 0
-                else None
+        for entry in leaderboard:
+            agent_id = entry.get("agentId")
+            if not agent_id or agent_id not in totals:
+                continue
+            stats = totals[agent_id]
+            entry["bull"] = stats["bull"]
+            entry["bear"] = stats["bear"]
+            if stats["win_rate"] is not None:
+                entry["winRate"] = round(stats["win_rate"], 4)
+            recent_rate = recent.get(agent_id, {}).get("win_rate")
+            entry["recentWinRate"] = (
+                round(recent_rate, 4) if recent_rate is not None else None
+            )
+            entry["signals"] = self.store.recent_signals(
+                agent_id,
+                limit=signal_limit,
             )
 
-            evaluation_results[analyst_id] = {
-                "total_predictions": total_evaluated,
-                "correct_predictions": correct_predictions,
-                "win_rate": win_rate,
-                "bull": {
-                    "n": total_long,
-                    "win": correct_long,
-                    "unknown": unknown_long,
-                },
-                "bear": {
-                    "n": total_short,
-                    "win": correct_short,
-                    "unknown": unknown_short,
-                },
-                "hold": hold_count,
-                "signals": individual_signals,
-            }
-
-        return evaluation_results
+        _rerank(leaderboard)
+        return leaderboard
 
     def clear_daily_predictions(self):
         """Clear predictions after evaluation"""
@@ -268,10 +340,13 @@ def update_leaderboard_with_evaluations(
         # Keep only recent signals (e.g., last 100 individual signals)
         entry["signals"] = entry["signals"][-100:]
 
-    # Re-rank analysts by win rate (rank starts from 1)
+    _rerank(leaderboard)
+    return leaderboard
+
+
+def _rerank(leaderboard: List[Dict[str, Any]]):
+    """Re-rank analysts by win rate (rank starts from 1)"""
     analyst_entries = [e for e in leaderboard if e.get("rank") is not None]
-    analyst_entries.sort(key=lambda e: e.get("winRate", 0), reverse=True)
+    analyst_entries.sort(key=lambda e: e.get("winRate") or 0, reverse=True)
     for idx, entry in enumerate(analyst_entries):
         entry["rank"] = idx + 1  # Rank 1 = highest win rate (gold medal)
-
-    return leaderboard
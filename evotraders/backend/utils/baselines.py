@@ -2,10 +2,17 @@
 """
 Baseline Strategy Calculators
 Tracks performance of simple baseline strategies for comparison
+
+BaselineCalculator works on per-ticker dicts one day at a time.
+BaselineEngine computes the same strategies on a (dates x tickers) price
+matrix: a whole backtest window in one vectorized pass, or one day at a
+time in live mode.
 """
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Tuple, TypedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -354,3 +361,465 @@ def calculate_momentum_scores(
             momentum_scores[ticker] = 0.0
 
     return momentum_scores
+
+
+def _month_keys(dates: Sequence[str]) -> np.ndarray:
+    """Map YYYY-MM-DD dates to comparable month numbers"""
+    return np.array(
+        [int(d[:4]) * 12 + int(d[5:7]) for d in dates],
+        dtype=np.int64,
+    )
+
+
+def momentum_score_matrix(
+    history: np.ndarray,
+    lookback_days: int = 20,
+    first_row: int = 0,
+) -> np.ndarray:
+    """
+    Momentum scores for every row of a price matrix
+
+    Vectorized ``calculate_momentum_scores``: the score of a row is the
+    return from the first price within the last ``lookback_days`` rows
+    (including the row itself) to the row's price. Missing (NaN) prices
+    are skipped.
+
+    Args:
+        history: (dates x tickers) prices, oldest first
+        lookback_days: Number of rows the momentum is measured over
+        first_row: Only score rows from this index on
+
+    Returns:
+        (rows - first_row) x tickers scores, 0.0 where undefined
+    """
+    rows, cols = history.shape
+    valid = np.isfinite(history) & (history > 0)
+
+    # Index of the next valid price at or after each row, per ticker
+    next_valid = np.where(valid, np.arange(rows)[:, None], rows)
+    next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+
+    target_rows = np.arange(first_row, rows)
+    window_start = np.maximum(0, target_rows - lookback_days + 1)
+    start_rows = next_valid[window_start]
+    has_start = start_rows < target_rows[:, None]
+
+    safe_rows = np.minimum(start_rows, rows - 1)
+    start = history[safe_rows, np.arange(cols)[None, :]]
+    end = history[target_rows]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = (end - start) / start
+    ok = has_start & valid[target_rows] & np.isfinite(scores)
+    return np.where(ok, scores, 0.0)
+
+
+class BaselineEngine:
+    """
+    Array-backed baseline strategies over a (dates x tickers) price matrix
+
+    Computes the same equal-weight, market-cap-weighted and monthly
+    momentum baselines as BaselineCalculator. ``run`` processes a whole
+    window at once: positions only change on the first day and on
+    momentum rebalance days, so every curve is a matrix-vector product
+    over the days in between. ``step`` is the one-day form for live mode;
+    both continue from the state left by previous calls.
+
+    State is exported in the same format as BaselineCalculator plus the
+    ``price_history`` used for momentum.
+    """
+
+    def __init__(
+        self,
+        initial_capital: float = 100000.0,
+        lookback_days: int = 20,
+        history_days: int = 60,
+    ):
+        self.initial_capital = initial_capital
+        self.lookback_days = lookback_days
+        self.history_days = max(history_days, lookback_days)
+
+        self.tickers: List[str] = []
+        self._index: Dict[str, int] = {}
+
+        self.equal_weight_shares: Optional[np.ndarray] = None
+        self.market_cap_shares: Optional[np.ndarray] = None
+        self.momentum_shares = np.zeros(0)
+        self.momentum_cash = initial_capital
+        self.momentum_last_rebalance_date: Optional[str] = None
+
+        # Recent closes for momentum, oldest first
+        self.history = np.zeros((0, 0))
+        self.history_dates: List[str] = []
+
+    def _add_tickers(self, tickers: Sequence[str]):
+        new = [t for t in tickers if t not in self._index]
+        if not new:
+            return
+        for ticker in new:
+            self._index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+
+        def _pad(arr: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            if arr is None:
+                return None
+            return np.concatenate([arr, np.zeros(len(new))])
+
+        self.equal_weight_shares = _pad(self.equal_weight_shares)
+        self.market_cap_shares = _pad(self.market_cap_shares)
+        self.momentum_shares = _pad(self.momentum_shares)
+        self.history = np.concatenate(
+            [self.history, np.full((len(self.history), len(new)), np.nan)],
+            axis=1,
+        )
+
+    def _columns(self, tickers: Sequence[str]) -> np.ndarray:
+        self._add_tickers(tickers)
+        return np.array([self._index[t] for t in tickers], dtype=np.int64)
+
+    def _to_matrix(
+        self,
+        tickers: Sequence[str],
+        values: np.ndarray,
+        fill: float,
+    ) -> np.ndarray:
+        """Scatter (rows x len(tickers)) values into engine columns"""
+        cols = self._columns(tickers)
+        matrix = np.full((values.shape[0], len(self.tickers)), fill)
+        matrix[:, cols] = values
+        return matrix
+
+    def run(
+        self,
+        dates: Sequence[str],
+        tickers: Sequence[str],
+        prices: np.ndarray,
+        market_caps: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute baseline values for consecutive trading days
+
+        Args:
+            dates: Trading dates (YYYY-MM-DD), ascending
+            tickers: Column labels of ``prices`` and ``market_caps``
+            prices: (dates x tickers) closing prices, NaN where missing
+            market_caps: (tickers,) or (dates x tickers) market caps
+
+        Returns:
+            Dict with equal_weight, market_cap_weighted and momentum
+            arrays holding one value per date
+        """
+        n_days = len(dates)
+        if not n_days:
+            empty = np.zeros(0)
+            return {
+                "equal_weight": empty,
+                "market_cap_weighted": empty,
+                "momentum": empty,
+            }
+
+        prices = np.asarray(prices, dtype=float).reshape(n_days, len(tickers))
+        raw = self._to_matrix(tickers, prices, np.nan)
+        n = len(self.tickers)
+        px = np.nan_to_num(raw, nan=0.0)
+
+        caps = np.zeros((n_days, n))
+        if market_caps is not None:
+            market_caps = np.asarray(market_caps, dtype=float)
+            caps = self._to_matrix(
+                tickers,
+                np.broadcast_to(market_caps, (n_days, len(tickers))),
+                0.0,
+            )
+        caps = np.nan_to_num(caps, nan=0.0)
+
+        # Equal weight: buy on the first day, hold afterwards
+        if self.equal_weight_shares is None:
+            allocation = self.initial_capital / len(tickers)
+            first = px[0]
+            self.equal_weight_shares = np.where(
+                first > 0,
+                allocation / np.where(first > 0, first, 1.0),
+                0.0,
+            )
+        equal_weight = px @ self.equal_weight_shares
+
+        # Market cap: buy on the first day with market cap data, fall
+        # back to the equal-weight value until then
+        market_cap = equal_weight.copy()
+        start = 0
+        if self.market_cap_shares is None:
+            totals = np.where(caps > 0, caps, 0.0).sum(axis=1)
+            with_caps = np.flatnonzero(totals > 0)
+            if len(with_caps):
+                start = with_caps[0]
+                held = (caps[start] > 0) & (px[start] > 0)
+                weights = np.where(held, caps[start], 0.0) / totals[start]
+                self.market_cap_shares = np.where(
+                    held,
+                    self.initial_capital
+                    * weights
+                    / np.where(held, px[start], 1.0),
+                    0.0,
+                )
+            else:
+                start = n_days
+        if self.market_cap_shares is not None:
+            market_cap[start:] = px[start:] @ self.market_cap_shares
+
+        momentum = self._run_momentum(
+            dates,
+            raw,
+            px,
+            self._columns(tickers),
+        )
+
+        self._append_history(dates, raw)
+
+        return {
+            "equal_weight": equal_weight,
+            "market_cap_weighted": market_cap,
+            "momentum": momentum,
+        }
+
+    def _run_momentum(
+        self,
+        dates: Sequence[str],
+        raw: np.ndarray,
+        px: np.ndarray,
+        universe: np.ndarray,
+    ) -> np.ndarray:
+        """Momentum values, rebalancing on the first day of each month"""
+        n_days = len(dates)
+        history = np.concatenate([self.history, raw])
+        scores = momentum_score_matrix(
+            history,
+            self.lookback_days,
+            first_row=len(self.history),
+        )
+
+        months = _month_keys(dates)
+        previous = np.empty_like(months)
+        previous[1:] = months[:-1]
+        if self.momentum_last_rebalance_date is None:
+            previous[0] = -1
+        else:
+            previous[0] = _month_keys([self.momentum_last_rebalance_date])[0]
+        rebalance_days = np.flatnonzero(months != previous).tolist()
+
+        values = np.empty(n_days)
+        bounds = sorted({0, *rebalance_days, n_days})
+
+        for seg_start, seg_end in zip(bounds[:-1], bounds[1:]):
+            if seg_start in rebalance_days:
+                self._rebalance_momentum(
+                    px[seg_start],
+                    scores[seg_start],
+                    universe,
+                )
+                self.momentum_last_rebalance_date = dates[seg_start]
+            values[seg_start:seg_end] = (
+                self.momentum_cash
+                + px[seg_start:seg_end] @ self.momentum_shares
+            )
+        return values
+
+    def _rebalance_momentum(
+        self,
+        prices: np.ndarray,
+        scores: np.ndarray,
+        universe: np.ndarray,
+    ):
+        """Equal-weight the top half of ``universe`` columns by momentum"""
+        current_value = self.momentum_cash + prices @ self.momentum_shares
+
+        # Stable descending sort keeps ticker order among equal scores
+        order = universe[np.argsort(-scores[universe], kind="stable")]
+        mid_point = len(order) // 2
+        longs = order[:mid_point] if mid_point > 0 else order
+
+        shares = np.zeros(len(prices))
+        if len(longs) == 0:
+            self.momentum_shares = shares
+            self.momentum_cash = current_value
+            return
+
+        allocation = current_value / len(longs)
+        bought = longs[prices[longs] > 0]
+        shares[bought] = allocation / prices[bought]
+        self.momentum_shares = shares
+        self.momentum_cash = current_value - allocation * len(bought)
+
+    def _append_history(self, dates: Sequence[str], raw: np.ndarray):
+        self.history = np.concatenate([self.history, raw])[
+            -self.history_days :
+        ]
+        self.history_dates = (self.history_dates + list(dates))[
+            -self.history_days :
+        ]
+
+    def step(
+        self,
+        date: str,
+        tickers: List[str],
+        prices: Dict[str, float],
+        market_caps: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """
+        Advance all baselines by one trading day
+
+        Returns:
+            Dict with keys: equal_weight, market_cap_weighted, momentum
+        """
+        row = np.array([[prices.get(t, np.nan) for t in tickers]])
+        caps = None
+        if market_caps:
+            caps = np.array([market_caps.get(t, 0.0) for t in tickers])
+        values = self.run([date], tickers, row, caps)
+        return {name: float(curve[0]) for name, curve in values.items()}
+
+    def mark_to_market(self, prices: Dict[str, float]) -> Dict[str, float]:
+        """
+        Value the current baseline holdings without trading
+
+        Baselines that have not invested yet are worth the initial capital.
+        """
+        px = np.array([prices.get(t, 0.0) or 0.0 for t in self.tickers])
+
+        def _value(shares: Optional[np.ndarray]) -> float:
+            if shares is None:
+                return self.initial_capital
+            return float(px @ shares)
+
+        momentum = self.initial_capital
+        if self.momentum_last_rebalance_date is not None:
+            momentum = float(self.momentum_cash + px @ self.momentum_shares)
+
+        return {
+            "equal_weight": _value(self.equal_weight_shares),
+            "market_cap_weighted": _value(self.market_cap_shares),
+            "momentum": momentum,
+        }
+
+    def _positions(self, shares: Optional[np.ndarray]) -> Dict[str, float]:
+        if shares is None:
+            return {}
+        return {
+            self.tickers[i]: float(shares[i]) for i in np.flatnonzero(shares)
+        }
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Export engine state for persistence
+
+        Returns:
+            BaselineCalculator state plus ``price_history``
+        """
+        price_history = {}
+        for i, ticker in enumerate(self.tickers):
+            column = self.history[:, i]
+            price_history[ticker] = [
+                {"date": date, "price": float(price)}
+                for date, price in zip(self.history_dates, column)
+                if np.isfinite(price)
+            ]
+
+        return {
+            "baseline_state": {
+                "initialized": self.equal_weight_shares is not None,
+                "initial_allocation": self._positions(
+                    self.equal_weight_shares,
+                ),
+            },
+            "baseline_vw_state": {
+                "initialized": self.market_cap_shares is not None,
+                "initial_allocation": self._positions(self.market_cap_shares),
+            },
+            "momentum_state": {
+                "positions": self._positions(self.momentum_shares),
+                "cash": float(self.momentum_cash),
+                "initialized": self.momentum_last_rebalance_date is not None,
+                "last_rebalance_date": self.momentum_last_rebalance_date,
+            },
+            "price_history": price_history,
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        """
+        Load engine state exported by ``export_state``
+
+        Also accepts the state persisted by BaselineCalculator, with
+        price history entries as dicts or (date, price) pairs.
+        """
+
+        def _shares(positions: Dict[str, float]) -> np.ndarray:
+            self._add_tickers(list(positions))
+            shares = np.zeros(len(self.tickers))
+            for ticker, qty in positions.items():
+                shares[self._index[ticker]] = qty
+            return shares
+
+        price_history = {
+            ticker: [
+                (entry["date"], entry["price"])
+                if isinstance(entry, dict)
+                else tuple(entry)
+                for entry in history
+            ]
+            for ticker, history in state.get("price_history", {}).items()
+        }
+        self._add_tickers(list(price_history))
+        dates = sorted({d for h in price_history.values() for d, _ in h})
+        dates = dates[-self.history_days :]
+        row_of = {d: i for i, d in enumerate(dates)}
+        self.history = np.full((len(dates), len(self.tickers)), np.nan)
+        for ticker, history in price_history.items():
+            for date, price in history:
+                if date in row_of:
+                    self.history[row_of[date], self._index[ticker]] = price
+        self.history_dates = dates
+
+        baseline_state = state.get("baseline_state", {})
+        if baseline_state.get("initialized", False):
+            self.equal_weight_shares = _shares(
+                baseline_state.get("initial_allocation", {}),
+            )
+
+        baseline_vw_state = state.get("baseline_vw_state", {})
+        if baseline_vw_state.get("initialized", False):
+            self.market_cap_shares = _shares(
+                baseline_vw_state.get("initial_allocation", {}),
+            )
+
+        momentum_state = state.get("momentum_state", {})
+        if momentum_state.get("initialized", False):
+            self.momentum_shares = _shares(momentum_state.get("positions", {}))
+            self.momentum_cash = momentum_state.get(
+                "cash",
+                self.initial_capital,
+            )
+            self.momentum_last_rebalance_date = momentum_state.get(
+                "last_rebalance_date",
+            )
+
+        # Shares of tickers added after a vector was restored
+        for name in (
+            "equal_weight_shares",
+            "market_cap_shares",
+            "momentum_shares",
+        ):
+            shares = getattr(self, name)
+            if shares is not None and len(shares) < len(self.tickers):
+                setattr(
+                    self,
+                    name,
+                    np.concatenate(
+                        [shares, np.zeros(len(self.tickers) - len(shares))],
+                    ),
+                )
+
+        logger.info(
+            f"Restored baselines for {len(self.tickers)} tickers, "
+            f"{len(self.history_dates)} days of price history, "
+            f"last momentum rebalance: {self.momentum_last_rebalance_date}",
+        )
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Token-bucket rate limiting for external data providers
+
+Requests take a token before they are sent, so bursts are smoothed out
+proactively instead of waiting for the provider to answer 429. A 429 that
+still slips through pauses the whole bucket, so every caller backs off
+together rather than each one retrying on its own.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from backend.config.env_config import get_env_float
+
+# Default requests per minute and burst size per provider
+_DEFAULT_LIMITS = {
+    "finnhub": (60.0, 10),
+    "financial_datasets": (120.0, 20),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from threads and coroutines"""
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """Block the current thread until a token is available"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait for a token without blocking the event loop"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back all callers, e.g. after the provider answered 429"""
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + seconds,
+            )
+            self._tokens = min(self._tokens, 0.0)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Get the shared limiter for a provider.
+
+    Limits can be overridden with ``{PROVIDER}_RATE_LIMIT`` (requests per
+    minute) and ``{PROVIDER}_RATE_BURST`` environment variables.
+    """
+    with _limiters_lock:
+        limiter: Optional[TokenBucket] = _limiters.get(provider)
+        if limiter is None:
+            rate, burst = _DEFAULT_LIMITS.get(provider, (60.0, 10))
+            prefix = provider.upper()
+            limiter = TokenBucket(
+                rate_per_minute=get_env_float(f"{prefix}_RATE_LIMIT", rate),
+                capacity=int(get_env_float(f"{prefix}_RATE_BURST", burst)),
+            )
+            _limiters[provider] = limiter
+        return limiter
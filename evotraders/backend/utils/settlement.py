@@ -5,18 +5,11 @@ Unified daily settlement logic for agent portfolio, baselines, and analyst track
 """
 # flake8: noqa: E501
 import logging
-from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from backend.services.storage import StorageService
-from backend.utils.analyst_tracker import (
-    AnalystPerformanceTracker,
-    update_leaderboard_with_evaluations,
-)
-from backend.utils.baselines import (
-    BaselineCalculator,
-    calculate_momentum_scores,
-)
+from backend.utils.analyst_tracker import AnalystPerformanceTracker
+from backend.utils.baselines import BaselineEngine
 
 logger = logging.getLogger(__name__)
 
@@ -40,10 +33,13 @@ class SettlementCoordinator:
     ):
         self.storage = storage
         self.initial_capital = initial_capital
-        self.baseline_calculator = BaselineCalculator(initial_capital)
-        self.analyst_tracker = AnalystPerformanceTracker()
-
-        self.price_history: Dict[str, List[tuple]] = {}
+        # Baseline portfolios and the price history momentum is scored on
+        self.baselines = BaselineEngine(
+            initial_capital,
+            lookback_days=20,
+            history_days=60,
+        )
+        self.analyst_tracker = AnalystPerformanceTracker(storage.predictions)
 
         # Load persisted state from storage
         self._load_persisted_state()
@@ -52,61 +48,33 @@ class SettlementCoordinator:
         """
         Load persisted baseline and price history state from storage
 
-        This restores the baseline calculator state so that backtest/live mode
+        This restores the baseline engine state so that backtest/live mode
         can resume from where it left off.
         """
         internal_state = self.storage.load_internal_state()
-
-        # Load baseline calculator state
-        baseline_state = {
-            "baseline_state": internal_state.get("baseline_state", {}),
-            "baseline_vw_state": internal_state.get("baseline_vw_state", {}),
-            "momentum_state": internal_state.get("momentum_state", {}),
-        }
-        self.baseline_calculator.load_state(baseline_state)
-
-        # Load price history for momentum calculation
-        saved_price_history = internal_state.get("price_history", {})
-        if saved_price_history:
-            # Convert saved format back to list of tuples
-            for ticker, history in saved_price_history.items():
-                self.price_history[ticker] = [
-                    (entry["date"], entry["price"])
-                    if isinstance(entry, dict)
-                    else tuple(entry)
-                    for entry in history
-                ]
-            logger.info(
-                f"Restored price history for {len(self.price_history)} tickers",
-            )
+        self.baselines.load_state(
+            {
+                key: internal_state.get(key, {})
+                for key in (
+                    "baseline_state",
+                    "baseline_vw_state",
+                    "momentum_state",
+                    "price_history",
+                )
+            },
+        )
 
     def _save_persisted_state(self):
         """
         Save baseline and price history state to storage
 
-        This persists the baseline calculator state so that backtest/live mode
+        This persists the baseline engine state so that backtest/live mode
         can resume from where it left off after restart.
         """
         internal_state = self.storage.load_internal_state()
-
-        # Export baseline calculator state
-        baseline_state = self.baseline_calculator.export_state()
-        internal_state["baseline_state"] = baseline_state["baseline_state"]
-        internal_state["baseline_vw_state"] = baseline_state[
-            "baseline_vw_state"
-        ]
-        internal_state["momentum_state"] = baseline_state["momentum_state"]
-
-        # Save price history (convert tuples to dicts for JSON serialization)
-        price_history_serializable = {}
-        for ticker, history in self.price_history.items():
-            price_history_serializable[ticker] = [
-                {"date": date, "price": price} for date, price in history
-            ]
-        internal_state["price_history"] = price_history_serializable
-
+        internal_state.update(self.baselines.export_state())
         self.storage.save_internal_state(internal_state)
-        logger.info("Persisted baseline calculator and price history state")
+        logger.info("Persisted baseline engine and price history state")
 
     def record_analyst_predictions(
         self,
@@ -131,25 +99,6 @@ class SettlementCoordinator:
         """
         self.analyst_tracker.record_analyst_predictions(final_predictions)
 
-    def update_price_history(
-        self,
-        date: str,
-        prices: Dict[str, float],
-    ):
-        """
-        Update price history for momentum calculation
-
-        Args:
-            date: Trading date (YYYY-MM-DD)
-            prices: Current prices for each ticker
-        """
-        for ticker, price in prices.items():
-            if ticker not in self.price_history:
-                self.price_history[ticker] = []
-            self.price_history[ticker].append((date, price))
-
-            self.price_history[ticker] = self.price_history[ticker][-60:]
-
     def run_daily_settlement(
         self,
         date: str,
@@ -177,23 +126,12 @@ class SettlementCoordinator:
         """
         logger.info(f"Running daily settlement for {date}")
 
-        self.update_price_history(date, close_prices)
-
-        momentum_scores = calculate_momentum_scores(
+        # Records the close for momentum and rebalances on a new month
+        baseline_values = self.baselines.step(
+            date,
             tickers,
-            self.price_history,
-            lookback_days=20,
-        )
-
-        rebalance_momentum = self._should_rebalance_momentum(date)
-
-        baseline_values = self.baseline_calculator.get_all_baseline_values(
-            tickers=tickers,
-            prices=close_prices,
-            market_caps=market_caps,
-            momentum_scores=momentum_scores,
-            date=date,
-            rebalance_momentum=rebalance_momentum,
+            close_prices,
+            market_caps,
         )
 
         agent_value = self.storage.calculate_portfolio_value(
@@ -201,16 +139,15 @@ class SettlementCoordinator:
             close_prices,
         )
 
+        leaderboard = self.storage.load_file("leaderboard") or []
+        self.analyst_tracker.seed_from_leaderboard(leaderboard)
         analyst_evaluations = self.analyst_tracker.evaluate_predictions(
             open_prices,
             close_prices,
             date,
         )
-
-        leaderboard = self.storage.load_file("leaderboard") or []
-        updated_leaderboard = update_leaderboard_with_evaluations(
+        updated_leaderboard = self.analyst_tracker.render_leaderboard(
             leaderboard,
-            analyst_evaluations,
         )
         self.storage.save_file("leaderboard", updated_leaderboard)
 
@@ -234,24 +171,6 @@ class SettlementCoordinator:
             "leaderboard_updated": True,
         }
 
-    def _should_rebalance_momentum(self, date: str) -> bool:
-        """
-        Check if momentum portfolio should rebalance
-
-        Returns True if it's a new month
-        """
-        last_rebalance = self.baseline_calculator.momentum_last_rebalance_date
-        if last_rebalance is None:
-            return True
-
-        last_date = datetime.strptime(last_rebalance, "%Y-%m-%d")
-        current_date = datetime.strptime(date, "%Y-%m-%d")
-
-        return (current_date.year, current_date.month) != (
-            last_date.year,
-            last_date.month,
-        )
-
     def _update_summary_with_baselines(
         self,
         date: str,
@@ -276,9 +195,9 @@ class SettlementCoordinator:
 
     def update_intraday_values(
         self,
-        tickers: List[str],
+        tickers: List[str],  # pylint: disable=W0613
         current_prices: Dict[str, float],
-        market_caps: Dict[str, float],
+        market_caps: Dict[str, float],  # pylint: disable=W0613
         agent_portfolio: Dict[str, Any],
     ) -> Dict[str, float]:
         """
@@ -298,41 +217,9 @@ class SettlementCoordinator:
             current_prices,
         )
 
-        equal_weight = self.baseline_calculator.calculate_equal_weight_value(
-            tickers,
-            current_prices,
-        )
-        market_cap = (
-            self.baseline_calculator.calculate_market_cap_weighted_value(
-                tickers,
-                current_prices,
-                market_caps,
-            )
-        )
-
-        momentum_scores = calculate_momentum_scores(
-            tickers,
-            self.price_history,
-            lookback_days=20,
-        )
-
-        last_date = (
-            list(self.price_history.values())[0][-1][0]
-            if self.price_history
-            else ""
-        )
-
-        momentum = self.baseline_calculator.calculate_momentum_value(
-            tickers,
-            current_prices,
-            momentum_scores,
-            date=last_date,
-            rebalance=False,
-        )
-
+        # Baselines only trade at settlement; intraday they are marked
+        # to market
         return {
             "agent": agent_value,
-            "equal_weight": equal_weight,
-            "market_cap_weighted": market_cap,
-            "momentum": momentum,
+            **self.baselines.mark_to_market(current_prices),
         }
@@ -5,9 +5,13 @@ Trading Execution Engine - Supports Two Modes
 2. Portfolio mode: Executes specific trades and tracks positions
 """
 # flake8: noqa: E501
-from copy import deepcopy
+import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 
 class DirectionSignalRecorder:
@@ -110,13 +114,371 @@ def parse_pm_decisions(pm_output: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         return {}
 
 
+def is_whole_quantity(quantity: Any) -> bool:
+    """Whether a share quantity is a whole number (10 and 10.0, not 10.5)"""
+    try:
+        return float(quantity).is_integer()
+    except (TypeError, ValueError):
+        return False
+
+
+def _shares(values: Sequence[Any], what: str) -> np.ndarray:
+    """Share counts as int64, rejecting fractional ones"""
+    arr = np.asarray(values, dtype=np.float64)
+    if not np.all(np.mod(arr, 1) == 0):
+        raise ValueError(f"{what} must be whole shares: {list(values)}")
+    return arr.astype(np.int64)
+
+
+class Fills(NamedTuple):
+    """Per-order outcome of PortfolioBook.apply_orders"""
+
+    ok: np.ndarray  # bool, order fully executed
+    closed: np.ndarray  # shares covered (long) or sold (short)
+    opened: np.ndarray  # shares bought (long) or shorted (short)
+    failures: Dict[int, Dict[str, Any]]  # order index -> failed leg
+
+
+class PortfolioBook:
+    """
+    Array-backed portfolio: positions, cost basis and margin as vectors
+
+    Long/short shares and cost bases are NumPy vectors indexed by ticker
+    column. ``apply_orders`` applies a whole batch of orders with the same
+    semantics as executing them one after another: shares held on the
+    opposite side are closed first, and the opening leg fails if the cash
+    left after all earlier orders does not cover it. Runs of feasible
+    orders are applied as one vector update; the book only falls back to
+    recomputing after an order fails.
+
+    Columns touched since the last ``take_changes`` are tracked, so
+    callers can record compact per-day deltas instead of full copies.
+    """
+
+    def __init__(
+        self,
+        cash: float = 100000.0,
+        margin_requirement: float = 0.0,
+        margin_used: float = 0.0,
+    ):
+        self.cash = float(cash)
+        self.margin_requirement = float(margin_requirement)
+        self.margin_used = float(margin_used)
+
+        self.tickers: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.long = np.zeros(0, dtype=np.int64)
+        self.short = np.zeros(0, dtype=np.int64)
+        self.long_cost = np.zeros(0)
+        self.short_cost = np.zeros(0)
+
+        # Portfolio keys the book does not model, passed through as-is
+        self.extra: Dict[str, Any] = {}
+        self._changed: set = set()
+
+    @classmethod
+    def from_portfolio(cls, portfolio: Dict[str, Any]) -> "PortfolioBook":
+        """Build a book from the portfolio dict format"""
+        book = cls(
+            cash=portfolio.get("cash", 100000.0),
+            margin_requirement=portfolio.get("margin_requirement", 0.0),
+            margin_used=portfolio.get("margin_used", 0.0),
+        )
+        positions = portfolio.get("positions") or {}
+        cols = book.columns(list(positions))
+        book.long[cols] = _shares(
+            [p.get("long", 0) for p in positions.values()],
+            "Long positions",
+        )
+        book.short[cols] = _shares(
+            [p.get("short", 0) for p in positions.values()],
+            "Short positions",
+        )
+        for col, position in zip(cols, positions.values()):
+            book.long_cost[col] = position.get("long_cost_basis", 0.0)
+            book.short_cost[col] = position.get("short_cost_basis", 0.0)
+        modeled = ("cash", "positions", "margin_requirement", "margin_used")
+        book.extra = {k: v for k, v in portfolio.items() if k not in modeled}
+        book._changed.clear()
+        return book
+
+    def to_portfolio(self) -> Dict[str, Any]:
+        """Export in the portfolio dict format"""
+        return {
+            **self.extra,
+            "cash": self.cash,
+            "positions": self.positions(range(len(self.tickers))),
+            "margin_requirement": self.margin_requirement,
+            "margin_used": self.margin_used,
+        }
+
+    def positions(self, cols: Sequence[int]) -> Dict[str, Dict[str, Any]]:
+        """Position dicts of the given columns, by ticker"""
+        cols = np.asarray(cols, dtype=np.int64)
+        return {
+            self.tickers[col]: {
+                "long": long,
+                "short": short,
+                "long_cost_basis": long_cost,
+                "short_cost_basis": short_cost,
+            }
+            for col, long, short, long_cost, short_cost in zip(
+                cols.tolist(),
+                self.long[cols].tolist(),
+                self.short[cols].tolist(),
+                self.long_cost[cols].tolist(),
+                self.short_cost[cols].tolist(),
+            )
+        }
+
+    def columns(self, tickers: Sequence[str]) -> np.ndarray:
+        """Column of each ticker, adding empty positions for new ones"""
+        new = [t for t in dict.fromkeys(tickers) if t not in self._index]
+        if new:
+            for ticker in new:
+                self._index[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+            pad = len(new)
+            self.long = np.concatenate([self.long, np.zeros(pad, np.int64)])
+            self.short = np.concatenate([self.short, np.zeros(pad, np.int64)])
+            self.long_cost = np.concatenate([self.long_cost, np.zeros(pad)])
+            self.short_cost = np.concatenate([self.short_cost, np.zeros(pad)])
+            self._changed.update(self._index[t] for t in new)
+        return np.array([self._index[t] for t in tickers], dtype=np.int64)
+
+    def price_vector(self, prices: Dict[str, float]) -> np.ndarray:
+        """Prices aligned to the book columns, NaN where missing"""
+        return np.array(
+            [prices.get(t, np.nan) for t in self.tickers],
+            dtype=np.float64,
+        )
+
+    def value(self, prices: Dict[str, float]) -> float:
+        """Net liquidation value; margin used is frozen cash, not lost"""
+        net = (self.long - self.short) * self.price_vector(prices)
+        return self.cash + self.margin_used + float(np.nansum(net))
+
+    def take_changes(self) -> Dict[str, Dict[str, Any]]:
+        """Positions changed since the last call, by ticker"""
+        changes = self.positions(sorted(self._changed))
+        self._changed.clear()
+        return changes
+
+    def _legs(self, cols, is_long, is_short, qty, price):
+        """Closing and opening quantities and their cash effects"""
+        held = np.where(
+            is_long,
+            self.short[cols],
+            np.where(is_short, self.long[cols], 0),
+        )
+        closed = np.clip(np.minimum(qty, held), 0, None)
+        opened = np.where(
+            is_long | is_short,
+            np.clip(qty - closed, 0, None),
+            0,
+        )
+
+        mr = self.margin_requirement
+        released = closed * self.short_cost[cols] * mr
+        margin_needed = opened * price * mr
+        # Cash change of the closing leg, what the opening leg needs, and
+        # the cash change of the opening leg
+        close_cash = np.where(
+            is_long,
+            released - closed * price,
+            closed * price,
+        )
+        need = np.where(is_long, opened * price, margin_needed)
+        open_cash = np.where(
+            is_long,
+            -opened * price,
+            opened * price - margin_needed,
+        )
+        return closed, opened, close_cash, need, open_cash
+
+    def _apply(self, cols, is_long, is_short, price, closed, opened):
+        """Vector update for orders with unique columns"""
+        mr = self.margin_requirement
+        lc = cols[is_long]
+        if lc.size:
+            cover, buy, p = closed[is_long], opened[is_long], price[is_long]
+            released = cover * self.short_cost[lc] * mr
+            self.short[lc] -= cover
+            self.short_cost[lc] = np.where(
+                (cover > 0) & (self.short[lc] == 0),
+                0.0,
+                self.short_cost[lc],
+            )
+            new_long = self.long[lc] + buy
+            with np.errstate(divide="ignore", invalid="ignore"):
+                blended = (
+                    self.long[lc] * self.long_cost[lc] + buy * p
+                ) / new_long
+            self.long_cost[lc] = np.where(
+                (buy > 0) & (new_long > 0),
+                blended,
+                self.long_cost[lc],
+            )
+            self.long[lc] = new_long
+            self.cash += float(np.sum(released - cover * p - buy * p))
+            self.margin_used -= float(np.sum(released))
+
+        sc = cols[is_short]
+        if sc.size:
+            sell, short = closed[is_short], opened[is_short]
+            p = price[is_short]
+            margin_needed = short * p * mr
+            self.long[sc] -= sell
+            self.long_cost[sc] = np.where(
+                (sell > 0) & (self.long[sc] == 0),
+                0.0,
+                self.long_cost[sc],
+            )
+            new_short = self.short[sc] + short
+            with np.errstate(divide="ignore", invalid="ignore"):
+                blended = (
+                    self.short[sc] * self.short_cost[sc] + short * p
+                ) / new_short
+            self.short_cost[sc] = np.where(
+                (short > 0) & (new_short > 0),
+                blended,
+                self.short_cost[sc],
+            )
+            self.short[sc] = new_short
+            self.cash += float(np.sum(sell * p + short * p - margin_needed))
+            self.margin_used += float(np.sum(margin_needed))
+
+        self._changed.update(cols[(closed > 0) | (opened > 0)].tolist())
+
+    def apply_orders(
+        self,
+        tickers: Sequence[str],
+        actions: Sequence[str],
+        quantities: Sequence[int],
+        prices: Sequence[float],
+    ) -> Fills:
+        """
+        Apply a batch of orders in sequence order
+
+        Args:
+            tickers: Ticker of each order, unique within the batch
+            actions: "long" (cover shorts, then buy) or "short" (sell
+                longs, then short); anything else is a no-op
+            quantities: Whole shares per order
+            prices: Execution price per order, > 0
+
+        Returns:
+            Fills with closed/opened shares per order; a failed order
+            keeps its closing leg, as when executed on its own
+
+        Raises:
+            ValueError: A quantity is not a whole number of shares
+        """
+        n = len(tickers)
+        cols = self.columns(tickers)
+        action_arr = np.asarray(actions, dtype=object)
+        is_long = action_arr == "long"
+        is_short = action_arr == "short"
+        qty = _shares(quantities, "Order quantities").reshape(n)
+        price = np.asarray(prices, dtype=np.float64).reshape(n)
+
+        ok = np.ones(n, dtype=bool)
+        closed_all = np.zeros(n, dtype=np.int64)
+        opened_all = np.zeros(n, dtype=np.int64)
+        failures: Dict[int, Dict[str, Any]] = {}
+
+        start = 0
+        while start < n:
+            part = slice(start, n)
+            closed, opened, close_cash, need, open_cash = self._legs(
+                cols[part],
+                is_long[part],
+                is_short[part],
+                qty[part],
+                price[part],
+            )
+            steps = close_cash + open_cash
+            cash_before = self.cash + np.concatenate(
+                [[0.0], np.cumsum(steps)[:-1]],
+            )
+            available = cash_before + close_cash
+            failed = np.flatnonzero((opened > 0) & (available < need))
+            stop = failed[0] if failed.size else n - start
+
+            done = slice(start, start + stop)
+            self._apply(
+                cols[done],
+                is_long[done],
+                is_short[done],
+                price[done],
+                closed[:stop],
+                opened[:stop],
+            )
+            closed_all[done] = closed[:stop]
+            opened_all[done] = opened[:stop]
+            if not failed.size:
+                break
+
+            # The failing order still closes what it held on the other side
+            i = start + stop
+            one = slice(i, i + 1)
+            self._apply(
+                cols[one],
+                is_long[one],
+                is_short[one],
+                price[one],
+                closed[stop : stop + 1],
+                np.zeros(1, dtype=np.int64),
+            )
+            closed_all[i] = closed[stop]
+            ok[i] = False
+            failures[i] = self._failure(
+                tickers[i],
+                bool(is_long[i]),
+                int(opened[stop]),
+                float(price[i]),
+                float(need[stop]),
+                float(available[stop]),
+            )
+            start = i + 1
+
+        return Fills(ok, closed_all, opened_all, failures)
+
+    @staticmethod
+    def _failure(ticker, is_long, quantity, price, needed, available):
+        if is_long:
+            action = "buy"
+            reason = f"Insufficient cash (needed: ${needed:.2f}, available: ${available:.2f})"
+        else:
+            action = "short"
+            reason = f"Insufficient margin (needed: ${needed:.2f}, available: ${available:.2f})"
+        return {
+            "status": "failed",
+            "ticker": ticker,
+            "action": action,
+            "quantity": quantity,
+            "price": price,
+            "reason": reason,
+        }
+
+
 class PortfolioTradeExecutor:
-    """Portfolio mode trade executor, executes specific trades and tracks positions"""
+    """
+    Portfolio mode trade executor, executes specific trades and tracks positions
+
+    Positions live in a PortfolioBook; ``portfolio`` exports them in the
+    dict format. ``portfolio_history`` holds one compact delta per
+    ``execute_trades`` call (cash, margin and only the positions that
+    changed); ``portfolio_at`` rebuilds the full portfolio of an entry
+    from the portfolio the executor started with, or was last set to
+    before it.
+    """
 
-    portfolio: Dict[str, Any]
     trade_history: List[Dict[str, Any]]
     portfolio_history: List[Dict[str, Any]]
 
+    _LEG_NAMES = {"long": ("Cover", "Buy"), "short": ("Sell", "Short")}
+
     def __init__(self, initial_portfolio: Optional[Dict[str, Any]] = None):
         """
         Initialize Portfolio trade executor
@@ -126,18 +488,36 @@ class PortfolioTradeExecutor:
         """
 
         if initial_portfolio is None:
-            self.portfolio = {
+            initial_portfolio = {
                 "cash": 100000.0,
                 "positions": {},
                 # Default 0.0 (short selling disabled)
                 "margin_requirement": 0.0,
                 "margin_used": 0.0,
             }
-        else:
-            self.portfolio = deepcopy(initial_portfolio)
+        self.book = PortfolioBook.from_portfolio(initial_portfolio)
+        # (first portfolio_history index, full portfolio) the deltas from
+        # that index on are applied to
+        self._bases: List[Tuple[int, Dict[str, Any]]] = [
+            (0, self.book.to_portfolio()),
+        ]
 
         self.trade_history = []  # Trade history
-        self.portfolio_history = []  # Portfolio history
+        self.portfolio_history = []  # Per-day portfolio deltas
+
+    @property
+    def portfolio(self) -> Dict[str, Any]:
+        """Current portfolio state (a fresh dict on each access)"""
+        return self.book.to_portfolio()
+
+    @portfolio.setter
+    def portfolio(self, portfolio: Dict[str, Any]):
+        self.book = PortfolioBook.from_portfolio(portfolio)
+        base = (len(self.portfolio_history), self.book.to_portfolio())
+        if self._bases[-1][0] == base[0]:
+            self._bases[-1] = base
+        else:
+            self._bases.append(base)
 
     def execute_trade(
         self,
@@ -169,15 +549,63 @@ class PortfolioTradeExecutor:
         if price <= 0:
             return {"status": "failed", "reason": "Invalid price"}
 
-        result = self._execute_single_trade(
-            ticker=ticker,
-            action=action,
-            target_quantity=quantity,
-            price=price,
-            date=current_date,
+        if not is_whole_quantity(quantity):
+            return {"status": "failed", "reason": "Invalid quantity"}
+
+        return self._execute_batch(
+            [ticker],
+            [action],
+            [int(float(quantity))],
+            [price],
+            current_date,
+        )[0]
+
+    def _execute_batch(
+        self,
+        tickers: List[str],
+        actions: List[str],
+        quantities: List[int],
+        prices: List[float],
+        date: str,
+    ) -> List[Dict[str, Any]]:
+        """Apply orders as one batch, returning a result per order"""
+        fills = self.book.apply_orders(tickers, actions, quantities, prices)
+        ok, closed, opened = (
+            fills.ok.tolist(),
+            fills.closed.tolist(),
+            fills.opened.tolist(),
         )
 
-        return result
+        results = []
+        for i, ticker in enumerate(tickers):
+            if not ok[i]:
+                results.append(fills.failures[i])
+                continue
+
+            trades_executed = []
+            close_name, open_name = self._LEG_NAMES.get(
+                actions[i],
+                (None, None),
+            )
+            if closed[i] > 0:
+                trades_executed.append(f"{close_name} {closed[i]} shares")
+            if opened[i] > 0:
+                trades_executed.append(f"{open_name} {opened[i]} shares")
+
+            # Record trade with backtest-compatible timestamp
+            trade_record = {
+                "status": "success",
+                "ticker": ticker,
+                "action": actions[i],
+                "target_quantity": quantities[i],
+                "price": prices[i],
+                "trades": trades_executed,
+                "date": date,
+                "timestamp": f"{date}T09:30:00",
+            }
+            self.trade_history.append(trade_record)
+            results.append(trade_record)
+        return results
 
     def execute_trades(
         self,
@@ -207,13 +635,15 @@ class PortfolioTradeExecutor:
             "timestamp": timestamp,
             "executed_trades": [],
             "failed_trades": [],
-            "portfolio_before": deepcopy(self.portfolio),
+            "portfolio_before": self.book.to_portfolio(),
             "portfolio_after": None,
         }
 
-        print(f"\n💼 Executing Portfolio trades for {current_date}...")
+        logger.info(f"Executing Portfolio trades for {current_date}")
 
-        # Execute trades for each ticker
+        # Results in decision order: failed records or batch order indices
+        slots: List[Any] = []
+        tickers, actions, quantities, prices = [], [], [], []
         for ticker, decision in decisions.items():
             action = decision.get("action", "hold")
             quantity = decision.get("quantity", 0)
@@ -221,49 +651,51 @@ class PortfolioTradeExecutor:
             if action == "hold" or quantity == 0:
                 continue
 
-            price = current_prices.get(ticker, 0)
-            if price <= 0:
-                execution_report["failed_trades"].append(
+            price = current_prices.get(ticker) or 0
+            reason = None
+            if not is_whole_quantity(quantity):
+                reason = "Quantity must be a whole number of shares"
+            elif price <= 0:
+                reason = "No valid price data"
+            if reason:
+                slots.append(
                     {
                         "ticker": ticker,
                         "action": action,
                         "quantity": quantity,
-                        "reason": "No valid price data",
+                        "reason": reason,
                     },
                 )
-                print(
-                    f"   ❌ {ticker}: Unable to execute {action} - No valid price",
-                )
                 continue
 
-            # Execute trade
-            trade_result = self._execute_single_trade(
-                ticker,
-                action,
-                quantity,
-                price,
-                current_date,
-            )
-            if trade_result["status"] == "success":
-                execution_report["executed_trades"].append(trade_result)
-
-                trades_info = ", ".join(trade_result.get("trades", []))
-                print(
-                    f"   ✔ {ticker}: {action} Target {quantity} shares "
-                    f"({trades_info}) @ ${price:.2f}",
-                )
+            slots.append(len(tickers))
+            tickers.append(ticker)
+            actions.append(action)
+            quantities.append(int(float(quantity)))
+            prices.append(price)
+
+        results = self._execute_batch(
+            tickers,
+            actions,
+            quantities,
+            prices,
+            current_date,
+        )
+        for slot in slots:
+            result = results[slot] if isinstance(slot, int) else slot
+            if result.get("status") == "success":
+                execution_report["executed_trades"].append(result)
             else:
-                execution_report["failed_trades"].append(trade_result)
-                print(
-                    f"   ✗ {ticker}: Unable to execute {action} - {trade_result['reason']}",
-                )
+                execution_report["failed_trades"].append(result)
 
         # Record final portfolio state
-        execution_report["portfolio_after"] = deepcopy(self.portfolio)
+        execution_report["portfolio_after"] = self.book.to_portfolio()
         self.portfolio_history.append(
             {
                 "date": current_date,
-                "portfolio": deepcopy(self.portfolio),
+                "cash": self.book.cash,
+                "margin_used": self.book.margin_used,
+                "positions": self.book.take_changes(),
             },
         )
 
@@ -271,434 +703,79 @@ class PortfolioTradeExecutor:
         portfolio_value = self._calculate_portfolio_value(current_prices)
         execution_report["portfolio_value"] = portfolio_value
 
-        print("\n✔ Trade execution completed:")
-        print(f"   Success: {len(execution_report['executed_trades'])} trades")
-        print(f"   Failed: {len(execution_report['failed_trades'])} trades")
-        print(f"   Portfolio value: ${portfolio_value:,.2f}")
-        print(f"   Cash balance: ${self.portfolio['cash']:,.2f}")
-
-        return execution_report
-
-    def _execute_single_trade(
-        self,
-        ticker: str,
-        action: str,
-        target_quantity: int,
-        price: float,
-        date: str,
-    ) -> Dict[str, Any]:
-        """
-        Execute single trade - Incremental mode
-
-        Args:
-            ticker: Stock ticker
-            action: long(add position)/short(reduce position)/hold
-            target_quantity: Incremental quantity (long=buy shares, short=sell shares)
-            price: Current price
-            date: Trade date
-        """
-
-        # Ensure position exists
-        if ticker not in self.portfolio["positions"]:
-            self.portfolio["positions"][ticker] = {
-                "long": 0,
-                "short": 0,
-                "long_cost_basis": 0.0,
-                "short_cost_basis": 0.0,
-            }
-
-        position = self.portfolio["positions"][ticker]
-        current_long = position["long"]
-        current_short = position["short"]
-
-        trades_executed = []  # Record actually executed trade steps
-
-        if action == "long":
-            result = self._execute_long_action(
-                ticker,
-                target_quantity,
-                price,
-                date,
-                current_long,
-                current_short,
-                trades_executed,
-            )
-            if result["status"] == "failed":
-                return result
-
-        elif action == "short":
-            result = self._execute_short_action(
-                ticker,
-                target_quantity,
-                price,
-                date,
-                current_long,
-                current_short,
-                trades_executed,
-            )
-            if result["status"] == "failed":
-                return result
-
-        elif action == "hold":
-            print(f"\n⏸️ {ticker} Position unchanged: {current_long} shares")
-
-        # Record trade with backtest-compatible timestamp
-        trade_record = {
-            "status": "success",
-            "ticker": ticker,
-            "action": action,
-            "target_quantity": target_quantity,
-            "price": price,
-            "trades": trades_executed,
-            "date": date,
-            "timestamp": f"{date}T09:30:00",
-        }
-
-        self.trade_history.append(trade_record)
-
-        return trade_record
-
-    def _execute_long_action(
-        self,
-        ticker: str,
-        target_quantity: int,
-        price: float,
-        date: str,
-        current_long: int,
-        current_short: int,
-        trades_executed: list,
-    ) -> Dict[str, Any]:
-        """Execute long action: Buy shares or cover shorts first"""
-        print(
-            f"\n📈 {ticker} Long operation: Current Long {current_long}, "
-            f"Short {current_short} → Target quantity {target_quantity}",
-        )
-
-        if target_quantity <= 0:
-            print("   ⏸️ Quantity is 0, no trade needed")
-            return {"status": "success"}
-
-        remaining = target_quantity
-
-        # If has short position, cover first
-        if current_short > 0:
-            cover_qty = min(remaining, current_short)
-            print(f"   1️⃣ Cover short: {cover_qty} shares")
-            cover_result = self._cover_short_position(
-                ticker,
-                cover_qty,
-                price,
-                date,
-            )
-            if cover_result["status"] == "failed":
-                return cover_result
-            trades_executed.append(f"Cover {cover_qty} shares")
-            remaining -= cover_qty
-
-        # If still has remaining quantity, buy long
-        if remaining > 0:
-            print(f"   2️⃣ Buy long: {remaining} shares")
-            buy_result = self._buy_long_position(
-                ticker,
-                remaining,
-                price,
-                date,
-            )
-            if buy_result["status"] == "failed":
-                return buy_result
-            trades_executed.append(f"Buy {remaining} shares")
-
-        # Display final result
-        final_long = self.portfolio["positions"][ticker]["long"]
-        final_short = self.portfolio["positions"][ticker]["short"]
-        print(
-            f"   ✅ Final state: Long {final_long} shares, Short {final_short} shares",
-        )
-
-        return {"status": "success"}
-
-    def _execute_short_action(
-        self,
-        ticker: str,
-        target_quantity: int,
-        price: float,
-        date: str,
-        current_long: int,
-        current_short: int,
-        trades_executed: list,
-    ) -> Dict[str, Any]:
-        """Execute short action: Sell long positions first, then short if needed"""
-        print(
-            f"\n📉 {ticker} Short operation (quantity={target_quantity} shares):",
-        )
-        print(
-            f"   Current state: Long {current_long} shares, Short {current_short} shares",
-        )
-
-        if target_quantity <= 0:
-            print("   ⏸️ Quantity is 0, no trade needed")
-            return {"status": "success"}
-
-        remaining_quantity = target_quantity
-
-        # Step 1: If there are long positions, sell first
-        if current_long > 0:
-            sell_quantity = min(remaining_quantity, current_long)
-            print(f"   1️⃣ Sell long: {sell_quantity} shares")
-            sell_result = self._sell_long_position(
-                ticker,
-                sell_quantity,
-                price,
-                date,
-            )
-            if sell_result["status"] == "failed":
-                return sell_result
-            trades_executed.append(f"Sell {sell_quantity} shares")
-            remaining_quantity -= sell_quantity
-
-        # Step 2: If there's remaining quantity, establish or increase short position
-        if remaining_quantity > 0:
-            print(f"   2️⃣ Short: {remaining_quantity} shares")
-            short_result = self._open_short_position(
-                ticker,
-                remaining_quantity,
-                price,
-                date,
-            )
-            if short_result["status"] == "failed":
-                return short_result
-            trades_executed.append(f"Short {remaining_quantity} shares")
-
-        # Display final result
-        final_long = self.portfolio["positions"][ticker]["long"]
-        final_short = self.portfolio["positions"][ticker]["short"]
-        print(
-            f"   ✅ Final state: Long {final_long} shares, Short {final_short} shares",
+        logger.info(
+            f"Trade execution completed: "
+            f"{len(execution_report['executed_trades'])} succeeded, "
+            f"{len(execution_report['failed_trades'])} failed, "
+            f"portfolio value ${portfolio_value:,.2f}, "
+            f"cash ${self.book.cash:,.2f}",
         )
 
-        return {"status": "success"}
-
-    def _buy_long_position(
-        self,
-        ticker: str,
-        quantity: int,
-        price: float,
-        _date: str,
-    ) -> Dict[str, Any]:
-        """Buy long position"""
-        position = self.portfolio["positions"][ticker]
-        trade_value = quantity * price
-
-        if self.portfolio["cash"] < trade_value:
-            return {
-                "status": "failed",
-                "ticker": ticker,
-                "action": "buy",
-                "quantity": quantity,
-                "price": price,
-                "reason": f"Insufficient cash (needed: ${trade_value:.2f}, available: "
-                f"${self.portfolio['cash']:.2f})",
-            }
-
-        # Update position cost basis
-        old_long = position["long"]
-        old_cost_basis = position["long_cost_basis"]
-        new_long = old_long + quantity
-
-        # 🐛 Debug info
-        print(f"   🔍 Buy {ticker}:")
-        print(f"      Old position: {old_long} shares @ ${old_cost_basis:.2f}")
-        print(f"      Buy: {quantity} shares @ ${price:.2f}")
-        print(f"      New position: {new_long} shares")
-
-        if new_long > 0:
-            new_cost_basis = (
-                (old_long * old_cost_basis) + (quantity * price)
-            ) / new_long
-            print(
-                f"      New cost: ${new_cost_basis:.2f} = "
-                f"(({old_long} × ${old_cost_basis:.2f}) + "
-                f"({quantity} × ${price:.2f})) / {new_long}",
-            )
-            position["long_cost_basis"] = new_cost_basis
-        position["long"] = new_long
-
-        # Deduct cash
-        self.portfolio["cash"] -= trade_value
-
-        return {"status": "success"}
-
-    def _sell_long_position(
-        self,
-        ticker: str,
-        quantity: int,
-        price: float,
-        _date: str,
-    ) -> Dict[str, Any]:
-        """Sell long position"""
-        position = self.portfolio["positions"][ticker]
-
-        if position["long"] < quantity:
-            return {
-                "status": "failed",
-                "ticker": ticker,
-                "action": "sell",
-                "quantity": quantity,
-                "price": price,
-                "reason": f"Insufficient long position (holding: {position['long']},"
-                f" trying to sell: {quantity})",
-            }
-
-        # Reduce position
-        position["long"] -= quantity
-        if position["long"] == 0:
-            position["long_cost_basis"] = 0.0
-
-        # Increase cash
-        trade_value = quantity * price
-        self.portfolio["cash"] += trade_value
-
-        return {"status": "success"}
-
-    def _open_short_position(
-        self,
-        ticker: str,
-        quantity: int,
-        price: float,
-        _date: str,
-    ) -> Dict[str, Any]:
-        """Open short position"""
-        position = self.portfolio["positions"][ticker]
-        trade_value = quantity * price
-        margin_needed = trade_value * self.portfolio["margin_requirement"]
-
-        if self.portfolio["cash"] < margin_needed:
-            return {
-                "status": "failed",
-                "ticker": ticker,
-                "action": "short",
-                "quantity": quantity,
-                "price": price,
-                "reason": f"Insufficient margin (needed: ${margin_needed:.2f}, "
-                f"available: ${self.portfolio['cash']:.2f})",
-            }
-
-        # Update position cost basis
-        old_short = position["short"]
-        old_cost_basis = position["short_cost_basis"]
-        new_short = old_short + quantity
-        if new_short > 0:
-            position["short_cost_basis"] = (
-                (old_short * old_cost_basis) + (quantity * price)
-            ) / new_short
-        position["short"] = new_short
-
-        # Increase cash (short sale proceeds) and margin used
-        self.portfolio["cash"] += trade_value - margin_needed
-        self.portfolio["margin_used"] += margin_needed
-
-        return {"status": "success"}
-
-    def _cover_short_position(
-        self,
-        ticker: str,
-        quantity: int,
-        price: float,
-        _date: str,
-    ) -> Dict[str, Any]:
-        """Cover short position"""
-        position = self.portfolio["positions"][ticker]
-
-        if position["short"] < quantity:
-            return {
-                "status": "failed",
-                "ticker": ticker,
-                "action": "cover",
-                "quantity": quantity,
-                "price": price,
-                "reason": f"Insufficient short position (holding: {position['short']}, "
-                f"trying to cover: {quantity})",
-            }
+        return execution_report
 
-        # Calculate released margin - 🔧 FIX: Use cost_basis instead of current price
-        trade_value = quantity * price
-        cost_basis = position["short_cost_basis"]
-        margin_released = (
-            quantity * cost_basis * self.portfolio["margin_requirement"]
+    def portfolio_at(self, index: int) -> Dict[str, Any]:
+        """Rebuild the full portfolio after a portfolio_history entry"""
+        # Normalizes negative indices and raises IndexError like a list
+        index = range(len(self.portfolio_history))[index]
+        start, base = next(
+            (start, base)
+            for start, base in reversed(self._bases)
+            if start <= index
         )
-
-        # Reduce position
-        position["short"] -= quantity
-        if position["short"] == 0:
-            position["short_cost_basis"] = 0.0
-
-        # Deduct cash (buy to cover) and release margin
-        self.portfolio["cash"] -= trade_value
-        self.portfolio["cash"] += margin_released
-        self.portfolio["margin_used"] -= margin_released
-
-        return {"status": "success"}
+        entries = self.portfolio_history[start : index + 1]
+        portfolio = {**base, "positions": dict(base["positions"])}
+        for entry in entries:
+            portfolio["positions"].update(entry["positions"])
+        portfolio["cash"] = entries[-1]["cash"]
+        portfolio["margin_used"] = entries[-1]["margin_used"]
+        return portfolio
 
     def _calculate_portfolio_value(
         self,
         current_prices: Dict[str, float],
     ) -> float:
         """Calculate total portfolio value (net liquidation value)"""
-        # Add margin_used back because it's frozen cash, not lost money
-        total_value = self.portfolio["cash"] + self.portfolio["margin_used"]
-
-        for ticker, position in self.portfolio["positions"].items():
-            if ticker in current_prices:
-                price = current_prices[ticker]
-                # Add long position value
-                total_value += position["long"] * price
-                # Subtract short position value (liability)
-                total_value -= position["short"] * price
-
-        return total_value
+        return self.book.value(current_prices)
 
     def get_portfolio_summary(
         self,
         current_prices: Dict[str, float],
     ) -> Dict[str, Any]:
         """Get portfolio summary"""
-        portfolio_value = self._calculate_portfolio_value(current_prices)
-
-        positions_summary = []
-        for ticker, position in self.portfolio["positions"].items():
-            if position["long"] > 0 or position["short"] > 0:
-                price = current_prices.get(ticker, 0)
-                long_value = position["long"] * price
-                short_value = position["short"] * price
+        book = self.book
+        price = np.nan_to_num(book.price_vector(current_prices))
+        long_value = book.long * price
+        short_value = book.short * price
+        long_pnl = np.where(
+            book.long > 0,
+            long_value - book.long * book.long_cost,
+            0.0,
+        )
+        short_pnl = np.where(
+            book.short > 0,
+            book.short * book.short_cost - short_value,
+            0.0,
+        )
 
-                positions_summary.append(
-                    {
-                        "ticker": ticker,
-                        "long_shares": position["long"],
-                        "short_shares": position["short"],
-                        "long_value": long_value,
-                        "short_value": short_value,
-                        "long_cost_basis": position["long_cost_basis"],
-                        "short_cost_basis": position["short_cost_basis"],
-                        "long_pnl": (
-                            long_value
-                            - (position["long"] * position["long_cost_basis"])
-                            if position["long"] > 0
-                            else 0
-                        ),
-                        "short_pnl": (
-                            (position["short"] * position["short_cost_basis"])
-                            - short_value
-                            if position["short"] > 0
-                            else 0
-                        ),
-                    },
-                )
+        positions_summary = [
+            {
+                "ticker": book.tickers[col],
+                "long_shares": int(book.long[col]),
+                "short_shares": int(book.short[col]),
+                "long_value": float(long_value[col]),
+                "short_value": float(short_value[col]),
+                "long_cost_basis": float(book.long_cost[col]),
+                "short_cost_basis": float(book.short_cost[col]),
+                "long_pnl": float(long_pnl[col]),
+                "short_pnl": float(short_pnl[col]),
+            }
+            for col in np.flatnonzero((book.long > 0) | (book.short > 0))
+        ]
 
         return {
-            "portfolio_value": portfolio_value,
-            "cash": self.portfolio["cash"],
-            "margin_used": self.portfolio["margin_used"],
+            "portfolio_value": self._calculate_portfolio_value(current_prices),
+            "cash": book.cash,
+            "margin_used": book.margin_used,
             "positions": positions_summary,
             "total_trades": len(self.trade_history),
         }
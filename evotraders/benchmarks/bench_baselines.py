@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark baseline computation over a full backtest window
+
+Compares the per-day dict path (BaselineCalculator with
+calculate_momentum_scores, as settlement used to run it) against one
+vectorized BaselineEngine pass over the (dates x tickers) price matrix,
+and checks that both produce the same curves.
+
+Usage (from the evotraders directory):
+    python -m benchmarks.bench_baselines --years 5 --tickers 500
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.baselines import (
+    BaselineCalculator,
+    BaselineEngine,
+    calculate_momentum_scores,
+)
+
+
+def _legacy(dates, tickers, prices, caps):
+    calculator = BaselineCalculator(100000.0)
+    history = {}
+    market_caps = dict(zip(tickers, caps))
+    curves = []
+    for row, date in enumerate(dates):
+        day_prices = dict(zip(tickers, prices[row]))
+        for ticker, price in day_prices.items():
+            history.setdefault(ticker, []).append((date, price))
+            history[ticker] = history[ticker][-60:]
+        scores = calculate_momentum_scores(tickers, history, lookback_days=20)
+        last = calculator.momentum_last_rebalance_date
+        values = calculator.get_all_baseline_values(
+            tickers,
+            day_prices,
+            market_caps,
+            scores,
+            date,
+            rebalance_momentum=last is None or last[:7] != date[:7],
+        )
+        curves.append(list(values.values()))
+    return np.array(curves)
+
+
+def run(years: int, n_tickers: int, skip_legacy: bool):
+    rng = np.random.default_rng(0)
+    dates = [
+        d.strftime("%Y-%m-%d")
+        for d in pd.bdate_range("2020-01-02", periods=252 * years)
+    ]
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    returns = rng.normal(0.0003, 0.02, (len(dates), n_tickers))
+    prices = 100.0 * np.exp(np.cumsum(returns, axis=0))
+    caps = rng.uniform(1e9, 1e12, n_tickers)
+    print(f"{len(dates)} days x {n_tickers} tickers")
+
+    start = time.perf_counter()
+    values = BaselineEngine(100000.0).run(dates, tickers, prices, caps)
+    engine_ms = (time.perf_counter() - start) * 1000
+    print(f"{'vectorized':>12} {engine_ms:>10.1f} ms")
+
+    if skip_legacy:
+        return
+
+    start = time.perf_counter()
+    legacy = _legacy(dates, tickers, prices, caps)
+    legacy_ms = (time.perf_counter() - start) * 1000
+    print(f"{'per-day':>12} {legacy_ms:>10.1f} ms")
+
+    curves = np.stack(list(values.values()), axis=1)
+    print(f"max abs difference: {np.abs(curves - legacy).max():.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+    run(args.years, args.tickers, args.skip_legacy)
+
+
+if __name__ == "__main__":
+    main()
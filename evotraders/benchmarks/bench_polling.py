@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark live quote polling against the local quote server
+
+Runs AsyncPollingPriceManager over a large watchlist served by
+QuoteServer and reports quote throughput, the time until every symbol
+has a price (one sequential round takes symbols x latency), and how
+often hot and quiet symbols were polled.
+
+Usage (from the evotraders directory):
+    python -m benchmarks.bench_polling --symbols 200 --seconds 20
+"""
+import argparse
+import asyncio
+import time
+
+from backend.data.async_price_manager import AsyncPollingPriceManager
+from backend.utils.rate_limiter import TokenBucket
+from benchmarks.quote_server import QuoteServer
+
+
+async def run(args):
+    server = QuoteServer(latency_ms=args.latency_ms)
+    base_url = await server.start()
+    symbols = [f"S{i:04d}" for i in range(args.symbols)]
+
+    manager = AsyncPollingPriceManager(
+        api_key="bench",
+        poll_interval=args.poll_interval,
+        concurrency=args.concurrency,
+        base_url=base_url,
+        limiter=TokenBucket(
+            rate_per_minute=args.rate_limit,
+            capacity=args.concurrency,
+        ),
+    )
+    ticks = []
+    manager.add_price_callback(ticks.append)
+    manager.subscribe(symbols)
+
+    start = time.perf_counter()
+    manager.start()
+    while len(manager.latest_prices) < len(symbols):
+        await asyncio.sleep(0.01)
+    first_round = time.perf_counter() - start
+    await asyncio.sleep(max(0.0, args.seconds - first_round))
+    manager.stop()
+    await asyncio.sleep(0.1)
+    await server.stop()
+    elapsed = time.perf_counter() - start
+
+    sequential = len(symbols) * args.latency_ms / 1000
+    print(f"{len(symbols)} symbols, {args.latency_ms:.0f} ms latency")
+    print(
+        f"first round:    {first_round:8.2f} s "
+        f"(sequential ~{sequential:.1f} s)",
+    )
+    print(f"quotes/s:       {manager.requests / elapsed:8.1f}")
+    print(f"errors:         {manager.errors:8d}")
+    for label, hot in (("hot", True), ("quiet", False)):
+        polled = [server.requests[s] for s in symbols if server.hot[s] is hot]
+        if polled:
+            print(
+                f"{label + ' polls/min:':<16}"
+                f"{sum(polled) / len(polled) / elapsed * 60:8.1f}",
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--poll-interval", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate-limit", type=float, default=60000.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark per-cycle cost of StorageService.update_dashboard_after_cycle
+
+Runs many simulated trading days against a temporary dashboard directory
+and reports the average time of one cycle in windows along the way. With
+append-only histories the cost should stay flat as the history grows.
+
+Usage (from the evotraders directory):
+    python -m benchmarks.bench_storage --days 5000 --window 500
+"""
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from backend.services.storage import StorageService
+
+TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "AMD"]
+
+
+def run(days: int, window: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = StorageService(
+            dashboard_dir=Path(tmpdir) / "team_dashboard",
+            initial_cash=100000.0,
+        )
+        portfolio = {
+            "cash": 50000.0,
+            "positions": {t: {"long": 10, "short": 0} for t in TICKERS},
+            "margin_used": 0.0,
+        }
+
+        print(f"{'days':>8} {'ms/cycle':>10}")
+        start_day = date(2000, 1, 3)
+        window_start = time.perf_counter()
+        for i in range(days):
+            day = (start_day + timedelta(days=i)).isoformat()
+            prices = {t: 100.0 + (i + j) % 17 for j, t in enumerate(TICKERS)}
+            storage.update_dashboard_after_cycle(
+                portfolio=portfolio,
+                prices=prices,
+                date=day,
+                executed_trades=[
+                    {
+                        "ticker": TICKERS[i % len(TICKERS)],
+                        "action": "long",
+                        "quantity": 1,
+                        "price": prices[TICKERS[i % len(TICKERS)]],
+                    },
+                ],
+                baseline_values={
+                    "equal_weight": 100000.0 + i,
+                    "market_cap_weighted": 100000.0 + 2 * i,
+                    "momentum": 100000.0 + 3 * i,
+                },
+            )
+            if (i + 1) % window == 0:
+                elapsed = time.perf_counter() - window_start
+                print(f"{i + 1:>8} {elapsed / window * 1000:>10.3f}")
+                window_start = time.perf_counter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--days", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=500)
+    args = parser.parse_args()
+    run(args.days, args.window)
+
+
+if __name__ == "__main__":
+    main()
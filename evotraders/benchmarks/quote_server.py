@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Finnhub quote endpoint
+
+Serves ``GET /api/v1/quote?symbol=...`` with a random-walk price per
+symbol after a simulated network latency, so the live price manager can
+be load-tested without an API key or rate limits. A fraction of the
+symbols is "hot" and moves on every quote; the rest rarely change.
+
+Usage (from the evotraders directory):
+    python -m benchmarks.quote_server --port 8770 --latency-ms 150
+
+then point live mode at it:
+    FINNHUB_BASE_URL=http://127.0.0.1:8770/api/v1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class QuoteServer:
+    """Minimal keep-alive HTTP server answering quote requests"""
+
+    def __init__(
+        self,
+        latency_ms: float = 150.0,
+        jitter_ms: float = 50.0,
+        hot_fraction: float = 0.2,
+        seed: int = 0,
+    ):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.hot_fraction = hot_fraction
+        self._random = random.Random(seed)
+        self.prices: Dict[str, float] = {}
+        self.opens: Dict[str, float] = {}
+        self.hot: Dict[str, bool] = {}
+        self.requests: Counter = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def quote(self, symbol: str) -> Dict[str, float]:
+        if symbol not in self.prices:
+            price = self._random.uniform(20, 500)
+            self.prices[symbol] = price
+            self.opens[symbol] = price
+            self.hot[symbol] = self._random.random() < self.hot_fraction
+
+        price = self.prices[symbol]
+        if self.hot[symbol]:
+            price *= 1 + self._random.gauss(0, 0.002)
+        elif self._random.random() < 0.05:
+            price *= 1 + self._random.gauss(0, 0.0005)
+        price = round(price, 2)
+        self.prices[symbol] = price
+
+        open_price = self.opens[symbol]
+        return {
+            "c": price,
+            "d": round(price - open_price, 2),
+            "dp": round((price - open_price) / open_price * 100, 4),
+            "h": max(price, open_price),
+            "l": min(price, open_price),
+            "o": open_price,
+            "pc": open_price,
+            "t": int(time.time()),
+        }
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                # Skip headers; quote requests carry no body
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+
+                parts = request_line.decode("latin-1").split()
+                url = urlsplit(parts[1] if len(parts) > 1 else "/")
+                symbol = parse_qs(url.query).get("symbol", [""])[0]
+                if url.path.endswith("/quote") and symbol:
+                    self.requests[symbol] += 1
+                    await asyncio.sleep(
+                        max(
+                            0.0,
+                            self.latency
+                            + self._random.uniform(-self.jitter, self.jitter),
+                        ),
+                    )
+                    status, body = "200 OK", json.dumps(self.quote(symbol))
+                else:
+                    status, body = "404 Not Found", json.dumps({"error": "?"})
+
+                payload = body.encode()
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        "\r\n"
+                    ).encode()
+                    + payload,
+                )
+                await writer.drain()
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.CancelledError,
+        ):
+            # Client went away or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, returning the API base URL"""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/api/v1"
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def _serve(args):
+    server = QuoteServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        hot_fraction=args.hot_fraction,
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f"Quote server listening: FINNHUB_BASE_URL={base_url}")
+    await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--hot-fraction", type=float, default=0.2)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -436,6 +436,30 @@ export default function LiveTradingApp() {
           }
         },
 
+        // Batched price updates: changed symbols since the last batch,
+        // or every symbol when snapshot is true
+        price_batch: (e) => {
+          try {
+            const prices = e.prices || {};
+            const changed = Object.keys(prices);
+            if (changed.length === 0) return;
+
+            updateTickersFromPrices(prices);
+
+            // Deltas only carry symbols whose price changed
+            if (!e.snapshot) {
+              const rolling = Object.fromEntries(changed.map(symbol => [symbol, true]));
+              setRollingTickers(prev => ({ ...prev, ...rolling }));
+              setTimeout(() => {
+                const done = Object.fromEntries(changed.map(symbol => [symbol, false]));
+                setRollingTickers(prev => ({ ...prev, ...done }));
+              }, 500);
+            }
+          } catch (error) {
+            console.error('[Price Batch] Error:', error);
+          }
+        },
+
         // Day progress events
         day_start: (e) => {
           setCurrentDate(e.date);
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+import fakeredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from alias.server.core import persistence_writer as writer_module
+from alias.server.core.event_manager import RedisStreamEventManager
+from alias.server.core.persistence_writer import PersistenceWriter
+from alias.server.models import conversation, user  # noqa: F401
+from alias.server.models.message import Message, MessageState, ResponseMessage
+from alias.server.schemas.session_entity import SessionEntity
+from alias.server.services import chat_service, session_service
+from alias.server.services.chat_service import ChatService, run_agent_worker
+from alias.server.services.session_service import SessionService
+
+
+@pytest_asyncio.fixture
+async def engine(monkeypatch):
+    """In-memory SQLite database behind a write-behind writer"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    @asynccontextmanager
+    async def session_scope():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    monkeypatch.setattr(writer_module, "session_scope", session_scope)
+    monkeypatch.setattr(PersistenceWriter, "_instance", None)
+    writer = PersistenceWriter()
+    monkeypatch.setattr(session_service, "persistence_writer", writer)
+    monkeypatch.setattr(chat_service, "persistence_writer", writer)
+    yield engine
+    await writer.stop()
+    await engine.dispose()
+
+
+@pytest.fixture
+def stops(monkeypatch):
+    recorded = []
+
+    async def record_task_stop(self, user_id, conversation_id, task_id):
+        recorded.append(task_id)
+
+    monkeypatch.setattr(
+        chat_service.ActionService,
+        "record_task_stop",
+        record_task_stop,
+    )
+    return recorded
+
+
+def make_session(redis):
+    entity = SessionEntity(
+        user_id=uuid.uuid4(),
+        conversation_id=uuid.uuid4(),
+        task_id=uuid.uuid4(),
+    )
+    event_manager = RedisStreamEventManager(
+        task_id=entity.task_id,
+        user_id=entity.user_id,
+        redis=redis,
+        flush_interval=0.01,
+    )
+    return SessionService(session_entity=entity, event_manager=event_manager)
+
+
+@pytest.mark.asyncio
+async def test_chat_output_is_persisted_after_client_disconnects(
+    engine,
+    stops,
+    monkeypatch,
+):
+    redis = fakeredis.FakeAsyncRedis()
+    session = make_session(redis)
+    disconnected = asyncio.Event()
+
+    async def arun_agents(session_service, sandbox):
+        message = await session_service.create_message(
+            ResponseMessage(content="", status=MessageState.RUNNING),
+        )
+        await disconnected.wait()
+        for text in ["Hello", "Hello!"]:
+            await session_service.create_message(
+                ResponseMessage(content=text, status=MessageState.RUNNING),
+                message_id=message.id,
+            )
+        await session_service.create_message(
+            ResponseMessage(content="Hello!"),
+            message_id=message.id,
+        )
+
+    monkeypatch.setattr(chat_service, "arun_agents", arun_agents)
+    worker = asyncio.create_task(run_agent_worker(session))
+
+    # The client reads the first frame and goes away
+    response = ChatService().handle_chat_response(session_service=session)
+    await asyncio.wait_for(response.__anext__(), timeout=5)
+    await response.aclose()
+    disconnected.set()
+    await asyncio.wait_for(worker, timeout=5)
+
+    async with AsyncSession(engine) as db:
+        messages = (await db.exec(select(Message))).all()
+    assert [m.message["content"] for m in messages] == ["Hello!"]
+    entity = session.session_entity
+    assert messages[0].conversation_id == entity.conversation_id
+    assert stops == [entity.task_id]
+    await redis.aclose()
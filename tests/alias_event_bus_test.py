@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import uuid
+
+import pytest
+
+from alias.server.core.config import settings
+from alias.server.core.event import HeartBeatEvent, StopEvent
+from alias.server.core.event_manager import EventManager
+from alias.server.core.event_manager.event_bus import (
+    BackpressurePolicy,
+    EventBus,
+)
+from alias.server.models import conversation, user  # noqa: F401
+from alias.server.models.message import Message
+from alias.server.schemas.event import (
+    MessageCreateEvent,
+    MessageFinishEvent,
+    MessageUpdateEvent,
+)
+
+
+def make_message(message_id, text):
+    return Message(
+        id=message_id,
+        conversation_id=uuid.uuid4(),
+        parent_message_id=None,
+        message={"role": "assistant", "content": text},
+    )
+
+
+def create(message_id):
+    return MessageCreateEvent(message=make_message(message_id, ""))
+
+
+def update(message_id, text):
+    return MessageUpdateEvent(message=make_message(message_id, text))
+
+
+async def drain(bus):
+    events = []
+    while not bus.empty():
+        events.append(await bus.get())
+    return events
+
+
+def content(event):
+    return event.message.message["content"]
+
+
+@pytest.mark.asyncio
+async def test_superseded_updates_move_behind_later_events():
+    bus = EventBus(maxsize=8)
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    await bus.put(create(first))
+    await bus.put(update(first, "He"))
+    await bus.put(create(second))
+    await bus.put(update(first, "Hello"))
+    await bus.put(update(second, "Hi"))
+    await bus.put(
+        MessageFinishEvent(message=make_message(second, "Hi!")),
+    )
+
+    events = await drain(bus)
+    assert [type(e) for e in events] == [
+        MessageCreateEvent,
+        MessageCreateEvent,
+        MessageUpdateEvent,
+        MessageFinishEvent,
+    ]
+    # The latest update comes after the events put before it
+    assert content(events[2]) == "Hello"
+    assert content(events[3]) == "Hi!"
+    assert bus.stats()["coalesced"] == 2
+    assert bus.stats()["high_water"] == 4
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_drops_updates_of_a_full_bus():
+    bus = EventBus(maxsize=2, policy=BackpressurePolicy.DROP)
+    await bus.put(create(uuid.uuid4()))
+    await bus.put(create(uuid.uuid4()))
+
+    await asyncio.wait_for(bus.put(update(uuid.uuid4(), "x")), timeout=1)
+    # Stop events are taken even when the bus is full
+    await asyncio.wait_for(bus.put(StopEvent()), timeout=1)
+    # Other events still wait for the consumer
+    blocked = asyncio.create_task(bus.put(create(uuid.uuid4())))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    assert bus.stats()["dropped"] == 1
+    assert isinstance(await bus.get(), MessageCreateEvent)
+    assert isinstance(await bus.get(), MessageCreateEvent)
+    await asyncio.wait_for(blocked, timeout=1)
+    assert [type(e) for e in await drain(bus)] == [
+        StopEvent,
+        MessageCreateEvent,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_the_consumer():
+    bus = EventBus(maxsize=1, policy=BackpressurePolicy.BLOCK)
+    await bus.put(update(uuid.uuid4(), "a"))
+
+    blocked = asyncio.create_task(bus.put(update(uuid.uuid4(), "b")))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    assert content(await bus.get()) == "a"
+    await asyncio.wait_for(blocked, timeout=1)
+    assert content(await bus.get()) == "b"
+    assert bus.stats()["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_only_fill_an_empty_bus():
+    bus = EventBus(maxsize=1)
+    await bus.put(HeartBeatEvent())
+    # Neither waits on the full bus
+    await asyncio.wait_for(bus.put(HeartBeatEvent()), timeout=1)
+    assert bus.qsize() == 1
+
+    await bus.get()
+    await bus.put(create(uuid.uuid4()))
+    await asyncio.wait_for(bus.put(HeartBeatEvent()), timeout=1)
+
+    assert [type(e) for e in await drain(bus)] == [MessageCreateEvent]
+    assert bus.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_closed_bus_releases_blocked_producers():
+    bus = EventBus(maxsize=1, policy=BackpressurePolicy.BLOCK)
+    await bus.put(create(uuid.uuid4()))
+    blocked = asyncio.create_task(bus.put(create(uuid.uuid4())))
+    await asyncio.sleep(0.05)
+
+    await bus.close()
+    await asyncio.wait_for(blocked, timeout=1)
+    await asyncio.wait_for(bus.put(StopEvent()), timeout=1)
+
+    assert isinstance(await bus.get(), MessageCreateEvent)
+    assert await bus.get() is None
+    assert bus.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_disconnected_listener_releases_the_agent():
+    manager = EventManager(
+        task_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        maxsize=1,
+        policy=BackpressurePolicy.BLOCK,
+    )
+
+    async def agent():
+        for n in range(5):
+            await manager.put(update(uuid.uuid4(), str(n)))
+
+    async def client():
+        async for _ in manager.listen():
+            await asyncio.sleep(3600)
+
+    producing = asyncio.create_task(agent())
+    reading = asyncio.create_task(client())
+    await asyncio.sleep(0.05)
+    assert not producing.done()
+
+    # The response stops reading when the client disconnects
+    reading.cancel()
+    await asyncio.wait_for(producing, timeout=1)
+    assert manager.bus.stats()["dropped"] > 0
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_timer_beats_idle_listeners_and_expires_them(
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "MAX_CHAT_EXECUTION_TIME", 0.5)
+    managers = [
+        EventManager(task_id=uuid.uuid4(), user_id=uuid.uuid4())
+        for _ in range(2)
+    ]
+    for manager in managers:
+        manager.heartbeat_interval = 0.05
+
+    async def collect(manager):
+        return [event async for event in manager.listen()]
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(collect(m) for m in managers)),
+        timeout=5,
+    )
+
+    for manager, events in zip(managers, results):
+        assert manager.expired
+        assert len(events) >= 3
+        assert all(isinstance(e, HeartBeatEvent) for e in events)
+
+
+class StalledEventManager(EventManager):
+    """Manager whose transport hangs on heartbeats until released"""
+
+    def __init__(self, released, **kwargs):
+        super().__init__(**kwargs)
+        self.released = released
+
+    async def _put(self, event):
+        if isinstance(event, HeartBeatEvent):
+            await self.released.wait()
+        await super()._put(event)
+
+
+@pytest.mark.asyncio
+async def test_stalled_heartbeat_does_not_delay_other_listeners():
+    released = asyncio.Event()
+    managers = [
+        StalledEventManager(
+            released,
+            task_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+        )
+        for _ in range(5)
+    ]
+    managers.append(EventManager(task_id=uuid.uuid4(), user_id=uuid.uuid4()))
+    for manager in managers:
+        manager.heartbeat_interval = 0.05
+
+    listeners = [manager.listen() for manager in managers]
+    reads = [asyncio.ensure_future(anext(it)) for it in listeners]
+    try:
+        event = await asyncio.wait_for(reads[-1], timeout=1)
+        assert isinstance(event, HeartBeatEvent)
+    finally:
+        released.set()
+        for read in reads:
+            await asyncio.wait_for(read, timeout=1)
+        for listener in listeners:
+            await listener.aclose()
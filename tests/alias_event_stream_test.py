@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import uuid
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from alias.server.core.event import (
+    ErrorEvent,
+    HeartBeatEvent,
+    StopEvent,
+)
+from alias.server.core.event_manager import RedisStreamEventManager
+from alias.server.models import conversation, user  # noqa: F401
+from alias.server.models.message import Message
+from alias.server.schemas.event import (
+    MessageCreateEvent,
+    MessageFinishEvent,
+    MessageUpdateEvent,
+)
+
+
+@pytest_asyncio.fixture
+async def redis():
+    """In-process Redis shared by the writer and readers of a test"""
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+def make_manager(redis, task_id, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    return RedisStreamEventManager(
+        task_id=task_id,
+        user_id=uuid.uuid4(),
+        redis=redis,
+        **kwargs,
+    )
+
+
+def make_message(message_id, text):
+    return Message(
+        id=message_id,
+        conversation_id=uuid.uuid4(),
+        parent_message_id=None,
+        message={"role": "assistant", "content": text},
+    )
+
+
+async def collect(manager):
+    events = []
+    async for event in manager.listen():
+        events.append(event)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_events_round_trip_and_updates_coalesce(redis):
+    task_id = uuid.uuid4()
+    writer = make_manager(redis, task_id)
+    message_id = uuid.uuid4()
+
+    await writer.put(MessageCreateEvent(message=make_message(message_id, "")))
+    text = ""
+    for token in ["Hello", " wor", "ld", "!"]:
+        text += token
+        await writer.put(
+            MessageUpdateEvent(message=make_message(message_id, text)),
+        )
+    await writer.put(
+        MessageFinishEvent(message=make_message(message_id, text)),
+    )
+    await writer.stop()
+
+    # A reader on another worker only shares the Redis stream
+    events = await collect(make_manager(redis, task_id))
+
+    assert [type(e) for e in events] == [
+        MessageCreateEvent,
+        MessageFinishEvent,
+        StopEvent,
+    ]
+    assert events[1].message.id == message_id
+    assert events[1].message.message["content"] == "Hello world!"
+    # Everything was buffered and written in one pipelined round trip
+    stats = writer.stats()
+    assert stats["written"] == 3
+    assert stats["round_trips"] == 1
+    assert stats["coalesced"] == 4
+    assert await redis.ttl(writer.key) > 0
+
+
+@pytest.mark.asyncio
+async def test_superseding_update_is_written_after_later_events(redis):
+    task_id = uuid.uuid4()
+    writer = make_manager(redis, task_id)
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    await writer.put(MessageUpdateEvent(message=make_message(first, "He")))
+    await writer.put(MessageCreateEvent(message=make_message(second, "")))
+    await writer.put(MessageUpdateEvent(message=make_message(first, "Hey")))
+    await writer.stop()
+
+    events = await collect(make_manager(redis, task_id))
+
+    assert [(type(e), e.message.id) for e in events[:-1]] == [
+        (MessageCreateEvent, second),
+        (MessageUpdateEvent, first),
+    ]
+    assert events[1].message.message["content"] == "Hey"
+
+
+@pytest.mark.asyncio
+async def test_reader_resumes_after_last_event_id(redis):
+    task_id = uuid.uuid4()
+    writer = make_manager(redis, task_id)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for message_id in ids:
+        await writer.put(
+            MessageFinishEvent(message=make_message(message_id, "done")),
+        )
+        await writer.flush()
+    await writer.put(ErrorEvent(message="boom", code=500))
+    await writer.stop()
+
+    first = make_manager(redis, task_id)
+    listener = first.listen()
+    received = await listener.__anext__()
+    assert received.message.id == ids[0]
+    await listener.aclose()
+
+    # The client reconnects with the id of the last event it received
+    resumed = make_manager(redis, task_id, last_event_id=first.last_event_id)
+    events = await collect(resumed)
+    assert [e.message.id for e in events[:2]] == ids[1:]
+    assert isinstance(events[2], ErrorEvent)
+    assert events[2].message == "boom"
+    assert isinstance(events[3], StopEvent)
+
+
+@pytest.mark.asyncio
+async def test_live_reader_gets_heartbeats_and_trimmed_stream(redis):
+    task_id = uuid.uuid4()
+    writer = make_manager(redis, task_id, maxlen=10, batch_size=4)
+    reader = make_manager(redis, task_id)
+    reader.heartbeat_interval = 1
+
+    reading = asyncio.create_task(collect(reader))
+    await asyncio.sleep(1.2)
+    for _ in range(200):
+        await writer.put(
+            MessageFinishEvent(message=make_message(uuid.uuid4(), "x")),
+        )
+    await writer.stop()
+    events = await asyncio.wait_for(reading, timeout=5)
+
+    assert isinstance(events[0], HeartBeatEvent)
+    assert isinstance(events[-1], StopEvent)
+    # Heartbeats are generated by readers, never stored
+    assert await redis.xlen(writer.key) < 200
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mem0.configs.embeddings.base import BaseEmbedderConfig
+from mem0.embeddings.openai import OpenAIEmbedding
+
+from alias.memory_service.memory_base.embedding_batcher import (
+    EmbeddingBatcher,
+    get_embedding_batcher,
+)
+from alias.memory_service.memory_base.embedding_cache import EmbeddingCache
+
+
+def vector(text):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+class FakeEmbeddings:
+    """OpenAI embeddings endpoint answering in reverse order"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def create(self, input, model, dimensions):
+        self.calls.append(list(input))
+        if self.error is not None:
+            raise self.error
+        data = [
+            SimpleNamespace(index=i, embedding=vector(text))
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])
+
+
+def make_openai_embedder(base_url="http://embed.test/v1", error=None):
+    model = OpenAIEmbedding(
+        BaseEmbedderConfig(
+            model="text-embedding-v4",
+            api_key="test",
+            embedding_dims=2,
+            openai_base_url=base_url,
+        ),
+    )
+    model.client = SimpleNamespace(embeddings=FakeEmbeddings(error))
+    return model
+
+
+class StubEmbedder:
+    """Embedder of another provider, one text per call"""
+
+    def __init__(self):
+        self.config = SimpleNamespace(model="stub", embedding_dims=2)
+        self.calls = 0
+
+    def embed(self, text, memory_action=None):
+        self.calls += 1
+        return vector(text)
+
+
+def make_batcher(model, **kwargs):
+    kwargs.setdefault("max_wait", 60)
+    return EmbeddingBatcher(model, cache=EmbeddingCache(0, path=""), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    model = make_openai_embedder()
+    batcher = make_batcher(model, max_batch_size=2)
+
+    embeddings = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.embed("a"),
+            batcher.embed("bb"),
+            batcher.embed_many(["ccc", "dddd"]),
+        ),
+        timeout=1,
+    )
+
+    assert model.client.embeddings.calls == [["a", "bb"], ["ccc", "dddd"]]
+    assert embeddings == [
+        vector("a"),
+        vector("bb"),
+        [vector("ccc"), vector("dddd")],
+    ]
+    assert batcher.stats()["avg_batch_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_when_the_wait_ends():
+    model = make_openai_embedder()
+    batcher = make_batcher(model, max_batch_size=10, max_wait=0.05)
+
+    embedding = asyncio.ensure_future(batcher.embed("a"))
+    await asyncio.sleep(0.01)
+    assert not embedding.done()
+    await batcher.embed("b")
+
+    assert await embedding == vector("a")
+    assert model.client.embeddings.calls == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_texts_share_one_embedding():
+    model = StubEmbedder()
+    batcher = make_batcher(model, max_wait=0.01)
+
+    embeddings = await asyncio.gather(
+        batcher.embed("a"),
+        batcher.embed("a"),
+        batcher.embed_many(["a", "b", "a"]),
+    )
+
+    assert embeddings == [
+        vector("a"),
+        vector("a"),
+        [vector("a"), vector("b"), vector("a")],
+    ]
+    assert model.calls == 2
+    assert batcher.stats()["requested"] == 5
+    assert batcher.stats()["embedded"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_waiter():
+    model = make_openai_embedder(error=RuntimeError("endpoint down"))
+    batcher = make_batcher(model, max_wait=0.01)
+
+    results = await asyncio.gather(
+        batcher.embed("a"),
+        batcher.embed("a"),
+        batcher.embed("b"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(model.client.embeddings.calls) == 1
+
+    # Nothing is left in flight: the next request is sent again
+    model.client.embeddings.error = None
+    assert await batcher.embed("a") == vector("a")
+    assert len(model.client.embeddings.calls) == 2
+
+
+def test_batch_response_is_put_back_in_input_order():
+    model = make_openai_embedder()
+    batcher = make_batcher(model)
+
+    texts = ["one", "two\nlines", "three"]
+    assert batcher._embed_batch(texts, "add") == [
+        vector("one"),
+        vector("two lines"),
+        vector("three"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batchers_are_shared_per_loop_and_configuration():
+    batcher = get_embedding_batcher(make_openai_embedder())
+
+    assert get_embedding_batcher(make_openai_embedder()) is batcher
+    assert (
+        get_embedding_batcher(make_openai_embedder("http://other.test/v1"))
+        is not batcher
+    )
+
+    async def on_new_loop():
+        return get_embedding_batcher(make_openai_embedder())
+
+    other = await asyncio.to_thread(asyncio.run, on_new_loop())
+    assert other is not batcher
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from mem0.configs.embeddings.base import BaseEmbedderConfig
+from mem0.embeddings.openai import OpenAIEmbedding
+
+from alias.memory_service.memory_base.embedding_batcher import (
+    EmbeddingBatcher,
+)
+from alias.memory_service.memory_base.embedding_cache import (
+    EmbeddingCache,
+    embedding_key,
+)
+
+
+def test_least_recently_used_embeddings_are_evicted():
+    cache = EmbeddingCache(max_entries=2, path="")
+    cache.put_many({"a": [1.0], "b": [2.0]})
+    assert cache.get_many(["a"]) == {"a": [1.0]}
+
+    cache.put_many({"c": [3.0]})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+    assert cache.stats()["entries"] == 2
+
+
+def test_zero_entries_disables_the_cache(tmp_path):
+    path = tmp_path / "embeddings.sqlite"
+    cache = EmbeddingCache(max_entries=0, path=str(path))
+    cache.put_many({"a": [1.0]})
+
+    assert not cache.enabled
+    assert not cache.on_disk
+    assert cache.get_many(["a"]) == {}
+    assert not path.exists()
+    assert cache.stats()["misses"] == 0
+
+
+def test_embeddings_survive_a_restart_on_disk(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite")
+    EmbeddingCache(max_entries=10, path=path).put_many(
+        {"a": [0.1, -2.5], "b": [3.0, 4.0]},
+    )
+
+    cache = EmbeddingCache(max_entries=10, path=path)
+    assert cache.get_many(["a", "b", "c"]) == {
+        "a": [0.1, -2.5],
+        "b": [3.0, 4.0],
+    }
+    # Read from disk once, then served from memory
+    assert cache.get_many(["a"]) == {"a": [0.1, -2.5]}
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(0.75)
+
+
+def test_disk_tier_is_trimmed_to_the_most_recently_used(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(max_entries=10, path=path, max_disk_entries=2)
+    cache.put_many({"a": [1.0], "b": [2.0]})
+    cache.put_many({"c": [3.0], "d": [4.0]})
+
+    with sqlite3.connect(path) as db:
+        keys = {key for (key,) in db.execute("SELECT key FROM embeddings")}
+    assert keys == {"c", "d"}
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, input, model, dimensions):
+        self.calls.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text))])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data)
+
+
+def make_embedder(base_url):
+    model = OpenAIEmbedding(
+        BaseEmbedderConfig(
+            model="text-embedding-v4",
+            api_key="test",
+            embedding_dims=1,
+            openai_base_url=base_url,
+        ),
+    )
+    model.client = SimpleNamespace(embeddings=FakeEmbeddings())
+    return model
+
+
+@pytest.mark.asyncio
+async def test_batcher_serves_cached_embeddings_per_endpoint():
+    cache = EmbeddingCache(max_entries=10, path="")
+    model = make_embedder("http://embed.test/v1")
+    batcher = EmbeddingBatcher(model, max_wait=0, cache=cache)
+
+    assert await batcher.embed("abc") == [3.0]
+    assert await batcher.embed_many(["abc", "de"], "search") == [
+        [3.0],
+        [2.0],
+    ]
+    assert model.client.embeddings.calls == [["abc"], ["de"]]
+    assert cache.stats()["hits"] == 1
+    assert embedding_key(batcher._group("search"), "de") in cache._entries
+
+    # The same model name on another endpoint is embedded again
+    other = make_embedder("http://other.test/v1")
+    other_batcher = EmbeddingBatcher(other, max_wait=0, cache=cache)
+    assert await other_batcher.embed("abc") == [3.0]
+    assert other.client.embeddings.calls == [["abc"]]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from alias.memory_service.service.core.task_manager import (
+    UserProfilingTaskManager,
+)
+from alias.memory_service.service.core.task_store import (
+    InMemoryTaskStore,
+    RedisTaskStore,
+)
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def manager(request):
+    """Task manager on each store backend"""
+    if request.param == "memory":
+        store = InMemoryTaskStore(expiry=60)
+    else:
+        store = RedisTaskStore(
+            client=fakeredis.FakeAsyncRedis(decode_responses=True),
+            expiry=60,
+        )
+    yield UserProfilingTaskManager(store=store)
+    await store.clear()
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_task_lifecycle_keeps_indexes_in_step(manager):
+    await manager.add_task("a", None, "add_memory")
+    await manager.add_task("b", None, "clear_memory")
+    await manager.update_task_status("a", "completed", result={"ok": 1})
+    await manager.update_task_status("b", "failed", error="boom")
+    await manager.update_task_status("missing", "completed")
+
+    task = await manager.get_task_status("a")
+    assert task["status"] == "completed"
+    assert task["result"] == {"ok": 1}
+    assert task["completed_at"] is not None
+    assert await manager.get_task_status("missing") == {
+        "error": "Task not found",
+    }
+    assert set(await manager.get_tasks_by_status("failed")) == {"b"}
+    assert await manager.get_tasks_by_status("running") == {}
+
+    stats = await manager.get_storage_stats()
+    assert stats["total_tasks"] == 2
+    assert stats["tasks_by_status"]["completed"] == 1
+    assert stats["tasks_by_status"]["failed"] == 1
+    assert stats["tasks_by_date"][date.today().isoformat()] == 2
+
+    assert await manager.delete_task("b")
+    assert not await manager.delete_task("b")
+    assert set(await manager.get_all_tasks()) == {"a"}
+    assert (await manager.get_storage_stats())["tasks_by_status"][
+        "failed"
+    ] == 0
+    assert await manager.rebuild_index() == 1
+
+
+@pytest.mark.asyncio
+async def test_date_range_pages_cover_every_task(manager):
+    submit_ids = {f"task-{i}" for i in range(45)}
+    for submit_id in submit_ids:
+        await manager.add_task(submit_id, None, "record_action")
+
+    today = date.today()
+    start = today - timedelta(days=2)
+    seen, cursor, pages = {}, None, 0
+    while True:
+        tasks, cursor = await manager.get_tasks_page(
+            start,
+            today,
+            cursor,
+            limit=10,
+        )
+        seen.update(tasks)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert set(seen) == submit_ids
+    assert pages > 1
+    assert set(await manager.get_tasks_by_date_range(start, today)) == (
+        submit_ids
+    )
+    assert await manager.get_tasks_by_date(start) == {}
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from alias.memory_service.service.core.exceptions import QueueFullError
+from alias.memory_service.service.core.work_queue import WorkQueue
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_bounded_and_in_order_per_user():
+    queue = WorkQueue(workers=3, max_depth=100)
+    running, peak, done = set(), [0], []
+
+    def make_job(uid, n):
+        async def job():
+            # A user never has two jobs running at once
+            assert uid not in running
+            running.add(uid)
+            peak[0] = max(peak[0], len(running))
+            await asyncio.sleep(0.01)
+            running.discard(uid)
+            done.append((uid, n))
+            if n == 2:
+                raise RuntimeError("model unavailable")
+
+        return job
+
+    for n in range(4):
+        for uid in ("a", "b", "c", "d", "e"):
+            queue.submit(uid, make_job(uid, n), "add_memory")
+    await queue.stop()
+
+    assert len(done) == 20
+    assert peak[0] == 3
+    for uid in "abcde":
+        assert [n for u, n in done if u == uid] == [0, 1, 2, 3]
+    stats = queue.stats()
+    assert stats["completed"] == 15
+    assert stats["failed"] == 5
+    assert stats["depth"] == stats["running"] == 0
+    latency = stats["queue_latency_seconds"]["add_memory"]
+    assert latency["count"] == latency["buckets"]["+Inf"] == 20
+    assert stats["processing_time_seconds"]["all"]["count"] == 20
+
+
+@pytest.mark.asyncio
+async def test_full_queue_refuses_work_with_retry_after():
+    queue = WorkQueue(workers=1, max_depth=2)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    queue.submit("a", blocked)
+    await asyncio.sleep(0)
+    queue.submit("a", blocked)
+    queue.submit("b", blocked)
+
+    with pytest.raises(QueueFullError) as error:
+        queue.submit("c", blocked)
+    assert error.value.status_code == 429
+    assert error.value.retry_after >= 1
+    stats = queue.stats()
+    assert stats["rejected"] == 1
+    assert stats["depth"] == 2
+    assert stats["active_users"] == 2
+
+    release.set()
+    await queue.stop()
+    assert queue.stats()["completed"] == 3
+    queue.submit("c", blocked)
+    await queue.stop()
+    assert queue.stats()["completed"] == 4
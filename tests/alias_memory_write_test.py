@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import pytest
+
+from alias.memory_service.memory_base import base_vec_memory
+from alias.memory_service.memory_base.base_vec_memory import (
+    BaseAsyncVectorMemory,
+)
+from alias.memory_service.memory_base.candidate_pool import (
+    AsyncVectorCandidateMemory,
+)
+from alias.memory_service.memory_base.storage import SQLiteManager
+
+
+class FakeVectorStore:
+    """In-memory vector store recording its write calls"""
+
+    def __init__(self, points=None, fail_bulk=False, fail_ids=()):
+        self.points = dict(points or {})
+        self.fail_bulk = fail_bulk
+        self.fail_ids = set(fail_ids)
+        self.inserts = []
+        self.updates = []
+        self.deletes = []
+
+    def _check(self, ids):
+        if self.fail_ids.intersection(ids):
+            raise RuntimeError("write refused")
+
+    def insert(self, vectors, ids, payloads):
+        self.inserts.append(list(ids))
+        if self.fail_bulk and len(ids) > 1:
+            raise RuntimeError("bulk write refused")
+        self._check(ids)
+        for vector, point_id, payload in zip(vectors, ids, payloads):
+            self.points[point_id] = (vector, payload)
+
+    def update(self, vector_id, vector, payload):
+        self.updates.append(vector_id)
+        self._check([vector_id])
+        self.points[vector_id] = (vector, payload)
+
+    def delete(self, vector_id):
+        self.deletes.append(vector_id)
+        self._check([vector_id])
+        del self.points[vector_id]
+
+    def get(self, vector_id):
+        vector, payload = self.points[vector_id]
+        return SimpleNamespace(id=vector_id, vector=vector, payload=payload)
+
+
+@pytest.fixture(autouse=True)
+def no_telemetry(monkeypatch):
+    monkeypatch.setattr(base_vec_memory, "capture_event", lambda *a: None)
+
+
+def make_memory(vector_store, provider="qdrant", cls=BaseAsyncVectorMemory):
+    # The pools' constructor builds real models and stores
+    memory = cls.__new__(cls)
+    memory.config = SimpleNamespace(
+        vector_store=SimpleNamespace(provider=provider),
+    )
+    memory.vector_store = vector_store
+    memory.db = SQLiteManager(":memory:")
+    return memory
+
+
+def stored(memory_id, data, **payload):
+    return memory_id, ([0.0], {"data": data, "created_at": "t0", **payload})
+
+
+ACTIONS = {
+    "memory": [
+        {"event": "ADD", "text": "likes tea"},
+        {
+            "event": "UPDATE",
+            "id": "0",
+            "text": "likes green tea",
+            "old_memory": "likes tea",
+        },
+        {"event": "NONE", "id": "2", "text": "works remotely"},
+        {"event": "DELETE", "id": "1", "text": "lives in Paris"},
+        {"event": "ADD", "text": "runs daily"},
+    ],
+}
+UUID_MAPPING = {"0": "m-tea", "1": "m-paris", "2": "m-remote"}
+EMBEDDINGS = {text: [1.0] for text in ("likes tea", "runs daily")}
+EMBEDDINGS["likes green tea"] = [2.0]
+
+
+def store_with_memories(**kwargs):
+    return FakeVectorStore(
+        dict(
+            [
+                stored("m-tea", "tea drinker"),
+                stored("m-paris", "lives in Paris"),
+                stored("m-remote", "works remotely"),
+            ],
+        ),
+        **kwargs,
+    )
+
+
+async def execute(memory):
+    return await memory._execute_memory_actions(
+        ACTIONS,
+        UUID_MAPPING,
+        EMBEDDINGS,
+        {"user_id": "u1"},
+    )
+
+
+def events(results):
+    return [(r["event"], r["memory"]) for r in results]
+
+
+@pytest.mark.asyncio
+async def test_qdrant_points_are_upserted_in_one_call():
+    vector_store = store_with_memories()
+    memory = make_memory(vector_store)
+
+    results = await execute(memory)
+
+    assert events(results) == [
+        ("ADD", "likes tea"),
+        ("UPDATE", "likes green tea"),
+        ("DELETE", "lives in Paris"),
+        ("ADD", "runs daily"),
+    ]
+    added = [results[0]["id"], results[3]["id"]]
+    assert vector_store.inserts == [[added[0], "m-tea", added[1]]]
+    assert vector_store.updates == []
+    assert vector_store.deletes == ["m-paris"]
+    assert vector_store.points["m-tea"][1]["data"] == "likes green tea"
+    assert results[1]["previous_memory"] == "likes tea"
+    for memory_id, event in zip(
+        [added[0], "m-tea", "m-paris", added[1]],
+        ["ADD", "UPDATE", "DELETE", "ADD"],
+    ):
+        assert [h["event"] for h in memory.db.get_history(memory_id)] == [
+            event,
+        ]
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_write_falls_back_to_single_writes():
+    vector_store = store_with_memories(fail_bulk=True, fail_ids={"m-tea"})
+    memory = make_memory(vector_store)
+
+    results = await execute(memory)
+
+    # The refused update is left out, the other actions are kept
+    assert events(results) == [
+        ("ADD", "likes tea"),
+        ("DELETE", "lives in Paris"),
+        ("ADD", "runs daily"),
+    ]
+    assert len(vector_store.inserts) == 3
+    assert vector_store.updates == ["m-tea"]
+    assert vector_store.points["m-tea"][1]["data"] == "tea drinker"
+    assert memory.db.get_history("m-tea") == []
+    assert len(memory.db.get_history(results[2]["id"])) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_vector_stores_write_points_one_by_one():
+    vector_store = store_with_memories()
+    memory = make_memory(vector_store, provider="chroma")
+
+    results = await execute(memory)
+
+    assert len(results) == 4
+    assert [len(ids) for ids in vector_store.inserts] == [1, 1]
+    assert vector_store.updates == ["m-tea"]
+
+
+@pytest.mark.asyncio
+async def test_failed_preparation_drops_only_its_action():
+    vector_store = store_with_memories()
+    # The memory to update is gone
+    del vector_store.points["m-tea"]
+    memory = make_memory(vector_store)
+
+    results = await execute(memory)
+
+    assert events(results) == [
+        ("ADD", "likes tea"),
+        ("DELETE", "lives in Paris"),
+        ("ADD", "runs daily"),
+    ]
+    assert vector_store.inserts == [[results[0]["id"], results[2]["id"]]]
+
+
+@pytest.mark.asyncio
+async def test_history_failure_keeps_the_written_actions():
+    vector_store = store_with_memories()
+    memory = make_memory(vector_store)
+
+    def refuse(records):
+        raise RuntimeError("database is locked")
+
+    memory.db.add_history_many = refuse
+
+    # The points were written, so the actions are still reported
+    results = await execute(memory)
+    assert len(results) == 4
+    assert "m-paris" not in vector_store.points
+    assert vector_store.points["m-tea"][1]["data"] == "likes green tea"
+
+
+@pytest.mark.asyncio
+async def test_last_action_on_a_memory_wins():
+    vector_store = store_with_memories()
+    memory = make_memory(vector_store)
+
+    results = await memory._execute_memory_actions(
+        {
+            "memory": [
+                {"event": "UPDATE", "id": "0", "text": "likes green tea"},
+                {"event": "DELETE", "id": "0", "text": "likes tea"},
+                {"event": "UPDATE", "id": "1", "text": "lives in Rome"},
+            ],
+        },
+        UUID_MAPPING,
+        {"likes green tea": [2.0], "lives in Rome": [3.0]},
+        {"user_id": "u1"},
+    )
+
+    assert events(results) == [
+        ("DELETE", "likes tea"),
+        ("UPDATE", "lives in Rome"),
+    ]
+    assert "m-tea" not in vector_store.points
+    assert [h["event"] for h in memory.db.get_history("m-tea")] == [
+        "DELETE",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_candidate_update_counts_a_visit():
+    vector_store = FakeVectorStore(
+        dict(
+            [
+                stored(
+                    "m-tea",
+                    "tea drinker",
+                    visited_count=2,
+                    user_id="u1",
+                    score=0.5,
+                ),
+            ],
+        ),
+    )
+    memory = make_memory(vector_store, cls=AsyncVectorCandidateMemory)
+
+    results = await memory._execute_memory_actions(
+        {
+            "memory": [
+                {"event": "UPDATE", "id": "0", "text": "likes green tea"},
+            ],
+        },
+        {"0": "m-tea"},
+        {"likes green tea": [2.0]},
+        {"session_id": "s1"},
+    )
+
+    assert events(results) == [("UPDATE", "likes green tea")]
+    vector, payload = vector_store.points["m-tea"]
+    assert vector == [2.0]
+    assert payload["visited_count"] == 3
+    assert payload["last_access_time"] == payload["updated_at"]
+    assert payload["created_at"] == "t0"
+    assert (payload["user_id"], payload["score"]) == ("u1", 0.5)
+    assert payload["session_id"] == "s1"
+    history = memory.db.get_history("m-tea")
+    assert [(h["old_memory"], h["new_memory"]) for h in history] == [
+        ("tea drinker", "likes green tea"),
+    ]
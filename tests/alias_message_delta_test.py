@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import uuid
+
+from alias.server.utils.message_delta import (
+    MessageDeltaEncoder,
+    diff_message,
+)
+
+
+def apply_frame(state, frame):
+    """What a delta-aware client does with a frame"""
+    if frame["frame"] == "snapshot":
+        return {k: v for k, v in frame.items() if k not in ("frame", "seq")}
+    state = copy.deepcopy(state)
+    for path, text in frame.get("append", {}).items():
+        target, key = _resolve(state, path)
+        target[key] += text
+    for path, value in frame.get("set", {}).items():
+        target, key = _resolve(state, path)
+        target[key] = value
+    return state
+
+
+def _resolve(state, path):
+    if path.startswith("message."):
+        return state["message"], path[len("message.") :]
+    return state, path
+
+
+def make_info(message_id, content, status="running", step=0):
+    return {
+        "id": message_id,
+        "message": {
+            "role": "assistant",
+            "type": "response",
+            "status": status,
+            "content": content,
+        },
+        "update_time": f"2025-01-01T00:00:{step:02d}",
+        "meta_data": {},
+    }
+
+
+def test_diff_message_appends_and_sets():
+    previous = make_info("m", "Hello")
+    current = make_info("m", "Hello world", status="finished", step=1)
+    current["message"]["arguments"] = {"q": 1}
+    del current["meta_data"]
+
+    append, changed = diff_message(previous, current)
+
+    assert append == {"message.content": " world"}
+    assert changed == {
+        "message.status": "finished",
+        "message.arguments": {"q": 1},
+        "update_time": "2025-01-01T00:00:01",
+        "meta_data": None,
+    }
+
+
+def test_delta_stream_rebuilds_message_with_less_data():
+    message_id = str(uuid.uuid4())
+    encoder = MessageDeltaEncoder(snapshot_interval=20)
+    tokens = [f"token{i} " for i in range(60)]
+
+    states, frames = [], []
+    content = ""
+    for step, token in enumerate(tokens):
+        content += token
+        info = make_info(message_id, content, step=step % 60)
+        states.append(info)
+        frames.append(encoder.encode(info, snapshot=step == 0))
+
+    client = None
+    for state, frame in zip(states, frames):
+        client = apply_frame(client, frame)
+        assert client == state
+
+    assert [f["seq"] for f in frames] == list(range(1, 61))
+    snapshots = [f["seq"] for f in frames if f["frame"] == "snapshot"]
+    assert snapshots == [1, 21, 41]
+    assert frames[1]["append"] == {"message.content": tokens[1]}
+
+    full_bytes = sum(len(json.dumps(s)) for s in states)
+    delta_bytes = sum(len(json.dumps(f)) for f in frames)
+    assert delta_bytes < full_bytes / 2
+
+    # A finished message is sent whole, and a new stream starts over
+    final = encoder.encode(states[-1], snapshot=True)
+    assert final["frame"] == "snapshot"
+    encoder.forget(message_id)
+    assert encoder.encode(states[0])["seq"] == 1
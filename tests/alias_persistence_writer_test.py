@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+import fakeredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from alias.server.core import persistence_writer as writer_module
+from alias.server.core.cache import redis_cache
+from alias.server.core.config import settings
+from alias.server.core.persistence_writer import PersistenceWriter
+from alias.server.models import conversation, user  # noqa: F401
+from alias.server.models.message import Message
+from alias.server.models.plan import Plan
+from alias.server.models.state import State
+
+
+@pytest_asyncio.fixture
+async def database(monkeypatch):
+    """In-memory SQLite database counting the sessions opened on it"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    sessions = []
+
+    @asynccontextmanager
+    async def session_scope():
+        sessions.append(1)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    monkeypatch.setattr(writer_module, "session_scope", session_scope)
+    monkeypatch.setattr(
+        redis_cache,
+        "redis_client",
+        fakeredis.FakeAsyncRedis(),
+    )
+    yield engine, sessions
+    await engine.dispose()
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    monkeypatch.setattr(PersistenceWriter, "_instance", None)
+    return PersistenceWriter()
+
+
+async def fetch(engine, model):
+    async with AsyncSession(engine) as session:
+        return (await session.exec(select(model))).all()
+
+
+def make_message(conversation_id, message_id=None):
+    return Message(
+        id=message_id or uuid.uuid4(),
+        conversation_id=conversation_id,
+        parent_message_id=None,
+        message={"role": "assistant", "content": "done"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batch_in_one_session(database, writer):
+    engine, sessions = database
+    await writer.start()
+    conversation_id = uuid.uuid4()
+
+    messages = [make_message(conversation_id) for _ in range(20)]
+    for message in messages:
+        await writer.add_message(message)
+    # A resumed stream submits a message again
+    await writer.add_message(messages[0])
+    for step in range(3):
+        await writer.add_plan(
+            Plan(conversation_id=conversation_id, content={"step": step}),
+        )
+        await writer.add_state(
+            State(conversation_id=conversation_id, content=f"s{step}"),
+        )
+    assert sessions == []
+    assert writer.pending == 22
+
+    assert await writer.flush()
+    assert len(sessions) == 1
+    assert len(await fetch(engine, Message)) == 20
+    plans = await fetch(engine, Plan)
+    assert [p.content for p in plans] == [{"step": 2}]
+
+    # Later plans update the stored row; stored messages are skipped
+    await writer.add_message(messages[1])
+    await writer.add_plan(
+        Plan(conversation_id=conversation_id, content={"step": 3}),
+    )
+    await writer.stop()
+    assert len(await fetch(engine, Message)) == 20
+    assert [p.content for p in await fetch(engine, Plan)] == [{"step": 3}]
+    assert [s.content for s in await fetch(engine, State)] == ["s2"]
+    assert writer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_background_flush_and_durable_stop(
+    database,
+    writer,
+    monkeypatch,
+):
+    engine, _ = database
+    monkeypatch.setattr(settings, "PERSIST_FLUSH_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "PERSIST_SHUTDOWN_RETRIES", 2)
+    await writer.start()
+
+    await writer.add_message(make_message(uuid.uuid4()))
+    await asyncio.sleep(0.2)
+    assert len(await fetch(engine, Message)) == 1
+
+    # The database fails once while shutting down
+    healthy_scope = writer_module.session_scope
+    failures = []
+
+    @asynccontextmanager
+    async def flaky_scope():
+        if not failures:
+            failures.append(1)
+            raise ConnectionError("database unavailable")
+        async with healthy_scope() as session:
+            yield session
+
+    await writer.stop()
+    await writer.add_message(make_message(uuid.uuid4()))
+    await writer.add_message(make_message(uuid.uuid4()))
+    assert len(await fetch(engine, Message)) == 3
+
+    monkeypatch.setattr(writer_module, "session_scope", flaky_scope)
+    await writer.start()
+    await writer.add_message(make_message(uuid.uuid4()))
+    await writer.stop()
+    assert failures == [1]
+    assert writer.failures == 1
+    assert writer.pending == 0
+    assert len(await fetch(engine, Message)) == 4
+
+
+@pytest.mark.asyncio
+async def test_flush_of_one_conversation_keeps_the_others_buffered(
+    database,
+    writer,
+):
+    engine, sessions = database
+    await writer.start()
+    read, other = uuid.uuid4(), uuid.uuid4()
+    for conversation_id in (read, other):
+        await writer.add_message(make_message(conversation_id))
+        await writer.add_plan(
+            Plan(conversation_id=conversation_id, content={"step": 0}),
+        )
+
+    assert await writer.flush(read)
+    assert len(sessions) == 1
+    assert [m.conversation_id for m in await fetch(engine, Message)] == [
+        read,
+    ]
+    assert [p.conversation_id for p in await fetch(engine, Plan)] == [read]
+    assert writer.pending == 2
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_latest_stored_row_of_a_conversation_is_updated(
+    database,
+    writer,
+):
+    engine, _ = database
+    conversation_id = uuid.uuid4()
+    # Plans of an older version, stored newest first
+    async with AsyncSession(engine) as session:
+        for step, created in ((1, "2025-01-02"), (0, "2025-01-01")):
+            session.add(
+                Plan(
+                    conversation_id=conversation_id,
+                    content={"step": step},
+                    create_time=created,
+                ),
+            )
+        await session.commit()
+
+    await writer.add_plan(
+        Plan(conversation_id=conversation_id, content={"step": 2}),
+    )
+
+    plans = sorted(await fetch(engine, Plan), key=lambda p: p.create_time)
+    assert [p.content for p in plans] == [{"step": 0}, {"step": 2}]